@@ -14,6 +14,7 @@ Usage:
 Examples:
   python3 run_benchmark.py lfm2.5-thinking:1.2b atomic atomic
   python3 run_benchmark.py mistral:7b extended atomic --output csv
+  python3 run_benchmark.py mistral:7b atomic atomic --repeat 5
   python3 run_benchmark.py gpt-oss:latest phase2 atomic
 
 Phases:
@@ -49,13 +50,17 @@ try:
 except ImportError:
     requests = None  # Only needed for compare mode
 
+from utils.blob_store import open_store, pack_row
+from utils.prompt_corpora import COMPARE_PROMPTS
+from utils.repetition import run_repeated, summarize_repetitions
+
 # Import cache module
 from utils.result_cache import ResultCache, get_cache, get_prompts_for_phase
 
 # Import error recovery module
 from utils.error_recovery import (
     Checkpoint, RetryConfig, retry_with_backoff, is_retryable_error,
-    load_checkpoint, save_checkpoint, clear_checkpoint,
+    load_checkpoint, save_checkpoint, journal_checkpoint, clear_checkpoint,
     save_partial_results, load_partial_results, register_crash_handler,
     add_resume_parser, get_resume_info, TimeoutHandler
 )
@@ -78,6 +83,8 @@ SUITE_PATH = Path(
 OLLAMA_BASE_URL = os.environ.get("OLLAMA_HOST", "http://localhost:11434")
 LLAMA_SERVER_URL = os.environ.get("LLAMA_SERVER_URL", "http://127.0.0.1:8081")
 CACHE_DIR = WORKSPACE / ".cache"
+# Content-addressed store for assistant_content of result JSON and cache files
+BLOB_DIR = WORKSPACE / "blobs"
 
 
 def build_ollama_options(model: str) -> dict:
@@ -90,9 +97,24 @@ def build_ollama_options(model: str) -> dict:
     opts: dict[str, Any] = {"temperature": 0.0}
     if "qwen3.5" in model_l or "glm" in model_l:
         opts.update({"num_predict": 1024, "top_p": 0.9, "top_k": 40})
+    opts.update(tuned_runtime_options(model))
     return opts
 
 
+_RUNTIME_OPTIONS: Dict[str, dict] = {}
+
+
+def tuned_runtime_options(model: str) -> dict:
+    """Runtime knobs (num_thread, num_batch, ...) that selfopt/runtime_tuner.py wrote to phase2_config.json."""
+    if model not in _RUNTIME_OPTIONS:
+        try:
+            entry = json.loads(CONFIG_PATH.read_text()).get("models", {}).get(model) or {}
+        except (OSError, ValueError):
+            entry = {}
+        _RUNTIME_OPTIONS[model] = dict(entry.get("runtime_options") or {})
+    return _RUNTIME_OPTIONS[model]
+
+
 def build_ollama_chat_kwargs(model: str, messages: list[dict], tools: list[dict]) -> dict:
     kwargs: dict[str, Any] = {
         "model": model,
@@ -229,13 +251,16 @@ def save_cache(model: str, phase: str, variant: str, signature: str, result: Dic
     cache_key = get_cache_key(model, phase, variant)
     cache_file = CACHE_DIR / f"{cache_key}.json"
     
+    blobs = open_store(BLOB_DIR)
+    if isinstance(result.get("results"), list):
+        result = {**result, "results": [pack_row(r, blobs) if isinstance(r, dict) else r for r in result["results"]]}
     cache_data = {
         "harness_signature": signature,
         "cached_at": time.time(),
         "result": result
     }
     
-    cache_file.write_text(json.dumps(cache_data, indent=2))
+    cache_file.write_text(json.dumps(cache_data, separators=(",", ":")))
 
 # =============================================================================
 # CONFIG LOADING
@@ -268,6 +293,14 @@ def get_variant_config(model: str, variant: str, config: Dict) -> Dict:
     return model_cfg["variants"][variant]
 
 
+def select_prompts(prompts: List[Tuple], prompt_ids: Optional[List[str]]) -> List[Tuple]:
+    """Keep only prompts whose id is in prompt_ids (None = all), preserving suite order."""
+    if prompt_ids is None:
+        return list(prompts)
+    wanted = set(prompt_ids)
+    return [p for p in prompts if p[0] in wanted]
+
+
 def extract_ollama_metrics(response: Dict) -> Dict:
     """Extract Ollama-native token/timing metrics from chat response.
 
@@ -278,6 +311,7 @@ def extract_ollama_metrics(response: Dict) -> Dict:
     prompt_eval_count = response.get("prompt_eval_count")
     prompt_eval_duration_ns = response.get("prompt_eval_duration")
     total_duration_ns = response.get("total_duration")
+    load_duration_ns = response.get("load_duration")
 
     tokens_per_second = None
     if isinstance(eval_count, int) and eval_count >= 0 and isinstance(eval_duration_ns, (int, float)) and eval_duration_ns > 0:
@@ -291,6 +325,7 @@ def extract_ollama_metrics(response: Dict) -> Dict:
         "eval_duration_ms": (eval_duration_ns / 1e6) if isinstance(eval_duration_ns, (int, float)) else None,
         "prompt_eval_duration_ms": (prompt_eval_duration_ns / 1e6) if isinstance(prompt_eval_duration_ns, (int, float)) else None,
         "total_duration_ms": (total_duration_ns / 1e6) if isinstance(total_duration_ns, (int, float)) else None,
+        "load_duration_ms": (load_duration_ns / 1e6) if isinstance(load_duration_ns, (int, float)) else None,
     }
 
 
@@ -317,6 +352,7 @@ class PromptResult:
     eval_duration_ms: Optional[float] = None
     prompt_eval_duration_ms: Optional[float] = None
     total_duration_ms: Optional[float] = None
+    load_duration_ms: Optional[float] = None  # Model load time inside this call (0 when warm)
 
 @dataclass
 class PhaseResult:
@@ -344,6 +380,7 @@ class PhaseResult:
     min_tps: Optional[float] = None
     total_tokens_generated: Optional[int] = None
     total_prompt_tokens: Optional[int] = None
+    total_load_duration_ms: Optional[float] = None  # Model (re)loads during the phase, excluded from inference
     notes: str = ""
 
 # =============================================================================
@@ -356,7 +393,8 @@ def run_atomic_phase(
     checkpoint: Optional[Checkpoint] = None,
     run_dir: Optional[Path] = None,
     timeout_s: int = TIMEOUT_SECONDS,
-    max_retries: int = 1
+    max_retries: int = 1,
+    prompt_ids: Optional[List[str]] = None
 ) -> PhaseResult:
     """Run atomic phase (P1-P12)
     
@@ -369,6 +407,7 @@ def run_atomic_phase(
         run_dir: Directory for saving checkpoints
         timeout_s: Timeout per prompt in seconds
         max_retries: Max retries per prompt
+        prompt_ids: Optional subset of prompt ids to run (default: all)
     """
     
     model_cfg = get_model_config(model, config)
@@ -392,7 +431,8 @@ def run_atomic_phase(
     # Track current prompt index for checkpointing
     prompt_idx = 0
     
-    for prompt_id, prompt_text, expected in ATOMIC_PROMPTS:
+    atomic_prompts = select_prompts(ATOMIC_PROMPTS, prompt_ids)
+    for prompt_id, prompt_text, expected in atomic_prompts:
         # Skip already completed prompts if resuming
         if prompt_idx < start_index:
             prompt_idx += 1
@@ -411,6 +451,7 @@ def run_atomic_phase(
             "eval_duration_ms": None,
             "prompt_eval_duration_ms": None,
             "total_duration_ms": None,
+            "load_duration_ms": None,
         }
         retry_count = 0
         
@@ -495,6 +536,7 @@ def run_atomic_phase(
             eval_duration_ms=metrics.get("eval_duration_ms"),
             prompt_eval_duration_ms=metrics.get("prompt_eval_duration_ms"),
             total_duration_ms=metrics.get("total_duration_ms"),
+            load_duration_ms=metrics.get("load_duration_ms"),
         ))
         
         # Save checkpoint after each prompt
@@ -502,14 +544,14 @@ def run_atomic_phase(
             checkpoint.prompt_index = prompt_idx + 1
             checkpoint.completed_prompts.append(prompt_id)
             checkpoint.partial_results.append(asdict(results[-1]))
-            save_checkpoint(run_dir, checkpoint)
+            journal_checkpoint(run_dir, checkpoint)
         
         prompt_idx += 1
     
     # Clear checkpoint on successful completion
     if checkpoint and run_dir:
         clear_checkpoint(run_dir)
-    total = len(ATOMIC_PROMPTS)
+    total = len(atomic_prompts)
     accuracy = passed / total if total else 0
     restraint_score = restraint_passed / restraint_total if restraint_total else 0
     
@@ -537,6 +579,7 @@ def run_atomic_phase(
 
     total_tokens_generated = sum(r.tokens_generated for r in results if isinstance(r.tokens_generated, int))
     total_prompt_tokens = sum(r.prompt_tokens for r in results if isinstance(r.prompt_tokens, int))
+    total_load_duration_ms = sum(r.load_duration_ms for r in results if isinstance(r.load_duration_ms, (int, float)))
 
     print("=" * 80)
     print(f"RESULT: {passed}/{total} passed ({accuracy*100:.1f}%) | Restraint: {restraint_score:.2f} | Latency: avg={avg_latency_ms:.0f}ms med={median_latency_ms:.0f}ms max={max_latency_ms:.0f}ms")
@@ -567,6 +610,7 @@ def run_atomic_phase(
         min_tps=min_tps,
         total_tokens_generated=total_tokens_generated,
         total_prompt_tokens=total_prompt_tokens,
+        total_load_duration_ms=total_load_duration_ms,
     )
 
 def run_extended_phase(
@@ -575,7 +619,8 @@ def run_extended_phase(
     checkpoint: Optional[Checkpoint] = None,
     run_dir: Optional[Path] = None,
     timeout_s: int = TIMEOUT_SECONDS,
-    max_retries: int = 1
+    max_retries: int = 1,
+    prompt_ids: Optional[List[str]] = None
 ) -> PhaseResult:
     """Run extended phase (P13-P30, multi-turn)
     
@@ -589,12 +634,20 @@ def run_extended_phase(
         run_dir: Directory for saving checkpoints
         timeout_s: Timeout per prompt in seconds
         max_retries: Max retries per prompt
+        prompt_ids: Optional subset of prompt ids to run (default: all)
     """
     
     model_cfg = get_model_config(model, config)
     variant_cfg = get_variant_config(model, variant, config)
     system_prompt = variant_cfg.get("system", model_cfg.get("system_prompt"))
     effective_timeout_s = model_cfg.get("timeout_seconds", timeout_s)
+    if prompt_ids is not None:
+        wanted = set(prompt_ids)
+        suite = {
+            category: [item for item in items if item["id"] in wanted]
+            for category, items in suite.items()
+        }
+        suite = {category: items for category, items in suite.items() if items}
     
     results = []
     by_category = {}
@@ -641,6 +694,7 @@ def run_extended_phase(
                 "eval_duration_ms": None,
                 "prompt_eval_duration_ms": None,
                 "total_duration_ms": None,
+                "load_duration_ms": None,
             }
             
             signal.signal(signal.SIGALRM, timeout_handler)
@@ -705,6 +759,7 @@ def run_extended_phase(
                 eval_duration_ms=metrics.get("eval_duration_ms"),
                 prompt_eval_duration_ms=metrics.get("prompt_eval_duration_ms"),
                 total_duration_ms=metrics.get("total_duration_ms"),
+            load_duration_ms=metrics.get("load_duration_ms"),
             ))
             
             # Save checkpoint after each prompt
@@ -712,7 +767,7 @@ def run_extended_phase(
                 checkpoint.prompt_index = prompt_idx + 1
                 checkpoint.completed_prompts.append(prompt_id)
                 checkpoint.partial_results.append(asdict(results[-1]))
-                save_checkpoint(run_dir, checkpoint)
+                journal_checkpoint(run_dir, checkpoint)
             
             prompt_idx += 1
         
@@ -752,6 +807,7 @@ def run_extended_phase(
 
     total_tokens_generated = sum(r.tokens_generated for r in results if isinstance(r.tokens_generated, int))
     total_prompt_tokens = sum(r.prompt_tokens for r in results if isinstance(r.prompt_tokens, int))
+    total_load_duration_ms = sum(r.load_duration_ms for r in results if isinstance(r.load_duration_ms, (int, float)))
 
     print("\n" + "=" * 80)
     print(f"RESULT: {passed}/{total} passed ({total_accuracy*100:.1f}%) | Latency: avg={avg_latency_ms:.0f}ms med={median_latency_ms:.0f}ms max={max_latency_ms:.0f}ms")
@@ -786,14 +842,209 @@ def run_extended_phase(
         min_tps=min_tps,
         total_tokens_generated=total_tokens_generated,
         total_prompt_tokens=total_prompt_tokens,
+        total_load_duration_ms=total_load_duration_ms,
     )
 
+# =============================================================================
+# STRUCTURED API
+# =============================================================================
+
+def phase_result_from_cache(cached_result: Dict, model: str) -> PhaseResult:
+    """Rebuild a (summary-only) PhaseResult from a ResultCache entry."""
+    summary = cached_result.get("summary", {})
+    return PhaseResult(
+        model=cached_result["model"],
+        phase=cached_result["phase"],
+        variant=cached_result["variant"],
+        timestamp=cached_result.get("timestamp", time.time()),
+        config_name=cached_result.get("config_name", model),
+        system_prompt="",  # Not stored in cache
+        passed=summary.get("passed", 0),
+        total=summary.get("total", 0),
+        accuracy=summary.get("accuracy", 0.0),
+        results=[],  # Not needed for summary
+        failed_prompts=cached_result.get("failed_prompts", []),
+        restraint_score=summary.get("restraint_score"),
+        by_category=cached_result.get("by_category"),
+    )
+
+
+def run_phase(
+    model: str, phase: str, variant: str,
+    config: Optional[Dict] = None,
+    timeout_s: int = TIMEOUT_SECONDS,
+    max_retries: int = 1,
+    use_cache: bool = True,
+    resume_dir: Optional[Path] = None,
+    prompt_ids: Optional[List[str]] = None,
+) -> PhaseResult:
+    """Run one standard-mode (model, phase, variant) job and return its PhaseResult.
+
+    This is the in-process entry point behind the CLI: cache lookup, checkpointed
+    run, cache save. It does not print the summary box or write output files, so
+    callers (CLI, supervisor worker) decide what to do with the result.
+    """
+    phase = phase.lower()
+    if phase == "phase2":
+        phase = "atomic"
+    if phase not in ("atomic", "extended"):
+        raise ValueError(f"Invalid phase: {phase}. Use: atomic|extended|phase2")
+
+    if config is None:
+        config = load_harness_config()
+
+    cache = get_cache()
+    prompts = get_prompts_for_phase(phase)
+    if prompt_ids is not None:
+        # A subset run is a different cache entry than the full suite.
+        prompts = select_prompts(prompts, prompt_ids)
+    if use_cache:
+        is_cached, cached_result, time_saved = cache.check(model, phase, variant, prompts)
+        if cached_result:
+            return phase_result_from_cache(cached_result, model)
+
+    print(f"\n🚀 Starting {phase.upper()} phase benchmark...")
+
+    # Handle resume from checkpoint
+    resume_from = 0
+    checkpoint = None
+    run_dir = resume_dir
+    if run_dir is not None:
+        if not run_dir.exists():
+            raise FileNotFoundError(f"Resume directory not found: {run_dir}")
+        checkpoint = load_checkpoint(run_dir)
+        if checkpoint:
+            resume_from = checkpoint.prompt_index
+            print(f"🔄 Resuming from prompt index {resume_from}")
+            print(f"   Completed prompts: {len(checkpoint.completed_prompts)}")
+        else:
+            print(f"⚠️ No checkpoint found in {run_dir}, starting fresh")
+
+    # Create run directory for checkpointing
+    if run_dir is None:
+        timestamp = time.strftime("%Y%m%d_%H%M%S")
+        run_dir = WORKSPACE / f"run_{model.split(':')[0]}_{phase}_{timestamp}"
+        run_dir.mkdir(parents=True, exist_ok=True)
+
+    # Initialize checkpoint for new runs
+    if not checkpoint:
+        checkpoint = Checkpoint(
+            run_id=str(run_dir.name),
+            prompt_index=0,
+            completed_prompts=[],
+            partial_results=[],
+            metadata={
+                "model": model,
+                "phase": phase,
+                "variant": variant
+            }
+        )
+
+    # Register crash handler
+    register_crash_handler(run_dir, checkpoint)
+
+    if phase == "atomic":
+        result = run_atomic_phase(
+            model, variant, config,
+            start_index=resume_from,
+            checkpoint=checkpoint,
+            run_dir=run_dir,
+            timeout_s=timeout_s,
+            max_retries=max_retries,
+            prompt_ids=prompt_ids
+        )
+    else:  # extended
+        suite = load_extended_suite()
+        print(f"   ✅ Loaded extended suite ({len(suite)} categories)")
+        result = run_extended_phase(
+            model, variant, config, suite,
+            start_index=resume_from,
+            checkpoint=checkpoint,
+            run_dir=run_dir,
+            timeout_s=timeout_s,
+            max_retries=max_retries,
+            prompt_ids=prompt_ids
+        )
+
+    if use_cache:
+        result_dict = {
+            "summary": {
+                "passed": result.passed,
+                "total": result.total,
+                "accuracy": result.accuracy,
+                "restraint_score": result.restraint_score
+            },
+            "results": [asdict(r) for r in result.results],
+            "failed_prompts": result.failed_prompts,
+            "by_category": result.by_category,
+        }
+        cache.save(model, phase, variant, prompts, result_dict)
+
+    return result
+
+def run_phase_repeated(
+    model: str, phase: str, variant: str,
+    config: Optional[Dict] = None,
+    max_reps: int = 5,
+    confidence: float = 0.90,
+    timeout_s: int = TIMEOUT_SECONDS,
+    max_retries: int = 1,
+    prompt_ids: Optional[List[str]] = None,
+) -> Dict[str, Any]:
+    """Run each prompt up to max_reps times, stopping early once its outcome is settled.
+
+    Every round is an uncached run_phase over the prompts still unsettled.
+    Returns the repetition summary (bootstrap CIs, per-prompt pass rates)
+    plus the raw rows per prompt.
+    """
+    phase = phase.lower()
+    if phase == "phase2":
+        phase = "atomic"
+    if config is None:
+        config = load_harness_config()
+    ids = [p[0] for p in select_prompts(get_prompts_for_phase(phase), prompt_ids)]
+    rounds = []
+
+    def run_round(pending: List[str]) -> List[Dict]:
+        rounds.append(len(pending))
+        print(f"\n🔁 Repetition round {len(rounds)}: {len(pending)} prompt(s)")
+        result = run_phase(model, phase, variant, config=config, timeout_s=timeout_s,
+                           max_retries=max_retries, use_cache=False, prompt_ids=pending)
+        return [asdict(r) for r in result.results]
+
+    rows = run_repeated(run_round, ids, max_reps=max_reps, confidence=confidence)
+    summary = summarize_repetitions(rows, max_reps=max_reps, confidence=confidence)
+    summary["rounds"] = rounds
+    return {
+        "model": model,
+        "phase": phase,
+        "variant": variant,
+        "timestamp": time.time(),
+        "summary": summary,
+        "results": {pid: [{k: v for k, v in r.items() if k != "assistant_content"} for r in rs]
+                    for pid, rs in rows.items()},
+    }
+
+
+def print_repetition_summary(report: Dict[str, Any]) -> None:
+    """Print accuracy/latency intervals and how many runs early stopping saved"""
+    s = report["summary"]
+    ci = s["accuracy_ci"]
+    print(f"\n📊 {report['model']} {report['phase']}/{report['variant']}: "
+          f"accuracy {s['accuracy']:.3f} [{ci[0]}, {ci[1]}] @ {s['confidence']:.0%}")
+    for q in (50, 95):
+        print(f"   latency p{q}: {s[f'latency_p{q}_ms']} ms  CI {s[f'latency_p{q}_ci_ms']}")
+    print(f"   runs: {s['runs']} of {s['prompts'] * s['max_reps']} max ({s['runs_saved']} saved by early stopping)")
+    if s["flaky_prompts"]:
+        print(f"   unsettled after {s['max_reps']} reps: {', '.join(s['flaky_prompts'])}")
+
 # =============================================================================
 # OUTPUT FORMATTING
 # =============================================================================
 
 def save_json_output(result: PhaseResult, output_path: Path) -> None:
     """Save results as JSON"""
+    blobs = open_store(BLOB_DIR)
     data = {
         "model": result.model,
         "phase": result.phase,
@@ -816,14 +1067,24 @@ def save_json_output(result: PhaseResult, output_path: Path) -> None:
             "min_tps": result.min_tps,
             "total_tokens_generated": result.total_tokens_generated,
             "total_prompt_tokens": result.total_prompt_tokens,
+            "total_load_duration_ms": result.total_load_duration_ms,
         },
         "by_category": result.by_category,
         "failed_prompts": result.failed_prompts,
-        "results": [asdict(r) for r in result.results]
+        # assistant_content over a few hundred bytes becomes a BLOB_DIR reference
+        "results": [pack_row(asdict(r), blobs) for r in result.results]
     }
     
     output_path.write_text(json.dumps(data, indent=2))
 
+def save_prompt_log(result: PhaseResult, output_path: Path) -> None:
+    """Write one JSON line per prompt (the supervisor's per-job debug log)"""
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, "w", encoding="utf-8") as f:
+        for r in result.results:
+            row = r if isinstance(r, dict) else asdict(r)
+            f.write(json.dumps(row, ensure_ascii=False) + "\n")
+
 def save_csv_output(result: PhaseResult, output_path: Path) -> None:
     """Save results as CSV (summary + detail rows)"""
     with open(output_path, 'w', newline='') as f:
@@ -925,16 +1186,6 @@ def print_summary(result: PhaseResult) -> None:
 # COMPARE MODE — Backend comparison (Ollama vs llama-server)
 # =============================================================================
 
-COMPARE_PROMPTS = [
-    {"id": "simple_qa_1", "category": "simple_qa", "prompt": "What is the capital of France?", "expected_keywords": ["paris", "Paris"], "max_tokens": 50},
-    {"id": "simple_qa_2", "category": "simple_qa", "prompt": "Explain what photosynthesis is in one sentence.", "expected_keywords": ["light", "plant", "energy", "convert"], "max_tokens": 60},
-    {"id": "reasoning_1", "category": "reasoning", "prompt": "If all roses are flowers and some flowers fade quickly, what can we conclude about roses?", "expected_keywords": ["may", "might", "some", "could", "fade"], "max_tokens": 80},
-    {"id": "reasoning_2", "category": "reasoning", "prompt": "A train travels 60 mph. Another train travels 80 mph. They start 280 miles apart heading toward each other. How long until they meet?", "expected_keywords": ["2", "hours"], "max_tokens": 60},
-    {"id": "coding_1", "category": "coding", "prompt": "Write a Python function to check if a number is prime. Include comments.", "expected_keywords": ["def", "prime", "return", "%", "range"], "max_tokens": 100},
-    {"id": "coding_2", "category": "coding", "prompt": "Write a simple JavaScript function that reverses a string.", "expected_keywords": ["function", "return", "reverse"], "max_tokens": 80},
-    {"id": "math_1", "category": "math", "prompt": "What is the square root of 144?", "expected_keywords": ["12"], "max_tokens": 30},
-    {"id": "long_context_1", "category": "long_context", "prompt": "Summarize: AI evolved from 1950s symbolic systems to ML in the 1990s, deep learning in the 2010s, and transformers in 2017. LLMs now demonstrate emergent reasoning. Challenges: efficiency, hallucination, AGI.", "expected_keywords": ["ai", "deep learning", "transformer"], "max_tokens": 80},
-]
 
 
 def _call_openai_compat(base_url: str, model: str, prompt: str, max_tokens: int, timeout: int = 120) -> Dict[str, Any]:
@@ -1195,9 +1446,13 @@ def main():
 Examples:
   python3 run_benchmark.py lfm2.5-thinking:1.2b atomic atomic
   python3 run_benchmark.py mistral:7b extended atomic --output csv
+  python3 run_benchmark.py mistral:7b atomic atomic --repeat 5
   python3 run_benchmark.py gpt-oss:latest phase2 atomic --output json
   python3 run_benchmark.py qwen3.5:35b --mode compare --backends ollama,llama-server
   python3 run_benchmark.py lfm2.5-thinking:1.2b,glm-4.7-flash:latest --mode model-compare
+  python3 run_benchmark.py qwen3.5:35b --mode load --rates 0.5,1,2,4 --load-duration-s 60
+  python3 run_benchmark.py qwen2.5:3b,mistral:7b --mode coldstart --coldstart-reps 5
+  python3 run_benchmark.py qwen3.5:9b --mode prefix --prefix-lengths 0,2048,8192
         """
     )
     
@@ -1216,9 +1471,11 @@ Examples:
     )
     parser.add_argument(
         "--mode",
-        choices=["standard", "compare", "model-compare"],
+        choices=["standard", "compare", "model-compare", "load", "coldstart", "prefix"],
         default="standard",
-        help="Mode: standard (tool-calling), compare (backend A/B), model-compare (multi-model)"
+        help="Mode: standard (tool-calling), compare (backend A/B), model-compare (multi-model), "
+             "load (open-loop QPS sweep), coldstart (cold vs evicted-but-cached vs warm TTFT), "
+             "prefix (prompt-prefix cache savings on the extended suite)"
     )
     parser.add_argument(
         "--backends",
@@ -1260,6 +1517,12 @@ Examples:
         action="store_true",
         help="Disable result cache (always run benchmark)"
     )
+    parser.add_argument(
+        "--prompt-log",
+        type=str,
+        default="",
+        help="Also write per-prompt rows as JSONL to this path (standard mode, single run)"
+    )
     parser.add_argument(
         "--clear-cache",
         action="store_true",
@@ -1284,6 +1547,81 @@ Examples:
         help="Maximum retries per failed prompt (default: 1)"
     )
     
+    parser.add_argument(
+        "--prompt-ids",
+        type=str,
+        default="",
+        help="Comma-separated prompt ids to run (e.g. P1,P5,P9). Default: full suite"
+    )
+    
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=1,
+        help="Run each prompt up to N times with early stopping and bootstrap CIs (default: 1 = single run)"
+    )
+    parser.add_argument(
+        "--confidence",
+        type=float,
+        default=0.90,
+        help="Confidence level for --repeat settling and intervals (default: 0.90)"
+    )
+    parser.add_argument(
+        "--rates",
+        type=str,
+        default="0.25,0.5,1,2,4",
+        help="Offered QPS levels for load mode (default: 0.25,0.5,1,2,4)"
+    )
+    parser.add_argument(
+        "--load-duration-s",
+        type=float,
+        default=60.0,
+        help="Seconds per QPS level in load mode (default: 60)"
+    )
+    parser.add_argument(
+        "--arrival",
+        choices=["poisson", "fixed"],
+        default="poisson",
+        help="Arrival process for load mode (default: poisson)"
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=8,
+        help="Max in-flight requests in load mode (default: 8)"
+    )
+    parser.add_argument(
+        "--corpus",
+        type=str,
+        default="compare",
+        help="Load-mode prompts: compare, prompts_v1, or a JSON path (default: compare)"
+    )
+    
+    parser.add_argument(
+        "--coldstart-reps",
+        type=int,
+        default=3,
+        help="Cold and evicted-but-cached samples per model in coldstart mode (default: 3)"
+    )
+    parser.add_argument(
+        "--warm-requests",
+        type=int,
+        default=3,
+        help="Warm samples after each cold load in coldstart mode (default: 3)"
+    )
+    parser.add_argument(
+        "--restart-cmd",
+        type=str,
+        default="",
+        help='Coldstart mode: restart the server before each cold sample, e.g. "systemctl restart ollama"'
+    )
+    parser.add_argument(
+        "--prefix-lengths",
+        type=str,
+        default="0,1024,4096",
+        help="Prefix mode: comma-separated system-prefix sizes in approximate tokens (default: 0,1024,4096)"
+    )
+    
     parser.add_argument(
         "--isolate-call",
         action="store_true",
@@ -1316,6 +1654,90 @@ Examples:
             print(f"\n{result['qualitative_assessment']}")
         return
 
+    # ── Load mode (open-loop QPS sweep per backend × model) ───────────────
+    if args.mode == "load":
+        from utils.load_generator import format_markdown, run_load_test
+
+        backend_names = [b.strip() for b in args.backends.split(",")]
+        backend_urls = {
+            "ollama": OLLAMA_BASE_URL,
+            "llama-server": args.llama_server_url,
+        }
+        backends = {bn: backend_urls.get(bn, bn) for bn in backend_names}
+        models = [m.strip() for m in args.model.split(",")]
+        slug = "_vs_".join(m.split(":")[0] for m in models)
+        outdir = None if args.no_save else WORKSPACE / f"load_{slug}_{'_vs_'.join(backend_names)}"
+        print(f"📈 Load mode: {models} across {list(backends)} @ {args.rates} qps ({args.arrival})")
+        result = run_load_test(
+            backends, models, corpus=args.corpus, out_dir=outdir,
+            rates=[float(r) for r in args.rates.split(",") if r.strip()],
+            duration_s=args.load_duration_s,
+            process=args.arrival,
+            concurrency=args.concurrency,
+            timeout_s=args.timeout,
+        )
+        print(format_markdown(result))
+        if outdir is not None:
+            print(f"💾 Saved: {outdir}")
+        return
+
+    # ── Coldstart mode (cold / evicted-but-cached / warm TTFT) ────────────
+    if args.mode == "coldstart":
+        from utils.cold_start import ColdStartBench, format_markdown as format_coldstart
+
+        models = [m.strip() for m in args.model.split(",")]
+        slug = "_vs_".join(m.split(":")[0] for m in models)
+        outdir = None if args.no_save else WORKSPACE / f"coldstart_{slug}"
+        print(f"🧊 Coldstart mode: {models} x {args.coldstart_reps} reps")
+        bench = ColdStartBench(
+            OLLAMA_BASE_URL,
+            warm_requests=args.warm_requests,
+            restart_cmd=args.restart_cmd or None,
+            timeout_s=max(args.timeout, 300),
+        )
+        report = bench.run(models, reps=args.coldstart_reps, out_dir=outdir)
+        print(format_coldstart(report))
+        if outdir is not None:
+            print(f"💾 Saved: {outdir}")
+        return
+
+    # ── Prefix mode (prompt-prefix / KV-cache reuse on the extended suite) ─
+    if args.mode == "prefix":
+        from utils.prefix_cache import (
+            LlamaServerChatClient, PrefixCacheBench, format_markdown as format_prefix, load_suite, parse_lengths,
+        )
+
+        class _OllamaExtendedClient:
+            """Same request path and metrics as run_extended_phase."""
+            name = "ollama"
+
+            def chat(self, model, messages, max_tokens):
+                kwargs = build_ollama_chat_kwargs(model=model, messages=messages, tools=TOOLS)
+                kwargs["options"] = {**kwargs["options"], "num_predict": max_tokens}
+                kwargs["keep_alive"] = "30m"
+                metrics = extract_ollama_metrics(ollama.chat(**kwargs))
+                return {**metrics, "cached_tokens": None}
+
+        models = [m.strip() for m in args.model.split(",")]
+        backend = args.backends.split(",")[0].strip()
+        if backend == "ollama":
+            client = _OllamaExtendedClient()
+        else:
+            client = LlamaServerChatClient(args.llama_server_url if backend == "llama-server" else backend,
+                                           tools=TOOLS, timeout_s=args.timeout)
+        prompt_ids = [p.strip() for p in args.prompt_ids.split(",") if p.strip()] or None
+        system_prompt = (load_harness_config()["models"].get(models[0]) or {}).get("system_prompt")
+        slug = "_vs_".join(m.split(":")[0] for m in models)
+        outdir = None if args.no_save else WORKSPACE / f"prefix_{slug}_{client.name}"
+        print(f"🧩 Prefix mode: {models} on {client.name} @ prefix {args.prefix_lengths} tokens")
+        bench = PrefixCacheBench(client, system_prompt=system_prompt)
+        report = bench.run(models, load_suite(SUITE_PATH, prompt_ids), parse_lengths(args.prefix_lengths),
+                           out_dir=outdir)
+        print(format_prefix(report))
+        if outdir is not None:
+            print(f"💾 Saved: {outdir}")
+        return
+
     # ── Model-compare mode (multi-model, same backend) ────────────────────
     if args.mode == "model-compare":
         models = [m.strip() for m in args.model.split(",")]
@@ -1365,135 +1787,35 @@ Examples:
         if args.clear_cache:
             cache.clear()
         
-        # Get prompts for caching
-        prompts = get_prompts_for_phase(phase)
-        
-        # Check cache (unless disabled)
-        cached_result = None
-        if not args.no_cache:
-            is_cached, cached_result, time_saved = cache.check(
-                args.model, phase, args.variant, prompts
-            )
-            
-            if cached_result:
-                # Reconstruct Phase is_cached andResult from cache
-                from dataclasses import dataclass
-                
-                result = PhaseResult(
-                    model=cached_result["model"],
-                    phase=cached_result["phase"],
-                    variant=cached_result["variant"],
-                    timestamp=cached_result.get("timestamp", time.time()),
-                    config_name=cached_result.get("config_name", args.model),
-                    system_prompt="",  # Not stored in cache
-                    passed=cached_result.get("summary", {}).get("passed", 0),
-                    total=cached_result.get("summary", {}).get("total", 0),
-                    accuracy=cached_result.get("summary", {}).get("accuracy", 0.0),
-                    results=[],  # Not needed for summary
-                    failed_prompts=cached_result.get("failed_prompts", []),
-                    restraint_score=cached_result.get("summary", {}).get("restraint_score"),
-                    by_category=cached_result.get("by_category")
-                )
-                
-                print_summary(result)
-                cache.print_stats()
-                
-                if not args.no_save:
-                    if args.output == "json":
-                        output_path = WORKSPACE / f"{phase}_result_{args.model.split(':')[0]}_{args.variant}.json"
-                    else:
-                        output_path = WORKSPACE / f"{phase}_result_{args.model.split(':')[0]}_{args.variant}.csv"
-                    
-                    if args.output == "json":
-                        save_json_output(result, output_path)
-                    else:
-                        save_csv_output(result, output_path)
-                    
-                    print(f"💾 Saved: {output_path}")
-                
-                return  # Exit early with cached result
-        
-        # Run benchmark
-        print(f"\n🚀 Starting {phase.upper()} phase benchmark...")
-        
-        # Handle resume from checkpoint
-        resume_from = 0
-        run_dir = None
-        checkpoint = None
-        
-        if args.resume:
-            run_dir = Path(args.resume)
-            if not run_dir.exists():
-                print(f"❌ Resume directory not found: {run_dir}", file=sys.stderr)
-                sys.exit(1)
-            
-            checkpoint = load_checkpoint(run_dir)
-            if checkpoint:
-                resume_from = checkpoint.prompt_index
-                print(f"🔄 Resuming from prompt index {resume_from}")
-                print(f"   Completed prompts: {len(checkpoint.completed_prompts)}")
-            else:
-                print(f"⚠️ No checkpoint found in {run_dir}, starting fresh")
-        
-        # Create run directory for checkpointing
-        if not run_dir:
-            timestamp = time.strftime("%Y%m%d_%H%M%S")
-            run_dir = WORKSPACE / f"run_{args.model.split(':')[0]}_{phase}_{timestamp}"
-            run_dir.mkdir(parents=True, exist_ok=True)
-        
-        # Initialize checkpoint for new runs
-        if not checkpoint:
-            checkpoint = Checkpoint(
-                run_id=str(run_dir.name),
-                prompt_index=0,
-                completed_prompts=[],
-                partial_results=[],
-                metadata={
-                    "model": args.model,
-                    "phase": phase,
-                    "variant": args.variant
-                }
-            )
-        
-        # Register crash handler
-        register_crash_handler(run_dir, checkpoint)
-        
-        if phase == "atomic":
-            result = run_atomic_phase(
-                args.model, args.variant, config,
-                start_index=resume_from,
-                checkpoint=checkpoint,
-                run_dir=run_dir,
+        if args.repeat > 1:
+            report = run_phase_repeated(
+                args.model, phase, args.variant,
+                config=config,
+                max_reps=args.repeat,
+                confidence=args.confidence,
                 timeout_s=args.timeout,
-                max_retries=args.max_retries
-            )
-        else:  # extended
-            suite = load_extended_suite()
-            print(f"   ✅ Loaded extended suite ({len(suite)} categories)")
-            result = run_extended_phase(
-                args.model, args.variant, config, suite,
-                start_index=resume_from,
-                checkpoint=checkpoint,
-                run_dir=run_dir,
-                timeout_s=args.timeout,
-                max_retries=args.max_retries
+                max_retries=args.max_retries,
+                prompt_ids=[p.strip() for p in args.prompt_ids.split(",") if p.strip()] or None,
             )
+            print_repetition_summary(report)
+            if not args.no_save:
+                output_path = WORKSPACE / f"{phase}_repeat_{args.model.split(':')[0]}_{args.variant}.json"
+                output_path.write_text(json.dumps(report, indent=2))
+                print(f"💾 Saved: {output_path}")
+            return
         
-        # Save to cache (unless disabled)
-        if not args.no_cache:
-            # Build result dict for cache
-            result_dict = {
-                "summary": {
-                    "passed": result.passed,
-                    "total": result.total,
-                    "accuracy": result.accuracy,
-                    "restraint_score": result.restraint_score
-                },
-                "results": [asdict(r) for r in result.results],
-                "failed_prompts": result.failed_prompts,
-                "by_category": result.by_category,
-            }
-            cache.save(args.model, phase, args.variant, prompts, result_dict)
+        result = run_phase(
+            args.model, phase, args.variant,
+            config=config,
+            timeout_s=args.timeout,
+            max_retries=args.max_retries,
+            use_cache=not args.no_cache,
+            resume_dir=Path(args.resume) if args.resume else None,
+            prompt_ids=[p.strip() for p in args.prompt_ids.split(",") if p.strip()] or None,
+        )
+        
+        if args.prompt_log:
+            save_prompt_log(result, Path(args.prompt_log))
         
         # Print summary
         print_summary(result)
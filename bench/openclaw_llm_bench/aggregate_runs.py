@@ -1,7 +1,9 @@
 #!/usr/bin/env python3
 """Aggregate multiple run folders into one markdown progress report.
 
-Reads runs/*/summary.json when present; otherwise falls back to results.jsonl.
+Merges each run's mergeable per-suite stats (runs/*/summary_sketches.json,
+written by run_bench.py) without touching raw rows; runs recorded before
+sketches existed fall back to one streaming pass over results.jsonl.
 Outputs:
 - runs/AGGREGATE_SUMMARY.md
 
@@ -13,9 +15,10 @@ from __future__ import annotations
 import json
 import os
 import math
-import statistics
 from typing import Any, Dict, List, Optional, Tuple
 
+from summary_stats import SuiteKey, SuiteStats, load_run_stats
+
 HERE = os.path.dirname(os.path.abspath(__file__))
 RUNS_DIR = os.path.join(HERE, "runs")
 OUT_MD = os.path.join(RUNS_DIR, "AGGREGATE_SUMMARY.md")
@@ -46,22 +49,6 @@ def percentile(xs: List[float], p: float) -> Optional[float]:
     return d0 + d1
 
 
-def load_results(run_dir: str) -> List[Dict[str, Any]]:
-    p = os.path.join(run_dir, "results.jsonl")
-    if not os.path.exists(p):
-        return []
-    rows = []
-    with open(p, "r", encoding="utf-8") as f:
-        for ln in f:
-            ln = ln.strip()
-            if not ln:
-                continue
-            obj = json.loads(ln)
-            if obj.get("record_type") == "result":
-                rows.append(obj)
-    return rows
-
-
 def fmt(x: Any) -> str:
     if x is None:
         return ""
@@ -99,22 +86,12 @@ def main() -> int:
 
     run_ids = sorted([d for d in os.listdir(RUNS_DIR) if os.path.isdir(os.path.join(RUNS_DIR, d)) and not d.startswith(".")])
 
-    # Aggregate per (provider, model, thinking)
-    agg: Dict[Tuple[str, str, Optional[str]], Dict[str, Any]] = {}
+    # Aggregate per (provider, model, thinking): counters and latency sketches
+    # merge across runs; suite wall-clock stays one span per run.
+    agg: Dict[SuiteKey, Dict[str, Any]] = {}
 
     for rid in run_ids:
-        rdir = os.path.join(RUNS_DIR, rid)
-        rows = load_results(rdir)
-        if not rows:
-            continue
-
-        # group per model
-        groups: Dict[Tuple[str, str, Optional[str]], List[Dict[str, Any]]] = {}
-        for r in rows:
-            k = (r.get("provider"), r.get("model"), r.get("thinking_level"))
-            groups.setdefault(k, []).append(r)
-
-        for k, rs in groups.items():
+        for k, st in load_run_stats(os.path.join(RUNS_DIR, rid)).items():
             prov, model, thinking = k
             a = agg.setdefault(
                 k,
@@ -123,36 +100,18 @@ def main() -> int:
                     "model": model,
                     "thinking": thinking,
                     "runs": [],
-                    "n_total": 0,
-                    "n_ok": 0,
-                    "n_success": 0,
-                    "n_error": 0,
-                    "n_rate_limited": 0,
-                    "n_skipped": 0,
-                    "e2e_success": [],
+                    "stats": SuiteStats(),
                     "wall_ms_spans": [],
                 },
             )
             a["runs"].append(rid)
-            a["n_total"] += len(rs)
-            a["n_ok"] += sum(1 for r in rs if r.get("availability_status") == "ok")
-            a["n_success"] += sum(1 for r in rs if r.get("availability_status") == "ok" and r.get("success"))
-            a["n_error"] += sum(1 for r in rs if r.get("availability_status") == "error")
-            a["n_rate_limited"] += sum(1 for r in rs if r.get("availability_status") == "rate_limited")
-            a["n_skipped"] += sum(1 for r in rs if r.get("availability_status") == "skipped_unavailable")
-
-            for r in rs:
-                if r.get("availability_status") == "ok" and r.get("success") and r.get("e2e_ms") is not None:
-                    a["e2e_success"].append(float(r["e2e_ms"]))
-
-            starts = [r.get("started_at_ms") for r in rs if r.get("started_at_ms") is not None]
-            ends = [r.get("ended_at_ms") for r in rs if r.get("ended_at_ms") is not None]
-            if starts and ends:
-                a["wall_ms_spans"].append(max(ends) - min(starts))
+            a["stats"].merge(st)
+            if st.wall_clock_ms is not None:
+                a["wall_ms_spans"].append(st.wall_clock_ms)
 
     lines: List[str] = []
     lines.append("# Aggregate Benchmark Progress\n")
-    lines.append("This file is auto-generated from `runs/*/results.jsonl`.\n")
+    lines.append("This file is auto-generated from `runs/*/summary_sketches.json` (or `results.jsonl` for older runs).\n")
     lines.append(
         "| Model | Thinking | Runs | n(total) | n(ok) | ok% (total) | n(success) | succ% (ok) | succ% (total) | n(error) | n(rate) | n(skipped) | e2e p50 | e2e p95 | suite wall p50 | Type |"
     )
@@ -160,13 +119,14 @@ def main() -> int:
     lines.append("|---|---|---:|---:|---:|---:|---:|---:|---:|---:|---:|---:|---:|---:|---:|---|")
 
     for k, a in sorted(agg.items(), key=lambda kv: (kv[0][0] or "", kv[0][1] or "", str(kv[0][2] or ""))):
-        nt = a["n_total"]
-        ok = a["n_ok"]
-        succ = a["n_success"]
+        c = a["stats"].counts
+        nt = c["n_total"]
+        ok = c["n_ok"]
+        succ = c["n_success"]
         ok_rate_total = (ok / nt) if nt else None
         succ_rate_ok = (succ / ok) if ok else None
         succ_rate_total = (succ / nt) if nt else None
-        e2e = a["e2e_success"]
+        e2e = a["stats"].e2e_success
         wall = a["wall_ms_spans"]
         prov_type = "local" if a["provider"] == "ollama_openai" else "remote"
         lines.append(
@@ -180,11 +140,11 @@ def main() -> int:
                 ns=succ,
                 srok=pct(succ_rate_ok),
                 srt=pct(succ_rate_total),
-                ne=a["n_error"],
-                nr=a["n_rate_limited"],
-                nsk=a["n_skipped"],
-                p50=fmt(percentile(e2e, 50)),
-                p95=fmt(percentile(e2e, 95)),
+                ne=c["n_error"],
+                nr=c["n_rate_limited"],
+                nsk=c["n_skipped_unavailable"],
+                p50=fmt(e2e.percentile(50)),
+                p95=fmt(e2e.percentile(95)),
                 w50=fmt(percentile([float(x) for x in wall], 50) if wall else None),
                 ptype=prov_type,
             )
@@ -22,6 +22,9 @@ from collections import defaultdict
 from dataclasses import dataclass, asdict
 from typing import Any, Dict, List, Optional, Tuple
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.blob_store import find_store, is_ref, resolve  # noqa: E402
+
 
 @dataclass
 class PromptResult:
@@ -33,7 +36,7 @@ class PromptResult:
     objective_pass: bool
     failure_type: Optional[str]
     output_length: int
-    raw_output: str
+    raw_output: Any  # text, or a runs/blobs reference (utils.blob_store.find_store(path).resolve)
 
 
 @dataclass
@@ -73,6 +76,7 @@ def percentile(xs: List[float], p: float) -> Optional[float]:
 def load_results(results_jsonl_path: str) -> List[PromptResult]:
     """Load results from results.jsonl."""
     results = []
+    store = None
     with open(results_jsonl_path, "r", encoding="utf-8") as f:
         for line in f:
             line = line.strip()
@@ -83,7 +87,13 @@ def load_results(results_jsonl_path: str) -> List[PromptResult]:
                 continue
             
             raw_output = obj.get("raw_output", "")
-            output_length = len(raw_output) if raw_output else 0
+            # A packed ref's "size" is UTF-8 bytes; resolve it so every length counts characters.
+            text = raw_output
+            if is_ref(raw_output):
+                if store is None:
+                    store = find_store(results_jsonl_path)
+                text = resolve(raw_output, store)
+            output_length = len(text) if text else 0
             
             result = PromptResult(
                 model=obj.get("model", ""),
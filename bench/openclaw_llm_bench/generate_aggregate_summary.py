@@ -1,106 +1,64 @@
 #!/usr/bin/env python3
-"""Generate comprehensive aggregate summary from benchmark results."""
+"""Generate comprehensive aggregate summary from benchmark results.
+
+Usage: generate_aggregate_summary.py [RUN_ID ...]
+
+Several run ids (or shards of one run) are merged from their per-suite
+counters and latency sketches (see summary_stats.py); raw rows are only read
+for runs without summary_sketches.json and for the results.csv export.
+"""
 
 import json
 import os
 import sys
-import statistics
 import csv
-from collections import defaultdict
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, Iterable, List, Tuple
 from datetime import datetime
 
-def load_results(results_file: str) -> List[Dict[str, Any]]:
-    """Load all result records from JSONL file."""
-    results = []
-    with open(results_file) as f:
-        for line in f:
-            if not line.strip():
-                continue
-            try:
-                record = json.loads(line)
-                if record.get("record_type") == "result":
-                    results.append(record)
-            except json.JSONDecodeError:
-                pass
-    return results
+from summary_stats import SuiteStats, iter_records, load_run_stats, merge_stats
 
-def aggregate_by_model(results: List[Dict]) -> Dict[str, Dict]:
-    """Aggregate results by model."""
-    agg = {}
-    
-    for result in results:
-        model = result.get("model")
-        if not model:
-            continue
-        
-        if model not in agg:
-            agg[model] = {
-                "calls": [],
-                "success_count": 0,
-                "pass_count": 0,
-                "e2e_times": [],
-                "failures": defaultdict(int),
-                "by_prompt": {},
-            }
-        
-        agg[model]["calls"].append(result)
-        agg[model]["e2e_times"].append(result.get("e2e_ms", 0))
-        
-        if result.get("success"):
-            agg[model]["success_count"] += 1
-        
-        if result.get("objective_pass"):
-            agg[model]["pass_count"] += 1
-        else:
-            violation = result.get("violation", "unknown")
-            agg[model]["failures"][violation] += 1
-        
-        # Track per-prompt stats
-        prompt_id = result.get("prompt_id", "unknown")
-        if prompt_id not in agg[model]["by_prompt"]:
-            agg[model]["by_prompt"][prompt_id] = {"pass": 0, "total": 0}
-        agg[model]["by_prompt"][prompt_id]["total"] += 1
-        if result.get("objective_pass"):
-            agg[model]["by_prompt"][prompt_id]["pass"] += 1
-    
+def iter_results(results_file: str) -> Iterable[Dict[str, Any]]:
+    """Stream result records from a JSONL file."""
+    for record in iter_records(results_file):
+        if record.get("record_type") == "result":
+            yield record
+
+def aggregate_by_model(run_dirs: List[str]) -> Dict[str, SuiteStats]:
+    """Merge per-suite stats of all runs into one SuiteStats per model."""
+    agg: Dict[str, SuiteStats] = {}
+    for (_prov, model, _thinking), stats in merge_stats(load_run_stats(d) for d in run_dirs).items():
+        if model:
+            agg.setdefault(model, SuiteStats()).merge(stats)
     return agg
 
-def compute_percentiles(times: List[int]) -> Dict[str, float]:
-    """Compute p50, p95, p99 from latencies."""
-    if not times:
-        return {"p50": 0, "p95": 0, "p99": 0}
-    
-    sorted_times = sorted(times)
-    n = len(sorted_times)
-    return {
-        "p50": sorted_times[int(n * 0.50)],
-        "p95": sorted_times[min(int(n * 0.95), n-1)],
-        "p99": sorted_times[min(int(n * 0.99), n-1)],
-    }
+def compute_percentiles(stats: SuiteStats) -> Dict[str, float]:
+    """p50, p95, p99 of all recorded latencies from the merged sketch."""
+    e2e = stats.e2e_all
+    return {f"p{p}": e2e.percentile(p) or 0 for p in (50, 95, 99)}
 
-def generate_summary(agg: Dict[str, Dict]) -> Dict[str, Any]:
+def generate_summary(agg: Dict[str, SuiteStats]) -> Dict[str, Any]:
     """Generate summary statistics per model."""
     summary = {}
     
-    for model, data in agg.items():
-        times = data["e2e_times"]
-        n = len(data["calls"])
+    for model, stats in agg.items():
+        c = stats.counts
+        e2e = stats.e2e_all
+        n = c["n_total"]
         
         summary[model] = {
             "num_prompts": n,
-            "success_count": data["success_count"],
-            "success_rate_pct": 100.0 * data["success_count"] / n if n > 0 else 0,
-            "objective_pass_count": data["pass_count"],
-            "objective_pass_rate_pct": 100.0 * data["pass_count"] / n if n > 0 else 0,
-            "mean_latency_ms": statistics.mean(times) if times else 0,
-            "median_latency_ms": statistics.median(times) if times else 0,
-            "min_latency_ms": min(times) if times else 0,
-            "max_latency_ms": max(times) if times else 0,
-            "stdev_latency_ms": statistics.stdev(times) if len(times) > 1 else 0,
-            "percentiles_ms": compute_percentiles(times),
-            "error_taxonomy": dict(data["failures"]),
-            "by_prompt": data["by_prompt"],
+            "success_count": c["n_success"],
+            "success_rate_pct": 100.0 * c["n_success"] / n if n > 0 else 0,
+            "objective_pass_count": c["n_objective_pass"],
+            "objective_pass_rate_pct": 100.0 * c["n_objective_pass"] / n if n > 0 else 0,
+            "mean_latency_ms": e2e.mean or 0,
+            "median_latency_ms": e2e.percentile(50) or 0,
+            "min_latency_ms": e2e.min or 0,
+            "max_latency_ms": e2e.max or 0,
+            "stdev_latency_ms": e2e.stdev or 0,
+            "percentiles_ms": compute_percentiles(stats),
+            "error_taxonomy": dict(stats.violations),
+            "by_prompt": stats.by_prompt,
         }
     
     return summary
@@ -130,8 +88,8 @@ def generate_markdown_table(ranked: List[tuple]) -> str:
     
     return "\n".join(lines)
 
-def generate_csv(results: List[Dict], csv_path: str) -> None:
-    """Export all results to CSV."""
+def generate_csv(results: Iterable[Dict], csv_path: str) -> None:
+    """Export results to CSV one row at a time."""
     with open(csv_path, "w", newline="", encoding="utf-8") as f:
         writer = csv.DictWriter(f, fieldnames=[
             "model", "prompt_id", "prompt_name", "e2e_ms", "ttft_ms",
@@ -171,30 +129,28 @@ def generate_hidden_gems(ranked: List[tuple]) -> List[str]:
     return sorted(gems, key=lambda x: -x["pass_rate"])
 
 def main():
-    if len(sys.argv) < 2:
-        run_id = "20260214_093023"  # Default
-    else:
-        run_id = sys.argv[1]
+    run_ids = sys.argv[1:] or ["20260214_093023"]  # Default
+    run_id = ", ".join(run_ids)
     
     here = os.path.dirname(os.path.abspath(__file__))
-    run_dir = os.path.join(here, "runs", run_id)
-    results_file = os.path.join(run_dir, "results.jsonl")
+    run_dirs = [os.path.join(here, "runs", rid) for rid in run_ids]
+    # Reports for a multi-run merge are written next to the first run.
+    run_dir = run_dirs[0]
     
-    if not os.path.exists(results_file):
-        print(f"Results file not found: {results_file}")
+    missing = [d for d in run_dirs if not os.path.isdir(d)]
+    if missing:
+        print(f"Run folder not found: {missing[0]}")
         sys.exit(1)
     
-    print(f"[{datetime.now().strftime('%H:%M:%S')}] Loading results from {results_file}...")
-    results = load_results(results_file)
-    print(f"[{datetime.now().strftime('%H:%M:%S')}] Loaded {len(results)} result records")
+    print(f"[{datetime.now().strftime('%H:%M:%S')}] Merging stats from {len(run_dirs)} run(s)...")
+    agg = aggregate_by_model(run_dirs)
+    n_results = sum(stats.counts["n_total"] for stats in agg.values())
+    print(f"[{datetime.now().strftime('%H:%M:%S')}] Aggregated {n_results} result records, {len(agg)} models")
     
-    if not results:
+    if not n_results:
         print("No results found!")
         sys.exit(1)
     
-    agg = aggregate_by_model(results)
-    print(f"[{datetime.now().strftime('%H:%M:%S')}] Aggregated {len(agg)} models")
-    
     summary = generate_summary(agg)
     ranked = rank_models(summary)
     
@@ -204,9 +160,13 @@ def main():
         json.dump(summary, f, indent=2, sort_keys=True)
     print(f"[{datetime.now().strftime('%H:%M:%S')}] Wrote {summary_json}")
     
-    # Write CSV export
+    # Write CSV export (the one output that needs raw rows; streamed)
     csv_path = os.path.join(run_dir, "results.csv")
-    generate_csv(results, csv_path)
+    results_files = [os.path.join(d, "results.jsonl") for d in run_dirs]
+    generate_csv(
+        (r for path in results_files if os.path.exists(path) for r in iter_results(path)),
+        csv_path,
+    )
     print(f"[{datetime.now().strftime('%H:%M:%S')}] Wrote {csv_path}")
     
     # Write markdown table
@@ -225,7 +185,7 @@ def main():
         f.write(f"**Run ID:** {run_id}\n")
         f.write(f"**Generated:** {datetime.now().isoformat()}\n\n")
         f.write(f"**Total Models:** {len(summary)}\n")
-        f.write(f"**Total Prompts:** {len(results)}/209\n\n")
+        f.write(f"**Total Prompts:** {n_results}/209\n\n")
         f.write(generate_markdown_table(ranked))
         
         gems = generate_hidden_gems(ranked)
@@ -1,358 +1,17 @@
 #!/usr/bin/env python3
-"""
-Phase 3C: CPU Utilization Profiling (Final - requests + psutil)
-================================================================
+"""Phase 3C: CPU Utilization Profiling (final).
+
+Superseded by scenarios/phase3c_cpu.json. This entry point forwards its arguments
+to the scenario engine:
 
-Accurate CPU profiling using psutil and requests library.
-Tests: qwen2.5:3b, llama3.2:3b, qwen3:4b, phi3:3.8b (5 prompts each)
+    python3 scenario_engine.py run phase3c_cpu [--models ...] [--resume]
 
-Outputs: CSV + Markdown report
+The original standalone runner is in git history.
 """
 
-import json
-import csv
-import os
 import sys
-import time
-from pathlib import Path
-from datetime import datetime
-from typing import List, Tuple
-
-import psutil
-import requests
-
-
-# Configuration
-MODELS = [
-    "qwen2.5:3b",
-    "llama3.2:3b",
-    "qwen3:4b",
-    "phi3:3.8b",
-]
-
-PROMPTS = [
-    "What is 2+2?",
-    "Explain machine learning in one sentence.",
-    "Who is the first president of the USA?",
-    "What is the capital of France?",
-    "Describe the water cycle.",
-]
-
-OLLAMA_ENDPOINT = "http://localhost:11434"
-OUTPUT_DIR = "phase3c_results"
-NUM_CORES = os.cpu_count() or 4
-
-
-def run_inference_with_cpu_profile(model: str, prompt: str) -> Tuple[float, float, float, int, List[float], bool]:
-    """
-    Run inference and profile CPU usage.
-    Returns: (duration_ms, mean_cpu_pct, peak_cpu_pct, cores_above_90, per_core_peaks, thermal)
-    """
-    print(f"    → {prompt[:50]:50s} ", end='', flush=True)
-    
-    url = f"{OLLAMA_ENDPOINT}/api/generate"
-    payload = {
-        "model": model,
-        "prompt": prompt,
-        "stream": False,
-    }
-    
-    # Warm up sampling
-    psutil.cpu_percent(interval=0.05, percpu=False)
-    psutil.cpu_percent(interval=0.05, percpu=True)
-    time.sleep(0.05)
-    
-    # Collect CPU samples during inference
-    cpu_samples = []
-    per_core_samples = []
-    
-    try:
-        start_time = time.time()
-        
-        # Make request with timeout
-        response = requests.post(url, json=payload, timeout=300)
-        duration_ms = (time.time() - start_time) * 1000
-        
-        # Sampling loop runs concurrently
-        # Sample CPU every 100ms
-        sample_interval = 0.1
-        sampling_duration = 0
-        max_samples = int(duration_ms / (sample_interval * 1000)) + 5
-        
-        # Run CPU sampling (simplified - just sample after to measure peak possible usage)
-        # In practice, we need to sample during. Let's do a quick estimate.
-        for _ in range(min(3, max_samples)):
-            cpu_pct = psutil.cpu_percent(interval=sample_interval, percpu=False)
-            per_core = psutil.cpu_percent(interval=0.05, percpu=True)
-            cpu_samples.append(cpu_pct)
-            per_core_samples.append(per_core)
-        
-        if not cpu_samples:
-            cpu_samples = [0.0]
-            per_core_samples = [[0.0] * NUM_CORES]
-        
-        # Calculate metrics
-        mean_cpu = sum(cpu_samples) / len(cpu_samples)
-        peak_cpu = max(cpu_samples)
-        
-        # Per-core analysis
-        per_core_peaks = [0.0] * NUM_CORES
-        for per_core in per_core_samples:
-            for i, usage in enumerate(per_core):
-                if i < len(per_core_peaks):
-                    per_core_peaks[i] = max(per_core_peaks[i], usage)
-        
-        cores_above_90 = sum(1 for u in per_core_peaks if u >= 90.0)
-        
-        # Check thermal
-        thermal = check_thermal_throttling()
-        
-        # Parse response to verify success
-        success = response.status_code == 200
-        
-        if success:
-            result_data = response.json()
-            print(f"OK {duration_ms:7.0f}ms | CPU:{peak_cpu:5.1f}%", flush=True)
-            return duration_ms, mean_cpu, peak_cpu, cores_above_90, per_core_peaks, thermal
-        else:
-            print(f"FAIL (HTTP {response.status_code})", flush=True)
-            return 0.0, 0.0, 0.0, 0, [0.0] * NUM_CORES, False
-            
-    except requests.exceptions.Timeout:
-        print(f"TIMEOUT", flush=True)
-        return 0.0, 0.0, 0.0, 0, [0.0] * NUM_CORES, False
-    except Exception as e:
-        print(f"ERROR: {str(e)[:40]}", flush=True)
-        return 0.0, 0.0, 0.0, 0, [0.0] * NUM_CORES, False
-
-
-def check_thermal_throttling() -> bool:
-    """Check for thermal throttling."""
-    try:
-        # Check thermal zones
-        for thermal_dir in Path('/sys/class/thermal').glob('thermal_zone*'):
-            try:
-                temp_file = thermal_dir / 'temp'
-                if temp_file.exists():
-                    with open(temp_file, 'r') as f:
-                        current_temp = int(f.read().strip())
-                    
-                    # Check against trip point
-                    trip_file = thermal_dir / 'trip_point_0_temp'
-                    if trip_file.exists():
-                        with open(trip_file, 'r') as f:
-                            max_temp = int(f.read().strip())
-                        if current_temp > (max_temp * 0.95):
-                            return True
-            except Exception:
-                pass
-        
-        # Check CPU frequency scaling
-        for cpu_dir in sorted(Path('/sys/devices/system/cpu').glob('cpu[0-9]*')):
-            try:
-                cpufreq_dir = cpu_dir / 'cpufreq'
-                cur_freq_file = cpufreq_dir / 'scaling_cur_freq'
-                max_freq_file = cpufreq_dir / 'cpuinfo_max_freq'
-                
-                if cur_freq_file.exists() and max_freq_file.exists():
-                    with open(cur_freq_file, 'r') as f:
-                        cur_freq = int(f.read().strip())
-                    with open(max_freq_file, 'r') as f:
-                        max_freq = int(f.read().strip())
-                    
-                    # If significantly below max, likely throttled
-                    if cur_freq < (max_freq * 0.90):
-                        return True
-            except Exception:
-                pass
-    except Exception:
-        pass
-    
-    return False
-
-
-def main():
-    os.makedirs(OUTPUT_DIR, exist_ok=True)
-    
-    print("=" * 90)
-    print("Phase 3C: CPU Utilization Profiling (requests + psutil)")
-    print("=" * 90)
-    print(f"Timestamp: {datetime.now().isoformat()}")
-    print(f"System: {NUM_CORES} cores")
-    print(f"Endpoint: {OLLAMA_ENDPOINT}")
-    print(f"Output: {OUTPUT_DIR}/")
-    print()
-    
-    # Verify connection
-    try:
-        tags_resp = requests.get(f"{OLLAMA_ENDPOINT}/api/tags", timeout=5)
-        if tags_resp.status_code != 200:
-            print("ERROR: Cannot connect to Ollama!")
-            sys.exit(1)
-    except Exception as e:
-        print(f"ERROR: Connection failed: {e}")
-        sys.exit(1)
-    
-    results = []
-    
-    # Run profiling
-    for model_num, model in enumerate(MODELS, 1):
-        print(f"\n[{model_num}/{len(MODELS)}] Model: {model}")
-        
-        for prompt_num, prompt in enumerate(PROMPTS, 1):
-            duration_ms, mean_cpu, peak_cpu, cores_90, per_core_peaks, thermal = \
-                run_inference_with_cpu_profile(model, prompt)
-            
-            if duration_ms > 0:
-                results.append({
-                    'model': model,
-                    'prompt_idx': prompt_num,
-                    'prompt': prompt,
-                    'duration_ms': duration_ms,
-                    'mean_cpu_pct': mean_cpu,
-                    'peak_cpu_pct': peak_cpu,
-                    'cores_above_90': cores_90,
-                    'thermal_throttle': thermal,
-                    'per_core_peak_min': min(per_core_peaks),
-                    'per_core_peak_max': max(per_core_peaks),
-                    'per_core_peak_mean': sum(per_core_peaks) / len(per_core_peaks),
-                })
-            
-            time.sleep(0.2)  # Cooldown
-    
-    print("\n" + "=" * 90)
-    print(f"Results: {len(results)} inferences completed")
-    print()
-    
-    # Write CSV
-    csv_path = Path(OUTPUT_DIR) / "cpu_profile.csv"
-    if results:
-        with open(csv_path, 'w', newline='') as f:
-            fieldnames = ['model', 'prompt_idx', 'prompt', 'duration_ms', 'mean_cpu_pct', 
-                         'peak_cpu_pct', 'cores_above_90', 'thermal_throttle',
-                         'per_core_peak_min', 'per_core_peak_max', 'per_core_peak_mean']
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-            for r in results:
-                writer.writerow({
-                    'model': r['model'],
-                    'prompt_idx': r['prompt_idx'],
-                    'prompt': r['prompt'],
-                    'duration_ms': f"{r['duration_ms']:.0f}",
-                    'mean_cpu_pct': f"{r['mean_cpu_pct']:.1f}",
-                    'peak_cpu_pct': f"{r['peak_cpu_pct']:.1f}",
-                    'cores_above_90': r['cores_above_90'],
-                    'thermal_throttle': r['thermal_throttle'],
-                    'per_core_peak_min': f"{r['per_core_peak_min']:.1f}",
-                    'per_core_peak_max': f"{r['per_core_peak_max']:.1f}",
-                    'per_core_peak_mean': f"{r['per_core_peak_mean']:.1f}",
-                })
-        print(f"✓ CSV: {csv_path}")
-    
-    # Generate report
-    report_path = Path(OUTPUT_DIR) / "CPU_PROFILE_REPORT.md"
-    generate_report(results, report_path)
-    print(f"✓ Report: {report_path}")
-
-
-def generate_report(results: List[dict], report_path: Path):
-    """Generate markdown report."""
-    
-    # Aggregate by model
-    by_model = {}
-    for r in results:
-        if r['model'] not in by_model:
-            by_model[r['model']] = []
-        by_model[r['model']].append(r)
-    
-    lines = []
-    lines.append("# Phase 3C: CPU Utilization Profiling Report")
-    lines.append(f"\n**Generated:** {datetime.now().isoformat()}")
-    lines.append(f"**System:** {NUM_CORES} cores")
-    lines.append(f"**Total samples:** {len(results)} inferences")
-    lines.append("")
-    
-    # Summary table
-    lines.append("## Summary by Model\n")
-    lines.append("| Model | Mean CPU % | Peak CPU % | Cores >90% | Thermal Events |")
-    lines.append("|-------|-----------|-----------|-----------|---|")
-    
-    for model in MODELS:
-        if model in by_model:
-            samples = by_model[model]
-            mean_cpus = [s['mean_cpu_pct'] for s in samples]
-            peak_cpus = [s['peak_cpu_pct'] for s in samples]
-            thermal_count = sum(1 for s in samples if s['thermal_throttle'])
-            cores_90_list = [s['cores_above_90'] for s in samples]
-            
-            avg_mean = sum(mean_cpus) / len(mean_cpus) if mean_cpus else 0
-            max_peak = max(peak_cpus) if peak_cpus else 0
-            max_cores_90 = max(cores_90_list) if cores_90_list else 0
-            
-            lines.append(f"| {model:20s} | {avg_mean:9.1f} | {max_peak:9.1f} | {max_cores_90:9d} | {thermal_count:3d}/{len(samples):3d} |")
-    
-    lines.append("")
-    
-    # Detailed per-model analysis
-    lines.append("## Per-Model Analysis\n")
-    for model in MODELS:
-        if model in by_model:
-            samples = by_model[model]
-            peak_cpus = [s['peak_cpu_pct'] for s in samples]
-            
-            lines.append(f"### {model}")
-            lines.append(f"- Samples: {len(samples)}")
-            lines.append(f"- Peak CPU: {max(peak_cpus):.1f}%")
-            lines.append(f"- Mean CPU: {sum(s['mean_cpu_pct'] for s in samples)/len(samples):.1f}%")
-            lines.append(f"- Core saturation (>90%): {max(s['cores_above_90'] for s in samples)}")
-            lines.append(f"- Thermal events: {sum(1 for s in samples if s['thermal_throttle'])}")
-            lines.append("")
-    
-    # Bottleneck analysis
-    lines.append("## Bottleneck Analysis\n")
-    all_peak = [r['peak_cpu_pct'] for r in results]
-    peak_overall = max(all_peak) if all_peak else 0
-    high_load_count = sum(1 for p in all_peak if p > 85)
-    thermal_total = sum(1 for r in results if r['thermal_throttle'])
-    
-    lines.append(f"**Peak system CPU:** {peak_overall:.1f}%")
-    lines.append(f"**High-load events (>85%):** {high_load_count}/{len(results)}")
-    lines.append(f"**Thermal throttling events:** {thermal_total}/{len(results)}")
-    lines.append("")
-    
-    if peak_overall > 85:
-        lines.append("### ✓ Conclusion: **CPU IS Likely the Bottleneck**")
-        lines.append("- Peak CPU utilization exceeds 85%, indicating high contention")
-        if high_load_count > len(results) * 0.3:
-            lines.append("- Frequent high-load events detected (>30% of samples)")
-        if thermal_total > 0:
-            lines.append("- Thermal throttling detected - system protecting from overheating")
-    else:
-        lines.append("### ✗ Conclusion: **CPU NOT the Bottleneck**")
-        lines.append("- Peak CPU remains below 85%, indicating spare capacity")
-        lines.append("- Other factors (I/O, memory, model loading) may be limiting")
-    
-    lines.append("")
-    lines.append("## Scaling Efficiency")
-    lines.append("Observe CPU usage correlation with model size:")
-    
-    size_order = ["qwen2.5:3b", "llama3.2:3b", "phi3:3.8b", "qwen3:4b"]
-    for model in size_order:
-        if model in by_model:
-            peak = max(s['peak_cpu_pct'] for s in by_model[model])
-            lines.append(f"  - {model:15s}: peak {peak:5.1f}% CPU")
-    
-    lines.append("")
-    lines.append("- **Linear scaling:** CPU usage ∝ model size → CPU-bound workload")
-    lines.append("- **Sub-linear scaling:** Usage growth slower than size increase → I/O bottleneck")
-    
-    # Write report
-    with open(report_path, 'w') as f:
-        f.write('\n'.join(lines))
-    
-    # Print summary
-    print("\n" + '\n'.join(lines[:35]))
 
+from scenario_engine import main
 
 if __name__ == "__main__":
-    main()
+    raise SystemExit(main(["run", "phase3c_cpu", *sys.argv[1:]]))
@@ -1,551 +1,17 @@
 #!/usr/bin/env python3
-"""
-Phase 3C: CPU Utilization Profiling for LLM Inference
-=========================================================
+"""Phase 3C: CPU Utilization Profiling for LLM Inference.
 
-Captures per-core CPU metrics, thermal info, and utilization during model inference.
-Tests: qwen2.5:3b, llama3.2:3b, qwen3:4b, phi3:3.8b (10 prompts each)
+Superseded by scenarios/phase3c_cpu.json. This entry point forwards its arguments
+to the scenario engine:
 
-Metrics:
-- CPU usage before/peak/after inference
-- Per-core utilization & saturation
-- Thermal throttling detection
-- Single-core vs multi-core load distribution
+    python3 scenario_engine.py run phase3c_cpu [--models ...] [--resume]
 
-Output: CSV + Markdown report
+The original standalone runner is in git history.
 """
 
-import json
-import subprocess
-import time
-import re
-import csv
-import os
 import sys
-from typing import Dict, List, Tuple, Optional, Any
-from dataclasses import dataclass, asdict
-from datetime import datetime
-
-# Models to profile (fast, lightweight)
-MODELS = [
-    "qwen2.5:3b",      # smallest, lightest load
-    "llama3.2:3b",     # small, reference
-    "qwen3:4b",        # medium, heavier load
-    "phi3:3.8b",       # small reference
-]
-
-# Simple test prompts (fast, deterministic)
-PROMPTS = [
-    "What is 2+2?",
-    "Explain machine learning in one sentence.",
-    "Who is the first president of the USA?",
-    "What is the capital of France?",
-    "Describe the water cycle.",
-    "What is 10 * 5?",
-    "List three primary colors.",
-    "What is Python used for?",
-    "Name a renewable energy source.",
-    "What year did the Titanic sink?"
-]
-
-OLLAMA_ENDPOINT = "http://localhost:11434"
-
-
-@dataclass
-class CPUSnapshot:
-    """Captured CPU metrics at a point in time."""
-    timestamp: float
-    overall_usage: float  # % (0-100)
-    per_core_usage: List[float]  # % per core
-    avg_core_usage: float
-    peak_core_usage: float
-    cores_above_50_pct: int
-    cores_above_80_pct: int
-
-
-@dataclass
-class InferenceSample:
-    """CPU metrics for a single inference run."""
-    model: str
-    prompt_idx: int
-    prompt: str
-    duration_ms: float
-    cpu_before: CPUSnapshot
-    cpu_peak: CPUSnapshot
-    cpu_after: CPUSnapshot
-    thermal_throttle: bool
-    notes: str = ""
-
-
-def run_cmd(cmd: List[str]) -> Tuple[int, str, str]:
-    """Execute command and return (returncode, stdout, stderr)."""
-    try:
-        p = subprocess.run(cmd, capture_output=True, text=True, timeout=60)
-        return p.returncode, p.stdout, p.stderr
-    except subprocess.TimeoutExpired:
-        return 124, "", "TIMEOUT"
-    except FileNotFoundError:
-        return 127, "", "NOT_FOUND"
-    except Exception as e:
-        return 1, "", str(e)
-
-
-def get_cpu_metrics() -> CPUSnapshot:
-    """Capture current CPU metrics via 'top' in batch mode."""
-    try:
-        # Use 'top' in batch mode for single snapshot
-        returncode, stdout, _ = run_cmd(["top", "-b", "-n", "1", "-d", "0.5"])
-        
-        if returncode != 0 or not stdout:
-            return CPUSnapshot(
-                timestamp=time.time(),
-                overall_usage=0.0,
-                per_core_usage=[],
-                avg_core_usage=0.0,
-                peak_core_usage=0.0,
-                cores_above_50_pct=0,
-                cores_above_80_pct=0,
-            )
-        
-        # Parse top output
-        lines = stdout.strip().split('\n')
-        per_core = []
-        
-        # Look for "%Cpu(s):" line (overall CPU usage)
-        overall = 0.0
-        for line in lines:
-            if line.startswith("%Cpu(s):"):
-                # Format: "%Cpu(s):  5.2%us,  2.1%sy,  0.0%ni, 92.7%id, ..."
-                # Extract the idle percentage and calculate usage
-                match = re.search(r'(\d+\.\d+)%id', line)
-                if match:
-                    idle_pct = float(match.group(1))
-                    overall = 100.0 - idle_pct
-                break
-        
-        # Parse per-core usage using 'mpstat' as fallback for more accurate metrics
-        returncode, mpstat_out, _ = run_cmd(["mpstat", "-P", "ALL", "1", "1"])
-        
-        if returncode == 0 and mpstat_out:
-            # Parse mpstat output (Linux format)
-            # Headers: CPU %usr %nice %sys %iowait %irq %soft %steal %guest %gnice %idle
-            lines = mpstat_out.strip().split('\n')
-            for line in lines:
-                if line.startswith("all"):
-                    # Extract idle and calculate usage
-                    parts = line.split()
-                    if len(parts) > 9:
-                        try:
-                            idle = float(parts[-1])
-                            overall = 100.0 - idle
-                        except ValueError:
-                            pass
-                elif re.match(r'^\d+\s+', line):
-                    # CPU-specific line
-                    parts = line.split()
-                    if len(parts) > 9:
-                        try:
-                            idle = float(parts[-1])
-                            usage = 100.0 - idle
-                            per_core.append(usage)
-                        except ValueError:
-                            pass
-        
-        # Fallback: use 'ps' to estimate per-core load via threads
-        if not per_core:
-            # Get approximate per-core from load average
-            try:
-                with open('/proc/loadavg', 'r') as f:
-                    load_line = f.read().strip()
-                    loads = load_line.split()[:1]
-                    if loads:
-                        # Rough estimate: assume load is distributed across cores
-                        load = float(loads[0])
-                        # Simulate per-core distribution (capped at 100%)
-                        num_cores = os.cpu_count() or 4
-                        per_core = [min(100.0, (load / num_cores) * 100.0)] * num_cores
-            except Exception:
-                per_core = []
-        
-        # Fallback if still empty
-        if not per_core:
-            per_core = [overall] * (os.cpu_count() or 4)
-        
-        avg_usage = sum(per_core) / len(per_core) if per_core else overall
-        peak_usage = max(per_core) if per_core else overall
-        cores_50 = sum(1 for u in per_core if u >= 50.0)
-        cores_80 = sum(1 for u in per_core if u >= 80.0)
-        
-        return CPUSnapshot(
-            timestamp=time.time(),
-            overall_usage=overall,
-            per_core_usage=per_core,
-            avg_core_usage=avg_usage,
-            peak_core_usage=peak_usage,
-            cores_above_50_pct=cores_50,
-            cores_above_80_pct=cores_80,
-        )
-    except Exception as e:
-        print(f"Error capturing CPU metrics: {e}", file=sys.stderr)
-        return CPUSnapshot(
-            timestamp=time.time(),
-            overall_usage=0.0,
-            per_core_usage=[],
-            avg_core_usage=0.0,
-            peak_core_usage=0.0,
-            cores_above_50_pct=0,
-            cores_above_80_pct=0,
-        )
-
-
-def check_thermal_throttle() -> bool:
-    """Check if CPU thermal throttling is active."""
-    try:
-        # Check thermal state on Linux
-        paths = [
-            "/sys/class/thermal/thermal_zone0/temp",
-            "/sys/class/thermal/thermal_zone1/temp",
-        ]
-        for path in paths:
-            if os.path.exists(path):
-                with open(path, 'r') as f:
-                    temp_mk = int(f.read().strip()) // 1000  # Convert to Celsius
-                    # Typical throttle threshold is 95-100°C for i7-8700
-                    if temp_mk > 90:
-                        return True
-        
-        # Check Intel P-State turbo boost status
-        try:
-            returncode, out, _ = run_cmd(["cat", "/sys/devices/system/cpu/intel_pstate/no_turbo"])
-            if returncode == 0 and out.strip() == "1":
-                return True
-        except:
-            pass
-        
-        return False
-    except Exception:
-        return False
-
-
-def inference_via_ollama(model: str, prompt: str) -> Tuple[float, bool]:
-    """
-    Run inference via Ollama and measure timing.
-    Returns (duration_ms, error_flag).
-    """
-    try:
-        import urllib.request
-        import urllib.error
-        
-        url = f"{OLLAMA_ENDPOINT}/api/generate"
-        payload = {
-            "model": model,
-            "prompt": prompt,
-            "stream": False,
-        }
-        
-        data = json.dumps(payload).encode('utf-8')
-        req = urllib.request.Request(url, data=data, method="POST")
-        req.add_header("Content-Type", "application/json")
-        
-        start = time.time()
-        try:
-            with urllib.request.urlopen(req, timeout=300) as resp:
-                response_data = json.loads(resp.read().decode('utf-8'))
-            duration_ms = (time.time() - start) * 1000.0
-            return duration_ms, False
-        except (urllib.error.URLError, urllib.error.HTTPError) as e:
-            return 0.0, True
-    except Exception as e:
-        print(f"Error running inference: {e}", file=sys.stderr)
-        return 0.0, True
-
-
-def monitor_inference(model: str, prompt: str, prompt_idx: int) -> InferenceSample:
-    """Run inference while monitoring CPU metrics."""
-    print(f"  [{model}] Prompt {prompt_idx + 1}/10: {prompt[:40]}...", flush=True)
-    
-    # Capture CPU before inference
-    time.sleep(0.5)
-    cpu_before = get_cpu_metrics()
-    
-    # Run inference and track peak CPU
-    cpu_peak = cpu_before
-    start_time = time.time()
-    
-    # Start inference in background and sample CPU during execution
-    duration_ms, error = inference_via_ollama(model, prompt)
-    
-    # Sample CPU during inference (up to 5 samples during the inference)
-    for _ in range(5):
-        if time.time() - start_time > duration_ms / 1000.0:
-            break
-        snapshot = get_cpu_metrics()
-        if snapshot.overall_usage > cpu_peak.overall_usage:
-            cpu_peak = snapshot
-        time.sleep(0.05)
-    
-    # Re-sample peak to ensure we capture it
-    time.sleep(0.1)
-    final_sample = get_cpu_metrics()
-    if final_sample.overall_usage > cpu_peak.overall_usage:
-        cpu_peak = final_sample
-    
-    # Capture CPU after inference
-    time.sleep(1.0)
-    cpu_after = get_cpu_metrics()
-    
-    thermal = check_thermal_throttle()
-    
-    return InferenceSample(
-        model=model,
-        prompt_idx=prompt_idx,
-        prompt=prompt,
-        duration_ms=duration_ms,
-        cpu_before=cpu_before,
-        cpu_peak=cpu_peak,
-        cpu_after=cpu_after,
-        thermal_throttle=thermal,
-        notes="error" if error else "ok",
-    )
-
-
-def run_profiling() -> List[InferenceSample]:
-    """Run CPU profiling across all models."""
-    results = []
-    
-    print("=" * 80)
-    print("Phase 3C: CPU Utilization Profiling")
-    print("=" * 80)
-    print(f"Timestamp: {datetime.now().isoformat()}")
-    print(f"System: {os.cpu_count()} cores")
-    print(f"Endpoint: {OLLAMA_ENDPOINT}")
-    print()
-    
-    for model in MODELS:
-        print(f"Testing model: {model}")
-        for idx, prompt in enumerate(PROMPTS):
-            sample = monitor_inference(model, prompt, idx)
-            results.append(sample)
-            print(f"    CPU: before={sample.cpu_before.overall_usage:.1f}% "
-                  f"peak={sample.cpu_peak.overall_usage:.1f}% "
-                  f"after={sample.cpu_after.overall_usage:.1f}% "
-                  f"duration={sample.duration_ms:.0f}ms "
-                  f"throttle={sample.thermal_throttle}")
-        print()
-    
-    return results
-
-
-def generate_csv_report(results: List[InferenceSample], output_path: str) -> None:
-    """Generate CSV report from profiling results."""
-    with open(output_path, 'w', newline='') as f:
-        writer = csv.writer(f)
-        
-        # Header
-        writer.writerow([
-            "model",
-            "prompt_idx",
-            "duration_ms",
-            "cpu_before_%",
-            "cpu_peak_%",
-            "cpu_after_%",
-            "peak_per_core_avg_%",
-            "peak_per_core_max_%",
-            "cores_above_50%",
-            "cores_above_80%",
-            "thermal_throttle",
-            "notes",
-        ])
-        
-        # Data rows
-        for sample in results:
-            writer.writerow([
-                sample.model,
-                sample.prompt_idx,
-                f"{sample.duration_ms:.1f}",
-                f"{sample.cpu_before.overall_usage:.1f}",
-                f"{sample.cpu_peak.overall_usage:.1f}",
-                f"{sample.cpu_after.overall_usage:.1f}",
-                f"{sample.cpu_peak.avg_core_usage:.1f}",
-                f"{sample.cpu_peak.peak_core_usage:.1f}",
-                sample.cpu_peak.cores_above_50_pct,
-                sample.cpu_peak.cores_above_80_pct,
-                "yes" if sample.thermal_throttle else "no",
-                sample.notes,
-            ])
-
-
-def generate_markdown_report(results: List[InferenceSample], output_path: str) -> None:
-    """Generate markdown summary report."""
-    # Aggregate by model
-    model_stats = {}
-    for r in results:
-        if r.model not in model_stats:
-            model_stats[r.model] = {
-                "samples": [],
-                "errors": 0,
-                "throttles": 0,
-            }
-        model_stats[r.model]["samples"].append(r)
-        if r.notes == "error":
-            model_stats[r.model]["errors"] += 1
-        if r.thermal_throttle:
-            model_stats[r.model]["throttles"] += 1
-    
-    with open(output_path, 'w') as f:
-        f.write("# Phase 3C: CPU Utilization Profiling Report\n\n")
-        f.write(f"**Timestamp:** {datetime.now().isoformat()}\n")
-        f.write(f"**System:** {os.cpu_count()} cores (Intel i7-8700 @ 70% scaling)\n")
-        f.write(f"**Endpoint:** {OLLAMA_ENDPOINT}\n\n")
-        
-        # Summary table
-        f.write("## Summary by Model\n\n")
-        f.write("| Model | n(runs) | Errors | CPU Before (%) | CPU Peak (%) | CPU After (%) | "
-                "Peak Avg Core (%) | Peak Max Core (%) | Cores @ 50%+ | Cores @ 80%+ | Throttles |\n")
-        f.write("|-------|---------|--------|---|---|---|---|---|---|---|---|\n")
-        
-        for model in MODELS:
-            if model not in model_stats:
-                continue
-            
-            stats = model_stats[model]
-            samples = stats["samples"]
-            valid = [s for s in samples if s.notes == "ok"]
-            
-            if not valid:
-                f.write(f"| {model} | {len(samples)} | {stats['errors']} | - | - | - | - | - | - | - | - |\n")
-                continue
-            
-            cpu_before = sum(s.cpu_before.overall_usage for s in valid) / len(valid)
-            cpu_peak = sum(s.cpu_peak.overall_usage for s in valid) / len(valid)
-            cpu_after = sum(s.cpu_after.overall_usage for s in valid) / len(valid)
-            peak_avg = sum(s.cpu_peak.avg_core_usage for s in valid) / len(valid)
-            peak_max = sum(s.cpu_peak.peak_core_usage for s in valid) / len(valid)
-            cores_50 = sum(s.cpu_peak.cores_above_50_pct for s in valid) / len(valid)
-            cores_80 = sum(s.cpu_peak.cores_above_80_pct for s in valid) / len(valid)
-            
-            f.write(
-                f"| {model} | {len(samples)} | {stats['errors']} | "
-                f"{cpu_before:.1f} | {cpu_peak:.1f} | {cpu_after:.1f} | "
-                f"{peak_avg:.1f} | {peak_max:.1f} | {cores_50:.1f} | {cores_80:.1f} | {stats['throttles']} |\n"
-            )
-        
-        # Detailed findings
-        f.write("\n## Key Findings\n\n")
-        
-        # Identify bottleneck
-        max_model = max(model_stats.items(), key=lambda x: sum(s.cpu_peak.overall_usage for s in x[1]["samples"] if s.notes == "ok") / len([s for s in x[1]["samples"] if s.notes == "ok"]) if [s for s in x[1]["samples"] if s.notes == "ok"] else 0)
-        f.write(f"1. **Highest CPU Load:** {max_model[0]} (avg peak CPU: "
-                f"{sum(s.cpu_peak.overall_usage for s in max_model[1]['samples'] if s.notes == 'ok') / len([s for s in max_model[1]['samples'] if s.notes == 'ok']):.1f}%)\n\n")
-        
-        # Single vs multi-core
-        f.write("2. **Single-core vs Multi-core Distribution:**\n")
-        for model in MODELS:
-            if model not in model_stats:
-                continue
-            valid = [s for s in model_stats[model]["samples"] if s.notes == "ok"]
-            if valid:
-                avg_per_core = sum(s.cpu_peak.avg_core_usage for s in valid) / len(valid)
-                max_per_core = sum(s.cpu_peak.peak_core_usage for s in valid) / len(valid)
-                f.write(f"   - **{model}:** Avg {avg_per_core:.1f}% per core, "
-                        f"Max {max_per_core:.1f}% per core\n")
-        f.write("\n")
-        
-        # Scaling efficiency
-        f.write("3. **Scaling Efficiency:**\n")
-        qwen_3b = model_stats.get("qwen2.5:3b", {}).get("samples", [])
-        qwen_4b = model_stats.get("qwen3:4b", {}).get("samples", [])
-        if qwen_3b and qwen_4b:
-            valid_3b = [s for s in qwen_3b if s.notes == "ok"]
-            valid_4b = [s for s in qwen_4b if s.notes == "ok"]
-            if valid_3b and valid_4b:
-                cpu_3b = sum(s.cpu_peak.overall_usage for s in valid_3b) / len(valid_3b)
-                cpu_4b = sum(s.cpu_peak.overall_usage for s in valid_4b) / len(valid_4b)
-                f.write(f"   - qwen2.5:3b: {cpu_3b:.1f}% CPU\n")
-                f.write(f"   - qwen3:4b: {cpu_4b:.1f}% CPU\n")
-                f.write(f"   - Ratio: {cpu_4b / cpu_3b:.2f}x (1.33x model size → {cpu_4b / cpu_3b:.2f}x CPU)\n\n")
-        
-        # Thermal info
-        f.write("4. **Thermal Throttling:**\n")
-        total_throttles = sum(s["throttles"] for s in model_stats.values())
-        f.write(f"   - Total throttling events: {total_throttles}\n")
-        if total_throttles == 0:
-            f.write(f"   - **No thermal throttling detected.** CPU is not thermally constrained.\n\n")
-        else:
-            for model in MODELS:
-                if model in model_stats and model_stats[model]["throttles"] > 0:
-                    f.write(f"   - {model}: {model_stats[model]['throttles']} events\n")
-            f.write("\n")
-        
-        # Conclusion
-        f.write("5. **CPU as Bottleneck Assessment:**\n")
-        f.write("   - CPU is utilized but not saturated (peak < 100%)\n")
-        f.write("   - Multi-core utilization is reasonable\n")
-        f.write("   - No thermal throttling → thermal headroom exists\n")
-        f.write("   - **Conclusion:** CPU is NOT the primary bottleneck. Likely I/O-bound (disk/memory).\n\n")
-        
-        # Per-model detail
-        f.write("## Detailed Results\n\n")
-        for model in MODELS:
-            if model not in model_stats:
-                continue
-            f.write(f"### {model}\n\n")
-            samples = model_stats[model]["samples"]
-            valid = [s for s in samples if s.notes == "ok"]
-            
-            if not valid:
-                f.write("No successful runs.\n\n")
-                continue
-            
-            f.write("| Prompt | Duration (ms) | CPU Before | CPU Peak | CPU After | Cores@80% | Throttle |\n")
-            f.write("|--------|---|---|---|---|---|---|\n")
-            for s in samples:
-                f.write(f"| {s.prompt[:30]} | {s.duration_ms:.0f} | {s.cpu_before.overall_usage:.1f}% | "
-                        f"{s.cpu_peak.overall_usage:.1f}% | {s.cpu_after.overall_usage:.1f}% | "
-                        f"{s.cpu_peak.cores_above_80_pct} | {'Y' if s.thermal_throttle else 'N'} |\n")
-            f.write("\n")
-
-
-def main():
-    """Main entry point."""
-    # Create output directory
-    output_dir = "phase3c_results"
-    os.makedirs(output_dir, exist_ok=True)
-    
-    print(f"Output directory: {output_dir}/")
-    print()
-    
-    try:
-        # Run profiling
-        results = run_profiling()
-        
-        # Generate reports
-        csv_path = os.path.join(output_dir, "phase3c_cpu_profile.csv")
-        md_path = os.path.join(output_dir, "phase3c_cpu_profile.md")
-        
-        generate_csv_report(results, csv_path)
-        generate_markdown_report(results, md_path)
-        
-        print("=" * 80)
-        print("PROFILING COMPLETE")
-        print("=" * 80)
-        print(f"CSV Report: {csv_path}")
-        print(f"MD Report:  {md_path}")
-        print()
-        
-        # Print summary to console
-        with open(md_path, 'r') as f:
-            print(f.read())
-        
-    except KeyboardInterrupt:
-        print("\nProfiling interrupted by user.", file=sys.stderr)
-        sys.exit(1)
-    except Exception as e:
-        print(f"Error: {e}", file=sys.stderr)
-        import traceback
-        traceback.print_exc()
-        sys.exit(1)
 
+from scenario_engine import main
 
 if __name__ == "__main__":
-    main()
+    raise SystemExit(main(["run", "phase3c_cpu", *sys.argv[1:]]))
@@ -12,6 +12,12 @@ Outputs (under bench/openclaw_llm_bench/runs/<run_id>/):
 - results.jsonl
 - summary.json
 - summary.md
+- summary_sketches.json (mergeable per-suite counters + latency sketches)
+
+Outputs longer than a few hundred bytes are stored once, compressed, in the
+shared content-addressed store runs/blobs/ (utils/blob_store.py); result rows
+hold {"blob": <sha256>, "size": <bytes>} references (`--inline-outputs` to opt
+out).
 
 Dependencies: Python 3 stdlib only.
 """
@@ -20,19 +26,29 @@ from __future__ import annotations
 
 import argparse
 import datetime as _dt
+import http.client
+import io
 import json
-import math
 import os
 import re
-import statistics
+import signal
 import subprocess
 import sys
+import threading
 import time
 import urllib.error
+import urllib.parse
 import urllib.request
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
 from typing import Any, Dict, Iterable, List, Optional, Tuple
 
+# Shared bench helpers (stdlib-only) live in bench/utils.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.blob_store import BlobStore, open_store  # noqa: E402
+from utils.model_residency import OllamaResidency  # noqa: E402
+from utils.resource_sampler import ResourceSampler, format_kb  # noqa: E402
+from summary_stats import SKETCHES_FILE, stream_suite_stats, write_sketches  # noqa: E402
+
 
 def now_ms() -> int:
     return time.time_ns() // 1_000_000
@@ -63,13 +79,74 @@ def append_jsonl(path: str, obj: Any) -> None:
         f.write("\n")
 
 
-def http_json(url: str, payload: Dict[str, Any], headers: Dict[str, str], timeout_s: int = 300) -> Dict[str, Any]:
+class JsonlWriter:
+    """Append-only JSONL writer that keeps the file open and buffers records.
+
+    Records reach disk at explicit flush points (end of each model suite, a
+    termination signal, close) or once `max_buffered` records are pending,
+    instead of one open/write/close per record.
+    """
+
+    def __init__(self, path: str, max_buffered: int = 256) -> None:
+        self.path = path
+        self.max_buffered = max(1, max_buffered)
+        self._buf: List[str] = []
+        self._f = open(path, "a", encoding="utf-8")
+
+    def write(self, obj: Any) -> None:
+        self._buf.append(json.dumps(obj, ensure_ascii=False))
+        if len(self._buf) >= self.max_buffered:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._f.closed:
+            return
+        # Swap first so a signal arriving mid-flush cannot write a line twice.
+        lines, self._buf = self._buf, []
+        if lines:
+            self._f.write("\n".join(lines) + "\n")
+        self._f.flush()
+        os.fsync(self._f.fileno())
+
+    def close(self) -> None:
+        if not self._f.closed:
+            self.flush()
+            self._f.close()
+
+    def __enter__(self) -> "JsonlWriter":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+def flush_on_signal(writer: JsonlWriter, signums: Tuple[int, ...] = (signal.SIGTERM, signal.SIGHUP)) -> None:
+    """Flush buffered results before exiting on SIGTERM/SIGHUP.
+
+    SIGINT already raises KeyboardInterrupt, which reaches the writer's close().
+    """
+    def handler(signum: int, _frame: Any) -> None:
+        writer.flush()
+        raise SystemExit(128 + signum)
+
+    for signum in signums:
+        signal.signal(signum, handler)
+
+
+def http_json(
+    url: str,
+    payload: Dict[str, Any],
+    headers: Dict[str, str],
+    timeout_s: int = 300,
+    *,
+    session: Optional["HttpSession"] = None,
+) -> Dict[str, Any]:
     data = json.dumps(payload).encode("utf-8")
     req = urllib.request.Request(url, data=data, method="POST")
     req.add_header("Content-Type", "application/json")
     for k, v in headers.items():
         req.add_header(k, v)
-    with urllib.request.urlopen(req, timeout=timeout_s) as resp:
+    with _urlopen(req, timeout_s, session) as resp:
         body = resp.read().decode("utf-8", errors="replace")
     return json.loads(body)
 
@@ -80,6 +157,7 @@ def http_sse(
     headers: Dict[str, str],
     *,
     timeout_s: int,
+    session: Optional["HttpSession"] = None,
 ) -> Iterable[Dict[str, Any]]:
     """Yield parsed JSON objects from a Server-Sent Events response.
 
@@ -92,7 +170,7 @@ def http_sse(
     for k, v in headers.items():
         req.add_header(k, v)
 
-    with urllib.request.urlopen(req, timeout=timeout_s) as resp:
+    with _urlopen(req, timeout_s, session) as resp:
         # resp is a file-like object; iterate by lines
         for raw in resp:
             try:
@@ -112,6 +190,140 @@ def http_sse(
                 continue
 
 
+def http_ndjson(
+    url: str,
+    payload: Dict[str, Any],
+    headers: Dict[str, str],
+    *,
+    timeout_s: int,
+    session: Optional["HttpSession"] = None,
+) -> Iterable[Dict[str, Any]]:
+    """Yield parsed JSON objects from a newline-delimited JSON stream (Ollama /api/*)."""
+    data = json.dumps(payload).encode("utf-8")
+    req = urllib.request.Request(url, data=data, method="POST")
+    req.add_header("Content-Type", "application/json")
+    for k, v in headers.items():
+        req.add_header(k, v)
+
+    with _urlopen(req, timeout_s, session) as resp:
+        for raw in resp:
+            line = raw.decode("utf-8", errors="replace").strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except Exception:
+                continue
+
+
+def _urlopen(req: urllib.request.Request, timeout_s: float, session: Optional["HttpSession"]) -> Any:
+    if session is None:
+        return urllib.request.urlopen(req, timeout=timeout_s)
+    return session.urlopen(req, timeout_s)
+
+
+class HttpSession:
+    """Keep-alive connections shared by every call of one provider (a stdlib pooled client).
+
+    `urlopen()` stands in for `urllib.request.urlopen` in the http_* helpers: the response
+    iterates by line, and error statuses raise `urllib.error.HTTPError`. A connection returns
+    to the idle pool only after its response has been read to the end. If the server dropped
+    an idle connection, the request is retried once on a fresh connection. Thread-safe.
+    """
+
+    def __init__(self, max_idle: int = 8) -> None:
+        self.max_idle = max_idle
+        self.connects = 0
+        self._idle: Dict[Tuple[str, str], List[http.client.HTTPConnection]] = {}
+        self._lock = threading.Lock()
+
+    def urlopen(self, req: urllib.request.Request, timeout_s: float) -> "_PooledResponse":
+        parts = urllib.parse.urlsplit(req.full_url)
+        key = (parts.scheme, parts.netloc)
+        path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        headers = dict(req.header_items())
+        for attempt in range(2):
+            conn, reused = self._acquire(key, timeout_s)
+            try:
+                conn.request(req.get_method(), path, body=req.data, headers=headers)
+                resp = conn.getresponse()
+                break
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                conn.close()
+                if not reused or attempt:
+                    raise
+            except BaseException:
+                conn.close()
+                raise
+        if resp.status >= 400:
+            body = resp.read()
+            self._finish(key, conn, resp)
+            raise urllib.error.HTTPError(req.full_url, resp.status, resp.reason, resp.msg, io.BytesIO(body))
+        return _PooledResponse(self, key, conn, resp)
+
+    def close(self) -> None:
+        with self._lock:
+            conns = [c for idle in self._idle.values() for c in idle]
+            self._idle.clear()
+        for conn in conns:
+            conn.close()
+
+    def _acquire(self, key: Tuple[str, str], timeout_s: float) -> Tuple[http.client.HTTPConnection, bool]:
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                conn = idle.pop()
+                conn.timeout = timeout_s
+                if conn.sock is not None:
+                    conn.sock.settimeout(timeout_s)
+                return conn, True
+            self.connects += 1
+        scheme, netloc = key
+        cls = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+        return cls(netloc, timeout=timeout_s), False
+
+    def _finish(self, key: Tuple[str, str], conn: http.client.HTTPConnection, resp: http.client.HTTPResponse) -> None:
+        # A body read by lines to its Content-Length leaves the response open with length 0.
+        drained = resp.isclosed() or (not resp.chunked and resp.length == 0)
+        reusable = drained and not resp.will_close
+        resp.close()
+        if reusable:
+            with self._lock:
+                idle = self._idle.setdefault(key, [])
+                if len(idle) < self.max_idle:
+                    idle.append(conn)
+                    return
+        conn.close()
+
+
+class _PooledResponse:
+    """Response of `HttpSession.urlopen`; closing it hands the connection back to the pool."""
+
+    def __init__(self, session: HttpSession, key: Tuple[str, str], conn: http.client.HTTPConnection,
+                 resp: http.client.HTTPResponse) -> None:
+        self._session = session
+        self._key = key
+        self._conn: Optional[http.client.HTTPConnection] = conn
+        self._resp = resp
+
+    def __enter__(self) -> "_PooledResponse":
+        return self
+
+    def __exit__(self, *_exc: Any) -> None:
+        self.close()
+
+    def __iter__(self) -> Iterable[bytes]:
+        return iter(self._resp)
+
+    def read(self, amt: Optional[int] = None) -> bytes:
+        return self._resp.read(amt)
+
+    def close(self) -> None:
+        if self._conn is not None:
+            conn, self._conn = self._conn, None
+            self._session._finish(self._key, conn, self._resp)
+
+
 def run_cmd(cmd: List[str], timeout_s: int = 60) -> Tuple[int, str, str]:
     try:
         p = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout_s)
@@ -338,14 +550,39 @@ def ollama_reasoning_profile(model: str, thinking_level: Optional[str]) -> Dict[
         prof["options"].update({"num_predict": 512})
     if thinking_level in ("high", "xhigh"):
         prof["think"] = True
+    prof["options"].update(tuned_runtime_options(model))
     return prof
 
 
+PHASE2_CONFIG_PATH = os.environ.get(
+    "BENCH_PHASE2_CONFIG_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "harness", "phase2_config.json"),
+)
+_RUNTIME_OPTIONS: Dict[str, Dict[str, Any]] = {}
+
+
+def tuned_runtime_options(model: str) -> Dict[str, Any]:
+    """Runtime knobs (num_thread, num_batch, ...) that selfopt/runtime_tuner.py wrote to phase2_config.json.
+
+    Only the native /api/chat path applies them; the OpenAI-compatible endpoint ignores options.
+    """
+    if model not in _RUNTIME_OPTIONS:
+        try:
+            with open(PHASE2_CONFIG_PATH, encoding="utf-8") as f:
+                entry = (json.load(f).get("models") or {}).get(model) or {}
+        except (OSError, ValueError):
+            entry = {}
+        _RUNTIME_OPTIONS[model] = dict(entry.get("runtime_options") or {})
+    return _RUNTIME_OPTIONS[model]
+
+
 class OllamaOpenAIProvider(Provider):
     name = "ollama_openai"
 
-    def __init__(self, base_url: str):
+    def __init__(self, base_url: str, session: Optional[HttpSession] = None):
         self.base_url = base_url.rstrip("/")
+        # None: a fresh urllib connection per call.
+        self.session = session
 
     def supports_streaming(self) -> bool:
         return True
@@ -376,7 +613,7 @@ class OllamaOpenAIProvider(Provider):
         try:
             payload["stream"] = bool(stream)
             if not stream:
-                resp = http_json(url, payload, headers={}, timeout_s=timeout_s)
+                resp = http_json(url, payload, headers={}, timeout_s=timeout_s, session=self.session)
                 content = (((resp.get("choices") or [{}])[0]).get("message") or {}).get("content")
                 if content is None:
                     return CallResult("error", False, "empty_response", "")
@@ -395,7 +632,7 @@ class OllamaOpenAIProvider(Provider):
             started = perf_ms()
             ttft: Optional[int] = None
             chunks: List[str] = []
-            for evt in http_sse(url, payload, headers={}, timeout_s=timeout_s):
+            for evt in http_sse(url, payload, headers={}, timeout_s=timeout_s, session=self.session):
                 choice0 = (evt.get("choices") or [{}])[0]
                 delta = choice0.get("delta") or {}
                 piece = delta.get("content")
@@ -419,12 +656,13 @@ class OllamaOpenAIProvider(Provider):
 class OllamaNativeProvider(Provider):
     name = "ollama_native"
 
-    def __init__(self, base_url: str):
+    def __init__(self, base_url: str, session: Optional[HttpSession] = None):
         self.base_url = base_url.rstrip("/")
+        # None: a fresh urllib connection per call.
+        self.session = session
 
     def supports_streaming(self) -> bool:
-        # /api/chat streaming is NDJSON and not parsed in this harness yet.
-        return False
+        return True
 
     def call(
         self,
@@ -434,10 +672,9 @@ class OllamaNativeProvider(Provider):
         thinking_level: Optional[str],
         timeout_s: int,
         stream: bool,
+        options: Optional[Dict[str, Any]] = None,
     ) -> CallResult:
-        if stream:
-            return CallResult("error", False, "stream_not_supported_for_ollama_native", "")
-
+        """`options` (e.g. num_ctx) are applied on top of the model's reasoning profile."""
         url = f"{self.base_url}/api/chat"
         profile = ollama_reasoning_profile(model, thinking_level)
         payload = {
@@ -446,14 +683,43 @@ class OllamaNativeProvider(Provider):
                 {"role": "system", "content": "You are a helpful assistant. Follow instructions exactly."},
                 {"role": "user", "content": prompt},
             ],
-            "stream": False,
-            "options": profile.get("options", {"temperature": 0}),
+            "stream": bool(stream),
+            "options": {**profile.get("options", {"temperature": 0}), **(options or {})},
         }
         if "think" in profile:
             payload["think"] = profile["think"]
 
         try:
-            resp = http_json(url, payload, headers={}, timeout_s=timeout_s)
+            if stream:
+                # NDJSON frames; the final one (done=true) carries the token counts.
+                started = perf_ms()
+                ttft: Optional[int] = None
+                chunks: List[str] = []
+                final: Dict[str, Any] = {}
+                for evt in http_ndjson(url, payload, headers={}, timeout_s=timeout_s, session=self.session):
+                    if evt.get("error"):
+                        return CallResult("error", False, "stream_error", str(evt["error"]), ttft_ms=ttft)
+                    piece = (evt.get("message") or {}).get("content")
+                    if piece:
+                        if ttft is None:
+                            ttft = max(0, perf_ms() - started)
+                        chunks.append(str(piece))
+                    if evt.get("done"):
+                        final = evt
+                text = "".join(chunks).strip()
+                if not text:
+                    return CallResult("error", False, "empty_response", "", ttft_ms=ttft)
+                return CallResult(
+                    "ok",
+                    True,
+                    None,
+                    text,
+                    ttft_ms=ttft,
+                    input_tokens=final.get("prompt_eval_count"),
+                    output_tokens=final.get("eval_count"),
+                )
+
+            resp = http_json(url, payload, headers={}, timeout_s=timeout_s, session=self.session)
             msg = resp.get("message") or {}
             content = msg.get("content")
             if content is None:
@@ -630,22 +896,6 @@ class ClaudeCodeCLIProvider(Provider):
 # Benchmark runner
 
 
-def percentile(xs: List[float], p: float) -> Optional[float]:
-    if not xs:
-        return None
-    xs = sorted(xs)
-    if len(xs) == 1:
-        return float(xs[0])
-    k = (len(xs) - 1) * (p / 100.0)
-    f = math.floor(k)
-    c = math.ceil(k)
-    if f == c:
-        return float(xs[int(k)])
-    d0 = xs[f] * (c - k)
-    d1 = xs[c] * (k - f)
-    return float(d0 + d1)
-
-
 def load_existing_keys(results_path: str) -> set:
     keys = set()
     if not os.path.exists(results_path):
@@ -756,28 +1006,42 @@ def ensure_ollama_idle(out_dir: str, tag: str) -> None:
     })
 
 
-def capture_resources(out_dir: str, tag: str) -> Dict[str, str]:
+def prepare_ollama_model(residency: OllamaResidency, out_dir: str, tag: str, model: str) -> None:
+    """Residency-aware alternative to ensure_ollama_idle.
+
+    Other runners are stopped only if `model` does not fit next to them, and the
+    model is warmed before the first prompt so its load time is logged as a
+    `model_load` event instead of inflating the first prompt's latency.
+    """
+    results_path = os.path.join(out_dir, "results.jsonl")
+    ev = residency.prepare(model)
+    for m in ev.evicted:
+        append_jsonl(results_path, {
+            "record_type": "event",
+            "tag": tag,
+            "event": "ollama_stop",
+            "model": m,
+            "ok": True,
+            "error": None,
+        })
+    append_jsonl(results_path, {"record_type": "event", "tag": tag, "event": "model_load", **asdict(ev)})
+
+
+def capture_resources(
+    out_dir: str,
+    tag: str,
+    sampler: ResourceSampler,
+    residency: Optional[OllamaResidency] = None,
+) -> Dict[str, str]:
+    """Write a /proc-based resource snapshot (no shell-outs) as resources_<tag>.json."""
     mkdir_p(out_dir)
-    res: Dict[str, str] = {}
-
-    rc, free_out, _ = run_cmd(["free", "-h"], timeout_s=10)
-    rc2, df_out, _ = run_cmd(["df", "-h", "/"], timeout_s=10)
-    rc3, ollama_out, _ = run_cmd(["ollama", "ps"], timeout_s=10)
-    rc4, du_out, _ = run_cmd(["du", "-sh", os.path.expanduser("~/.ollama")], timeout_s=30)
-
-    res_path = os.path.join(out_dir, f"resources_{tag}.txt")
-    with open(res_path, "w", encoding="utf-8") as f:
-        f.write("# free -h\n")
-        f.write(free_out if rc == 0 else "(free failed)\n")
-        f.write("\n# df -h /\n")
-        f.write(df_out if rc2 == 0 else "(df failed)\n")
-        f.write("\n# du -sh ~/.ollama\n")
-        f.write(du_out if rc4 == 0 else "(du failed)\n")
-        f.write("\n# ollama ps\n")
-        f.write(ollama_out if rc3 == 0 else "(ollama ps failed)\n")
-
-    res["resources_path"] = res_path
-    return res
+    snap = sampler.snapshot()
+    if residency is not None:
+        snap["ollama_ps"] = [r.name for r in residency.resident()]
+
+    res_path = os.path.join(out_dir, f"resources_{tag}.json")
+    write_json(res_path, snap)
+    return {"resources_path": res_path}
 
 
 def main() -> int:
@@ -829,6 +1093,24 @@ def main() -> int:
         action="store_true",
         help="Do NOT stop other Ollama runners between model suites. Use only for contention-mode experiments.",
     )
+    ap.add_argument(
+        "--sample-interval-ms",
+        type=int,
+        default=250,
+        help="Resource sampler period; each result row gets a CPU/RSS/thermal summary of its call window (0 = off)",
+    )
+    ap.add_argument(
+        "--residency",
+        choices=["aware", "strict"],
+        default="aware",
+        help="aware: warm each model once, stop other runners only when it does not fit in free RAM/VRAM, "
+        "order suites smallest model first; strict: stop every runner before each suite (previous behaviour)",
+    )
+    ap.add_argument(
+        "--inline-outputs",
+        action="store_true",
+        help="Keep raw_output text in results.jsonl instead of the shared runs/blobs store",
+    )
 
     args = ap.parse_args()
 
@@ -880,6 +1162,13 @@ def main() -> int:
 
     # Provider instances
     ollama_base = args.ollama_base.rstrip("/")
+    residency = OllamaResidency(ollama_base[:-3] if ollama_base.endswith("/v1") else ollama_base)
+    if args.residency == "aware":
+        # One contiguous suite per model, smallest first (sizes from the Ollama inventory).
+        ollama_tasks = [t for t in tasks if t["provider"].startswith("ollama_")]
+        ordered = [t for _, group in residency.order(ollama_tasks, lambda t: t["model"]) for t in group]
+        tasks = ordered + [t for t in tasks if not t["provider"].startswith("ollama_")]
+
     if args.ollama_api == "native" and ollama_base.endswith("/v1"):
         ollama_base = ollama_base[:-3]
     if args.ollama_api == "openai" and not ollama_base.endswith("/v1"):
@@ -961,8 +1250,64 @@ def main() -> int:
     }
     write_json(os.path.join(out_dir, "config.json"), config)
 
+    # Background /proc sampler: per-call resource windows + before/after snapshots.
+    sampler = ResourceSampler(interval_s=max(args.sample_interval_ms, 1) / 1000.0)
+    if args.sample_interval_ms > 0:
+        sampler.start()
+    try:
+        run_tasks(args, tasks, prompts, providers, residency, sampler, run_id, out_dir, existing_keys)
+    finally:
+        sampler.stop()
+    if args.sample_interval_ms > 0:
+        write_json(
+            os.path.join(out_dir, "resource_samples.json"),
+            {"stats": sampler.stats(), "fields": list(sampler.to_columns().keys()), "samples": sampler.to_columns()},
+        )
+
+    # Generate summaries
+    summarize(out_dir)
+    return 0
+
+
+def run_tasks(
+    args: argparse.Namespace,
+    tasks: List[Dict[str, Any]],
+    prompts: List[Dict[str, Any]],
+    providers: Dict[str, Any],
+    residency: OllamaResidency,
+    sampler: ResourceSampler,
+    run_id: str,
+    out_dir: str,
+    existing_keys: set,
+) -> None:
+    sampling = args.sample_interval_ms > 0
+    # One store for every run folder under runs/, so reruns share identical outputs.
+    blobs = None if getattr(args, "inline_outputs", False) else open_store(os.path.join(os.path.dirname(out_dir), "blobs"))
+    writer = JsonlWriter(os.path.join(out_dir, "results.jsonl"))
+    flush_on_signal(writer)
+    try:
+        _run_suites(args, tasks, prompts, providers, residency, sampler, run_id, out_dir, existing_keys, writer, sampling,
+                    blobs)
+    finally:
+        writer.close()
+
+
+def _run_suites(
+    args: argparse.Namespace,
+    tasks: List[Dict[str, Any]],
+    prompts: List[Dict[str, Any]],
+    providers: Dict[str, Any],
+    residency: OllamaResidency,
+    sampler: ResourceSampler,
+    run_id: str,
+    out_dir: str,
+    existing_keys: set,
+    writer: JsonlWriter,
+    sampling: bool,
+    blobs: Optional[BlobStore] = None,
+) -> None:
     # Run sequentially to avoid contention skew.
-    for task in tasks:
+    for task_idx, task in enumerate(tasks):
         provider_name = task["provider"]
         model = task["model"]
         thinking = task.get("thinking_level")
@@ -975,9 +1320,13 @@ def main() -> int:
 
         # Prevent cross-model interference: stop any old Ollama runners before starting a new model suite.
         if provider_name.startswith("ollama_") and (not args.allow_concurrent_ollama):
-            ensure_ollama_idle(out_dir, tag=f"{model_tag_safe}_pre")
+            if args.residency == "strict":
+                ensure_ollama_idle(out_dir, tag=f"{model_tag_safe}_pre")
+            else:
+                prepare_ollama_model(residency, out_dir, f"{model_tag_safe}_pre", model)
 
-        capture_resources(out_dir, f"{model_tag_safe}_before")
+        ollama_suite = provider_name.startswith("ollama_")
+        capture_resources(out_dir, f"{model_tag_safe}_before", sampler, residency if ollama_suite else None)
 
         for p in prompts:
             pid = p["id"]
@@ -1031,19 +1380,27 @@ def main() -> int:
                 "violation": violation,
                 "input_tokens": call_res.input_tokens,
                 "output_tokens": call_res.output_tokens,
-                "raw_output": call_res.raw_output,
+                "raw_output": blobs.pack(call_res.raw_output) if blobs is not None else call_res.raw_output,
                 "parsed_output": parsed,
                 "tool_calls": tool_calls,
                 "tool_call_count": tool_call_count,
                 "tool_use_success": tool_use_success,
+                "resources": sampler.window(started_perf_ms / 1000.0, ended_perf_ms / 1000.0) if sampling else None,
             }
-            append_jsonl(results_path, rec)
+            writer.write(rec)
 
-        capture_resources(out_dir, f"{model_tag_safe}_after")
+        # Flush point: a suite's rows are on disk before the next suite's events.
+        writer.flush()
+        capture_resources(out_dir, f"{model_tag_safe}_after", sampler, residency if ollama_suite else None)
 
-    # Generate summaries
-    summarize(out_dir)
-    return 0
+        if (
+            provider_name.startswith("ollama_")
+            and args.residency == "aware"
+            and not args.allow_concurrent_ollama
+            and all(t["model"] != model for t in tasks[task_idx + 1:])
+        ):
+            # Not needed again: free the memory now rather than when keep_alive expires.
+            residency.unload(model)
 
 
 def parse_free_h(text: str) -> Dict[str, Any]:
@@ -1084,6 +1441,18 @@ def parse_df_h_root(text: str) -> Dict[str, Any]:
     return {}
 
 
+def load_resources_snapshot(out_dir: str, tag: str) -> Optional[Dict[str, Any]]:
+    """Suite snapshot: resources_<tag>.json, or the legacy shell-out .txt of older runs."""
+    json_path = os.path.join(out_dir, f"resources_{tag}.json")
+    if os.path.exists(json_path):
+        snap = read_json(json_path)
+        snap["path"] = os.path.basename(json_path)
+        snap["mem_used"] = format_kb(snap.get("mem_used_kb")) or None
+        return snap
+    txt_path = os.path.join(out_dir, f"resources_{tag}.txt")
+    return parse_resources_file(txt_path) if os.path.exists(txt_path) else None
+
+
 def parse_resources_file(path: str) -> Dict[str, Any]:
     if not os.path.exists(path):
         return {}
@@ -1120,74 +1489,28 @@ def parse_resources_file(path: str) -> Dict[str, Any]:
 
 
 def summarize(out_dir: str) -> None:
-    results_path = os.path.join(out_dir, "results.jsonl")
-    rows: List[Dict[str, Any]] = []
-    with open(results_path, "r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            obj = json.loads(line)
-            if obj.get("record_type") == "result":
-                rows.append(obj)
-
-    # group by provider/model/thinking
-    groups: Dict[Tuple[str, str, Optional[str]], List[Dict[str, Any]]] = {}
-    for r in rows:
-        k = (r.get("provider"), r.get("model"), r.get("thinking_level"))
-        groups.setdefault(k, []).append(r)
+    # One streaming pass: rows are folded into per-suite counters and latency
+    # sketches as they are read, never held in memory or sorted.
+    stats, load_ms_by_model = stream_suite_stats(os.path.join(out_dir, "results.jsonl"))
 
     summary_models: List[Dict[str, Any]] = []
-    for (prov, model, thinking), rs in sorted(groups.items(), key=lambda x: (x[0][0], x[0][1], str(x[0][2]))):
-        e2es = [float(r["e2e_ms"]) for r in rs if r.get("availability_status") == "ok" and r.get("success") and r.get("e2e_ms") is not None]
-        succ = [r for r in rs if r.get("availability_status") == "ok" and r.get("success")]
-        ok = [r for r in rs if r.get("availability_status") == "ok"]
-        skipped = [r for r in rs if r.get("availability_status") == "skipped_unavailable"]
-        rate_limited = [r for r in rs if r.get("availability_status") == "rate_limited"]
-        errors = [r for r in rs if r.get("availability_status") == "error"]
-
-        obj_checked = [r for r in rs if r.get("objective_pass") is not None and r.get("availability_status") == "ok" and r.get("success")]
-        obj_pass = [r for r in obj_checked if r.get("objective_pass") is True]
-
-        # Wall-clock for this provider/model suite: min(started_at_ms) .. max(ended_at_ms)
-        starts = [r.get("started_at_ms") for r in rs if r.get("started_at_ms") is not None]
-        ends = [r.get("ended_at_ms") for r in rs if r.get("ended_at_ms") is not None]
-        wall_ms = (max(ends) - min(starts)) if starts and ends else None
-
+    for (prov, model, thinking), st in sorted(stats.items(), key=lambda x: (x[0][0], x[0][1], str(x[0][2]))):
         # Attach parsed before/after resource snapshots if present
         model_tag = f"{prov}__{model}__{thinking or 'none'}"
         model_tag_safe = re.sub(r"[^A-Za-z0-9_.-]+", "_", model_tag)
-        before_path = os.path.join(out_dir, f"resources_{model_tag_safe}_before.txt")
-        after_path = os.path.join(out_dir, f"resources_{model_tag_safe}_after.txt")
-        resources_before = parse_resources_file(before_path) if os.path.exists(before_path) else None
-        resources_after = parse_resources_file(after_path) if os.path.exists(after_path) else None
-
-        m = {
-            "provider": prov,
-            "model": model,
-            "thinking_level": thinking,
-            "n_total": len(rs),
-            "n_ok": len(ok),
-            "n_success": len(succ),
-            "n_skipped_unavailable": len(skipped),
-            "n_rate_limited": len(rate_limited),
-            "n_error": len(errors),
-            "success_rate_ok": (len(succ) / len(ok)) if ok else None,
-            "objective_pass_rate": (len(obj_pass) / len(obj_checked)) if obj_checked else None,
-            "wall_clock_ms": wall_ms,
-            "latency_ms": {
-                "p50": percentile(e2es, 50),
-                "p95": percentile(e2es, 95),
-                "p99": percentile(e2es, 99),
-                "mean": (statistics.mean(e2es) if e2es else None),
-            },
-            "resources_before": resources_before,
-            "resources_after": resources_after,
-        }
+        resources_before = load_resources_snapshot(out_dir, f"{model_tag_safe}_before")
+        resources_after = load_resources_snapshot(out_dir, f"{model_tag_safe}_after")
+
+        m = {"provider": prov, "model": model, "thinking_level": thinking}
+        m.update(st.summary())
+        # Warm-up load time, measured outside the prompt timings (None when not warmed).
+        m["model_load_ms"] = load_ms_by_model.get(model) if str(prov).startswith("ollama_") else None
+        m["resources_before"] = resources_before
+        m["resources_after"] = resources_after
         summary_models.append(m)
 
-    run_starts = [r.get("started_at_ms") for r in rows if r.get("started_at_ms") is not None]
-    run_ends = [r.get("ended_at_ms") for r in rows if r.get("ended_at_ms") is not None]
+    run_starts = [st.started_at_ms for st in stats.values() if st.started_at_ms is not None]
+    run_ends = [st.ended_at_ms for st in stats.values() if st.ended_at_ms is not None]
     run_wall_ms = (max(run_ends) - min(run_starts)) if run_starts and run_ends else None
 
     summary = {
@@ -1198,6 +1521,8 @@ def summarize(out_dir: str) -> None:
     }
 
     write_json(os.path.join(out_dir, "summary.json"), summary)
+    # Mergeable form for multi-run reports (aggregate_runs.py) without raw rows.
+    write_sketches(os.path.join(out_dir, SKETCHES_FILE), stats, run_id=os.path.basename(os.path.abspath(out_dir)))
 
     # summary.md
     md_lines = []
@@ -1211,8 +1536,8 @@ def summarize(out_dir: str) -> None:
         inv = {}
     if inv.get("ollama_store_du"):
         md_lines.append(f"Ollama store (du -sh ~/.ollama): {inv.get('ollama_store_du')}")
-    md_lines.append("\n| Provider | Model | Model size | Thinking | n(total) | n(ok) | n(err) | n(rate) | success% (ok) | obj pass% | wall ms | p50 ms | p95 ms | p99 ms | RAM used (before→after) | Disk used% (before→after) | Ollama store (before→after) |")
-    md_lines.append("|---|---|---:|---:|---:|---:|---:|---:|---:|---:|---:|---:|---:|---:|---|---|---|")
+    md_lines.append("\n| Provider | Model | Model size | Thinking | n(total) | n(ok) | n(err) | n(rate) | success% (ok) | obj pass% | wall ms | load ms | p50 ms | p95 ms | p99 ms | peak RSS | max °C | throttled | RAM used (before→after) | Disk used% (before→after) | Ollama store (before→after) |")
+    md_lines.append("|---|---|---:|---:|---:|---:|---:|---:|---:|---:|---:|---:|---:|---:|---:|---:|---:|---:|---|---|---|")
     for m in summary_models:
         lat = m["latency_ms"]
         def fmt(x: Any) -> str:
@@ -1227,6 +1552,7 @@ def summarize(out_dir: str) -> None:
                 return ""
             return f"{100.0 * float(x):.1f}%"
 
+        cr = m.get("call_resources") or {}
         rb = m.get("resources_before") or {}
         ra = m.get("resources_after") or {}
         ram_before = rb.get("mem_used")
@@ -1248,7 +1574,7 @@ def summarize(out_dir: str) -> None:
                     pass
 
         md_lines.append(
-            "| {prov} | {model} | {msize} | {think} | {n_total} | {n_ok} | {n_err} | {n_rate} | {succ} | {obj} | {wall} | {p50} | {p95} | {p99} | {ram} | {disk} | {store} |".format(
+            "| {prov} | {model} | {msize} | {think} | {n_total} | {n_ok} | {n_err} | {n_rate} | {succ} | {obj} | {wall} | {load} | {p50} | {p95} | {p99} | {rss} | {temp} | {thr} | {ram} | {disk} | {store} |".format(
                 prov=m["provider"],
                 model=m["model"],
                 msize=model_size,
@@ -1260,9 +1586,13 @@ def summarize(out_dir: str) -> None:
                 succ=pct(m.get("success_rate_ok")),
                 obj=pct(m.get("objective_pass_rate")),
                 wall=fmt(m.get("wall_clock_ms")),
+                load=fmt(m.get("model_load_ms")),
                 p50=fmt(lat["p50"]),
                 p95=fmt(lat["p95"]),
                 p99=fmt(lat["p99"]),
+                rss=format_kb(cr.get("proc_rss_kb_max")),
+                temp=fmt(cr.get("temp_c_max")),
+                thr=(f"{cr['n_throttled']}/{cr['n_calls']}" if cr else ""),
                 ram=(f"{ram_before}->{ram_after}" if ram_before or ram_after else ""),
                 disk=(f"{disk_before}->{disk_after}" if disk_before or disk_after else ""),
                 store=(f"{store_before}->{store_after}" if store_before or store_after else ""),
@@ -0,0 +1,767 @@
+#!/usr/bin/env python3
+"""Declarative scenario engine for the phase 3 / 3B / 3C style benchmarks.
+
+A scenario is a JSON file in `scenarios/`:
+
+- a prompt set (`prompts`: inline list or a prompts_*.json path, same schema
+  as run_bench.py suites, validators included)
+- sweep axes (`axes`): `model` (required), `prompt_set` (label -> prompt set),
+  `context_tokens` (each prompt becomes the instruction at the end of an
+  exact-length filler, 0 = prompt as-is), `stream`, and `options.<name>`
+  (Ollama runtime options such as num_thread)
+- collected metrics (`metrics`): latency, ttft, tokens, objective, tool_use,
+  cpu, cores, memory, thermal
+
+Every scenario runs through the run_bench.py providers, the /proc resource
+sampler and the same run folder layout (config.json, results.jsonl with one
+`result` row per call, written through JsonlWriter), so each one gets:
+
+- concurrency (`--concurrency`, in-flight calls per model)
+- pooled keep-alive connections to the provider, shared by every axis, model
+  and worker of the scenario
+- a response cache (`--cache`) for re-scoring validators without re-calling
+  models
+- streaming TTFT whenever `ttft` is collected
+- resume (`--resume`) keyed by scenario cell, prompt and repetition
+- residency-aware model loading, one contiguous suite per model
+
+Outputs (under bench/openclaw_llm_bench/runs/<run_id>/): config.json,
+results.jsonl, resource_samples.json (resource metrics only),
+scenario_summary.json, scenario_summary.md. Long raw outputs go to the
+shared runs/blobs/ store, as with run_bench.py.
+
+Dependencies: Python 3 stdlib only.
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime as _dt
+import hashlib
+import itertools
+import json
+import os
+import re
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+# Shared bench helpers (stdlib-only) live in bench/utils.
+sys.path.insert(0, os.path.dirname(HERE))
+from utils.blob_store import BlobStore, open_store  # noqa: E402
+from utils.context_gen import ContextGenerator, resolve_tokenizer  # noqa: E402
+from utils.model_residency import OllamaResidency  # noqa: E402
+from utils.resource_sampler import ResourceSampler  # noqa: E402
+from run_bench import (  # noqa: E402
+    CallResult,
+    HttpSession,
+    JsonlWriter,
+    OllamaNativeProvider,
+    OllamaOpenAIProvider,
+    Provider,
+    detect_tool_calls,
+    flush_on_signal,
+    mkdir_p,
+    now_ms,
+    perf_ms,
+    prepare_ollama_model,
+    read_json,
+    validate_output,
+    write_json,
+)
+
+SCENARIO_DIR = os.path.join(HERE, "scenarios")
+CACHE_DIR = os.environ.get(
+    "BENCH_SCENARIO_CACHE_DIR", os.path.join(os.path.dirname(HERE), ".cache", "scenarios")
+)
+PROVIDERS = ("ollama_native", "ollama_openai")
+AXES = ("model", "prompt_set", "context_tokens", "stream")
+OPTION_AXIS_PREFIX = "options."
+# Room for the chat template and the reply on top of the largest context point.
+NUM_CTX_HEADROOM = 1024
+
+
+# ---------------------------
+# Metrics
+
+
+def _values(rows: List[Dict[str, Any]], key: str) -> List[float]:
+    return [r[key] for r in rows if isinstance(r.get(key), (int, float)) and not isinstance(r.get(key), bool)]
+
+
+def _resources(rows: List[Dict[str, Any]], key: str) -> List[float]:
+    return [r["resources"][key] for r in rows if (r.get("resources") or {}).get(key) is not None]
+
+
+def percentile(xs: List[float], q: float) -> Optional[float]:
+    """Nearest-rank percentile (q in 0..100)."""
+    if not xs:
+        return None
+    s = sorted(xs)
+    return s[max(0, min(len(s) - 1, int(round(q / 100.0 * len(s) + 0.5)) - 1))]
+
+
+def _mean(xs: List[float]) -> Optional[float]:
+    return round(sum(xs) / len(xs), 1) if xs else None
+
+
+def _rate(rows: List[Dict[str, Any]], key: str) -> Optional[float]:
+    judged = [r[key] for r in rows if r.get(key) is not None]
+    return round(100.0 * sum(1 for v in judged if v) / len(judged), 1) if judged else None
+
+
+def _latency(rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+    e2e = _values(rows, "e2e_ms")
+    return {"e2e_ms_p50": percentile(e2e, 50), "e2e_ms_p95": percentile(e2e, 95), "e2e_ms_mean": _mean(e2e)}
+
+
+def _ttft(rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+    ttft = _values(rows, "ttft_ms")
+    return {"ttft_ms_p50": percentile(ttft, 50), "ttft_ms_p95": percentile(ttft, 95)}
+
+
+def _tokens(rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+    rates = [
+        r["output_tokens"] / ((r["e2e_ms"] - (r.get("ttft_ms") or 0)) / 1000.0)
+        for r in rows
+        if r.get("output_tokens") and (r.get("e2e_ms") or 0) > (r.get("ttft_ms") or 0)
+    ]
+    return {
+        "input_tokens_mean": _mean(_values(rows, "input_tokens")),
+        "output_tokens_mean": _mean(_values(rows, "output_tokens")),
+        "output_tok_s_mean": _mean(rates),
+    }
+
+
+def _cpu(rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+    return {
+        "cpu_pct_mean": _mean(_resources(rows, "cpu_pct_mean")),
+        "cpu_pct_max": max(_resources(rows, "cpu_pct_max"), default=None),
+        "proc_cpu_pct_max": max(_resources(rows, "proc_cpu_pct_max"), default=None),
+    }
+
+
+def _memory(rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+    return {
+        "proc_rss_kb_max": max(_resources(rows, "proc_rss_kb_max"), default=None),
+        "mem_available_kb_min": min(_resources(rows, "mem_available_kb_min"), default=None),
+    }
+
+
+def _thermal(rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+    return {
+        "temp_c_max": max(_resources(rows, "temp_c_max"), default=None),
+        "throttled_calls": sum(1 for r in rows if (r.get("resources") or {}).get("throttled")),
+    }
+
+
+METRICS: Dict[str, Callable[[List[Dict[str, Any]]], Dict[str, Any]]] = {
+    "latency": _latency,
+    "ttft": _ttft,
+    "tokens": _tokens,
+    "objective": lambda rows: {"objective_pass_pct": _rate(rows, "objective_pass")},
+    "tool_use": lambda rows: {"tool_use_pct": _rate(rows, "tool_use_success")},
+    "cpu": _cpu,
+    "cores": lambda rows: {"cores_busy_max": max(_resources(rows, "cores_busy_max"), default=None)},
+    "memory": _memory,
+    "thermal": _thermal,
+}
+# Metrics read from the resource sampler; collecting any of them starts it.
+RESOURCE_METRICS = ("cpu", "cores", "memory", "thermal")
+
+
+# ---------------------------
+# Scenario declarations
+
+
+@dataclass
+class Scenario:
+    name: str
+    prompts: List[Dict[str, Any]]
+    axes: Dict[str, List[Any]]
+    metrics: List[str]
+    provider: str = "ollama_native"
+    prompt_sets: Dict[str, List[Dict[str, Any]]] = field(default_factory=dict)
+    repeats: int = 1
+    concurrency: int = 1
+    timeout_s: int = 300
+    stream: bool = False
+    sample_interval_ms: int = 250
+    description: str = ""
+    replaces: List[str] = field(default_factory=list)
+
+    @property
+    def sampling(self) -> bool:
+        return any(m in RESOURCE_METRICS for m in self.metrics) and self.sample_interval_ms > 0
+
+    def num_ctx(self) -> Optional[int]:
+        """One context window for every call, so sizes never reload the runner."""
+        contexts = [int(c) for c in self.axes.get("context_tokens", []) if c]
+        return max(contexts) + NUM_CTX_HEADROOM if contexts else None
+
+
+def _load_prompts(spec: Any, base_dir: str) -> List[Dict[str, Any]]:
+    if isinstance(spec, str):
+        path = spec if os.path.isabs(spec) else os.path.join(base_dir, spec)
+        spec = read_json(path)
+    if not isinstance(spec, list) or not all(isinstance(p, dict) and p.get("id") and "prompt" in p for p in spec):
+        raise ValueError("prompts must be a list of {id, prompt, ...} objects or a path to one")
+    return spec
+
+
+def parse_scenario(data: Dict[str, Any], base_dir: str = HERE) -> Scenario:
+    """Validate a scenario declaration and resolve its prompt files (relative to `base_dir`)."""
+    name = data.get("name") or "scenario"
+    axes = {k: list(v) if isinstance(v, (list, tuple)) else v for k, v in (data.get("axes") or {}).items()}
+    unknown = [a for a in axes if a not in AXES and not a.startswith(OPTION_AXIS_PREFIX)]
+    if unknown:
+        raise ValueError(f"{name}: unknown axes {unknown} (known: {list(AXES)} and options.<name>)")
+    if not axes.get("model"):
+        raise ValueError(f"{name}: axes.model must list at least one model")
+
+    prompt_sets: Dict[str, List[Dict[str, Any]]] = {}
+    if "prompt_set" in axes:
+        sets = axes["prompt_set"]
+        if not isinstance(sets, dict) or not sets:
+            raise ValueError(f"{name}: axes.prompt_set must map labels to prompt sets")
+        prompt_sets = {label: _load_prompts(spec, base_dir) for label, spec in sets.items()}
+        axes["prompt_set"] = list(prompt_sets)
+        prompts: List[Dict[str, Any]] = []
+    else:
+        prompts = _load_prompts(data.get("prompts"), base_dir)
+    for axis, values in axes.items():
+        if not isinstance(values, list) or not values:
+            raise ValueError(f"{name}: axes.{axis} must be a non-empty list")
+
+    metrics = list(data.get("metrics") or ["latency"])
+    bad = [m for m in metrics if m not in METRICS]
+    if bad:
+        raise ValueError(f"{name}: unknown metrics {bad} (known: {sorted(METRICS)})")
+
+    provider = data.get("provider", "ollama_native")
+    if provider not in PROVIDERS:
+        raise ValueError(f"{name}: provider must be one of {list(PROVIDERS)}")
+    if provider != "ollama_native" and any(a == "context_tokens" or a.startswith(OPTION_AXIS_PREFIX) for a in axes):
+        # The OpenAI-compatible endpoint ignores options, so num_ctx could not be raised for long contexts.
+        raise ValueError(f"{name}: context_tokens and options.* axes need provider ollama_native")
+
+    return Scenario(
+        name=name,
+        prompts=prompts,
+        axes=axes,
+        metrics=metrics,
+        provider=provider,
+        prompt_sets=prompt_sets,
+        repeats=max(1, int(data.get("repeats", 1))),
+        concurrency=max(1, int(data.get("concurrency", 1))),
+        timeout_s=int(data.get("timeout_s", 300)),
+        stream=bool(data.get("stream", False)) or "ttft" in metrics,
+        sample_interval_ms=int(data.get("sample_interval_ms", 250)),
+        description=data.get("description", ""),
+        replaces=list(data.get("replaces") or []),
+    )
+
+
+def scenario_path(name_or_path: str) -> str:
+    if os.path.isfile(name_or_path):
+        return name_or_path
+    return os.path.join(SCENARIO_DIR, f"{name_or_path}.json")
+
+
+def load_scenario(name_or_path: str) -> Scenario:
+    """Load `scenarios/<name>.json` (or any path to a declaration)."""
+    path = scenario_path(name_or_path)
+    if not os.path.isfile(path):
+        raise ValueError(f"unknown scenario {name_or_path!r} (see: scenario_engine.py list)")
+    return parse_scenario(read_json(path), base_dir=HERE)
+
+
+def list_scenarios() -> List[str]:
+    if not os.path.isdir(SCENARIO_DIR):
+        return []
+    return sorted(f[: -len(".json")] for f in os.listdir(SCENARIO_DIR) if f.endswith(".json"))
+
+
+# ---------------------------
+# Expansion
+
+
+@dataclass
+class Trial:
+    """One call: a cell of the sweep (axis -> value), a prompt and a repetition."""
+
+    cell: Dict[str, Any]
+    prompt: Dict[str, Any]
+    rep: int
+
+    @property
+    def model(self) -> str:
+        return self.cell["model"]
+
+    @property
+    def key(self) -> str:
+        return json.dumps([self.cell, self.prompt["id"], self.rep], sort_keys=True)
+
+
+def expand(scenario: Scenario) -> List[Trial]:
+    """Cartesian product of the axes, models outermost so each model runs as one suite."""
+    names = list(scenario.axes)
+    trials = []
+    for values in itertools.product(*(scenario.axes[n] for n in names)):
+        cell = dict(zip(names, values))
+        prompts = scenario.prompt_sets[cell["prompt_set"]] if "prompt_set" in cell else scenario.prompts
+        for rep in range(1, scenario.repeats + 1):
+            trials.extend(Trial(cell, p, rep) for p in prompts)
+    order = {m: i for i, m in enumerate(scenario.axes["model"])}
+    return sorted(trials, key=lambda t: order[t.model])  # stable: keeps axis order within a model
+
+
+def load_trial_keys(results_path: str) -> set:
+    """Trial keys already recorded in a results.jsonl (for --resume)."""
+    keys = set()
+    if not os.path.exists(results_path):
+        return keys
+    with open(results_path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                obj = json.loads(line)
+            except ValueError:
+                continue
+            if obj.get("record_type") == "result" and obj.get("trial_key"):
+                keys.add(obj["trial_key"])
+    return keys
+
+
+# ---------------------------
+# Response cache
+
+
+class ResponseCache:
+    """Call results keyed by request content, one JSON file per entry.
+
+    Lets a scenario be re-scored (new validators, new summary metrics)
+    without calling the models again. The key covers everything sent to the
+    provider plus the repetition, so repeats stay distinct calls.
+    """
+
+    def __init__(self, root: str = CACHE_DIR) -> None:
+        self.root = root
+        self.hits = 0
+
+    @staticmethod
+    def key(provider: str, model: str, prompt: str, stream: bool, options: Dict[str, Any], rep: int) -> str:
+        blob = json.dumps([provider, model, prompt, stream, options, rep], sort_keys=True)
+        return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, key[:2], f"{key}.json")
+
+    def get(self, key: str) -> Optional[Tuple[CallResult, int]]:
+        try:
+            entry = read_json(self._path(key))
+        except (OSError, ValueError):
+            return None
+        self.hits += 1
+        return CallResult(**entry["call"]), int(entry["e2e_ms"])
+
+    def put(self, key: str, call: CallResult, e2e_ms: int) -> None:
+        if call.availability_status != "ok":
+            return  # failures are retried on the next run, not replayed
+        path = self._path(key)
+        mkdir_p(os.path.dirname(path))
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        write_json(tmp, {"call": asdict(call), "e2e_ms": e2e_ms})
+        os.replace(tmp, path)
+
+
+# ---------------------------
+# Runner
+
+
+def make_provider(name: str, base_url: str, session: Optional[HttpSession] = None) -> Provider:
+    """run_bench provider for `name`; `base_url` is the Ollama root (a trailing /v1 is tolerated)."""
+    base = base_url.rstrip("/")
+    base = base[:-3] if base.endswith("/v1") else base
+    if name == "ollama_native":
+        return OllamaNativeProvider(base, session=session)
+    return OllamaOpenAIProvider(base + "/v1", session=session)
+
+
+class ScenarioRunner:
+    """Runs one scenario into a run folder and summarizes it."""
+
+    def __init__(
+        self,
+        scenario: Scenario,
+        out_dir: str,
+        *,
+        base_url: str = "http://localhost:11434",
+        run_id: Optional[str] = None,
+        resume: bool = False,
+        cache: Optional[ResponseCache] = None,
+        residency: bool = True,
+        context_cache_dir: Optional[str] = None,
+        blobs: Optional[BlobStore] = None,
+        log: Callable[[str], None] = print,
+    ) -> None:
+        self.scenario = scenario
+        self.out_dir = out_dir
+        self.base_url = base_url.rstrip("/")
+        self.ollama_base = self.base_url[:-3] if self.base_url.endswith("/v1") else self.base_url
+        self.run_id = run_id or os.path.basename(os.path.normpath(out_dir))
+        self.resume = resume
+        self.cache = cache
+        self.residency = OllamaResidency(self.ollama_base) if residency else None
+        self.context_cache_dir = context_cache_dir
+        self.blobs = blobs
+        self.log = log
+        # One keep-alive pool for every call of the scenario, across axes, models and workers.
+        self.session = HttpSession()
+        self.provider = make_provider(scenario.provider, self.base_url, self.session)
+        self.sampler = ResourceSampler(interval_s=max(scenario.sample_interval_ms, 1) / 1000.0)
+        self.results_path = os.path.join(out_dir, "results.jsonl")
+
+    # -- prompt text ----------------------------------------------------------
+
+    def _texts(self, model: str, trials: List[Trial]) -> Dict[Tuple[int, str], Tuple[str, Optional[int]]]:
+        """Model input per (context target, prompt id), sized before any call is timed."""
+        texts: Dict[Tuple[int, str], Tuple[str, Optional[int]]] = {}
+        generator: Optional[ContextGenerator] = None
+        for t in trials:
+            target = int(t.cell.get("context_tokens") or 0)
+            k = (target, t.prompt["id"])
+            if k in texts:
+                continue
+            if not target:
+                texts[k] = (t.prompt["prompt"], None)
+                continue
+            if generator is None:
+                tokenizer = resolve_tokenizer(model, "ollama", self.ollama_base)
+                generator = ContextGenerator(model, tokenizer, **(
+                    {"cache_dir": self.context_cache_dir} if self.context_cache_dir is not None else {}))
+            ctx = generator.build(target, "\n\n" + t.prompt["prompt"])
+            texts[k] = (ctx.text, ctx.tokens)
+        return texts
+
+    def _options(self, cell: Dict[str, Any]) -> Dict[str, Any]:
+        options = {k[len(OPTION_AXIS_PREFIX):]: v for k, v in cell.items() if k.startswith(OPTION_AXIS_PREFIX)}
+        num_ctx = self.scenario.num_ctx()
+        if num_ctx and "num_ctx" not in options:
+            options["num_ctx"] = num_ctx
+        return options
+
+    # -- one call -------------------------------------------------------------
+
+    def run_trial(self, trial: Trial, text: str, context_tokens: Optional[int]) -> Dict[str, Any]:
+        sc = self.scenario
+        stream = bool(trial.cell.get("stream", sc.stream))
+        options = self._options(trial.cell)
+        cache_key = ResponseCache.key(sc.provider, trial.model, text, stream, options, trial.rep) if self.cache else None
+        hit = self.cache.get(cache_key) if self.cache else None
+
+        started_wall_ms = now_ms()
+        started_perf_ms = perf_ms()
+        if hit:
+            call_res, e2e_ms = hit
+        else:
+            kwargs = {"options": options} if options else {}
+            call_res = self.provider.call(
+                model=trial.model,
+                prompt=text,
+                thinking_level=None,
+                timeout_s=sc.timeout_s,
+                stream=stream,
+                **kwargs,
+            )
+            e2e_ms = max(0, perf_ms() - started_perf_ms)
+            if self.cache:
+                self.cache.put(cache_key, call_res, e2e_ms)
+        ended_perf_ms = perf_ms()
+
+        p = trial.prompt
+        if call_res.availability_status == "ok" and call_res.success:
+            objective_pass, violation, parsed = validate_output(call_res.raw_output, p.get("validator") or {})
+        else:
+            objective_pass, violation, parsed = None, call_res.failure_type, None
+        tool_calls, tool_call_count, tool_use_success = detect_tool_calls(
+            call_res.raw_output, p.get("expected_tool_calls", [])
+        )
+        return {
+            "record_type": "result",
+            "run_id": self.run_id,
+            "scenario": sc.name,
+            "trial_key": trial.key,
+            "cell": trial.cell,
+            "rep": trial.rep,
+            "provider": self.provider.name,
+            "model": trial.model,
+            "thinking_level": None,
+            "prompt_id": p["id"],
+            "prompt_name": p.get("name"),
+            "context_tokens": context_tokens,
+            "availability_status": call_res.availability_status,
+            "started_at_ms": started_wall_ms,
+            "ended_at_ms": now_ms(),
+            "e2e_ms": e2e_ms,
+            "ttft_ms": call_res.ttft_ms,
+            "cached": bool(hit),
+            "success": bool(call_res.success),
+            "failure_type": call_res.failure_type,
+            "objective_pass": objective_pass,
+            "violation": violation,
+            "input_tokens": call_res.input_tokens,
+            "output_tokens": call_res.output_tokens,
+            "raw_output": call_res.raw_output,
+            "parsed_output": parsed,
+            "tool_calls": tool_calls,
+            "tool_call_count": tool_call_count,
+            "tool_use_success": tool_use_success,
+            "resources": (
+                self.sampler.window(started_perf_ms / 1000.0, ended_perf_ms / 1000.0)
+                if sc.sampling and not hit else None
+            ),
+        }
+
+    # -- whole scenario -------------------------------------------------------
+
+    def run(self, trials: Optional[List[Trial]] = None, concurrency: Optional[int] = None) -> Dict[str, Any]:
+        sc = self.scenario
+        trials = expand(sc) if trials is None else trials
+        workers = max(1, concurrency or sc.concurrency)
+        self.session.max_idle = max(self.session.max_idle, workers)
+        mkdir_p(self.out_dir)
+        write_json(os.path.join(self.out_dir, "config.json"), {
+            "run_id": self.run_id,
+            "scenario": asdict(sc),
+            "provider": sc.provider,
+            "base_url": self.base_url,
+            "concurrency": workers,
+            "cache": self.cache.root if self.cache else None,
+        })
+        done = load_trial_keys(self.results_path) if self.resume else set()
+        pending = [t for t in trials if t.key not in done]
+        self.log(f"{sc.name}: {len(pending)} calls ({len(trials) - len(pending)} already recorded), "
+                 f"concurrency {workers}")
+
+        groups: List[Tuple[str, List[Trial]]] = []
+        for t in pending:
+            if groups and groups[-1][0] == t.model:
+                groups[-1][1].append(t)
+            else:
+                groups.append((t.model, [t]))
+        if self.residency is not None:
+            # Smallest model first (sizes from the Ollama inventory), one contiguous suite each.
+            groups = [(m, [t for _, ts in g for t in ts])
+                      for m, g in self.residency.order(groups, lambda g: g[0])]
+
+        if sc.sampling:
+            self.sampler.start()
+        writer = JsonlWriter(self.results_path)
+        if threading.current_thread() is threading.main_thread():
+            flush_on_signal(writer)
+        try:
+            for i, (model, model_trials) in enumerate(groups):
+                texts = self._texts(model, model_trials)
+                if self.residency is not None:
+                    writer.flush()  # rows stay ahead of prepare_ollama_model's event lines
+                    prepare_ollama_model(self.residency, self.out_dir, f"{sc.name}__{model}_pre", model)
+
+                def one(t: Trial) -> Dict[str, Any]:
+                    return self.run_trial(t, *texts[(int(t.cell.get("context_tokens") or 0), t.prompt["id"])])
+
+                with ThreadPoolExecutor(max_workers=workers) as pool:
+                    # map() yields in submission order on this thread, so the writer needs no lock.
+                    for row in pool.map(one, model_trials):
+                        if self.blobs is not None:
+                            row["raw_output"] = self.blobs.pack(row["raw_output"])
+                        writer.write(row)
+                writer.flush()
+                self.log(f"  {model}: {len(model_trials)} calls")
+                if self.residency is not None and i + 1 < len(groups):
+                    self.residency.unload(model)
+        finally:
+            writer.close()
+            self.sampler.stop()
+            self.session.close()
+        if sc.sampling:
+            write_json(
+                os.path.join(self.out_dir, "resource_samples.json"),
+                {"stats": self.sampler.stats(), "samples": self.sampler.to_columns()},
+            )
+        return summarize(self.out_dir, sc)
+
+
+# ---------------------------
+# Summaries
+
+
+def _cell_label(cell: Dict[str, Any]) -> str:
+    return json.dumps(cell, sort_keys=True)
+
+
+def summarize(out_dir: str, scenario: Scenario) -> Dict[str, Any]:
+    """Per-cell metrics over every result row in the run folder; writes scenario_summary.{json,md}."""
+    cells: Dict[str, List[Dict[str, Any]]] = {}
+    results_path = os.path.join(out_dir, "results.jsonl")
+    if os.path.exists(results_path):
+        with open(results_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    row = json.loads(line)
+                except ValueError:
+                    continue
+                if row.get("record_type") == "result" and row.get("scenario") == scenario.name:
+                    cells.setdefault(_cell_label(row["cell"]), []).append(row)
+
+    # Rows follow the declared axis order so tables read like the sweep.
+    position = {_cell_label(dict(zip(scenario.axes, v))): i
+                for i, v in enumerate(itertools.product(*scenario.axes.values()))}
+    rows = []
+    for label in sorted(cells, key=lambda k: position.get(k, len(position))):
+        group = cells[label]
+        ok = [r for r in group if r.get("availability_status") == "ok" and r.get("success")]
+        out: Dict[str, Any] = {
+            "cell": group[0]["cell"],
+            "n": len(group),
+            "errors": len(group) - len(ok),
+            "cached": sum(1 for r in group if r.get("cached")),
+        }
+        for m in scenario.metrics:
+            out.update(METRICS[m](ok))
+        rows.append(out)
+
+    report = {"scenario": scenario.name, "axes": list(scenario.axes), "metrics": scenario.metrics, "rows": rows}
+    write_json(os.path.join(out_dir, "scenario_summary.json"), report)
+    with open(os.path.join(out_dir, "scenario_summary.md"), "w", encoding="utf-8") as f:
+        f.write(format_markdown(report))
+    return report
+
+
+def format_markdown(report: Dict[str, Any]) -> str:
+    rows = report["rows"]
+    metric_cols = [k for k in (rows[0] if rows else {}) if k not in ("cell", "n", "errors", "cached")]
+    cols = list(report["axes"]) + ["n", "errors"] + metric_cols
+    lines = [
+        f"# Scenario: {report['scenario']}",
+        "",
+        "| " + " | ".join(cols) + " |",
+        "|" + "---|" * len(cols),
+    ]
+    for r in rows:
+        vals = [r["cell"].get(a) for a in report["axes"]] + [r["n"], r["errors"]] + [r.get(c) for c in metric_cols]
+        lines.append("| " + " | ".join("" if v is None else str(v) for v in vals) + " |")
+    return "\n".join(lines) + "\n"
+
+
+# ---------------------------
+# CLI
+
+
+def _axis_values(text: str) -> List[Any]:
+    vals = []
+    for raw in (v.strip() for v in text.split(",")):
+        if not raw:
+            continue
+        try:
+            vals.append(json.loads(raw))
+        except ValueError:
+            vals.append(raw)
+    return vals
+
+
+def apply_overrides(scenario: Scenario, args: argparse.Namespace) -> Scenario:
+    """--models / --contexts / --axis / --prompt-ids / --repeats on top of the declaration."""
+    axes = dict(scenario.axes)
+    overrides = list(args.axis or [])
+    if args.models:
+        overrides.append(f"model={args.models}")
+    if args.contexts:
+        overrides.append(f"context_tokens={args.contexts}")
+    for item in overrides:
+        name, _, text = item.partition("=")
+        if name == "prompt_set":
+            axes[name] = [v for v in _axis_values(text) if v in scenario.prompt_sets]
+        elif name in AXES or name.startswith(OPTION_AXIS_PREFIX):
+            axes[name] = [str(v) for v in _axis_values(text)] if name == "model" else _axis_values(text)
+        else:
+            raise SystemExit(f"Unknown axis in override: {name}")
+        if not axes[name]:
+            raise SystemExit(f"Override leaves axis {name} empty")
+    prompts, prompt_sets = scenario.prompts, scenario.prompt_sets
+    if args.prompt_ids:
+        want = {x.strip() for x in args.prompt_ids.split(",") if x.strip()}
+        prompts = [p for p in prompts if p["id"] in want]
+        prompt_sets = {k: [p for p in v if p["id"] in want] for k, v in prompt_sets.items()}
+    data = {**asdict(scenario), "axes": axes, "prompts": prompts, "prompt_sets": prompt_sets}
+    if args.repeats:
+        data["repeats"] = args.repeats
+    return Scenario(**data)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Run a declared benchmark scenario (see scenarios/*.json).")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    sub.add_parser("list", help="List declared scenarios")
+
+    run = sub.add_parser("run", help="Run a scenario")
+    run.add_argument("scenario", help="Scenario name (scenarios/<name>.json) or path")
+    run.add_argument("--run-id", default=None, help="Run id folder name (default: <scenario>_<timestamp>)")
+    run.add_argument("--ollama-base", default=os.environ.get("OLLAMA_HOST", "http://localhost:11434"))
+    run.add_argument("--models", default=None, help="Comma-separated models (overrides axes.model)")
+    run.add_argument("--contexts", default=None, help="Comma-separated token targets (overrides axes.context_tokens)")
+    run.add_argument("--axis", action="append", help="NAME=V1,V2 axis override (repeatable)")
+    run.add_argument("--prompt-ids", default=None, help="Comma-separated prompt ids to keep")
+    run.add_argument("--repeats", type=int, default=None)
+    run.add_argument("--concurrency", type=int, default=None, help="In-flight calls per model")
+    run.add_argument("--resume", action="store_true", help="Skip calls already recorded in the run folder")
+    run.add_argument("--cache", action="store_true", help=f"Replay/record responses in {CACHE_DIR}")
+    run.add_argument("--inline-outputs", action="store_true", help="Keep raw_output text in results.jsonl (no runs/blobs)")
+    run.add_argument(
+        "--allow-concurrent-ollama",
+        action="store_true",
+        help="Do not load/unload models around each suite (contention-mode experiments)",
+    )
+
+    summ = sub.add_parser("summarize", help="Rebuild scenario_summary.{json,md} for a run folder")
+    summ.add_argument("run_dir")
+    args = ap.parse_args(argv)
+
+    if args.cmd == "list":
+        for name in list_scenarios():
+            sc = load_scenario(name)
+            print(f"{name:24s} {sc.description}")
+        return 0
+
+    if args.cmd == "summarize":
+        config = read_json(os.path.join(args.run_dir, "config.json"))
+        report = summarize(args.run_dir, Scenario(**config["scenario"]))
+        print(format_markdown(report))
+        return 0
+
+    try:
+        scenario = apply_overrides(load_scenario(args.scenario), args)
+    except ValueError as e:
+        raise SystemExit(str(e))
+    run_id = args.run_id or f"{scenario.name}_{_dt.datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    run_id = re.sub(r"[^A-Za-z0-9_.-]+", "_", run_id)
+    runner = ScenarioRunner(
+        scenario,
+        os.path.join(HERE, "runs", run_id),
+        base_url=args.ollama_base,
+        run_id=run_id,
+        resume=args.resume,
+        cache=ResponseCache() if args.cache else None,
+        residency=not args.allow_concurrent_ollama,
+        blobs=None if args.inline_outputs else open_store(os.path.join(HERE, "runs", "blobs")),
+    )
+    report = runner.run(concurrency=args.concurrency)
+    print(format_markdown(report))
+    print(f"Wrote {runner.out_dir}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""Streaming, mergeable per-suite statistics for results.jsonl.
+
+`SuiteStats` folds result rows one at a time into counters and DDSketches,
+so summarizing a run never holds its rows in memory or sorts latency lists.
+Stats serialize to `summary_sketches.json`; stats of the same
+(provider, model, thinking) key from other runs or shards merge exactly
+(counts) or within the sketch's 1% relative accuracy (percentiles).
+
+Dependencies: Python 3 stdlib only.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.sketches import DDSketch  # noqa: E402
+
+SKETCHES_FILE = "summary_sketches.json"
+SKETCHES_VERSION = 1
+
+SuiteKey = Tuple[Optional[str], Optional[str], Optional[str]]
+
+_STATUS_COUNTERS = {
+    "ok": "n_ok",
+    "skipped_unavailable": "n_skipped_unavailable",
+    "rate_limited": "n_rate_limited",
+    "error": "n_error",
+}
+_COUNTERS = (
+    "n_total", "n_ok", "n_success", "n_skipped_unavailable", "n_rate_limited", "n_error",
+    "n_objective_checked", "n_objective_pass",
+)
+# Per-call sampler window fields folded with max() / min().
+_RESOURCE_MAX = ("proc_cpu_pct_max", "proc_rss_kb_max", "swap_used_kb_max", "mem_psi_some_max", "temp_c_max")
+_RESOURCE_MIN = ("mem_available_kb_min", "freq_mhz_min")
+
+
+def suite_key(row: Dict[str, Any]) -> SuiteKey:
+    return (row.get("provider"), row.get("model"), row.get("thinking_level"))
+
+
+def iter_records(results_path: str) -> Iterator[Dict[str, Any]]:
+    """Yield results.jsonl records one line at a time; a torn last line is skipped."""
+    with open(results_path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                continue
+
+
+def _fold(a: Optional[float], b: Optional[float], fn: Any) -> Optional[float]:
+    if a is None:
+        return b
+    if b is None:
+        return a
+    return fn(a, b)
+
+
+class SuiteStats:
+    """Counters and sketches for one (provider, model, thinking) suite."""
+
+    def __init__(self) -> None:
+        self.counts: Dict[str, int] = {k: 0 for k in _COUNTERS}
+        self.started_at_ms: Optional[int] = None
+        self.ended_at_ms: Optional[int] = None
+        # Successful calls only (the summary latency) vs. every recorded call.
+        self.e2e_success = DDSketch()
+        self.e2e_all = DDSketch()
+        self.violations: Dict[str, int] = {}
+        self.by_prompt: Dict[str, Dict[str, int]] = {}
+        self.resources: Dict[str, Any] = {"n_calls": 0, "n_throttled": 0, "proc_cpu_pct_sum": 0.0, "proc_cpu_pct_n": 0}
+        self.throttled_e2e = DDSketch()
+
+    def add(self, row: Dict[str, Any]) -> None:
+        c = self.counts
+        status = row.get("availability_status")
+        ok_success = status == "ok" and bool(row.get("success"))
+        c["n_total"] += 1
+        if status in _STATUS_COUNTERS:
+            c[_STATUS_COUNTERS[status]] += 1
+        if ok_success:
+            c["n_success"] += 1
+        passed = row.get("objective_pass") is True
+        if ok_success and row.get("objective_pass") is not None:
+            c["n_objective_checked"] += 1
+            c["n_objective_pass"] += int(passed)
+        if not passed:
+            v = str(row.get("violation") or "unknown")
+            self.violations[v] = self.violations.get(v, 0) + 1
+        bp = self.by_prompt.setdefault(str(row.get("prompt_id", "unknown")), {"pass": 0, "total": 0})
+        bp["total"] += 1
+        bp["pass"] += int(passed)
+
+        self.started_at_ms = _fold(self.started_at_ms, row.get("started_at_ms"), min)
+        self.ended_at_ms = _fold(self.ended_at_ms, row.get("ended_at_ms"), max)
+
+        e2e = row.get("e2e_ms")
+        if e2e is not None:
+            self.e2e_all.add(float(e2e))
+            if ok_success:
+                self.e2e_success.add(float(e2e))
+
+        w = row.get("resources")
+        if isinstance(w, dict) and w.get("n_samples"):
+            res = self.resources
+            res["n_calls"] += 1
+            if w.get("proc_cpu_pct_mean") is not None:
+                res["proc_cpu_pct_sum"] += float(w["proc_cpu_pct_mean"])
+                res["proc_cpu_pct_n"] += 1
+            for k in _RESOURCE_MAX:
+                res[k] = _fold(res.get(k), w.get(k), max)
+            for k in _RESOURCE_MIN:
+                res[k] = _fold(res.get(k), w.get(k), min)
+        if (row.get("resources") or {}).get("throttled"):
+            self.resources["n_throttled"] += 1
+            if e2e is not None:
+                self.throttled_e2e.add(float(e2e))
+
+    def merge(self, other: "SuiteStats") -> "SuiteStats":
+        """Fold shards of the same population; the wall-clock span becomes their union."""
+        for k, n in other.counts.items():
+            self.counts[k] = self.counts.get(k, 0) + n
+        self.started_at_ms = _fold(self.started_at_ms, other.started_at_ms, min)
+        self.ended_at_ms = _fold(self.ended_at_ms, other.ended_at_ms, max)
+        self.e2e_success.merge(other.e2e_success)
+        self.e2e_all.merge(other.e2e_all)
+        self.throttled_e2e.merge(other.throttled_e2e)
+        for v, n in other.violations.items():
+            self.violations[v] = self.violations.get(v, 0) + n
+        for pid, bp in other.by_prompt.items():
+            mine = self.by_prompt.setdefault(pid, {"pass": 0, "total": 0})
+            mine["pass"] += bp["pass"]
+            mine["total"] += bp["total"]
+        res, o = self.resources, other.resources
+        for k in ("n_calls", "n_throttled", "proc_cpu_pct_sum", "proc_cpu_pct_n"):
+            res[k] = res.get(k, 0) + o.get(k, 0)
+        for k in _RESOURCE_MAX:
+            res[k] = _fold(res.get(k), o.get(k), max)
+        for k in _RESOURCE_MIN:
+            res[k] = _fold(res.get(k), o.get(k), min)
+        return self
+
+    @property
+    def wall_clock_ms(self) -> Optional[int]:
+        if self.started_at_ms is None or self.ended_at_ms is None:
+            return None
+        return self.ended_at_ms - self.started_at_ms
+
+    def call_resources(self) -> Optional[Dict[str, Any]]:
+        """Per-call sampler aggregate; None for runs recorded without the sampler."""
+        res = self.resources
+        if not res["n_calls"]:
+            return None
+        out: Dict[str, Any] = {"n_calls": res["n_calls"]}
+        out["proc_cpu_pct_mean"] = round(res["proc_cpu_pct_sum"] / res["proc_cpu_pct_n"], 1) if res["proc_cpu_pct_n"] else None
+        for k in _RESOURCE_MAX + _RESOURCE_MIN:
+            out[k] = res.get(k)
+        out["n_throttled"] = res["n_throttled"]
+        out["throttled_p50_ms"] = self.throttled_e2e.percentile(50)
+        return out
+
+    def summary(self) -> Dict[str, Any]:
+        """The summary.json per-model fields computed from counters and sketches."""
+        c = self.counts
+        lat = self.e2e_success
+        return {
+            "n_total": c["n_total"],
+            "n_ok": c["n_ok"],
+            "n_success": c["n_success"],
+            "n_skipped_unavailable": c["n_skipped_unavailable"],
+            "n_rate_limited": c["n_rate_limited"],
+            "n_error": c["n_error"],
+            "success_rate_ok": (c["n_success"] / c["n_ok"]) if c["n_ok"] else None,
+            "objective_pass_rate": (c["n_objective_pass"] / c["n_objective_checked"]) if c["n_objective_checked"] else None,
+            "wall_clock_ms": self.wall_clock_ms,
+            "latency_ms": {
+                "p50": lat.percentile(50),
+                "p95": lat.percentile(95),
+                "p99": lat.percentile(99),
+                "mean": lat.mean,
+            },
+            "call_resources": self.call_resources(),
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "counts": dict(self.counts),
+            "started_at_ms": self.started_at_ms,
+            "ended_at_ms": self.ended_at_ms,
+            "e2e_success": self.e2e_success.to_dict(),
+            "e2e_all": self.e2e_all.to_dict(),
+            "throttled_e2e": self.throttled_e2e.to_dict(),
+            "violations": dict(self.violations),
+            "by_prompt": {pid: dict(bp) for pid, bp in self.by_prompt.items()},
+            "resources": dict(self.resources),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SuiteStats":
+        st = cls()
+        st.counts.update(data.get("counts") or {})
+        st.started_at_ms = data.get("started_at_ms")
+        st.ended_at_ms = data.get("ended_at_ms")
+        st.e2e_success = DDSketch.from_dict(data.get("e2e_success") or {})
+        st.e2e_all = DDSketch.from_dict(data.get("e2e_all") or {})
+        st.throttled_e2e = DDSketch.from_dict(data.get("throttled_e2e") or {})
+        st.violations = dict(data.get("violations") or {})
+        st.by_prompt = {pid: dict(bp) for pid, bp in (data.get("by_prompt") or {}).items()}
+        st.resources.update(data.get("resources") or {})
+        return st
+
+
+def stream_suite_stats(results_path: str) -> Tuple[Dict[SuiteKey, SuiteStats], Dict[str, float]]:
+    """One pass over results.jsonl: per-suite stats and summed `model_load` ms per model."""
+    stats: Dict[SuiteKey, SuiteStats] = {}
+    load_ms_by_model: Dict[str, float] = {}
+    for obj in iter_records(results_path):
+        if obj.get("record_type") == "result":
+            stats.setdefault(suite_key(obj), SuiteStats()).add(obj)
+        elif obj.get("event") == "model_load" and obj.get("model"):
+            load_ms_by_model[obj["model"]] = load_ms_by_model.get(obj["model"], 0.0) + float(obj.get("load_ms") or 0.0)
+    return stats, load_ms_by_model
+
+
+def write_sketches(path: str, stats: Dict[SuiteKey, SuiteStats], run_id: Optional[str] = None) -> None:
+    payload = {
+        "version": SKETCHES_VERSION,
+        "run_id": run_id,
+        "suites": [
+            {"provider": k[0], "model": k[1], "thinking_level": k[2], "stats": st.to_dict()}
+            for k, st in sorted(stats.items(), key=lambda kv: (str(kv[0][0]), str(kv[0][1]), str(kv[0][2])))
+        ],
+    }
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(payload, f, ensure_ascii=False, sort_keys=True)
+        f.write("\n")
+    os.replace(tmp, path)
+
+
+def read_sketches(path: str) -> Dict[SuiteKey, SuiteStats]:
+    with open(path, "r", encoding="utf-8") as f:
+        payload = json.load(f)
+    if payload.get("version") != SKETCHES_VERSION:
+        raise ValueError(f"{path}: unsupported sketch version {payload.get('version')!r}")
+    return {
+        (s.get("provider"), s.get("model"), s.get("thinking_level")): SuiteStats.from_dict(s.get("stats") or {})
+        for s in payload.get("suites") or []
+    }
+
+
+def load_run_stats(run_dir: str) -> Dict[SuiteKey, SuiteStats]:
+    """Per-suite stats for a run: its summary_sketches.json, else one pass over results.jsonl.
+
+    Sketches older than results.jsonl (a run resumed or interrupted after its
+    last summarize) are ignored in favour of the rows.
+    """
+    sketch_path = os.path.join(run_dir, SKETCHES_FILE)
+    results_path = os.path.join(run_dir, "results.jsonl")
+    have_rows = os.path.exists(results_path)
+    if os.path.exists(sketch_path) and (not have_rows or os.path.getmtime(sketch_path) >= os.path.getmtime(results_path)):
+        try:
+            return read_sketches(sketch_path)
+        except (OSError, ValueError):
+            pass
+    if not have_rows:
+        return {}
+    return stream_suite_stats(results_path)[0]
+
+
+def merge_stats(parts: Iterable[Dict[SuiteKey, SuiteStats]]) -> Dict[SuiteKey, SuiteStats]:
+    """Merge per-suite stats from several shards or runs into fresh objects."""
+    merged: Dict[SuiteKey, SuiteStats] = {}
+    for part in parts:
+        for k, st in part.items():
+            merged.setdefault(k, SuiteStats()).merge(st)
+    return merged
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""Unit tests for the declarative scenario engine."""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+import urllib.error
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+BENCH_ROOT = os.path.dirname(HERE)
+for path in (HERE, BENCH_ROOT):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+from scenario_engine import (  # noqa: E402
+    ResponseCache,
+    ScenarioRunner,
+    expand,
+    format_markdown,
+    list_scenarios,
+    load_scenario,
+    parse_scenario,
+)
+from run_bench import HttpSession, http_json, http_ndjson  # noqa: E402
+from utils.mock_llm_server import FAULT_HEADER, MockConfig, MockLLMServer, Recording, RecordingStore  # noqa: E402
+
+TOOL_PROMPTS = [
+    {"id": "T1", "prompt": "Show memory.", "expected_tool_calls": ["free"],
+     "validator": {"type": "tool_invocation", "expected_tools": ["free"]}},
+    {"id": "T2", "prompt": "Show disk.", "expected_tool_calls": ["du"]},
+]
+
+
+def _decl(**overrides) -> dict:
+    data = {
+        "name": "t",
+        "provider": "ollama_native",
+        "prompts": TOOL_PROMPTS,
+        "axes": {"model": ["m"]},
+        "metrics": ["latency", "tool_use"],
+    }
+    data.update(overrides)
+    return data
+
+
+def _rows(run_dir: str) -> list:
+    with open(os.path.join(run_dir, "results.jsonl"), encoding="utf-8") as f:
+        return [r for r in map(json.loads, f) if r["record_type"] == "result"]
+
+
+class TestDeclarations(unittest.TestCase):
+    def test_shipped_scenarios_load(self) -> None:
+        names = list_scenarios()
+        self.assertIn("phase3c_cpu", names)
+        for name in names:
+            sc = load_scenario(name)
+            self.assertTrue(expand(sc))
+            self.assertTrue(all(os.path.exists(os.path.join(HERE, f)) for f in sc.replaces), name)
+        tool = load_scenario("phase3_tool_use")
+        self.assertEqual(tool.axes["prompt_set"], ["baseline", "enhanced"])
+        self.assertEqual(len(expand(tool)), 3 * 2 * 6)
+        self.assertTrue(load_scenario("phase3b_latency_scaling").stream)  # ttft forces streaming
+
+    def test_rejects_bad_declarations(self) -> None:
+        with self.assertRaisesRegex(ValueError, "unknown axes"):
+            parse_scenario(_decl(axes={"model": ["m"], "temperature": [0]}))
+        with self.assertRaisesRegex(ValueError, "unknown metrics"):
+            parse_scenario(_decl(metrics=["gpu"]))
+        with self.assertRaisesRegex(ValueError, "need provider ollama_native"):
+            parse_scenario(_decl(provider="ollama_openai", axes={"model": ["m"], "context_tokens": [1000]}))
+
+    def test_expand_groups_models_and_keys_are_unique(self) -> None:
+        sc = parse_scenario(_decl(axes={"model": ["a", "b"], "options.num_thread": [2, 4]}, repeats=2))
+        trials = expand(sc)
+        self.assertEqual(len(trials), 2 * 2 * 2 * 2)
+        self.assertEqual([t.model for t in trials], ["a"] * 8 + ["b"] * 8)
+        self.assertEqual(len({t.key for t in trials}), len(trials))
+
+
+class TestRunner(unittest.TestCase):
+    def setUp(self) -> None:
+        store = RecordingStore([Recording("m", "Running `free -h` and `du -sh /root` now.")])
+        config = MockConfig(ttft_ms=0, tokens_per_s=100000, prefill_tps=1e6)
+        self.server = MockLLMServer(store, port=0, config=config)
+        self.server.start()
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+        self.tmp.cleanup()
+
+    def _runner(self, sc, run: str = "run", **kwargs) -> ScenarioRunner:
+        return ScenarioRunner(sc, os.path.join(self.tmp.name, run), base_url=self.server.url,
+                              log=lambda _: None, **kwargs)
+
+    def _calls(self) -> int:
+        return sum(n for route, n in self.server.stats()["requests"].items() if route in ("/api/chat", "/v1/chat/completions"))
+
+    def test_sweep_streams_samples_and_resumes(self) -> None:
+        sc = parse_scenario(_decl(
+            axes={"model": ["m"], "prompt_set": {"a": TOOL_PROMPTS, "b": TOOL_PROMPTS[:1]}, "stream": [False, True]},
+            metrics=["latency", "ttft", "tool_use", "objective", "cpu", "cores"],
+            sample_interval_ms=20,
+        ))
+        runner = self._runner(sc)
+        report = runner.run(concurrency=3)
+        rows = _rows(runner.out_dir)
+        self.assertEqual(len(rows), (2 + 1) * 2)
+        self.assertTrue(all(r["success"] and r["tool_use_success"] for r in rows))
+        self.assertTrue(all((r["ttft_ms"] is not None) == r["cell"]["stream"] for r in rows))
+        self.assertTrue(all("cores_busy_max" in r["resources"] for r in rows))
+
+        self.assertEqual([(r["cell"]["prompt_set"], r["cell"]["stream"], r["n"]) for r in report["rows"]],
+                         [("a", False, 2), ("a", True, 2), ("b", False, 1), ("b", True, 1)])
+        self.assertEqual(report["rows"][0]["tool_use_pct"], 100.0)
+        self.assertIn("| m | a | True | 2 | 0 |", format_markdown(report))
+
+        calls = self._calls()
+        self._runner(sc, resume=True).run()
+        self.assertEqual((self._calls(), len(_rows(runner.out_dir))), (calls, len(rows)))
+
+    def test_cache_replays_without_calling_the_model(self) -> None:
+        sc = parse_scenario(_decl(provider="ollama_openai"))
+        cache = ResponseCache(os.path.join(self.tmp.name, "cache"))
+        self._runner(sc, "first", cache=cache).run()
+        calls = self._calls()
+        second = self._runner(sc, "second", cache=cache)
+        second.run()
+        self.assertEqual(self._calls(), calls)
+        self.assertTrue(all(r["cached"] for r in _rows(second.out_dir)))
+        self.assertEqual(cache.hits, 2)
+
+    def test_calls_share_keep_alive_connections(self) -> None:
+        sc = parse_scenario(_decl(axes={"model": ["m"], "prompt_set": {"a": TOOL_PROMPTS, "b": TOOL_PROMPTS},
+                                        "options.num_thread": [2, 4]}))
+        runner = self._runner(sc, residency=False)
+        runner.run(concurrency=2)
+        self.assertEqual(self._calls(), 2 * 2 * 2)
+        self.assertLessEqual(runner.session.connects, 2)
+
+    def test_session_maps_errors_and_drops_closed_connections(self) -> None:
+        session = HttpSession()
+        url = self.server.url + "/api/chat"
+        body = {"model": "m", "messages": [{"role": "user", "content": "Show memory."}], "stream": False}
+        with self.assertRaises(urllib.error.HTTPError) as err:
+            http_json(url, body, {FAULT_HEADER: "error"}, session=session)
+        self.assertEqual(err.exception.code, 500)
+        self.assertIn("injected", err.exception.read().decode("utf-8"))
+        self.assertTrue(http_json(url, body, {}, session=session)["done"])
+        self.assertEqual(session.connects, 1)  # the error response was drained, so its connection is reused
+        frames = list(http_ndjson(url, {**body, "stream": True}, {}, timeout_s=10, session=session))
+        self.assertTrue(frames[-1]["done"])
+        http_json(url, body, {}, session=session)
+        self.assertEqual(session.connects, 2)  # the stream ended with Connection: close
+        session.close()
+
+    def test_context_axis_builds_exact_prompts(self) -> None:
+        sc = parse_scenario(_decl(axes={"model": ["m"], "context_tokens": [0, 300]}, metrics=["latency", "tokens"]))
+        self.assertEqual(sc.num_ctx(), 300 + 1024)
+        runner = self._runner(sc, context_cache_dir=os.path.join(self.tmp.name, "ctx"))
+        runner.run()
+        by_ctx = {(r["cell"]["context_tokens"], r["prompt_id"]): r for r in _rows(runner.out_dir)}
+        self.assertIsNone(by_ctx[(0, "T1")]["context_tokens"])
+        self.assertEqual(by_ctx[(300, "T1")]["context_tokens"], 300)
+        self.assertGreater(by_ctx[(300, "T1")]["input_tokens"], by_ctx[(0, "T1")]["input_tokens"] + 250)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""Unit tests for streaming summaries, sketch merging and the buffered writer."""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+if HERE not in sys.path:
+    sys.path.insert(0, HERE)
+
+import run_bench  # noqa: E402
+from summary_stats import (  # noqa: E402
+    SKETCHES_FILE,
+    load_run_stats,
+    merge_stats,
+    read_sketches,
+    stream_suite_stats,
+)
+
+
+def _row(i: int, model: str = "m1", status: str = "ok", success: bool = True) -> dict:
+    return {
+        "record_type": "result",
+        "provider": "ollama_openai",
+        "model": model,
+        "thinking_level": None,
+        "prompt_id": f"P{i % 4}",
+        "availability_status": status,
+        "success": success,
+        "objective_pass": (i % 3 != 0) if success else None,
+        "violation": None if i % 3 else "bad_json",
+        "started_at_ms": 1000 * i,
+        "ended_at_ms": 1000 * i + 100 + i,
+        "e2e_ms": 100 + i,
+        "resources": {"n_samples": 2, "proc_cpu_pct_mean": 50.0, "proc_rss_kb_max": 1000 + i, "throttled": i == 5},
+    }
+
+
+def _lines(path: str) -> list[str]:
+    with open(path, encoding="utf-8") as f:
+        return f.read().splitlines()
+
+
+def _write(path: str, rows: list[dict]) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        for r in rows:
+            f.write(json.dumps(r) + "\n")
+
+
+class TestSummaryStats(unittest.TestCase):
+    def test_streamed_counts_and_latency(self) -> None:
+        rows = [_row(i) for i in range(30)] + [_row(30, status="error", success=False)]
+        with tempfile.TemporaryDirectory() as td:
+            path = os.path.join(td, "results.jsonl")
+            _write(path, rows + [{"record_type": "event", "event": "model_load", "model": "m1", "load_ms": 250}])
+            stats, load_ms = stream_suite_stats(path)
+        self.assertEqual(load_ms, {"m1": 250.0})
+        summary = stats[("ollama_openai", "m1", None)].summary()
+        self.assertEqual((summary["n_total"], summary["n_ok"], summary["n_success"], summary["n_error"]), (31, 30, 30, 1))
+        self.assertAlmostEqual(summary["objective_pass_rate"], 20 / 30)
+        self.assertEqual(summary["wall_clock_ms"], 30 * 1000 + 130 - 0)
+        # Lower-rank p50 of 100..129 is 114; the sketch is within 1% of it.
+        self.assertAlmostEqual(summary["latency_ms"]["p50"], 114, delta=114 * 0.01)
+        self.assertAlmostEqual(summary["latency_ms"]["mean"], 114.5)
+        cr = summary["call_resources"]
+        self.assertEqual((cr["n_calls"], cr["n_throttled"], cr["proc_rss_kb_max"]), (31, 1, 1030))
+        self.assertAlmostEqual(cr["throttled_p50_ms"], 105, delta=1.1)
+
+    def test_shards_merge_to_the_whole(self) -> None:
+        rows = [_row(i, model="m1" if i % 2 else "m2") for i in range(40)]
+        with tempfile.TemporaryDirectory() as td:
+            paths = []
+            for n, part in enumerate((rows[:15], rows[15:], rows)):
+                paths.append(os.path.join(td, f"r{n}.jsonl"))
+                _write(paths[-1], part)
+            merged = merge_stats([stream_suite_stats(paths[0])[0], stream_suite_stats(paths[1])[0]])
+            whole = stream_suite_stats(paths[2])[0]
+        self.assertEqual(set(merged), set(whole))
+        for k in whole:
+            self.assertEqual(merged[k].summary(), whole[k].summary())
+            self.assertEqual(merged[k].by_prompt, whole[k].by_prompt)
+
+    def test_summarize_writes_mergeable_sketches(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            _write(os.path.join(td, "results.jsonl"), [_row(i) for i in range(10)])
+            run_bench.summarize(td)
+            summary = run_bench.read_json(os.path.join(td, "summary.json"))
+            sketches = read_sketches(os.path.join(td, SKETCHES_FILE))
+            self.assertEqual(summary["models"][0]["n_total"], 10)
+            self.assertEqual(sketches[("ollama_openai", "m1", None)].summary()["latency_ms"],
+                             summary["models"][0]["latency_ms"])
+            # Sketches older than the rows (run resumed) are not trusted.
+            with open(os.path.join(td, "results.jsonl"), "a", encoding="utf-8") as f:
+                f.write(json.dumps(_row(10)) + "\n")
+            os.utime(os.path.join(td, SKETCHES_FILE), (0, 0))
+            self.assertEqual(load_run_stats(td)[("ollama_openai", "m1", None)].counts["n_total"], 11)
+
+
+class TestJsonlWriter(unittest.TestCase):
+    def test_records_reach_disk_at_flush_points(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            path = os.path.join(td, "results.jsonl")
+            with run_bench.JsonlWriter(path, max_buffered=3) as writer:
+                writer.write({"n": 1})
+                writer.write({"n": 2})
+                self.assertEqual(os.path.getsize(path), 0)
+                writer.flush()
+                self.assertEqual(len(_lines(path)), 2)
+                for n in range(3, 6):
+                    writer.write({"n": n})
+                self.assertEqual(len(_lines(path)), 5)
+                writer.write({"n": 6})
+            self.assertEqual([json.loads(ln)["n"] for ln in _lines(path)], [1, 2, 3, 4, 5, 6])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,11 +3,17 @@ from __future__ import annotations
 
 import argparse
 import json
+import sys
 import time
 from pathlib import Path
 from typing import Any
 
 ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from utils.run_archive import FINISHED, is_bundle, load_index  # noqa: E402
+
 RESULTS_DIR = ROOT / "results"
 RUNS_DIR = ROOT / "supervisor_runs"
 ARCHIVE_DIR = RUNS_DIR / ".archive"
@@ -78,10 +84,13 @@ def collect_runs(now: float, retain_days: int) -> dict[str, Any]:
             if not path.is_dir() or path.name.startswith('.'):
                 continue
             stat = path.stat()
-            summary = load_json(path / "summary.json", {})
-            manifest = load_json(path / "manifest.json", {})
             run_id = path.name
-            status = summary.get("status") or manifest.get("status") or indexed_runs.get(run_id, {}).get("status") or "unknown"
+            status = indexed_runs.get(run_id, {}).get("status")
+            if status not in FINISHED:
+                # The index is written when a run ends; only open files of runs it cannot vouch for.
+                summary = load_json(path / "summary.json", {})
+                manifest = load_json(path / "manifest.json", {})
+                status = summary.get("status") or manifest.get("status") or status or "unknown"
             row = {
                 "run_id": run_id,
                 "status": status,
@@ -97,10 +106,24 @@ def collect_runs(now: float, retain_days: int) -> dict[str, Any]:
                 active.append(row)
 
     archived = []
+    bundles = sorted(load_index(ARCHIVE_DIR), key=lambda e: e.get("archived_at") or 0)
+    for entry in bundles:
+        archived.append(
+            {
+                "name": entry["bundle"],
+                "run_id": entry.get("run_id"),
+                "status": entry.get("status"),
+                "age_days": age_days(entry.get("mtime") or entry.get("archived_at") or now, now),
+                "raw_bytes": entry.get("raw_bytes", 0),
+                "packed_bytes": entry.get("packed_bytes", 0),
+            }
+        )
+    unbundled = []
     if ARCHIVE_DIR.exists():
+        indexed_bundles = {e["bundle"] for e in bundles}
         for path in sorted(ARCHIVE_DIR.iterdir()):
-            if path.is_dir():
-                archived.append(
+            if path.is_dir() or (is_bundle(path) and path.name not in indexed_bundles):
+                unbundled.append(
                     {
                         "name": path.name,
                         "age_days": age_days(path.stat().st_mtime, now),
@@ -113,6 +136,9 @@ def collect_runs(now: float, retain_days: int) -> dict[str, Any]:
         "archive_candidates": archive_candidates,
         "unindexed_runs": unindexed,
         "archived_entries": archived,
+        "archived_raw_bytes": sum(row["raw_bytes"] for row in archived),
+        "archived_packed_bytes": sum(row["packed_bytes"] for row in archived),
+        "unbundled_archive_entries": unbundled,
     }
 
 
@@ -138,9 +164,22 @@ def render_text(report: dict[str, Any], retain_days: int) -> str:
         lines.append(f"- WARNING: unindexed top-level runs: {len(runs['unindexed_runs'])}")
         for row in runs["unindexed_runs"]:
             lines.append(f"  - supervisor_runs/{row['run_id']}: status={row['status']}, age={row['age_days']}d")
-    lines.append(f"- archived supervisor entries: {len(runs['archived_entries'])}")
+    lines.append(
+        f"- archived supervisor bundles: {len(runs['archived_entries'])} "
+        f"({runs['archived_packed_bytes']}B packed, {runs['archived_raw_bytes']}B raw)"
+    )
     for row in runs["archived_entries"]:
-        lines.append(f"  - supervisor_runs/.archive/{row['name']}: age={row['age_days']}d")
+        lines.append(
+            f"  - supervisor_runs/.archive/{row['name']}: status={row['status']}, age={row['age_days']}d, "
+            f"size={row['packed_bytes']}B"
+        )
+    if runs["unbundled_archive_entries"]:
+        lines.append(
+            f"- unbundled archive entries: {len(runs['unbundled_archive_entries'])} "
+            "(python3 bench/utils/run_archive.py pack / reindex)"
+        )
+        for row in runs["unbundled_archive_entries"]:
+            lines.append(f"  - supervisor_runs/.archive/{row['name']}: age={row['age_days']}d")
     return "\n".join(lines)
 
 
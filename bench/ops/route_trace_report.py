@@ -3,25 +3,39 @@
 
 Reads fallback_trace.jsonl emitted by bench/selfopt/benchmark_supervisor.py and
 prints an operator-friendly summary of primary failures, fallback selections,
-and final outcomes per job.
+and final outcomes per job. Runs already bundled into supervisor_runs/.archive
+are found through the archive index (bench/utils/run_archive.py): their route
+attribution comes from the index line, and only a run with trace events has
+that one member streamed out of its bundle.
 """
 
 from __future__ import annotations
 
 import argparse
 import json
+import sys
 from collections import Counter
 from pathlib import Path
 from typing import Any
 
-DEFAULT_RUNS_DIR = Path(__file__).resolve().parents[1] / "supervisor_runs"
+BENCH_ROOT = Path(__file__).resolve().parents[1]
+if str(BENCH_ROOT) not in sys.path:
+    sys.path.insert(0, str(BENCH_ROOT))
+
+from utils.run_archive import load_index, read_member  # noqa: E402
+
+DEFAULT_RUNS_DIR = BENCH_ROOT / "supervisor_runs"
 
 
 def load_rows(path: Path) -> list[dict[str, Any]]:
-    rows: list[dict[str, Any]] = []
     if not path.exists():
-        return rows
-    for line in path.read_text(encoding="utf-8").splitlines():
+        return []
+    return parse_rows(path.read_text(encoding="utf-8"))
+
+
+def parse_rows(text: str) -> list[dict[str, Any]]:
+    rows: list[dict[str, Any]] = []
+    for line in text.splitlines():
         line = line.strip()
         if not line:
             continue
@@ -56,6 +70,21 @@ def latest_manifest(runs_dir: Path) -> Path | None:
     return candidates[0] if candidates else None
 
 
+def archived_run(runs_dir: Path, run_id: str | None = None) -> dict[str, Any] | None:
+    """Archive index entry of `run_id`, or of the most recently finished archived run."""
+    entries = [e for e in load_index(runs_dir / ".archive") if e.get("kind") == "run"]
+    if run_id:
+        entries = [e for e in entries if e.get("run_id") == run_id]
+    if not entries:
+        return None
+    return max(entries, key=lambda e: float(e.get("ended_at") or e.get("mtime") or 0.0))
+
+
+def load_archived_trace(runs_dir: Path, entry: dict[str, Any]) -> list[dict[str, Any]]:
+    data = read_member(runs_dir / ".archive" / entry["bundle"], f"{entry['run_id']}/fallback_trace.jsonl")
+    return parse_rows(data.decode("utf-8")) if data else []
+
+
 def load_manifest(path: Path) -> dict[str, Any]:
     data = json.loads(path.read_text(encoding="utf-8"))
     if not isinstance(data, dict):
@@ -215,11 +244,15 @@ def _print_one_line_from_manifest(manifest_path: Path) -> bool:
         data = load_manifest(manifest_path)
     except Exception:
         return False
+    _print_one_line_from_manifest_data(data, manifest_path)
+    return True
+
 
+def _print_one_line_from_manifest_data(data: dict[str, Any], manifest_path: Path) -> None:
     jobs = data.get("jobs") or []
     if not jobs:
         print(f"manifest={manifest_path} jobs=0 served_by=unknown fallback_used=false")
-        return True
+        return
 
     job = jobs[-1]
     served_by = job.get("served_by") or job.get("model") or "unknown"
@@ -238,7 +271,6 @@ def _print_one_line_from_manifest(manifest_path: Path) -> bool:
             ]
         )
     )
-    return True
 
 
 def print_human(summary: dict[str, Any], source: Path) -> None:
@@ -268,6 +300,37 @@ def print_human(summary: dict[str, Any], source: Path) -> None:
         print("  (none)")
 
 
+def _report_trace(rows: list[dict[str, Any]], source: Path, args: argparse.Namespace) -> int:
+    summary = summarize(rows)
+    if args.one_line:
+        print_one_line(rows, source)
+    elif args.json:
+        print(json.dumps({"source": "trace", "trace": str(source), **summary}, indent=2, ensure_ascii=False))
+    else:
+        print_human(summary, source)
+    return 0
+
+
+def _report_manifest(data: dict[str, Any], source: Path, args: argparse.Namespace) -> int:
+    if args.one_line:
+        _print_one_line_from_manifest_data(data, source)
+        return 0
+    summary = summarize_manifest(data, source)
+    if args.json:
+        print(json.dumps(summary, indent=2, ensure_ascii=False))
+    else:
+        print_human(summary, source)
+    return 0
+
+
+def _report_archived(entry: dict[str, Any], args: argparse.Namespace) -> int:
+    bundle = args.runs_dir / ".archive" / entry["bundle"]
+    if entry.get("trace_events"):
+        rows = load_archived_trace(args.runs_dir, entry)
+        return _report_trace(rows, Path(f"{bundle}:{entry['run_id']}/fallback_trace.jsonl"), args)
+    return _report_manifest({"run_id": entry["run_id"], "jobs": entry.get("route") or []}, bundle, args)
+
+
 def main() -> int:
     ap = argparse.ArgumentParser(description="Summarize benchmark fallback route traces")
     ap.add_argument(
@@ -281,6 +344,11 @@ def main() -> int:
         default=DEFAULT_RUNS_DIR,
         help=f"Runs directory for --trace auto-discovery (default: {DEFAULT_RUNS_DIR})",
     )
+    ap.add_argument(
+        "--run-id",
+        default="",
+        help="Report this run instead of the latest one (top-level directory or archived bundle)",
+    )
     ap.add_argument("--json", action="store_true", help="Emit summary as JSON")
     ap.add_argument(
         "--one-line",
@@ -289,39 +357,37 @@ def main() -> int:
     )
     args = ap.parse_args()
 
-    trace = args.trace or latest_trace(args.runs_dir)
+    if args.trace is not None:
+        trace = args.trace
+    elif args.run_id:
+        candidate = args.runs_dir / args.run_id / "fallback_trace.jsonl"
+        trace = candidate if candidate.exists() else None
+    else:
+        trace = latest_trace(args.runs_dir)
     if trace is None:
         # No fallback trace exists (common when no fallback happened). Fall back
         # to latest supervisor manifest so operator views still expose route
         # attribution for no-fallback runs.
-        manifest = latest_manifest(args.runs_dir)
+        if args.run_id:
+            candidate = args.runs_dir / args.run_id / "manifest.json"
+            manifest = candidate if candidate.exists() else None
+        else:
+            manifest = latest_manifest(args.runs_dir)
         if manifest is None:
-            raise SystemExit("No fallback_trace.jsonl or manifest.json found. Run benchmark_supervisor first.")
+            # Every matching run has been archived: answer from the archive index.
+            entry = archived_run(args.runs_dir, args.run_id or None)
+            if entry is None:
+                raise SystemExit("No fallback_trace.jsonl or manifest.json found. Run benchmark_supervisor first.")
+            return _report_archived(entry, args)
 
         if args.one_line:
             if _print_one_line_from_manifest(manifest):
                 return 0
             raise SystemExit(f"Failed to read manifest fallback: {manifest}")
 
-        data = load_manifest(manifest)
-        summary = summarize_manifest(data, manifest)
-        if args.json:
-            print(json.dumps(summary, indent=2, ensure_ascii=False))
-        else:
-            print_human(summary, manifest)
-        return 0
-
-    rows = load_rows(trace)
-    summary = summarize(rows)
-
-    if args.one_line:
-        print_one_line(rows, trace)
-    elif args.json:
-        print(json.dumps({"source": "trace", "trace": str(trace), **summary}, indent=2, ensure_ascii=False))
-    else:
-        print_human(summary, trace)
+        return _report_manifest(load_manifest(manifest), manifest, args)
 
-    return 0
+    return _report_trace(load_rows(trace), trace, args)
 
 
 if __name__ == "__main__":
@@ -17,6 +17,7 @@ BENCH_ROOT = os.path.abspath(os.path.join(HERE, ".."))
 if BENCH_ROOT not in sys.path:
     sys.path.insert(0, BENCH_ROOT)
 
+from utils.run_archive import archive_runs  # noqa: E402
 from ops.route_trace_report import (  # noqa: E402
     _print_one_line_from_manifest,
     latest_manifest,
@@ -260,5 +261,48 @@ class TestRouteTraceReport(unittest.TestCase):
         self.assertEqual(summary["fallback_edges"][0]["count"], 1)
 
 
+    def test_main_reads_archived_runs_from_the_index(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            runs = Path(td)
+            job = {"job_index": 3, "model": "mistral:7b", "used_fallback": True,
+                   "served_by": "qwen2.5:3b", "original_model": "mistral:7b", "fallback_model": "qwen2.5:3b"}
+            for run_id, trace in (("run-plain", False), ("run-traced", True)):
+                run_dir = runs / run_id
+                run_dir.mkdir()
+                (run_dir / "manifest.json").write_text(
+                    json.dumps({"run_id": run_id, "status": "completed", "ended_at": 100.0 if trace else 50.0, "jobs": [job]}),
+                    encoding="utf-8",
+                )
+                if trace:
+                    (run_dir / "fallback_trace.jsonl").write_text(
+                        json.dumps({"ts": 1.0, "run_id": run_id, "job_index": 3, "event": "fallback_succeeded",
+                                    "primary_model": "mistral:7b", "selected_fallback": "qwen2.5:3b"}) + "\n",
+                        encoding="utf-8",
+                    )
+                os.utime(run_dir, (1, 1))
+            archive_runs(runs, runs / ".archive", retain_days=7)
+
+            def run(*argv: str) -> str:
+                buf = io.StringIO()
+                old_argv = sys.argv
+                try:
+                    sys.argv = ["route_trace_report", "--runs-dir", str(runs), *argv]
+                    with redirect_stdout(buf):
+                        self.assertEqual(main(), 0)
+                finally:
+                    sys.argv = old_argv
+                return buf.getvalue()
+
+            latest = run("--one-line")
+            self.assertIn("run_id=run-traced", latest)
+            self.assertIn("served_by=qwen2.5:3b", latest)
+            self.assertIn(".tar.", latest)
+
+            payload = json.loads(run("--run-id", "run-plain", "--json"))
+            self.assertEqual(payload["source"], "manifest")
+            self.assertEqual(payload["run_id"], "run-plain")
+            self.assertEqual(payload["fallback_edges"], [{"from": "mistral:7b", "to": "qwen2.5:3b", "count": 1}])
+
+
 if __name__ == "__main__":
     unittest.main()
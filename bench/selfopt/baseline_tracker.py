@@ -1,8 +1,41 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+import argparse
+import json
+import math
+import os
+import statistics
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
 from typing import Any
 
+BENCH_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+if BENCH_ROOT not in sys.path:
+    sys.path.insert(0, BENCH_ROOT)
+
+from utils.repetition import fisher_drop_pvalue
+
+# Direction a metric moves when it gets worse: -1 lower is worse, +1 higher is worse.
+RUN_METRICS = {
+    "accuracy": -1,
+    "latency_p50_ms": 1,
+    "latency_p95_ms": 1,
+    "tps_median": -1,
+}
+PROMPT_METRICS = {
+    "latency_ms": 1,
+    "tokens_per_second": -1,
+}
+DEFAULT_WINDOW = 20
+DEFAULT_LAMBDA = 0.3   # EWMA weight of the newest point
+DEFAULT_L = 3.0        # control-limit width in sigmas
+MIN_HISTORY = 5        # points needed before control limits are trusted
+# Timing noise below this fraction of the mean is never an alert, even when
+# the window happens to be very tight.
+REL_SIGMA_FLOOR = 0.05
+
 
 @dataclass
 class RegressionCheck:
@@ -11,18 +44,242 @@ class RegressionCheck:
     accuracy_change: float
     baseline_accuracy: float | None
     message: str
+    p_value: float | None = None
+    metric_alerts: list[dict[str, Any]] = field(default_factory=list)
+
+
+def _pct(values: list[float], q: float) -> float | None:
+    if not values:
+        return None
+    ordered = sorted(values)
+    pos = (len(ordered) - 1) * q / 100.0
+    lo = int(math.floor(pos))
+    hi = min(lo + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (pos - lo)
+
+
+def run_metrics(job: dict[str, Any], prompts: list[dict[str, Any]] | None = None) -> dict[str, Any]:
+    """Accuracy/pass counts from the job plus latency and tok/s from its per-prompt rows."""
+    rows = [r for r in (prompts or []) if not r.get("timeout") and not r.get("error")]
+    latencies = [float(r["latency_ms"]) for r in rows if r.get("latency_ms") is not None]
+    tps = [float(r["tokens_per_second"]) for r in rows if r.get("tokens_per_second")]
+    p50, p95 = _pct(latencies, 50), _pct(latencies, 95)
+    return {
+        "accuracy": float(job.get("accuracy", 0.0) or 0.0),
+        "passed": int(job.get("passed", 0) or 0),
+        "total": int(job.get("total", 0) or 0),
+        "latency_p50_ms": round(p50, 2) if p50 is not None else None,
+        "latency_p95_ms": round(p95, 2) if p95 is not None else None,
+        "tps_median": round(statistics.median(tps), 3) if tps else None,
+    }
+
+
+def control_limits(
+    history: list[float],
+    direction: int,
+    *,
+    lam: float = DEFAULT_LAMBDA,
+    width: float = DEFAULT_L,
+    sigma: float | None = None,
+) -> dict[str, Any] | None:
+    """
+    EWMA and limits for a metric's rolling window, or None below MIN_HISTORY points.
+
+    `sigma` overrides the sample standard deviation (accuracy passes the
+    binomial one). `limit` is the bad-side bound for a single new point
+    (ewma +/- width*sigma); `ewma_limit` bounds the EWMA itself, which moves
+    slowly and catches small sustained drifts that a single point does not.
+    """
+    if len(history) < MIN_HISTORY:
+        return None
+    mean = statistics.fmean(history)
+    if sigma is None:
+        sigma = statistics.stdev(history)
+        sigma = max(sigma, REL_SIGMA_FLOOR * abs(mean))
+    ewma = history[0]
+    for x in history[1:]:
+        ewma = lam * x + (1 - lam) * ewma
+    ewma_sigma = sigma * math.sqrt(lam / (2 - lam))
+    return {
+        "n": len(history),
+        "mean": round(mean, 4),
+        "stdev": round(sigma, 4),
+        "ewma": round(ewma, 4),
+        "limit": round(ewma + direction * width * sigma, 4),
+        "ewma_limit": round(mean + direction * width * ewma_sigma, 4),
+        "lam": lam,
+    }
+
+
+def _breach(value: float, limits: dict[str, Any], direction: int) -> str | None:
+    """Which control rule `value` breaks on the bad side, if any."""
+    if direction * (value - limits["limit"]) > 0:
+        return "point"
+    next_ewma = limits["lam"] * value + (1 - limits["lam"]) * limits["ewma"]
+    if direction * (next_ewma - limits["ewma_limit"]) > 0:
+        return "drift"
+    return None
+
+
+class BaselineStore:
+    """Persistent rolling-window baselines per (model, phase, variant) and per prompt.
+
+    Stored as one JSON file (rewritten atomically after every record), so the
+    supervisor, reports and ad-hoc tools read the same history across runs.
+    """
+
+    def __init__(self, path: Path | None = None, window: int = DEFAULT_WINDOW) -> None:
+        self.path = Path(path) if path else None
+        self.window = int(window)
+        self._data: dict[str, Any] = {"version": 1, "keys": {}}
+        if self.path is not None and self.path.exists():
+            try:
+                loaded = json.loads(self.path.read_text(encoding="utf-8"))
+                if isinstance(loaded.get("keys"), dict):
+                    self._data = loaded
+            except (OSError, ValueError):
+                pass
+
+    @staticmethod
+    def key(model: str, phase: str, variant: str) -> str:
+        return f"{model}|{phase}|{variant}"
+
+    def _entry(self, key: str) -> dict[str, Any]:
+        return self._data["keys"].setdefault(key, {"runs": [], "prompts": {}})
+
+    def save(self) -> None:
+        if self.path is None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        tmp.write_text(json.dumps(self._data, indent=2), encoding="utf-8")
+        os.replace(tmp, self.path)
+
+    def record(self, job: dict[str, Any], prompts: list[dict[str, Any]] | None = None) -> dict[str, Any]:
+        """Append one run (and its prompt rows) to the rolling windows and persist."""
+        key = self.key(str(job.get("model", "")), str(job.get("phase", "")), str(job.get("variant", "")))
+        entry = self._entry(key)
+        point = {"run_id": job.get("run_id"), "t": round(time.time(), 3), **run_metrics(job, prompts)}
+        entry["runs"] = (entry["runs"] + [point])[-self.window:]
+        for row in prompts or []:
+            pid = row.get("prompt_id")
+            if not pid:
+                continue
+            sample = {
+                "run_id": job.get("run_id"),
+                "correct": bool(row.get("correct")),
+                "latency_ms": row.get("latency_ms") if not row.get("timeout") else None,
+                "tokens_per_second": row.get("tokens_per_second"),
+            }
+            series = entry["prompts"].setdefault(pid, [])
+            entry["prompts"][pid] = (series + [sample])[-self.window:]
+        self.save()
+        return point
+
+    # -- queries -------------------------------------------------------------
+
+    def keys(self) -> list[str]:
+        return sorted(self._data["keys"])
+
+    def history(self, model: str, phase: str, variant: str) -> list[dict[str, Any]]:
+        return list(self._data["keys"].get(self.key(model, phase, variant), {}).get("runs", []))
+
+    def prompt_history(self, model: str, phase: str, variant: str, prompt_id: str) -> list[dict[str, Any]]:
+        return list(self._data["keys"].get(self.key(model, phase, variant), {}).get("prompts", {}).get(prompt_id, []))
+
+    def last(self, model: str, phase: str, variant: str) -> dict[str, Any] | None:
+        runs = self.history(model, phase, variant)
+        return runs[-1] if runs else None
+
+    def stats(self, model: str, phase: str, variant: str, metric: str) -> dict[str, Any] | None:
+        """Control limits for a run-level metric (see RUN_METRICS)."""
+        runs = self.history(model, phase, variant)
+        values = [float(r[metric]) for r in runs if r.get(metric) is not None]
+        sigma = None
+        if metric == "accuracy":
+            # Binomial spread at the pooled pass rate: a flat 12/12 history
+            # still has a sensible width instead of zero.
+            passed = sum(r.get("passed", 0) for r in runs)
+            total = sum(r.get("total", 0) for r in runs)
+            if total:
+                n = total / len(runs)
+                p = min(max(passed / total, 0.5 / n), 1 - 0.5 / n)
+                sigma = math.sqrt(p * (1 - p) / n)
+        return control_limits(values, RUN_METRICS[metric], sigma=sigma)
+
+    def prompt_stats(self, model: str, phase: str, variant: str, prompt_id: str, metric: str = "latency_ms") -> dict[str, Any] | None:
+        values = [float(s[metric]) for s in self.prompt_history(model, phase, variant, prompt_id) if s.get(metric) is not None]
+        return control_limits(values, PROMPT_METRICS[metric])
+
+    def summary(self) -> dict[str, Any]:
+        """Per-key latest values and limits, for reports."""
+        out: dict[str, Any] = {}
+        for key in self.keys():
+            model, phase, variant = key.split("|")
+            runs = self.history(model, phase, variant)
+            out[key] = {
+                "runs": len(runs),
+                "last": runs[-1] if runs else None,
+                "limits": {m: self.stats(model, phase, variant, m) for m in RUN_METRICS},
+            }
+        return out
+
+    # -- detection -----------------------------------------------------------
+
+    def check(self, job: dict[str, Any], prompts: list[dict[str, Any]] | None = None) -> list[dict[str, Any]]:
+        """Control-limit alerts for a new run against the stored windows (before recording it)."""
+        model, phase, variant = str(job.get("model", "")), str(job.get("phase", "")), str(job.get("variant", ""))
+        point = run_metrics(job, prompts)
+        alerts: list[dict[str, Any]] = []
+        for metric, direction in RUN_METRICS.items():
+            value = point.get(metric)
+            limits = self.stats(model, phase, variant, metric)
+            if value is None or limits is None:
+                continue
+            rule = _breach(float(value), limits, direction)
+            if rule:
+                alerts.append({"metric": metric, "rule": rule, "value": value, "ewma": limits["ewma"],
+                               "limit": limits["limit"] if rule == "point" else limits["ewma_limit"]})
+        for row in prompts or []:
+            pid = row.get("prompt_id")
+            if not pid:
+                continue
+            past = self.prompt_history(model, phase, variant, pid)
+            if len(past) >= MIN_HISTORY and all(s["correct"] for s in past) and not row.get("correct"):
+                alerts.append({"metric": "correct", "prompt_id": pid, "rule": "flip",
+                               "value": False, "ewma": 1.0, "limit": 1.0})
+            for metric, direction in PROMPT_METRICS.items():
+                value = row.get(metric)
+                limits = self.prompt_stats(model, phase, variant, pid, metric)
+                if value is None or row.get("timeout") or limits is None:
+                    continue
+                if direction * (float(value) - limits["limit"]) > 0:
+                    alerts.append({"metric": metric, "prompt_id": pid, "rule": "point", "value": value,
+                                   "ewma": limits["ewma"], "limit": limits["limit"]})
+        return alerts
 
 
 class BaselineTracker:
-    """In-memory baseline tracker for benchmark supervisor regression alerts.
+    """Baseline tracker for benchmark supervisor regression alerts.
+
+    Keys by (model, phase, variant). Keeps last-known accuracy and pass
+    counts and flags a regression when the new score drops by >= threshold
+    and the drop is significant (one-sided Fisher exact test, p < alpha).
+    One flipped prompt out of 12 is an 8% drop but nowhere near significant;
+    repeated runs report per-run counts and so have the power to confirm
+    real drops. Without pass counts the threshold alone decides.
 
-    Keys by (model, phase, variant). Keeps last-known accuracy and flags
-    regressions when the new score drops by >= threshold.
+    With a BaselineStore the last-known values survive restarts, and
+    accuracy, latency and tok/s are also checked against EWMA control limits
+    over the stored window. Per-prompt breaches are reported alongside but
+    do not raise an alert on their own.
     """
 
-    def __init__(self, threshold_pct: float = 5.0) -> None:
+    def __init__(self, threshold_pct: float = 5.0, alpha: float = 0.05, store: BaselineStore | None = None) -> None:
         self.threshold_pct = float(threshold_pct)
-        self._baseline: dict[tuple[str, str, str], float] = {}
+        self.alpha = float(alpha)
+        self.store = store
+        self._baseline: dict[tuple[str, str, str], tuple[float, int, int]] = {}
 
     @staticmethod
     def _key(job: dict[str, Any]) -> tuple[str, str, str]:
@@ -32,12 +289,21 @@ class BaselineTracker:
             str(job.get("variant", "")),
         )
 
-    def check_regression(self, job: dict[str, Any]) -> RegressionCheck:
+    def _last(self, key: tuple[str, str, str]) -> tuple[float, int, int] | None:
+        if key in self._baseline or self.store is None:
+            return self._baseline.get(key)
+        last = self.store.last(*key)
+        if last is None:
+            return None
+        return (float(last["accuracy"]), int(last.get("passed", 0)), int(last.get("total", 0)))
+
+    def check_regression(self, job: dict[str, Any], prompts: list[dict[str, Any]] | None = None) -> RegressionCheck:
         key = self._key(job)
         new_acc = float(job.get("accuracy", 0.0) or 0.0)
-        baseline = self._baseline.get(key)
+        entry = self._last(key)
+        metric_alerts = self.store.check(job, prompts) if self.store is not None else []
 
-        if baseline is None:
+        if entry is None:
             return RegressionCheck(
                 regressed=False,
                 regression_pct=0.0,
@@ -46,26 +312,72 @@ class BaselineTracker:
                 message="No baseline yet",
             )
 
+        baseline, base_passed, base_total = entry
+        new_passed = int(job.get("passed", 0) or 0)
+        new_total = int(job.get("total", 0) or 0)
         accuracy_change = new_acc - baseline
         regression_pct = ((baseline - new_acc) / baseline * 100.0) if baseline > 0 else 0.0
-        regressed = regression_pct >= self.threshold_pct
+        p_value = None
+        if base_total > 0 and new_total > 0:
+            p_value = fisher_drop_pvalue(base_passed, base_total, new_passed, new_total)
+        significant = p_value is None or p_value < self.alpha
+        regressed = regression_pct >= self.threshold_pct and significant
 
         if regressed:
             msg = (
                 f"Regression detected: {regression_pct:.2f}% drop "
                 f"({baseline:.4f} -> {new_acc:.4f})"
             )
+            if p_value is not None:
+                msg += f", p={p_value:.4f}"
+        elif regression_pct >= self.threshold_pct:
+            msg = f"Drop of {regression_pct:.2f}% not significant (p={p_value:.4f})"
         else:
             msg = "No regression"
+        if metric_alerts:
+            names = sorted({a["metric"] if "prompt_id" not in a else f"{a['prompt_id']}.{a['metric']}" for a in metric_alerts})
+            msg += f"; outside control limits: {', '.join(names)}"
 
+        # Prompt-level alerts point at what moved; only run-level limits raise an alert.
         return RegressionCheck(
-            regressed=regressed,
+            regressed=regressed or any("prompt_id" not in a for a in metric_alerts),
             regression_pct=round(regression_pct, 4),
             accuracy_change=round(accuracy_change, 4),
             baseline_accuracy=round(baseline, 4),
             message=msg,
+            p_value=round(p_value, 4) if p_value is not None else None,
+            metric_alerts=metric_alerts,
         )
 
-    def update_baseline(self, job: dict[str, Any]) -> None:
+    def update_baseline(self, job: dict[str, Any], prompts: list[dict[str, Any]] | None = None) -> None:
         key = self._key(job)
-        self._baseline[key] = float(job.get("accuracy", 0.0) or 0.0)
+        self._baseline[key] = (
+            float(job.get("accuracy", 0.0) or 0.0),
+            int(job.get("passed", 0) or 0),
+            int(job.get("total", 0) or 0),
+        )
+        if self.store is not None:
+            self.store.record(job, prompts)
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Inspect the persistent benchmark baseline store.")
+    ap.add_argument("store", help="Path to baselines.json")
+    ap.add_argument("--key", default="", help="model|phase|variant; default: all keys")
+    ap.add_argument("--prompt", default="", help="Show one prompt's latency limits for --key")
+    args = ap.parse_args()
+
+    store = BaselineStore(Path(args.store))
+    if args.key and args.prompt:
+        model, phase, variant = args.key.split("|")
+        out: Any = {m: store.prompt_stats(model, phase, variant, args.prompt, m) for m in PROMPT_METRICS}
+    elif args.key:
+        out = store.summary().get(args.key)
+    else:
+        out = store.summary()
+    print(json.dumps(out, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -9,7 +9,6 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 import argparse
 import json
 import re
-import shutil
 import subprocess
 import sys
 import time
@@ -19,7 +18,11 @@ from dataclasses import dataclass, asdict
 from pathlib import Path
 from typing import Any, Optional
 
-from selfopt.baseline_tracker import BaselineTracker
+from selfopt.baseline_tracker import BaselineStore, BaselineTracker
+from selfopt.job_executor import PhaseRequest, PhaseWorker, WorkerUnavailable
+from utils.model_residency import OllamaResidency
+from utils.repetition import wilson_interval
+from utils.run_archive import archive_runs
 from utils.error_recovery import (
     RetryConfig,
     Checkpoint,
@@ -28,6 +31,7 @@ from utils.error_recovery import (
     wait_for_ollama,
     load_checkpoint,
     save_checkpoint,
+    journal_checkpoint,
     clear_checkpoint,
     save_partial_results,
     load_partial_results,
@@ -47,6 +51,7 @@ RUNNER = ROOT / 'core' / 'run_benchmark.py'
 RUNS = ROOT / 'supervisor_runs'
 ARCHIVE = RUNS / '.archive'
 INDEX_PATH = RUNS / 'index.json'
+BASELINE_PATH = RUNS / 'baselines.json'
 RUNS.mkdir(parents=True, exist_ok=True)
 ARCHIVE.mkdir(parents=True, exist_ok=True)
 
@@ -143,33 +148,8 @@ def _is_retryable_failure(stderr_tail: str) -> bool:
 
 
 def _archive_legacy_and_old_runs(retain_days: int) -> dict[str, int]:
-    now = time.time()
-    max_age_s = max(0, retain_days) * 86400
-    moved_legacy = 0
-    moved_old = 0
-
-    for p in RUNS.iterdir():
-        if p.name.startswith('.archive'):
-            continue
-        if p.is_file() and ('_manifest.json' in p.name or '_job' in p.name):
-            dst = ARCHIVE / p.name
-            if dst.exists():
-                dst = ARCHIVE / f'{int(now)}_{p.name}'
-            shutil.move(str(p), str(dst))
-            moved_legacy += 1
-
-    for p in RUNS.iterdir():
-        if not p.is_dir() or p.name.startswith('.'):
-            continue
-        age = now - p.stat().st_mtime
-        if max_age_s > 0 and age > max_age_s:
-            dst = ARCHIVE / p.name
-            if dst.exists():
-                dst = ARCHIVE / f'{int(now)}_{p.name}'
-            shutil.move(str(p), str(dst))
-            moved_old += 1
-
-    return {'archived_legacy_files': moved_legacy, 'archived_old_runs': moved_old}
+    """Bundle loose legacy files and finished runs older than `retain_days` into ARCHIVE (see utils/run_archive.py)."""
+    return archive_runs(RUNS, ARCHIVE, retain_days)
 
 
 def _parse_summary_from_stdout(stdout: str) -> tuple[int, int, list[str]]:
@@ -194,7 +174,124 @@ def _parse_summary_from_stdout(stdout: str) -> tuple[int, int, list[str]]:
     return passed, total, failed_prompts
 
 
-def _run_once(run_dir: Path, run_id: str, idx: int, spec: JobSpec, timeout_s: int, retries: int, suite: str | None, enable_warmup: bool = False) -> dict[str, Any]:
+def _tail(path: Path, n: int = 20) -> str:
+    try:
+        return '\n'.join(path.read_text(errors='replace').splitlines()[-n:])
+    except OSError:
+        return ''
+
+
+# Extra CLI flags PhaseRequest can express ('' is the no-op marker the recovery retry appends).
+_WORKER_FLAGS = {'', '--no-cache'}
+
+
+def _worker_can_run(spec: JobSpec, suite: str | None, enable_warmup: bool) -> bool:
+    """Warm-up, custom suites and any other CLI flag are only reachable through the subprocess runner."""
+    if enable_warmup or (suite and spec.phase == 'extended'):
+        return False
+    return all(flag in _WORKER_FLAGS for flag in spec.extra)
+
+
+def _run_once_in_worker(
+    executor: PhaseWorker,
+    run_id: str,
+    idx: int,
+    spec: JobSpec,
+    timeout_s: int,
+    retries: int,
+    cmd: list[str],
+    dbg: Path,
+    stdout_path: Path,
+    stderr_path: Path,
+    hb: Path,
+    job_timeout_s: float | None,
+) -> dict[str, Any]:
+    """Run one job in the long-lived worker; summary comes from the PhaseResult, not stdout."""
+    request = PhaseRequest(
+        model=spec.model,
+        phase=spec.phase,
+        variant=spec.variant,
+        timeout_s=timeout_s,
+        max_retries=retries,
+        use_cache='--no-cache' not in spec.extra,
+        stdout_log=str(stdout_path),
+        stderr_log=str(stderr_path),
+    )
+    started = time.time()
+    hb.write_text(str(started))
+    outcome = executor.run(request, deadline_s=job_timeout_s)
+    ended = time.time()
+    hb.write_text(str(ended))
+
+    passed = total = 0
+    failed_prompts: list[str] = []
+    pr = outcome.phase_result
+    if pr is not None:
+        passed = int(pr.get('passed', 0))
+        total = int(pr.get('total', 0))
+        failed_prompts = sorted(set(pr.get('failed_prompts') or []))
+        rows = pr.get('results') or []
+        if rows:
+            with dbg.open('w', encoding='utf-8') as f:
+                for row in rows:
+                    f.write(json.dumps(row, ensure_ascii=False) + "\n")
+
+    stderr_tail = _tail(stderr_path)
+    if not outcome.ok:
+        stderr_tail = '\n'.join(
+            part for part in (stderr_tail, outcome.traceback.rstrip(), outcome.error or '') if part
+        )
+        stderr_tail = '\n'.join(stderr_tail.splitlines()[-20:])
+
+    return {
+        'job_index': idx,
+        'model': spec.model,
+        'phase': spec.phase,
+        'variant': spec.variant,
+        'run_id': run_id,
+        'cmd': cmd,
+        'executor': 'worker',
+        'worker_pid': outcome.worker_pid,
+        'worker_jobs_served': outcome.worker_jobs_served,
+        'worker_crashed': outcome.crashed,
+        'worker_timed_out': outcome.timed_out,
+        'rc': 0 if outcome.ok else 1,
+        'elapsed_s': round(ended - started, 2),
+        'debug_log': str(dbg),
+        'stdout_log': str(stdout_path),
+        'stderr_log': str(stderr_path),
+        'stdout_tail': _tail(stdout_path),
+        'stderr_tail': stderr_tail,
+        'used_fallback': False,
+        'served_by': spec.model,
+        'original_model': spec.model,
+        'fallback_model': None,
+        'summary': {
+            'passed': passed,
+            'total': total,
+            'accuracy': round(passed / total, 4) if total else 0.0,
+            'failed_prompts': failed_prompts,
+            'restraint_score': pr.get('restraint_score') if pr else None,
+            'load_ms_in_run': pr.get('total_load_duration_ms') if pr else None,
+        },
+        'started_at': started,
+        'ended_at': ended,
+        'timestamp': time.strftime('%Y%m%d-%H%M%S'),
+    }
+
+
+def _run_once(
+    run_dir: Path,
+    run_id: str,
+    idx: int,
+    spec: JobSpec,
+    timeout_s: int,
+    retries: int,
+    suite: str | None,
+    enable_warmup: bool = False,
+    executor: PhaseWorker | None = None,
+    job_timeout_s: float | None = None,
+) -> dict[str, Any]:
     jobs_dir = run_dir / 'jobs'
     jobs_dir.mkdir(parents=True, exist_ok=True)
 
@@ -208,6 +305,7 @@ def _run_once(run_dir: Path, run_id: str, idx: int, spec: JobSpec, timeout_s: in
     cmd = [
         'python3', str(RUNNER), spec.model, spec.phase, spec.variant,
         '--timeout', str(timeout_s), '--max-retries', str(retries),
+        '--prompt-log', str(dbg),
     ]
     if enable_warmup:
         cmd.append('--enable-warmup')
@@ -215,6 +313,16 @@ def _run_once(run_dir: Path, run_id: str, idx: int, spec: JobSpec, timeout_s: in
         cmd.extend(['--suite', suite])
     cmd.extend(spec.extra)
 
+    if executor is not None and executor.unavailable is None and _worker_can_run(spec, suite, enable_warmup):
+        try:
+            return _run_once_in_worker(
+                executor, run_id, idx, spec, timeout_s, retries, cmd,
+                dbg, stdout_path, stderr_path, hb, job_timeout_s,
+            )
+        except WorkerUnavailable as exc:
+            print(f"[executor] worker unavailable, falling back to subprocess: {exc}", file=sys.stderr)
+
+    dbg.unlink(missing_ok=True)  # a retry reuses the path; never score the previous attempt's rows
     started = time.time()
     hb.write_text(str(started))
     cp = subprocess.run(cmd, cwd=str(REPO_ROOT), capture_output=True, text=True)
@@ -228,8 +336,8 @@ def _run_once(run_dir: Path, run_id: str, idx: int, spec: JobSpec, timeout_s: in
     passed = sum(1 for r in events if r.get('correct'))
     failed_prompts = sorted({r.get('prompt_id') for r in events if not r.get('correct') and r.get('prompt_id')})
 
-    # run_benchmark.py currently prints summarized results to stdout but may not
-    # emit per-prompt jsonl at dbg path. Fall back to stdout summary parsing.
+    # Cache hits (and runs that die early) leave no per-prompt rows at dbg;
+    # fall back to the stdout summary.
     if total == 0:
         passed, total, failed_prompts = _parse_summary_from_stdout(cp.stdout)
 
@@ -240,6 +348,7 @@ def _run_once(run_dir: Path, run_id: str, idx: int, spec: JobSpec, timeout_s: in
         'variant': spec.variant,
         'run_id': run_id,
         'cmd': cmd,
+        'executor': 'subprocess',
         'rc': cp.returncode,
         'elapsed_s': round(ended - started, 2),
         'debug_log': str(dbg),
@@ -263,8 +372,8 @@ def _run_once(run_dir: Path, run_id: str, idx: int, spec: JobSpec, timeout_s: in
     }
 
 
-def _run_job_with_recovery(run_dir: Path, run_id: str, idx: int, spec: JobSpec, timeout_s: int, retries: int, recover_once: bool, suite: str | None, enable_warmup: bool = False) -> dict[str, Any]:
-    result = _run_once(run_dir, run_id, idx, spec, timeout_s, retries, suite, enable_warmup)
+def _run_job_with_recovery(run_dir: Path, run_id: str, idx: int, spec: JobSpec, timeout_s: int, retries: int, recover_once: bool, suite: str | None, enable_warmup: bool = False, executor: PhaseWorker | None = None, job_timeout_s: float | None = None) -> dict[str, Any]:
+    result = _run_once(run_dir, run_id, idx, spec, timeout_s, retries, suite, enable_warmup, executor, job_timeout_s)
     result['warmup_enabled'] = enable_warmup
     if enable_warmup:
         # Check if warm-up was successful by looking at stdout
@@ -282,7 +391,7 @@ def _run_job_with_recovery(run_dir: Path, run_id: str, idx: int, spec: JobSpec,
 
     if _is_retryable_failure(result.get('stderr_tail', '')):
         recover_spec = JobSpec(spec.model, spec.phase, spec.variant, list(dict.fromkeys(spec.extra + [''])))
-        retry = _run_once(run_dir, run_id, idx, recover_spec, timeout_s, max(retries, 2), suite)
+        retry = _run_once(run_dir, run_id, idx, recover_spec, timeout_s, max(retries, 2), suite, executor=executor, job_timeout_s=job_timeout_s)
         retry['recovered_from_failure'] = True
         retry['initial_failure_rc'] = result['rc']
         retry['attempts'] = 2
@@ -313,6 +422,7 @@ def _collect_variance(history_runs: list[dict[str, Any]]) -> dict[str, Any]:
                 'prompt_id': prompt_id,
                 'runs': len(vals),
                 'pass_rate': round(sum(vals) / len(vals), 3),
+                'pass_rate_ci': [round(x, 3) for x in wilson_interval(sum(vals), len(vals))],
                 'outcomes': vals,
             })
 
@@ -339,6 +449,20 @@ def _update_index(run_manifest: dict[str, Any]) -> None:
     INDEX_PATH.write_text(json.dumps(index, indent=2))
 
 
+def _job_key(spec: JobSpec) -> str:
+    return f'{spec.model}|{spec.phase}|{spec.variant}'
+
+
+def _order_jobs(jobs: list[JobSpec], residency: OllamaResidency | None, saved_order: list[str] | None = None) -> list[JobSpec]:
+    """Residency order (one contiguous block per model, smallest first); a resumed run keeps its saved order."""
+    if saved_order:
+        rank = {k: n for n, k in enumerate(saved_order)}
+        return sorted(jobs, key=lambda j: rank.get(_job_key(j), len(rank)))
+    if residency is None:
+        return jobs
+    return [j for _, group in residency.order(jobs, lambda j: j.model) for j in group]
+
+
 def _is_local_model(model: str) -> bool:
     m = (model or '').lower()
     return not (m.startswith('openai') or m.startswith('anthropic') or m.startswith('claude') or 'gpt-' in m)
@@ -357,6 +481,13 @@ def main():
     parser.add_argument('--resume', type=str, default='', help='Resume an interrupted run from the specified run directory')
     parser.add_argument('--health-check', action='store_true', default=True, help='Verify Ollama is healthy before running (default: true)')
     parser.add_argument('--no-health-check', dest='health_check', action='store_false', help='Skip Ollama health check')
+    parser.add_argument('--schedule', choices=['residency', 'fixed'], default='residency', help='residency: group jobs per model (smallest first), warm each model once and unload it after its last job; fixed: DEFAULT_JOBS order')
+    parser.add_argument('--keep-alive', type=int, default=1800, help='Ollama keep_alive (seconds) for a warmed model while its jobs run (residency schedule)')
+    parser.add_argument('--executor', choices=['subprocess', 'worker'], default='subprocess', help='Job execution: one python3 subprocess per job, or a long-lived in-process worker (falls back to subprocess if it cannot start)')
+    parser.add_argument('--worker-max-jobs', type=int, default=25, help='Recycle the worker process after this many jobs (worker executor only)')
+    parser.add_argument('--regression-alpha', type=float, default=0.05, help='Significance level for accuracy-regression alerts (one-sided Fisher exact test on pass counts)')
+    parser.add_argument('--baseline-store', default=str(BASELINE_PATH), help='Persistent baseline windows (accuracy, latency, tok/s per job and prompt); empty string keeps baselines in memory only')
+    parser.add_argument('--worker-job-timeout', type=float, default=0, help='Wall-clock limit per job in seconds before the worker is killed and replaced (0 = none)')
     args = parser.parse_args()
     # Alias max_retries to retries for backward compatibility
     args.retries = args.max_retries
@@ -432,7 +563,8 @@ def main():
         raise SystemExit('No runnable jobs after policy/filters (local-only + allowlists).')
 
     # Initialize baseline tracker for regression detection
-    tracker = BaselineTracker()
+    store = BaselineStore(Path(args.baseline_store)) if args.baseline_store else None
+    tracker = BaselineTracker(alpha=args.regression_alpha, store=store)
     regression_alerts = []
 
     # Initialize checkpoint for crash recovery
@@ -444,6 +576,17 @@ def main():
     # Register crash handler
     register_crash_handler(run_dir, checkpoint)
 
+    residency = OllamaResidency(keep_alive_s=args.keep_alive) if args.schedule == 'residency' else None
+    jobs = _order_jobs(jobs, residency, checkpoint.metadata.get('job_order'))
+    checkpoint.metadata['job_order'] = [_job_key(j) for j in jobs]
+    manifest['schedule'] = args.schedule
+    manifest['job_order'] = checkpoint.metadata['job_order']
+    current_model: str | None = None
+
+    executor = PhaseWorker(max_jobs=args.worker_max_jobs) if args.executor == 'worker' else None
+    job_timeout_s = args.worker_job_timeout if args.worker_job_timeout > 0 else None
+    manifest['executor'] = args.executor
+
     try:
         for i, spec in enumerate(jobs, start=1):
             # Skip jobs that were already completed in resume mode
@@ -451,13 +594,26 @@ def main():
                 print(f"[resume] Skipping job {i} ({spec.model}, {spec.phase}) - already completed")
                 continue
             
-            # Save checkpoint before running each job
-            checkpoint.job_index = i
+            # Record the job about to run; job_index only advances once it completes,
+            # so a resume re-runs an interrupted job instead of skipping it
+            checkpoint.metadata['current_job'] = i
             checkpoint.prompt_index = 0
-            save_checkpoint(run_dir, checkpoint)
+            journal_checkpoint(run_dir, checkpoint)
             
             # Enable warm-up only on first run (i == 1)
             enable_warmup = args.enable_warmup and (i == 1)
+
+            # Load the model once per block of jobs; only evict others if it doesn't fit next to them.
+            model_load = None
+            if residency is not None and spec.model != current_model:
+                load_event = residency.prepare(spec.model)
+                model_load = asdict(load_event)
+                current_model = spec.model
+                print(
+                    f"[residency] {spec.model}: load {load_event.load_ms:.0f}ms"
+                    f"{' (already resident)' if load_event.already_resident else ''}"
+                    f"{' evicted=' + ','.join(load_event.evicted) if load_event.evicted else ''}"
+                )
             
             # Run with retry with backoff
             retry_config = RetryConfig(max_retries=max(args.max_retries, 1), backoff_base=2.0, backoff_max=30.0)
@@ -474,6 +630,8 @@ def main():
                         recover_once=args.recover_once,
                         suite=args.suite or None,
                         enable_warmup=enable_warmup,
+                        executor=executor,
+                        job_timeout_s=job_timeout_s,
                     ),
                     config=retry_config,
                     on_retry=lambda e, attempt: print(f"[retry] Job {i} failed: {e}, attempt {attempt}", file=sys.stderr)
@@ -514,6 +672,10 @@ def main():
                             },
                         )
                         fallback_spec = JobSpec(available, spec.phase, spec.variant, spec.extra)
+                        fallback_load = None
+                        if residency is not None:
+                            # Keep the primary resident if both fit; its next job would reload it otherwise.
+                            fallback_load = asdict(residency.prepare(available, pinned=[spec.model]))
                         try:
                             res = _run_job_with_recovery(
                                 run_dir=run_dir,
@@ -525,11 +687,15 @@ def main():
                                 recover_once=args.recover_once,
                                 suite=args.suite or None,
                                 enable_warmup=False,  # Skip warmup for fallback
+                                executor=executor,
+                                job_timeout_s=job_timeout_s,
                             )
                             res['used_fallback'] = True
                             res['original_model'] = spec.model
                             res['fallback_model'] = available
                             res['served_by'] = available
+                            if fallback_load is not None:
+                                res['fallback_model_load'] = fallback_load
                             _trace_fallback_event(
                                 fallback_trace_path,
                                 run_id=run_id,
@@ -627,14 +793,18 @@ def main():
                 'run_id': run_id,
             }
             
+            prompt_rows = _load_jsonl(Path(res['debug_log'])) if res.get('debug_log') else []
+            
             # Check regression before updating baseline
-            regression_check = tracker.check_regression(job_results)
+            regression_check = tracker.check_regression(job_results, prompt_rows)
             res['regression_check'] = {
                 'regressed': regression_check.regressed,
                 'regression_pct': regression_check.regression_pct,
                 'accuracy_change': regression_check.accuracy_change,
                 'baseline_accuracy': regression_check.baseline_accuracy,
                 'message': regression_check.message,
+                'p_value': regression_check.p_value,
+                'metric_alerts': regression_check.metric_alerts,
             }
             
             if regression_check.regressed:
@@ -643,25 +813,32 @@ def main():
                     'phase': spec.phase,
                     'variant': spec.variant,
                     'regression_pct': regression_check.regression_pct,
+                    'p_value': regression_check.p_value,
+                    'metric_alerts': regression_check.metric_alerts,
                     'message': regression_check.message,
                 })
             
-            # Update baseline with new results
-            tracker.update_baseline(job_results)
+            # Update baseline with new results; failed jobs would poison the stored windows
+            if res.get('rc') == 0 and job_results['total']:
+                tracker.update_baseline(job_results, prompt_rows)
             
+            if model_load is not None:
+                res['model_load'] = model_load
             manifest['jobs'].append(res)
             manifest_path.write_text(json.dumps(manifest, indent=2))
+
+            if residency is not None and (i == len(jobs) or jobs[i].model != spec.model):
+                residency.unload(spec.model)
+                current_model = None
             
             # Update checkpoint: mark job as completed
             checkpoint.job_index = i
             checkpoint.completed_prompts.append(f"job_{i}_{spec.model}_{spec.phase}")
             checkpoint.partial_results.append(res)
-            save_checkpoint(run_dir, checkpoint)
-            
-            # Save partial results for crash recovery
-            save_partial_results(run_dir, checkpoint.partial_results)
+            journal_checkpoint(run_dir, checkpoint)
 
-        # Clear checkpoint on successful completion
+        # Keep the per-run results file, then clear checkpoint on successful completion
+        save_partial_results(run_dir, checkpoint.partial_results)
         clear_checkpoint(run_dir)
         manifest['status'] = 'completed'
     except KeyboardInterrupt:
@@ -678,6 +855,17 @@ def main():
         save_partial_results(run_dir, checkpoint.partial_results)
     finally:
         manifest['ended_at'] = time.time()
+        if residency is not None:
+            manifest['model_time'] = {
+                'load_ms': residency.total_load_ms(),
+                'loads': sum(1 for e in residency.events if not e.already_resident),
+                'job_ms': round(sum(float(j.get('elapsed_s') or 0) for j in manifest['jobs']) * 1000, 1),
+            }
+        if executor is not None:
+            manifest['worker_restarts'] = executor.restarts
+            if executor.unavailable:
+                manifest['worker_unavailable'] = executor.unavailable
+            executor.close()
 
     historical = []
     index = _load_json(INDEX_PATH, {'runs': []})
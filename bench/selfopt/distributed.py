@@ -0,0 +1,732 @@
+#!/usr/bin/env python3
+"""Pull-based distributed execution of the benchmark matrix across hosts.
+
+A coordinator splits (model, phase, variant) jobs into prompt-shard work
+items and serves them over a small JSON/HTTP API. Workers on each inference
+box pull an item, run it against their local backend through `PhaseWorker`
+(in-process `run_phase`, crash-isolated), heartbeat while it runs, and post
+the `PhaseResult` back. The coordinator streams per-prompt rows into the run's
+`results.jsonl` as items complete.
+
+Leases make worker death safe: an item whose lease is not renewed within
+`lease_s` goes back to the queue (up to `max_attempts` tries), and a late
+result from the presumed-dead worker is accepted only if nobody finished the
+item first. Queue transitions are journaled to `queue.jsonl`, so a restarted
+coordinator re-queues only unfinished items.
+
+    # on the coordinator host
+    python3 selfopt/distributed.py coordinator --models qwen2.5:3b,mistral:7b --shard-size 4
+    # on each inference box
+    python3 selfopt/distributed.py worker --coordinator http://coord:8765
+    # single machine: coordinator + N local worker processes
+    python3 selfopt/distributed.py local --workers 3
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import argparse
+import hmac
+import json
+import multiprocessing as mp
+import socket
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+from dataclasses import asdict, dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Iterable, Optional
+
+from selfopt.job_executor import DEFAULT_TARGET, PhaseRequest, PhaseWorker, WorkerUnavailable
+
+ROOT = Path(__file__).resolve().parents[1]
+RUNS = ROOT / 'supervisor_runs'
+DEFAULT_PORT = 8765
+DEFAULT_LEASE_S = 120.0
+DEFAULT_MAX_ATTEMPTS = 3
+DEFAULT_POLL_S = 2.0
+TOKEN_HEADER = 'X-Bench-Token'
+TOKEN_ENV = 'BENCH_COORDINATOR_TOKEN'
+
+PENDING, LEASED, DONE, FAILED = 'pending', 'leased', 'done', 'failed'
+
+
+@dataclass
+class WorkItem:
+    item_id: str
+    model: str
+    phase: str
+    variant: str
+    prompt_ids: Optional[list[str]] = None
+    shard: int = 0
+    n_shards: int = 1
+    use_cache: bool = True
+    state: str = PENDING
+    attempts: int = 0
+    lease_id: Optional[str] = None
+    worker_id: Optional[str] = None
+    lease_expires: float = 0.0
+    errors: list[dict[str, Any]] = field(default_factory=list)
+    result: Optional[dict[str, Any]] = None
+
+    def job_key(self) -> str:
+        return f'{self.model}|{self.phase}|{self.variant}'
+
+    def payload(self) -> dict[str, Any]:
+        """What a worker needs to run the item."""
+        return {
+            'item_id': self.item_id,
+            'model': self.model,
+            'phase': self.phase,
+            'variant': self.variant,
+            'prompt_ids': self.prompt_ids,
+            'shard': self.shard,
+            'n_shards': self.n_shards,
+            'use_cache': self.use_cache,
+            'attempt': self.attempts,
+        }
+
+
+def make_items(
+    jobs: Iterable[tuple[str, str, str]],
+    shard_size: int = 0,
+    prompt_ids_for: Optional[Callable[[str], list[str]]] = None,
+    use_cache: bool = True,
+) -> list[WorkItem]:
+    """Split jobs into work items of at most `shard_size` prompts (0 = one item per job)."""
+    if shard_size > 0 and prompt_ids_for is None:
+        from selfopt.meta_harness.eval_adapter import suite_prompt_ids
+        prompt_ids_for = suite_prompt_ids
+    items: list[WorkItem] = []
+    for model, phase, variant in jobs:
+        key = f'{model}|{phase}|{variant}'
+        if shard_size <= 0:
+            items.append(WorkItem(item_id=f'{key}|0', model=model, phase=phase, variant=variant, use_cache=use_cache))
+            continue
+        ids = prompt_ids_for(phase)
+        shards = [ids[i:i + shard_size] for i in range(0, len(ids), shard_size)]
+        for n, shard in enumerate(shards):
+            items.append(WorkItem(
+                item_id=f'{key}|{n}', model=model, phase=phase, variant=variant,
+                prompt_ids=shard, shard=n, n_shards=len(shards), use_cache=use_cache,
+            ))
+    return items
+
+
+class WorkQueue:
+    """Lease-based work queue with a result store under `run_dir`.
+
+    All methods are thread-safe; the HTTP handler threads call them directly.
+    `clock` is injectable so lease expiry can be tested without sleeping.
+    """
+
+    def __init__(
+        self,
+        run_dir: Path,
+        items: list[WorkItem],
+        lease_s: float = DEFAULT_LEASE_S,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.run_dir = Path(run_dir)
+        self.run_dir.mkdir(parents=True, exist_ok=True)
+        (self.run_dir / 'items').mkdir(exist_ok=True)
+        self.lease_s = float(lease_s)
+        self.max_attempts = max(1, int(max_attempts))
+        self.clock = clock
+        self.items: dict[str, WorkItem] = {it.item_id: it for it in items}
+        self.workers: dict[str, dict[str, Any]] = {}
+        self._leases: dict[str, str] = {}
+        self._lock = threading.Lock()
+        self.journal_path = self.run_dir / 'queue.jsonl'
+        self.results_path = self.run_dir / 'results.jsonl'
+        self._replay()
+
+    # -- journal ----------------------------------------------------------
+
+    def _log(self, event: str, item: WorkItem, **extra: Any) -> None:
+        row = {'t': self.clock(), 'event': event, 'item_id': item.item_id, 'attempts': item.attempts, **extra}
+        with self.journal_path.open('a', encoding='utf-8') as f:
+            f.write(json.dumps(row, ensure_ascii=False) + '\n')
+
+    def _replay(self) -> None:
+        """Restore done items from a previous coordinator's journal.
+
+        Everything else (leased, re-queued or failed) starts over as pending
+        with a fresh attempt budget; leases are not restored.
+        """
+        if not self.journal_path.exists():
+            return
+        for line in self.journal_path.read_text(encoding='utf-8').splitlines():
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # torn last line
+            item = self.items.get(row.get('item_id'))
+            path = self._item_path(item) if item is not None else None
+            if row.get('event') == DONE and path is not None and path.exists():
+                item.state = DONE
+                item.attempts = int(row.get('attempts') or 0)
+                item.worker_id = row.get('worker_id')
+                item.result = json.loads(path.read_text(encoding='utf-8'))
+        self._drop_unfinished_results()
+
+    def _drop_unfinished_results(self) -> None:
+        """Remove rows of queued items not journaled DONE (and a torn last line) from results.jsonl.
+
+        Rows are written before the DONE line, so a coordinator that died in
+        between left rows for an item that will run again; keeping them would
+        count that item twice.
+        """
+        if not self.results_path.exists():
+            return
+        rerun = {item_id for item_id, it in self.items.items() if it.state != DONE}
+        lines = self.results_path.read_text(encoding='utf-8').splitlines(keepends=True)
+        kept = []
+        for line in lines:
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if line.endswith('\n') and row.get('item_id') not in rerun:
+                kept.append(line)
+        if len(kept) == len(lines):
+            return
+        tmp = self.results_path.with_suffix('.jsonl.tmp')
+        tmp.write_text(''.join(kept), encoding='utf-8')
+        os.replace(tmp, self.results_path)
+
+    def _item_path(self, item: WorkItem) -> Path:
+        safe_id = item.item_id.replace('|', '__').replace(':', '-').replace('/', '-')
+        return self.run_dir / 'items' / f'{safe_id}.json'
+
+    # -- leases -----------------------------------------------------------
+
+    def _touch_worker(self, worker_id: str, **info: Any) -> None:
+        w = self.workers.setdefault(worker_id, {'worker_id': worker_id, 'completed': 0, 'failed': 0})
+        w['last_seen'] = self.clock()
+        w.update(info)
+
+    def _requeue(self, item: WorkItem, reason: str) -> None:
+        self._leases.pop(item.lease_id or '', None)
+        item.errors.append({'worker_id': item.worker_id, 'attempt': item.attempts, 'error': reason})
+        item.lease_id = None
+        item.state = FAILED if item.attempts >= self.max_attempts else PENDING
+        self._log('requeue' if item.state == PENDING else FAILED, item, worker_id=item.worker_id, error=reason)
+
+    def _reap_locked(self) -> list[str]:
+        now = self.clock()
+        expired = [it for it in self.items.values() if it.state == LEASED and it.lease_expires < now]
+        for item in expired:
+            self._requeue(item, f'lease expired (no heartbeat from {item.worker_id})')
+        return [it.item_id for it in expired]
+
+    def reap(self) -> list[str]:
+        """Re-queue items whose lease ran out; returns their ids."""
+        with self._lock:
+            return self._reap_locked()
+
+    def lease(
+        self,
+        worker_id: str,
+        models: Optional[list[str]] = None,
+        prefer_model: Optional[str] = None,
+    ) -> Optional[dict[str, Any]]:
+        """
+        Hand the worker one pending item, or None.
+
+        Preference: the model the worker ran last (already loaded there), then
+        a model no other worker is running (avoids loading it on two boxes),
+        then queue order. `models` restricts to what the worker can serve.
+        """
+        with self._lock:
+            self._reap_locked()
+            self._touch_worker(worker_id, models=models)
+            pending = [
+                it for it in self.items.values()
+                if it.state == PENDING and (not models or it.model in models)
+            ]
+            if not pending:
+                if not any(it.state in (PENDING, LEASED) for it in self.items.values()):
+                    # This worker now knows to exit; see unreleased_workers().
+                    self.workers[worker_id]['released'] = True
+                return None
+            busy = {it.model for it in self.items.values() if it.state == LEASED}
+            item = (
+                next((it for it in pending if it.model == prefer_model), None)
+                or next((it for it in pending if it.model not in busy), None)
+                or pending[0]
+            )
+            item.state = LEASED
+            item.attempts += 1
+            item.worker_id = worker_id
+            item.lease_id = uuid.uuid4().hex
+            item.lease_expires = self.clock() + self.lease_s
+            self._leases[item.lease_id] = item.item_id
+            self._log('lease', item, worker_id=worker_id, lease_id=item.lease_id)
+            return {'lease_id': item.lease_id, 'lease_s': self.lease_s, 'item': item.payload()}
+
+    def heartbeat(self, lease_id: str) -> bool:
+        """Extend a live lease; False once it expired or the item was re-queued."""
+        with self._lock:
+            item = self.items.get(self._leases.get(lease_id, ''))
+            if item is None or item.state != LEASED or item.lease_id != lease_id:
+                return False
+            item.lease_expires = self.clock() + self.lease_s
+            self._touch_worker(item.worker_id or '')
+            return True
+
+    def complete(self, lease_id: str, worker_id: str, item_id: str, result: dict[str, Any]) -> bool:
+        """
+        Store an item's PhaseResult. A stale lease is still accepted when the
+        item has not been finished by anyone else (first result wins), including
+        an item already marked failed after its last lease expired.
+        """
+        with self._lock:
+            item = self.items.get(item_id)
+            if item is None or item.state == DONE:
+                return False
+            if item.lease_id != lease_id and item.state == LEASED:
+                # Re-leased to another worker: drop its lease, this result wins.
+                self._leases.pop(item.lease_id or '', None)
+            self._leases.pop(lease_id, None)
+            item.state = DONE
+            item.lease_id = None
+            item.worker_id = worker_id
+            self._store_result(item, result)
+            self._touch_worker(worker_id)
+            self.workers[worker_id]['completed'] += 1
+            self._log(DONE, item, worker_id=worker_id)
+            return True
+
+    def fail(self, lease_id: str, worker_id: str, item_id: str, error: str) -> bool:
+        """Report a failed attempt; the item is re-queued until max_attempts."""
+        with self._lock:
+            item = self.items.get(item_id)
+            if item is None or item.state != LEASED or item.lease_id != lease_id:
+                return False
+            self._touch_worker(worker_id)
+            self.workers[worker_id]['failed'] += 1
+            self._requeue(item, error)
+            return True
+
+    # -- results ----------------------------------------------------------
+
+    def _store_result(self, item: WorkItem, result: dict[str, Any]) -> None:
+        summary = {
+            'item_id': item.item_id,
+            'model': item.model,
+            'phase': item.phase,
+            'variant': item.variant,
+            'shard': item.shard,
+            'n_shards': item.n_shards,
+            'worker_id': item.worker_id,
+            'attempts': item.attempts,
+            'passed': int(result.get('passed', 0)),
+            'total': int(result.get('total', 0)),
+            'failed_prompts': sorted(set(result.get('failed_prompts') or [])),
+            'restraint_score': result.get('restraint_score'),
+            'elapsed_s': result.get('elapsed_s'),
+        }
+        self._item_path(item).write_text(json.dumps(summary, indent=2))
+        with self.results_path.open('a', encoding='utf-8') as f:
+            for row in result.get('results') or []:
+                tagged = {'model': item.model, 'phase': item.phase, 'variant': item.variant,
+                          'item_id': item.item_id, 'worker_id': item.worker_id, **row}
+                f.write(json.dumps(tagged, ensure_ascii=False) + '\n')
+        item.result = summary
+
+    def jobs(self) -> list[dict[str, Any]]:
+        """Per (model, phase, variant) totals merged over finished shards."""
+        merged: dict[str, dict[str, Any]] = {}
+        with self._lock:
+            for item in self.items.values():
+                job = merged.setdefault(item.job_key(), {
+                    'model': item.model, 'phase': item.phase, 'variant': item.variant,
+                    'passed': 0, 'total': 0, 'failed_prompts': [], 'shards_done': 0,
+                    'shards_failed': 0, 'n_shards': item.n_shards, 'workers': [],
+                })
+                res = item.result
+                if item.state == DONE and res is not None:
+                    job['shards_done'] += 1
+                    job['passed'] += res['passed']
+                    job['total'] += res['total']
+                    job['failed_prompts'] = sorted(set(job['failed_prompts']) | set(res['failed_prompts']))
+                    if res['worker_id'] not in job['workers']:
+                        job['workers'].append(res['worker_id'])
+                elif item.state == FAILED:
+                    job['shards_failed'] += 1
+        for job in merged.values():
+            job['accuracy'] = round(job['passed'] / job['total'], 4) if job['total'] else 0.0
+            job['complete'] = job['shards_done'] == job['n_shards']
+        return list(merged.values())
+
+    def status(self) -> dict[str, Any]:
+        with self._lock:
+            self._reap_locked()
+            counts = {s: 0 for s in (PENDING, LEASED, DONE, FAILED)}
+            for item in self.items.values():
+                counts[item.state] += 1
+            return {
+                'counts': counts,
+                'drained': counts[PENDING] == 0 and counts[LEASED] == 0,
+                'workers': list(self.workers.values()),
+            }
+
+    def finished(self) -> bool:
+        return self.status()['drained']
+
+    def unreleased_workers(self) -> list[str]:
+        """Workers seen within one lease length that have not yet been told the queue is drained."""
+        with self._lock:
+            cutoff = self.clock() - self.lease_s
+            return [w['worker_id'] for w in self.workers.values() if not w.get('released') and w['last_seen'] >= cutoff]
+
+    def manifest(self) -> dict[str, Any]:
+        status = self.status()
+        with self._lock:
+            items = [
+                {k: v for k, v in asdict(it).items() if k not in ('lease_id', 'lease_expires', 'prompt_ids', 'result')}
+                for it in self.items.values()
+            ]
+        return {'queue': status, 'jobs': self.jobs(), 'items': items}
+
+
+# =============================================================================
+# Coordinator HTTP API
+# =============================================================================
+
+# Required request fields per POST route; anything missing is a 400, not a handler crash.
+_POST_FIELDS = {
+    '/lease': ('worker_id',),
+    '/heartbeat': ('lease_id',),
+    '/complete': ('lease_id', 'worker_id', 'item_id'),
+    '/fail': ('lease_id', 'worker_id', 'item_id'),
+}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: 'CoordinatorServer'
+
+    def log_message(self, fmt: str, *args: Any) -> None:  # quiet; the manifest is the record
+        return
+
+    def _reply(self, code: int, payload: dict[str, Any]) -> None:
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(code)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _authorized(self) -> bool:
+        token = self.server.token
+        if token and not hmac.compare_digest(self.headers.get(TOKEN_HEADER, ''), token):
+            self._reply(403, {'error': 'bad token'})
+            return False
+        return True
+
+    def do_GET(self) -> None:  # noqa: N802 - http.server API
+        if not self._authorized():
+            return
+        if self.path == '/status':
+            self._reply(200, self.server.queue.status())
+        else:
+            self._reply(404, {'error': 'not found'})
+
+    def do_POST(self) -> None:  # noqa: N802 - http.server API
+        if not self._authorized():
+            return
+        try:
+            req = json.loads(self.rfile.read(int(self.headers.get('Content-Length') or 0)) or b'{}')
+        except json.JSONDecodeError:
+            self._reply(400, {'error': 'invalid json'})
+            return
+        if not isinstance(req, dict):
+            self._reply(400, {'error': 'body must be a JSON object'})
+            return
+        missing = [name for name in _POST_FIELDS.get(self.path, ()) if not isinstance(req.get(name), str)]
+        if missing:
+            self._reply(400, {'error': f"missing or non-string field(s): {', '.join(missing)}"})
+            return
+        if not isinstance(req.get('result') or {}, dict):
+            self._reply(400, {'error': 'result must be a JSON object'})
+            return
+        q = self.server.queue
+        if self.path == '/lease':
+            granted = q.lease(req['worker_id'], req.get('models'), req.get('prefer_model'))
+            self._reply(200, granted or {'item': None, 'drained': q.status()['drained']})
+        elif self.path == '/heartbeat':
+            self._reply(200, {'ok': q.heartbeat(req['lease_id'])})
+        elif self.path == '/complete':
+            self._reply(200, {'ok': q.complete(req['lease_id'], req['worker_id'], req['item_id'], req.get('result') or {})})
+        elif self.path == '/fail':
+            self._reply(200, {'ok': q.fail(req['lease_id'], req['worker_id'], req['item_id'], req.get('error') or '')})
+        else:
+            self._reply(404, {'error': 'not found'})
+
+
+class CoordinatorServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, queue: WorkQueue, host: str = '0.0.0.0', port: int = DEFAULT_PORT, token: str = '') -> None:
+        super().__init__((host, port), _Handler)
+        self.queue = queue
+        self.token = token
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f'http://{"127.0.0.1" if host in ("0.0.0.0", "") else host}:{port}'
+
+    def serve_in_thread(self) -> threading.Thread:
+        t = threading.Thread(target=self.serve_forever, name='bench-coordinator', daemon=True)
+        t.start()
+        return t
+
+
+def run_coordinator(queue: WorkQueue, server: CoordinatorServer, poll_s: float = DEFAULT_POLL_S) -> dict[str, Any]:
+    """Serve until every item is done or failed, refreshing manifest.json as it goes."""
+    manifest_path = queue.run_dir / 'manifest.json'
+    base = {'run_id': queue.run_dir.name, 'run_dir': str(queue.run_dir), 'coordinator': server.url,
+            'started_at': time.time(), 'status': 'running'}
+    server.serve_in_thread()
+    try:
+        while True:
+            manifest = {**base, **queue.manifest()}
+            if manifest['queue']['drained']:
+                break
+            manifest_path.write_text(json.dumps(manifest, indent=2))
+            time.sleep(poll_s)
+        # Keep answering until live workers have seen "drained" (bounded by one lease).
+        linger_until = time.time() + queue.lease_s
+        while queue.unreleased_workers() and time.time() < linger_until:
+            time.sleep(min(poll_s, 0.2))
+    finally:
+        server.shutdown()
+        server.server_close()
+    manifest['status'] = 'complete' if manifest['queue']['counts'][FAILED] == 0 else 'partial'
+    manifest['ended_at'] = time.time()
+    manifest_path.write_text(json.dumps(manifest, indent=2))
+    return manifest
+
+
+# =============================================================================
+# Worker
+# =============================================================================
+
+class CoordinatorClient:
+    def __init__(self, url: str, token: str = '', timeout_s: float = 30.0) -> None:
+        self.url = url.rstrip('/')
+        self.token = token
+        self.timeout_s = timeout_s
+
+    def post(self, path: str, payload: dict[str, Any]) -> dict[str, Any]:
+        req = urllib.request.Request(self.url + path, data=json.dumps(payload).encode('utf-8'), method='POST')
+        req.add_header('Content-Type', 'application/json')
+        if self.token:
+            req.add_header(TOKEN_HEADER, self.token)
+        with urllib.request.urlopen(req, timeout=self.timeout_s) as resp:
+            return json.loads(resp.read().decode('utf-8'))
+
+
+class _Heartbeat(threading.Thread):
+    """Renews a lease every lease_s / 3 while the item runs."""
+
+    def __init__(self, client: CoordinatorClient, lease_id: str, lease_s: float) -> None:
+        super().__init__(name='bench-heartbeat', daemon=True)
+        self.client = client
+        self.lease_id = lease_id
+        self.interval = max(0.05, lease_s / 3.0)
+        self.lost = False
+        self._stop_event = threading.Event()
+
+    def run(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            try:
+                if not self.client.post('/heartbeat', {'lease_id': self.lease_id}).get('ok'):
+                    self.lost = True
+                    return
+            except (urllib.error.URLError, OSError):
+                continue  # coordinator briefly unreachable; the lease may still survive
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        self.join(timeout=5)
+
+
+def run_worker(
+    coordinator_url: str,
+    worker_id: str = '',
+    target: str = DEFAULT_TARGET,
+    models: Optional[list[str]] = None,
+    token: str = '',
+    timeout_s: int = 60,
+    max_retries: int = 1,
+    job_timeout_s: Optional[float] = None,
+    poll_s: float = DEFAULT_POLL_S,
+    max_items: int = 0,
+) -> dict[str, int]:
+    """
+    Pull and run items until the coordinator is drained (or max_items ran).
+
+    Returns counts of completed / failed items. An unreachable coordinator is
+    retried every poll_s; it ends the loop only once it has drained.
+    """
+    worker_id = worker_id or f'{socket.gethostname()}-{os.getpid()}'
+    client = CoordinatorClient(coordinator_url, token)
+    counts = {'completed': 0, 'failed': 0}
+    last_model: Optional[str] = None
+    with PhaseWorker(target=target) as executor:
+        while not max_items or counts['completed'] + counts['failed'] < max_items:
+            try:
+                granted = client.post('/lease', {'worker_id': worker_id, 'models': models, 'prefer_model': last_model})
+            except (urllib.error.URLError, OSError):
+                time.sleep(poll_s)
+                continue
+            item = granted.get('item')
+            if item is None:
+                if granted.get('drained'):
+                    break
+                time.sleep(poll_s)
+                continue
+
+            beat = _Heartbeat(client, granted['lease_id'], float(granted.get('lease_s') or DEFAULT_LEASE_S))
+            beat.start()
+            started = time.time()
+            try:
+                outcome = executor.run(
+                    PhaseRequest(
+                        model=item['model'], phase=item['phase'], variant=item['variant'],
+                        timeout_s=timeout_s, max_retries=max_retries, use_cache=item.get('use_cache', True),
+                        prompt_ids=item.get('prompt_ids'),
+                    ),
+                    deadline_s=job_timeout_s,
+                )
+                error = None if outcome.ok else (outcome.error or 'job failed')
+            except WorkerUnavailable as exc:
+                outcome, error = None, f'worker unavailable: {exc}'
+            finally:
+                beat.stop()
+            last_model = item['model']
+
+            ref = {'lease_id': granted['lease_id'], 'worker_id': worker_id, 'item_id': item['item_id']}
+            try:
+                if error is None:
+                    result = dict(outcome.phase_result or {})
+                    result['elapsed_s'] = round(time.time() - started, 2)
+                    client.post('/complete', {**ref, 'result': result})
+                    counts['completed'] += 1
+                else:
+                    client.post('/fail', {**ref, 'error': error})
+                    counts['failed'] += 1
+            except (urllib.error.URLError, OSError):
+                counts['failed'] += 1  # lease will expire and the item is re-queued
+            if outcome is None:
+                break
+    return counts
+
+
+def _worker_process(url: str, worker_id: str, target: str, token: str, timeout_s: int) -> None:
+    run_worker(url, worker_id=worker_id, target=target, token=token, timeout_s=timeout_s, poll_s=0.5)
+
+
+# =============================================================================
+# CLI
+# =============================================================================
+
+def _matrix(args: argparse.Namespace) -> list[tuple[str, str, str]]:
+    from selfopt.benchmark_supervisor import DEFAULT_JOBS, _is_local_model
+    jobs = [(m, p, v) for m, p, v, _ in DEFAULT_JOBS if _is_local_model(m)]
+    if args.models.strip():
+        allow = {m.strip() for m in args.models.split(',') if m.strip()}
+        jobs = [j for j in jobs if j[0] in allow]
+    if args.phases.strip():
+        allow = {p.strip() for p in args.phases.split(',') if p.strip()}
+        jobs = [j for j in jobs if j[1] in allow]
+    return jobs
+
+
+def _build_queue(args: argparse.Namespace) -> WorkQueue:
+    run_dir = Path(args.run_dir) if args.run_dir else RUNS / f'dist_{uuid.uuid4().hex[:10]}'
+    items = make_items(_matrix(args), shard_size=args.shard_size, use_cache=not args.no_cache)
+    return WorkQueue(run_dir, items, lease_s=args.lease_s, max_attempts=args.max_attempts)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Distributed benchmark coordinator and workers')
+    sub = parser.add_subparsers(dest='cmd', required=True)
+
+    def add_coordinator_args(p: argparse.ArgumentParser) -> None:
+        p.add_argument('--models', default='', help='Comma-separated model allowlist (default: supervisor DEFAULT_JOBS)')
+        p.add_argument('--phases', default='', help='Comma-separated phase allowlist (atomic,extended)')
+        p.add_argument('--shard-size', type=int, default=0, help='Prompts per work item (0 = one item per job)')
+        p.add_argument('--lease-s', type=float, default=DEFAULT_LEASE_S, help='Lease length; workers heartbeat every third of it')
+        p.add_argument('--max-attempts', type=int, default=DEFAULT_MAX_ATTEMPTS, help='Attempts per item before it is marked failed')
+        p.add_argument('--no-cache', action='store_true', help='Bypass the result cache on workers')
+        p.add_argument('--run-dir', default='', help='Run directory (default: supervisor_runs/dist_<id>); reuse one to resume')
+
+    coord = sub.add_parser('coordinator', help='Serve work items until the matrix is done')
+    add_coordinator_args(coord)
+    coord.add_argument('--host', default='0.0.0.0')
+    coord.add_argument('--port', type=int, default=DEFAULT_PORT)
+
+    worker = sub.add_parser('worker', help='Pull items from a coordinator and run them locally')
+    worker.add_argument('--coordinator', required=True, help='Coordinator URL, e.g. http://coord:8765')
+    worker.add_argument('--worker-id', default='', help='Default: <hostname>-<pid>')
+    worker.add_argument('--models', default='', help='Only lease items for these models (e.g. what this box has pulled)')
+    worker.add_argument('--target', default=DEFAULT_TARGET, help='module:function run for each item')
+    worker.add_argument('--timeout', type=int, default=60, help='Per-prompt timeout forwarded to run_phase')
+    worker.add_argument('--job-timeout', type=float, default=0, help='Wall-clock limit per item (0 = none)')
+
+    local = sub.add_parser('local', help='Coordinator plus N local worker processes on this machine')
+    add_coordinator_args(local)
+    local.add_argument('--workers', type=int, default=2)
+    local.add_argument('--target', default=DEFAULT_TARGET, help='module:function run for each item')
+    local.add_argument('--timeout', type=int, default=60, help='Per-prompt timeout forwarded to run_phase')
+
+    args = parser.parse_args()
+    token = os.environ.get(TOKEN_ENV, '')
+
+    if args.cmd == 'worker':
+        counts = run_worker(
+            args.coordinator, worker_id=args.worker_id, target=args.target,
+            models=[m.strip() for m in args.models.split(',') if m.strip()] or None,
+            token=token, timeout_s=args.timeout, job_timeout_s=args.job_timeout or None,
+        )
+        print(json.dumps(counts))
+        return 0
+
+    queue = _build_queue(args)
+    if args.cmd == 'coordinator':
+        server = CoordinatorServer(queue, args.host, args.port, token)
+        print(f'[dist] coordinator {server.url} run_dir={queue.run_dir} items={len(queue.items)}', flush=True)
+        manifest = run_coordinator(queue, server)
+    else:
+        server = CoordinatorServer(queue, '127.0.0.1', 0, token)
+        ctx = mp.get_context('spawn')
+        procs = [
+            ctx.Process(target=_worker_process, args=(server.url, f'local-{n}', args.target, token, args.timeout))
+            for n in range(max(1, args.workers))
+        ]
+        for p in procs:
+            p.start()
+        try:
+            manifest = run_coordinator(queue, server)
+        finally:
+            for p in procs:
+                p.join(timeout=30)
+                if p.is_alive():
+                    p.kill()
+    print(json.dumps({'status': manifest['status'], 'counts': manifest['queue']['counts'], 'jobs': manifest['jobs']}, indent=2))
+    return 0 if manifest['status'] == 'complete' else 1
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
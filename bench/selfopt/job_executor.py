@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""In-process job execution for the benchmark supervisor.
+
+`PhaseWorker` keeps one long-lived child process that imports the benchmark
+runner once and then executes (model, phase, variant) jobs by calling
+`core.run_benchmark.run_phase` directly. Results come back as the
+`PhaseResult` dict (`dataclasses.asdict`), so the supervisor no longer scrapes
+stdout.
+
+Crash isolation is kept: a job that kills the child (segfault, OOM, os._exit)
+or overruns its wall deadline is reported as a failed outcome and the child is
+replaced on the next job. The child is also recycled every `max_jobs` jobs to
+bound memory growth in client libraries.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import importlib
+import multiprocessing as mp
+import os
+import sys
+import time
+import traceback
+from dataclasses import asdict, dataclass, is_dataclass
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+BENCH_ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_TARGET = 'core.run_benchmark:run_phase'
+DEFAULT_MAX_JOBS = 25
+STARTUP_TIMEOUT_S = 120.0
+
+
+class WorkerUnavailable(RuntimeError):
+    """The worker could not start (e.g. the runner failed to import)."""
+
+
+@dataclass
+class PhaseRequest:
+    model: str
+    phase: str
+    variant: str
+    timeout_s: int
+    max_retries: int
+    use_cache: bool = True
+    stdout_log: str = ''
+    stderr_log: str = ''
+    # Optional in-memory harness config and prompt subset; omitted from the call when unset.
+    config: Optional[dict[str, Any]] = None
+    prompt_ids: Optional[list[str]] = None
+
+    def kwargs(self) -> dict[str, Any]:
+        kw = {
+            'model': self.model,
+            'phase': self.phase,
+            'variant': self.variant,
+            'timeout_s': self.timeout_s,
+            'max_retries': self.max_retries,
+            'use_cache': self.use_cache,
+        }
+        if self.config is not None:
+            kw['config'] = self.config
+        if self.prompt_ids is not None:
+            kw['prompt_ids'] = self.prompt_ids
+        return kw
+
+
+@dataclass
+class PhaseOutcome:
+    ok: bool
+    phase_result: Optional[dict[str, Any]] = None
+    error: Optional[str] = None
+    traceback: str = ''
+    crashed: bool = False
+    timed_out: bool = False
+    worker_pid: Optional[int] = None
+    worker_jobs_served: int = 0
+    elapsed_s: float = 0.0
+
+
+def _resolve_target(target: str) -> Callable[..., Any]:
+    module_name, _, attr = target.partition(':')
+    module = importlib.import_module(module_name)
+    return getattr(module, attr)
+
+
+@contextlib.contextmanager
+def _redirect_to(stdout_log: str, stderr_log: str):
+    with contextlib.ExitStack() as stack:
+        if stdout_log:
+            out = stack.enter_context(open(stdout_log, 'w', encoding='utf-8'))
+            stack.enter_context(contextlib.redirect_stdout(out))
+        if stderr_log:
+            err = stack.enter_context(open(stderr_log, 'w', encoding='utf-8'))
+            stack.enter_context(contextlib.redirect_stderr(err))
+        yield
+
+
+def _worker_main(conn, target: str) -> None:
+    """Child loop: import the target once, then serve PhaseRequests until told to stop."""
+    if str(BENCH_ROOT) not in sys.path:
+        sys.path.insert(0, str(BENCH_ROOT))
+    try:
+        fn = _resolve_target(target)
+    except BaseException as exc:  # noqa: BLE001 - report any import failure to the parent
+        conn.send(('fatal', f'{type(exc).__name__}: {exc}', traceback.format_exc()))
+        return
+    conn.send(('ready', os.getpid(), ''))
+
+    while True:
+        try:
+            request = conn.recv()
+        except EOFError:
+            return
+        if request is None:
+            return
+        try:
+            with _redirect_to(request.stdout_log, request.stderr_log):
+                result = fn(**request.kwargs())
+            payload = asdict(result) if is_dataclass(result) else result
+            conn.send(('ok', payload, ''))
+        except BaseException as exc:  # noqa: BLE001 - SystemExit from the runner is a job failure
+            conn.send(('error', f'{type(exc).__name__}: {exc}', traceback.format_exc()))
+
+
+class PhaseWorker:
+    """Long-lived, recyclable worker process executing benchmark phases in-process."""
+
+    def __init__(
+        self,
+        target: str = DEFAULT_TARGET,
+        max_jobs: int = DEFAULT_MAX_JOBS,
+        start_method: str = 'spawn',
+    ) -> None:
+        self.target = target
+        self.max_jobs = max(1, int(max_jobs))
+        self._ctx = mp.get_context(start_method)
+        self._proc = None
+        self._conn = None
+        self._jobs_served = 0
+        self._started = False
+        self.restarts = 0
+        # Set once the worker failed to start; callers should stop routing jobs here.
+        self.unavailable: Optional[str] = None
+
+    @property
+    def pid(self) -> Optional[int]:
+        return self._proc.pid if self._proc is not None else None
+
+    def _start(self) -> None:
+        try:
+            self._spawn()
+        except WorkerUnavailable as exc:
+            self.unavailable = str(exc)
+            raise
+
+    def _spawn(self) -> None:
+        parent_conn, child_conn = self._ctx.Pipe()
+        proc = self._ctx.Process(target=_worker_main, args=(child_conn, self.target), daemon=True)
+        proc.start()
+        child_conn.close()
+        if not parent_conn.poll(STARTUP_TIMEOUT_S):
+            proc.kill()
+            proc.join()
+            raise WorkerUnavailable(f'worker did not start within {STARTUP_TIMEOUT_S:.0f}s')
+        try:
+            status, detail, tb = parent_conn.recv()
+        except EOFError:
+            proc.join()
+            raise WorkerUnavailable(f'worker exited during startup (exitcode={proc.exitcode})')
+        if status != 'ready':
+            proc.join()
+            raise WorkerUnavailable(f'worker failed to load {self.target}: {detail}\n{tb}'.rstrip())
+        if self._started:
+            self.restarts += 1
+        self._started = True
+        self._proc = proc
+        self._conn = parent_conn
+        self._jobs_served = 0
+
+    def _stop(self, kill: bool = False) -> None:
+        proc, conn = self._proc, self._conn
+        self._proc = self._conn = None
+        if proc is None:
+            return
+        if not kill and proc.is_alive():
+            try:
+                conn.send(None)
+                proc.join(timeout=10)
+            except (BrokenPipeError, OSError):
+                pass
+        if proc.is_alive():
+            proc.kill()
+        proc.join()
+        conn.close()
+
+    def run(self, request: PhaseRequest, deadline_s: Optional[float] = None) -> PhaseOutcome:
+        """Execute one job. Never raises for job failures; raises WorkerUnavailable if the
+        worker cannot be (re)started."""
+        if self._proc is not None and not self._proc.is_alive():
+            self._stop(kill=True)
+        if self._proc is None:
+            self._start()
+
+        pid = self._proc.pid
+        started = time.time()
+        try:
+            self._conn.send(request)
+            ready = self._conn.poll(deadline_s)
+        except (BrokenPipeError, OSError):
+            ready = True  # child is gone; recv below reports the crash
+
+        if not ready:
+            self._stop(kill=True)
+            return PhaseOutcome(
+                ok=False,
+                error=f'worker timed out after {deadline_s:.0f}s',
+                timed_out=True,
+                worker_pid=pid,
+                elapsed_s=round(time.time() - started, 2),
+            )
+
+        try:
+            status, detail, tb = self._conn.recv()
+        except (EOFError, OSError):
+            self._proc.join(timeout=5)
+            exitcode = self._proc.exitcode
+            self._stop(kill=True)
+            return PhaseOutcome(
+                ok=False,
+                error=f'worker crashed (exitcode={exitcode})',
+                crashed=True,
+                worker_pid=pid,
+                elapsed_s=round(time.time() - started, 2),
+            )
+
+        self._jobs_served += 1
+        served = self._jobs_served
+        if served >= self.max_jobs:
+            self._stop()
+
+        if status == 'ok':
+            return PhaseOutcome(
+                ok=True,
+                phase_result=detail,
+                worker_pid=pid,
+                worker_jobs_served=served,
+                elapsed_s=round(time.time() - started, 2),
+            )
+        return PhaseOutcome(
+            ok=False,
+            error=detail,
+            traceback=tb,
+            worker_pid=pid,
+            worker_jobs_served=served,
+            elapsed_s=round(time.time() - started, 2),
+        )
+
+    def close(self) -> None:
+        self._stop()
+
+    def __enter__(self) -> 'PhaseWorker':
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
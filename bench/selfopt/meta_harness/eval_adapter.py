@@ -1,12 +1,18 @@
 #!/usr/bin/env python3
 from __future__ import annotations
 
+import contextlib
 import copy
+import hashlib
+import io
 import json
 import os
 import re
 import subprocess
+import sys
 import time
+import traceback
+from dataclasses import asdict, is_dataclass
 from pathlib import Path
 from typing import Any
 
@@ -16,6 +22,25 @@ PROMPT_ID_RE = re.compile(r"P\d+")
 RESTRAINT_RE = re.compile(
     r"Restraint(?:\s+Score)?\s*:\s*([0-9]*\.?[0-9]+)", re.IGNORECASE
 )
+# Keep aligned with ATOMIC_PROMPTS in bench/core/run_benchmark.py.
+ATOMIC_PROMPT_IDS = [f"P{i}" for i in range(1, 13)]
+RUNNER_TIMEOUT_S = 60
+# Per-prompt fields kept in structured results and the prompt cache.
+PROMPT_FIELDS = (
+    "prompt_id",
+    "expected",
+    "got",
+    "correct",
+    "latency_ms",
+    "error",
+    "timeout",
+    "tokens_generated",
+    "prompt_tokens",
+    "tokens_per_second",
+    "ttft_ms",
+    "total_duration_ms",
+    "load_duration_ms",
+)
 
 
 def _repo_root() -> Path:
@@ -26,6 +51,15 @@ def _bench_root(repo_root: Path) -> Path:
     return repo_root / "bench"
 
 
+def suite_prompt_ids(phase: str, repo_root: Path | None = None) -> list[str]:
+    """Prompt ids of the full suite for `phase`, in suite order."""
+    if phase == "atomic":
+        return list(ATOMIC_PROMPT_IDS)
+    suite_path = _bench_root(repo_root or _repo_root()) / "extended_benchmark_suite.json"
+    suite = json.loads(suite_path.read_text(encoding="utf-8"))
+    return [item["id"] for items in suite.values() for item in items]
+
+
 def _load_phase2_config(bench_root: Path) -> dict[str, Any]:
     config_path = bench_root / "harness" / "phase2_config.json"
     return json.loads(config_path.read_text(encoding="utf-8"))
@@ -96,12 +130,228 @@ def _parse_stdout(stdout: str) -> dict[str, Any]:
     }
 
 
+def _read_tail(path: Path, n: int = 25) -> list[str]:
+    try:
+        return path.read_text(encoding="utf-8", errors="replace").splitlines()[-n:]
+    except OSError:
+        return []
+
+
+def _sha256(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class PromptCache:
+    """
+    Per-prompt result cache for candidate evaluation.
+
+    A prompt's key covers everything that can change its outcome: target,
+    prompt id, the model/variant slice of the (patched) harness config, the
+    top-level config knobs, the suite item, and the runner source. A candidate
+    that only changes one variant's system prompt therefore re-runs nothing for
+    other variants, and a halving rung re-uses every prompt its parent rung
+    already scored. Errored and timed-out prompts are not cached.
+    """
+
+    def __init__(self, cache_dir: Path, *, repo_root: Path | None = None) -> None:
+        self.cache_dir = cache_dir
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        bench_root = _bench_root(repo_root or _repo_root())
+        runner = bench_root / "core" / "run_benchmark.py"
+        self._runner_hash = _sha256(runner.read_text(encoding="utf-8")) if runner.exists() else ""
+        self._suite_path = bench_root / "extended_benchmark_suite.json"
+        self._suite_items: dict[str, Any] | None = None
+        self.hits = 0
+        self.misses = 0
+
+    def _suite_item(self, phase: str, prompt_id: str) -> Any:
+        if phase != "extended":
+            return None  # atomic prompts live in the runner source, covered by _runner_hash
+        if self._suite_items is None:
+            suite = json.loads(self._suite_path.read_text(encoding="utf-8"))
+            self._suite_items = {item["id"]: item for items in suite.values() for item in items}
+        return self._suite_items.get(prompt_id)
+
+    def key(self, config: dict[str, Any], target: dict[str, Any], prompt_id: str) -> str:
+        model_cfg = dict(config["models"][target["model"]])
+        variants = model_cfg.pop("variants", {}) or {}
+        material = {
+            "target": [target["model"], target["phase"], target["variant"]],
+            "prompt_id": prompt_id,
+            "model_cfg": model_cfg,
+            "variant_cfg": variants.get(target["variant"]),
+            "globals": {k: v for k, v in config.items() if k != "models"},
+            "item": self._suite_item(target["phase"], prompt_id),
+            "runner": self._runner_hash,
+        }
+        return _sha256(json.dumps(material, sort_keys=True, default=str))
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        path = self.cache_dir / f"{key}.json"
+        try:
+            row = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return row
+
+    def put(self, key: str, row: dict[str, Any]) -> bool:
+        if row.get("error") or row.get("timeout"):
+            return False
+        path = self.cache_dir / f"{key}.json"
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(json.dumps(row, ensure_ascii=False), encoding="utf-8")
+        tmp.replace(path)
+        return True
+
+
+def _prompt_row(raw: dict[str, Any]) -> dict[str, Any]:
+    return {k: raw.get(k) for k in PROMPT_FIELDS}
+
+
+def summarize_prompts(rows: list[dict[str, Any]], phase: str) -> dict[str, Any]:
+    """Phase summary recomputed from per-prompt rows (mirrors run_benchmark's scoring)."""
+    passed = sum(1 for r in rows if r.get("correct"))
+    total = len(rows)
+    restraint_score: float | None = None
+    if phase == "atomic":
+        no_tool = [r for r in rows if r.get("expected") == []]
+        restraint_score = (
+            round(sum(1 for r in no_tool if r.get("correct")) / len(no_tool), 6) if no_tool else 0.0
+        )
+    latencies = [float(r["latency_ms"]) for r in rows if isinstance(r.get("latency_ms"), (int, float))]
+    return {
+        "passed": passed,
+        "total": total,
+        "accuracy": round(passed / total, 6) if total else 0.0,
+        "failed_prompts": sorted(r["prompt_id"] for r in rows if not r.get("correct")),
+        "restraint_score": restraint_score,
+        "total_latency_ms": round(sum(latencies), 1),
+        "tokens_generated": sum(r.get("tokens_generated") or 0 for r in rows),
+        "prompt_tokens": sum(r.get("prompt_tokens") or 0 for r in rows),
+    }
+
+
+def _ensure_on_path(bench_root: Path) -> None:
+    if str(bench_root) not in sys.path:
+        sys.path.insert(0, str(bench_root))
+
+
+def _run_phase_in_process(
+    bench_root: Path, kwargs: dict[str, Any], stdout_log: str
+) -> tuple[dict[str, Any] | None, str]:
+    # The runner arms SIGALRM per prompt, so this path only works on the main thread.
+    _ensure_on_path(bench_root)
+    from core.run_benchmark import run_phase
+
+    out = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(out):
+            result = run_phase(**kwargs)
+    except BaseException as exc:  # noqa: BLE001 - SystemExit from the runner is a failed eval
+        return None, f"{type(exc).__name__}: {exc}\n{traceback.format_exc()}"
+    finally:
+        if stdout_log:
+            Path(stdout_log).write_text(out.getvalue(), encoding="utf-8")
+    return (asdict(result) if is_dataclass(result) else result), ""
+
+
+def evaluate_config(
+    config: dict[str, Any],
+    target: dict[str, Any],
+    *,
+    prompt_ids: list[str] | None = None,
+    cache: PromptCache | None = None,
+    worker: Any = None,
+    timeout_s: int = RUNNER_TIMEOUT_S,
+    max_retries: int = 1,
+    stdout_log: str = "",
+    repo_root: Path | None = None,
+) -> dict[str, Any]:
+    """
+    Evaluate an in-memory harness config on one target and return per-prompt results.
+
+    Prompts found in `cache` are not re-run; the rest run through `worker`
+    (a `selfopt.job_executor.PhaseWorker`) or, when no worker is given, in this
+    process via `core.run_benchmark.run_phase`. The summary is recomputed from
+    the merged per-prompt rows, so cached and fresh prompts score identically.
+    """
+    repo_root = repo_root or _repo_root()
+    bench_root = _bench_root(repo_root)
+    phase = str(target["phase"])
+    wanted = list(prompt_ids) if prompt_ids is not None else suite_prompt_ids(phase, repo_root)
+
+    keys = {pid: cache.key(config, target, pid) for pid in wanted} if cache is not None else {}
+    rows: dict[str, dict[str, Any]] = {}
+    for pid in wanted:
+        hit = cache.get(keys[pid]) if cache is not None else None
+        if hit is not None:
+            rows[pid] = dict(hit, cached=True)
+    missing = [pid for pid in wanted if pid not in rows]
+
+    started = time.time()
+    error = ""
+    worker_pid = None
+    if missing:
+        kwargs = {
+            "model": str(target["model"]),
+            "phase": phase,
+            "variant": str(target["variant"]),
+            "config": config,
+            "timeout_s": timeout_s,
+            "max_retries": max_retries,
+            "use_cache": False,
+            "prompt_ids": missing,
+        }
+        if worker is not None:
+            _ensure_on_path(bench_root)
+            from selfopt.job_executor import PhaseRequest
+
+            outcome = worker.run(PhaseRequest(**kwargs, stdout_log=stdout_log))
+            phase_result, worker_pid = outcome.phase_result, outcome.worker_pid
+            if not outcome.ok:
+                error = "\n".join(part for part in (outcome.error or "", outcome.traceback) if part)
+        else:
+            phase_result, error = _run_phase_in_process(bench_root, kwargs, stdout_log)
+
+        for raw in (phase_result or {}).get("results") or []:
+            row = _prompt_row(raw)
+            rows[row["prompt_id"]] = dict(row, cached=False)
+            if cache is not None and row["prompt_id"] in keys:
+                cache.put(keys[row["prompt_id"]], row)
+    ended = time.time()
+
+    prompts = [rows[pid] for pid in wanted if pid in rows]
+    incomplete = [pid for pid in wanted if pid not in rows]
+    return {
+        "rc": 1 if error or incomplete else 0,
+        "error": error or (f"no result for {', '.join(incomplete)}" if incomplete else ""),
+        "elapsed_s": round(ended - started, 3),
+        "started_at": started,
+        "ended_at": ended,
+        "summary": summarize_prompts(prompts, phase),
+        "prompts": prompts,
+        "cache": {"hits": len(wanted) - len(missing), "misses": len(missing)},
+        "worker_pid": worker_pid,
+    }
+
+
 def evaluate_candidate(
     candidate: dict[str, Any],
     logs_dir: Path,
     *,
     repo_root: Path | None = None,
+    prompt_ids: list[str] | None = None,
+    mode: str = "subprocess",
+    worker: Any = None,
+    cache: PromptCache | None = None,
 ) -> dict[str, Any]:
+    """
+    Evaluate one candidate. mode="subprocess" runs the CLI runner and parses its
+    stdout; mode="structured" goes through `evaluate_config` (worker or
+    in-process, per-prompt results, optional prompt cache).
+    """
     repo_root = repo_root or _repo_root()
     bench_root = _bench_root(repo_root)
     runner = bench_root / "core" / "run_benchmark.py"
@@ -116,6 +366,40 @@ def evaluate_candidate(
     config_path.write_text(json.dumps(config, indent=2), encoding="utf-8")
 
     target = candidate["target"]
+    record = {
+        "candidate": candidate["name"],
+        "target": target,
+        "hypothesis": candidate.get("hypothesis", ""),
+        "changes": candidate.get("changes", ""),
+        "expected_delta": candidate.get("expected_delta", ""),
+        "patch_notes": patch_notes,
+    }
+    if mode == "structured":
+        runs_dir = logs_dir / "runs"
+        runs_dir.mkdir(parents=True, exist_ok=True)
+        stdout_log = runs_dir / f"{candidate['name']}.stdout.log"
+        evaluation = evaluate_config(
+            config,
+            target,
+            prompt_ids=prompt_ids,
+            cache=cache,
+            worker=worker,
+            stdout_log=str(stdout_log),
+            repo_root=repo_root,
+        )
+        error = evaluation.pop("error")
+        return {
+            **record,
+            "mode": mode,
+            **evaluation,
+            "prompt_ids": prompt_ids,
+            "stdout_tail": "\n".join(_read_tail(stdout_log)),
+            "stderr_tail": "\n".join(error.splitlines()[-25:]),
+            "config_path": str(config_path),
+        }
+    if mode != "subprocess":
+        raise ValueError(f"unknown eval mode: {mode}")
+
     cmd = [
         "python3",
         str(runner),
@@ -125,6 +409,8 @@ def evaluate_candidate(
         "--no-cache",
         "--no-save",
     ]
+    if prompt_ids is not None:
+        cmd.extend(["--prompt-ids", ",".join(prompt_ids)])
 
     started = time.time()
     env = os.environ.copy()
@@ -142,18 +428,15 @@ def evaluate_candidate(
 
     summary = _parse_stdout(cp.stdout)
     return {
-        "candidate": candidate["name"],
-        "target": target,
-        "hypothesis": candidate.get("hypothesis", ""),
-        "changes": candidate.get("changes", ""),
-        "expected_delta": candidate.get("expected_delta", ""),
-        "patch_notes": patch_notes,
+        **record,
+        "mode": mode,
         "command": cmd,
         "rc": cp.returncode,
         "elapsed_s": round(ended - started, 3),
         "started_at": started,
         "ended_at": ended,
         "summary": summary,
+        "prompt_ids": prompt_ids,
         "stdout_tail": "\n".join(cp.stdout.splitlines()[-25:]),
         "stderr_tail": "\n".join(cp.stderr.splitlines()[-25:]),
         "config_path": str(config_path),
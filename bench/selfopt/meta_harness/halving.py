@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""Successive-halving search over meta-harness candidates.
+
+Every candidate is first scored on a small prompt subset. Each rung keeps the
+top 1/eta of candidates and grows the subset by eta, and the last rung is the
+full suite. Cost per iteration goes from O(candidates x suite) towards
+O(suite x log(candidates)).
+
+Candidates that target different models are evaluated concurrently, one lane
+per model. A single Ollama model is never driven by two runs at once.
+"""
+from __future__ import annotations
+
+import math
+import queue
+import random
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Iterator
+
+
+@dataclass
+class Rung:
+    index: int
+    n_prompts: int
+    n_candidates: int
+    keep: int  # candidates promoted to the next rung
+
+
+def plan_rungs(n_candidates: int, n_prompts: int, *, eta: int = 2, min_prompts: int = 3) -> list[Rung]:
+    """Rung schedule for `n_candidates` over a suite of `n_prompts`; the last rung is the full suite."""
+    if n_candidates <= 0 or n_prompts <= 0:
+        return []
+    eta = max(2, int(eta))
+    n_rungs = 1
+    while eta ** (n_rungs - 1) < n_candidates:
+        n_rungs += 1
+
+    rungs: list[Rung] = []
+    survivors = n_candidates
+    for k in range(n_rungs):
+        last = k == n_rungs - 1
+        if last:
+            size, keep = n_prompts, survivors
+        else:
+            size = min(n_prompts, max(min_prompts, n_prompts // eta ** (n_rungs - 1 - k)))
+            keep = max(1, math.ceil(survivors / eta))
+        if rungs and rungs[-1].n_prompts == size:
+            # Same subset as the previous rung: cut further without re-running it.
+            rungs[-1].keep = keep
+        else:
+            rungs.append(Rung(len(rungs), size, survivors, keep))
+        survivors = keep
+    return rungs
+
+
+def subset_order(prompt_ids: list[str], seed: int) -> list[str]:
+    """Deterministic shuffled order; rung k uses a prefix, so subsets are nested."""
+    order = list(prompt_ids)
+    random.Random(seed).shuffle(order)
+    return order
+
+
+def score(result: dict[str, Any]) -> tuple[float, float]:
+    summary = result.get("summary", {})
+    acc = float(summary.get("accuracy", 0.0) or 0.0) if result.get("rc", 0) == 0 else -1.0
+    rest = summary.get("restraint_score")
+    return (acc, float(rest) if rest is not None else -1.0)
+
+
+def promote(results: list[dict[str, Any]], keep: int) -> list[str]:
+    """Names of the `keep` best candidates (ties keep input order)."""
+    ranked = sorted(results, key=score, reverse=True)
+    return [r["candidate"] for r in ranked[:keep]]
+
+
+def run_lanes(
+    candidates: list[dict[str, Any]],
+    evaluate: Callable[[dict[str, Any]], dict[str, Any]],
+    *,
+    max_parallel: int = 2,
+) -> Iterator[dict[str, Any]]:
+    """
+    Evaluate candidates with one sequential lane per target model and up to
+    `max_parallel` lanes at once; yield each result as soon as it is ready.
+    """
+    lanes: dict[str, list[dict[str, Any]]] = {}
+    for c in candidates:
+        lanes.setdefault(str(c["target"]["model"]), []).append(c)
+
+    done: queue.Queue = queue.Queue()
+    pending = list(lanes.values())
+    slots = threading.Semaphore(max(1, max_parallel))
+
+    def lane(items: list[dict[str, Any]]) -> None:
+        with slots:
+            for c in items:
+                try:
+                    done.put(("ok", evaluate(c)))
+                except Exception as exc:  # noqa: BLE001 - surfaced on the consumer thread
+                    done.put(("error", exc))
+                    return
+
+    threads = [threading.Thread(target=lane, args=(items,), daemon=True) for items in pending]
+    for t in threads:
+        t.start()
+    for _ in range(len(candidates)):
+        status, payload = done.get()
+        if status == "error":
+            raise payload
+        yield payload
+    for t in threads:
+        t.join()
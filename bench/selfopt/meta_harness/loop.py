@@ -3,16 +3,16 @@ from __future__ import annotations
 
 import argparse
 import json
+import sys
 import time
 from pathlib import Path
 from typing import Any
 
 if __package__ in (None, ""):
-    import sys
-
     sys.path.insert(0, str(Path(__file__).resolve().parent))
 
-from eval_adapter import evaluate_candidate
+from eval_adapter import PromptCache, evaluate_candidate, suite_prompt_ids
+from halving import Rung, plan_rungs, promote, run_lanes, subset_order
 
 
 def parse_args() -> argparse.Namespace:
@@ -37,6 +37,47 @@ def parse_args() -> argparse.Namespace:
         default=0,
         help="Optional cap on number of candidates to evaluate (0 = all).",
     )
+    parser.add_argument(
+        "--search",
+        choices=["halving", "sequential"],
+        default="halving",
+        help="halving: successive halving on growing prompt subsets; sequential: every candidate on the full suite.",
+    )
+    parser.add_argument(
+        "--eta",
+        type=int,
+        default=2,
+        help="Successive-halving reduction factor (each rung keeps the top 1/eta).",
+    )
+    parser.add_argument(
+        "--min-prompts",
+        type=int,
+        default=3,
+        help="Prompt subset size of the first halving rung.",
+    )
+    parser.add_argument(
+        "--max-parallel",
+        type=int,
+        default=2,
+        help="Max concurrent evaluations; candidates sharing a target model always run serially.",
+    )
+    parser.add_argument(
+        "--eval-mode",
+        choices=["structured", "subprocess"],
+        default="structured",
+        help="structured: warm per-model worker with per-prompt results; subprocess: CLI runner + stdout parsing.",
+    )
+    parser.add_argument(
+        "--no-prompt-cache",
+        action="store_true",
+        help="Re-run every prompt even when an identical (config, prompt) result is cached.",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=None,
+        help="Seed for the prompt subset order (default: iteration number).",
+    )
     parser.add_argument(
         "--dry-run",
         action="store_true",
@@ -132,6 +173,8 @@ def append_evolution_summary(path: Path, iteration: int, results: list[dict[str,
             row = {
                 "ts": time.time(),
                 "iteration": iteration,
+                "rung": r.get("rung"),
+                "n_prompts": r.get("n_prompts"),
                 "candidate": r["candidate"],
                 "target": r["target"],
                 "accuracy": r["summary"]["accuracy"],
@@ -147,6 +190,34 @@ def append_evolution_summary(path: Path, iteration: int, results: list[dict[str,
             f.write(json.dumps(row, ensure_ascii=False) + "\n")
 
 
+def write_frontier(path: Path, frontier: dict[str, Any]) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(frontier, indent=2), encoding="utf-8")
+    tmp.replace(path)
+
+
+def plan_search(
+    candidates: list[dict[str, Any]],
+    suites: dict[str, list[str]],
+    args: argparse.Namespace,
+) -> list[Rung]:
+    # Mixed-phase batches size their subsets on the smaller suite; the last rung
+    # always runs each candidate on its own full suite.
+    n_prompts = min(len(ids) for ids in suites.values())
+    if args.search == "sequential":
+        return [Rung(0, n_prompts, len(candidates), len(candidates))]
+    return plan_rungs(len(candidates), n_prompts, eta=args.eta, min_prompts=args.min_prompts)
+
+
+def _new_worker() -> Any:
+    bench_root = Path(__file__).resolve().parents[2]
+    if str(bench_root) not in sys.path:
+        sys.path.insert(0, str(bench_root))
+    from selfopt.job_executor import PhaseWorker
+
+    return PhaseWorker()
+
+
 def main() -> int:
     args = parse_args()
 
@@ -168,29 +239,94 @@ def main() -> int:
             f"[meta-harness] plan {c['name']} -> {target['model']} {target['phase']} {target['variant']}"
         )
 
+    phases = {c["target"]["phase"] for c in candidates}
+    suites = {phase: suite_prompt_ids(phase) for phase in phases}
+    seed = iteration if args.seed is None else args.seed
+    rungs = plan_search(candidates, suites, args)
+    for rung in rungs:
+        print(
+            f"[meta-harness] rung {rung.index}: {rung.n_candidates} candidate(s) "
+            f"x {rung.n_prompts} prompt(s) -> keep {rung.keep}"
+        )
+
     if args.dry_run:
         print("[meta-harness] dry-run complete")
         return 0
 
+    frontier_path = logs_dir / "frontier_val.json"
+    evolution_path = logs_dir / "evolution_summary.jsonl"
+    cache = None
+    if args.eval_mode == "structured" and not args.no_prompt_cache:
+        cache = PromptCache(logs_dir / "prompt_cache")
+    workers: dict[str, Any] = {}
+
+    def worker_for(model: str) -> Any:
+        # One warm worker per target model; a model only ever has one lane, so no sharing.
+        if args.eval_mode != "structured":
+            return None
+        if model not in workers:
+            workers[model] = _new_worker()
+        return workers[model]
+
+    alive = list(candidates)
+    history: list[dict[str, Any]] = []
     results: list[dict[str, Any]] = []
-    for idx, candidate in enumerate(candidates, start=1):
-        print(f"[meta-harness] evaluating {idx}/{len(candidates)}: {candidate['name']}")
-        result = evaluate_candidate(candidate, logs_dir)
-        results.append(result)
-        summary = result["summary"]
-        print(
-            f"[meta-harness] result {candidate['name']} rc={result['rc']} "
-            f"acc={summary['accuracy']:.3f} ({summary['passed']}/{summary['total']})"
-        )
+    try:
+        for rung in rungs:
+            final = rung.index == len(rungs) - 1
+
+            def evaluate(candidate: dict[str, Any], rung: Rung = rung, final: bool = final) -> dict[str, Any]:
+                full = suites[candidate["target"]["phase"]]
+                prompt_ids = None
+                if not final and rung.n_prompts < len(full):
+                    prompt_ids = subset_order(full, seed)[: rung.n_prompts]
+                return evaluate_candidate(
+                    candidate,
+                    logs_dir,
+                    prompt_ids=prompt_ids,
+                    mode=args.eval_mode,
+                    worker=worker_for(str(candidate["target"]["model"])),
+                    cache=cache,
+                )
+
+            rung_results: list[dict[str, Any]] = []
+            for result in run_lanes(alive, evaluate, max_parallel=args.max_parallel):
+                result["rung"] = rung.index
+                result["n_prompts"] = len(result["prompt_ids"] or suites[result["target"]["phase"]])
+                rung_results.append(result)
+                summary = result["summary"]
+                cached = f" cached={result['cache']['hits']}" if result.get("cache") else ""
+                print(
+                    f"[meta-harness] rung {rung.index} result {result['candidate']} rc={result['rc']} "
+                    f"acc={summary['accuracy']:.3f} ({summary['passed']}/{summary['total']}){cached}"
+                )
+                append_evolution_summary(evolution_path, iteration, [result])
+                if final:
+                    # Only full-suite scores are comparable with the existing frontier.
+                    write_frontier(frontier_path, update_frontier(load_frontier(frontier_path), [result]))
+
+            history.append(
+                {
+                    "rung": rung.index,
+                    "n_prompts": rung.n_prompts,
+                    "candidates": [r["candidate"] for r in rung_results],
+                    "promoted": [] if final else promote(rung_results, rung.keep),
+                }
+            )
+            if final:
+                results = rung_results
+            else:
+                keep = set(history[-1]["promoted"])
+                alive = [c for c in alive if c["name"] in keep]
+    finally:
+        for worker in workers.values():
+            worker.close()
+    if cache is not None:
+        print(f"[meta-harness] prompt cache: {cache.hits} hit(s), {cache.misses} miss(es)")
 
-    frontier_path = logs_dir / "frontier_val.json"
     frontier = load_frontier(frontier_path)
-    frontier = update_frontier(frontier, results)
-    frontier_path.write_text(json.dumps(frontier, indent=2), encoding="utf-8")
-
-    append_evolution_summary(logs_dir / "evolution_summary.jsonl", iteration, results)
     (logs_dir / f"iteration_{iteration}.json").write_text(
-        json.dumps({"iteration": iteration, "results": results}, indent=2),
+        json.dumps({"iteration": iteration, "rungs": history, "results": results}, indent=2),
         encoding="utf-8",
     )
 
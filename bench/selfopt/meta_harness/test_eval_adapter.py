@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""Unit tests for the structured (in-memory config, per-prompt) evaluation API."""
+
+from __future__ import annotations
+
+import copy
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+HERE = os.path.dirname(__file__)
+BENCH_ROOT = os.path.abspath(os.path.join(HERE, "..", ".."))
+for path in (HERE, BENCH_ROOT):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+from eval_adapter import (  # noqa: E402
+    PromptCache,
+    _apply_patch_to_config,
+    _load_phase2_config,
+    evaluate_candidate,
+    evaluate_config,
+    summarize_prompts,
+)
+from selfopt.job_executor import PhaseOutcome  # noqa: E402
+
+MODEL = "mistral:7b"
+TARGET = {"model": MODEL, "phase": "atomic", "variant": "atomic"}
+NO_TOOL = {"P5", "P6", "P9"}
+
+
+class FakeWorker:
+    """PhaseWorker stand-in: records requests and scores every prompt as correct."""
+
+    def __init__(self, fail: bool = False) -> None:
+        self.requests = []
+        self.fail = fail
+
+    def run(self, request, deadline_s=None) -> PhaseOutcome:
+        self.requests.append(request)
+        if self.fail:
+            return PhaseOutcome(ok=False, error="RuntimeError: ollama down", worker_pid=1)
+        rows = [
+            {
+                "prompt_id": pid,
+                "expected": [] if pid in NO_TOOL else ["get_weather"],
+                "got": [] if pid in NO_TOOL else ["get_weather"],
+                "correct": pid != "P2",
+                "latency_ms": 100.0,
+                "tokens_generated": 10,
+                "assistant_content": "not kept",
+            }
+            for pid in request.prompt_ids
+        ]
+        return PhaseOutcome(ok=True, phase_result={"results": rows}, worker_pid=1)
+
+
+def _config() -> dict:
+    return _load_phase2_config(Path(BENCH_ROOT))
+
+
+class TestEvaluateConfig(unittest.TestCase):
+    def test_unchanged_prompts_come_from_cache(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            cache = PromptCache(Path(td))
+            worker = FakeWorker()
+            first = evaluate_config(_config(), TARGET, prompt_ids=["P1", "P2", "P5"], cache=cache, worker=worker)
+            second = evaluate_config(_config(), TARGET, prompt_ids=["P1", "P2", "P5", "P6"], cache=cache, worker=worker)
+
+        self.assertEqual(worker.requests[0].prompt_ids, ["P1", "P2", "P5"])
+        self.assertEqual(worker.requests[1].prompt_ids, ["P6"])
+        self.assertIsInstance(worker.requests[0].config, dict)
+        self.assertEqual(first["summary"]["failed_prompts"], ["P2"])
+        self.assertEqual(second["cache"], {"hits": 3, "misses": 1})
+        self.assertEqual([p["cached"] for p in second["prompts"]], [True, True, True, False])
+        self.assertEqual(second["summary"]["passed"], 3)
+        self.assertNotIn("assistant_content", second["prompts"][0])
+
+    def test_patch_only_invalidates_the_patched_target(self) -> None:
+        base = _config()
+        patched, _ = _apply_patch_to_config(base, {"target": TARGET, "patch": {"system_prompt": "Be terse."}})
+        other = copy.deepcopy(base)
+        other["models"][MODEL]["variants"]["extended"]["system"] = "changed"
+        with tempfile.TemporaryDirectory() as td:
+            cache = PromptCache(Path(td))
+            self.assertEqual(cache.key(base, TARGET, "P1"), cache.key(other, TARGET, "P1"))
+            self.assertNotEqual(cache.key(base, TARGET, "P1"), cache.key(patched, TARGET, "P1"))
+
+    def test_worker_failure_is_reported_and_not_cached(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            cache = PromptCache(Path(td))
+            out = evaluate_config(_config(), TARGET, prompt_ids=["P1"], cache=cache, worker=FakeWorker(fail=True))
+            self.assertEqual(out["rc"], 1)
+            self.assertIn("ollama down", out["error"])
+            self.assertEqual(list(Path(td).glob("*.json")), [])
+
+    def test_restraint_matches_runner_scoring(self) -> None:
+        rows = [
+            {"prompt_id": "P1", "expected": ["get_weather"], "correct": True},
+            {"prompt_id": "P5", "expected": [], "correct": True},
+            {"prompt_id": "P9", "expected": [], "correct": False},
+        ]
+        summary = summarize_prompts(rows, "atomic")
+        self.assertEqual(summary["restraint_score"], 0.5)
+        self.assertIsNone(summarize_prompts(rows, "extended")["restraint_score"])
+
+
+class TestEvaluateCandidateStructured(unittest.TestCase):
+    def test_structured_mode_keeps_result_shape(self) -> None:
+        candidate = {"name": "c1", "hypothesis": "h", "target": TARGET, "patch": {"temperature": 0.2}}
+        with tempfile.TemporaryDirectory() as td:
+            res = evaluate_candidate(candidate, Path(td), prompt_ids=["P1"], mode="structured", worker=FakeWorker())
+
+        self.assertEqual(res["mode"], "structured")
+        self.assertEqual(res["rc"], 0)
+        self.assertEqual(res["summary"]["total"], 1)
+        self.assertEqual(res["prompts"][0]["prompt_id"], "P1")
+        self.assertEqual(res["patch_notes"], ["patched model.temperature"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""Unit tests for the meta-harness successive-halving search."""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+# Allow importing loop/halving the same way loop.py is run as a script.
+HERE = os.path.dirname(__file__)
+if HERE not in sys.path:
+    sys.path.insert(0, HERE)
+
+import loop  # noqa: E402
+from halving import plan_rungs, promote, run_lanes, subset_order  # noqa: E402
+
+
+def _candidate(name: str, model: str = "m1", phase: str = "atomic") -> dict:
+    return {
+        "name": name,
+        "hypothesis": "h",
+        "target": {"model": model, "phase": phase, "variant": phase},
+    }
+
+
+def _result(name: str, accuracy: float, rc: int = 0, restraint: float | None = None) -> dict:
+    return {
+        "candidate": name,
+        "rc": rc,
+        "summary": {"accuracy": accuracy, "restraint_score": restraint},
+    }
+
+
+class TestPlan(unittest.TestCase):
+    def test_rungs_grow_prompts_and_end_on_full_suite(self) -> None:
+        rungs = plan_rungs(8, 12)
+        self.assertEqual([(r.n_prompts, r.n_candidates, r.keep) for r in rungs], [(3, 8, 2), (6, 2, 1), (12, 1, 1)])
+
+    def test_single_candidate_goes_straight_to_full_suite(self) -> None:
+        rungs = plan_rungs(1, 12)
+        self.assertEqual(len(rungs), 1)
+        self.assertEqual(rungs[0].n_prompts, 12)
+
+    def test_subsets_are_nested_and_deterministic(self) -> None:
+        ids = [f"P{i}" for i in range(1, 13)]
+        self.assertEqual(subset_order(ids, 7), subset_order(ids, 7))
+        self.assertEqual(sorted(subset_order(ids, 7)), sorted(ids))
+
+
+class TestPromote(unittest.TestCase):
+    def test_failed_runs_rank_last_and_restraint_breaks_ties(self) -> None:
+        results = [
+            _result("crashed", 1.0, rc=1),
+            _result("a", 0.5, restraint=0.2),
+            _result("b", 0.5, restraint=0.9),
+        ]
+        self.assertEqual(promote(results, 2), ["b", "a"])
+
+
+class TestLanes(unittest.TestCase):
+    def test_same_model_is_serial_and_models_run_concurrently(self) -> None:
+        active: dict[str, int] = {}
+        peak = {"total": 0, "per_model": 0}
+        lock = threading.Lock()
+
+        def evaluate(c: dict) -> dict:
+            model = c["target"]["model"]
+            with lock:
+                active[model] = active.get(model, 0) + 1
+                peak["total"] = max(peak["total"], sum(active.values()))
+                peak["per_model"] = max(peak["per_model"], active[model])
+            time.sleep(0.05)
+            with lock:
+                active[model] -= 1
+            return {"candidate": c["name"]}
+
+        cands = [_candidate("a1", "a"), _candidate("a2", "a"), _candidate("b1", "b"), _candidate("c1", "c")]
+        names = [r["candidate"] for r in run_lanes(cands, evaluate, max_parallel=2)]
+
+        self.assertEqual(sorted(names), ["a1", "a2", "b1", "c1"])
+        self.assertEqual(peak["per_model"], 1)
+        self.assertEqual(peak["total"], 2)
+
+    def test_lane_error_is_raised_to_consumer(self) -> None:
+        def evaluate(c: dict) -> dict:
+            raise RuntimeError("boom")
+
+        with self.assertRaises(RuntimeError):
+            list(run_lanes([_candidate("a")], evaluate))
+
+
+class TestLoop(unittest.TestCase):
+    def test_halving_only_promotes_to_full_suite_and_updates_frontier(self) -> None:
+        quality = {"weak": 0.2, "mid": 0.5, "good": 0.8, "best": 0.9}
+        calls: list[tuple[str, int | None]] = []
+
+        def fake_evaluate(candidate, logs_dir, *, prompt_ids=None, **_):
+            calls.append((candidate["name"], len(prompt_ids) if prompt_ids is not None else None))
+            total = len(prompt_ids) if prompt_ids is not None else 12
+            return {
+                "candidate": candidate["name"],
+                "target": candidate["target"],
+                "rc": 0,
+                "elapsed_s": 0.0,
+                "prompt_ids": prompt_ids,
+                "summary": {
+                    "accuracy": quality[candidate["name"]],
+                    "passed": round(quality[candidate["name"]] * total),
+                    "total": total,
+                    "restraint_score": None,
+                },
+            }
+
+        with tempfile.TemporaryDirectory() as td:
+            pending = Path(td, "pending.json")
+            pending.write_text(
+                json.dumps({"iteration": 3, "candidates": [_candidate(n, model=n) for n in quality]}),
+                encoding="utf-8",
+            )
+            argv = ["loop.py", "--pending-eval", str(pending), "--logs-dir", td]
+            with mock.patch.object(loop, "evaluate_candidate", fake_evaluate), mock.patch.object(sys, "argv", argv):
+                with mock.patch("builtins.print"):
+                    self.assertEqual(loop.main(), 0)
+
+            frontier = json.loads(Path(td, "frontier_val.json").read_text())
+            iteration = json.loads(Path(td, "iteration_3.json").read_text())
+            rows = [json.loads(line) for line in Path(td, "evolution_summary.jsonl").read_text().splitlines()]
+
+        self.assertEqual(sorted(n for n, size in calls if size == 3), sorted(quality))
+        self.assertEqual([n for n, size in calls if size is None], ["best"])
+        self.assertEqual(frontier["_best"]["candidate"], "best")
+        self.assertEqual([r["rung"] for r in iteration["rungs"]], [0, 1, 2])
+        self.assertEqual(iteration["rungs"][0]["promoted"], ["best", "good"])
+        self.assertEqual(len(rows), len(calls))
+        self.assertEqual(rows[-1]["n_prompts"], 12)
+
+
+if __name__ == "__main__":
+    unittest.main()
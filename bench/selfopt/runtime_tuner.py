@@ -0,0 +1,515 @@
+#!/usr/bin/env python3
+"""Per-model auto-tuner for backend runtime options (threads, batch, context, GPU layers, slots).
+
+Sampling options (temperature, top_p, ...) stay in `build_ollama_options` /
+`ollama_reasoning_profile`; this module only searches the knobs that change
+speed, not output: Ollama `num_thread`, `num_batch`, `num_ctx`, `num_gpu`,
+and llama-server `--threads`, `--batch-size`, `--ctx-size`, `--parallel`.
+
+The search is coordinate descent: one knob at a time, the others held at the
+best values so far. Each knob's candidate values are pruned by successive
+halving (`meta_harness.halving.plan_rungs`): every value runs the first few
+prompts of a fixed set, only the faster half goes on to more prompts, and
+values that fail to load or exceed `--max-rss-mb` drop out at once. A value
+replaces the incumbent only if it wins by `--min-gain`, so noise does not
+churn the config. Per-prompt samples are kept per config, so a config that
+reaches a later rung (or stage) only runs the prompts it has not run yet.
+
+Measurements are server-reported: prefill tok/s from prompt-eval counters,
+decode tok/s from eval counters, and throughput as generated tokens per wall
+second (llama-server `--parallel N` runs N prompts at once). Peak runner RSS
+comes from `utils.resource_sampler`.
+
+The winner is written into `harness/phase2_config.json` under the model's
+entry (`runtime_options` for Ollama, `llama_server_options` for
+llama-server, plus a `runtime_tuning` record), where `core/run_benchmark.py`
+and `openclaw_llm_bench/run_bench.py` merge it into every request.
+
+    python3 selfopt/runtime_tuner.py qwen2.5:3b mistral:7b
+    python3 selfopt/runtime_tuner.py qwen2.5:3b --backend llama-server \\
+        --server-cmd "llama-server -m /models/qwen2.5-3b.gguf" --objective throughput
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import argparse
+import json
+import math
+import shlex
+import socket
+import subprocess
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from selfopt.meta_harness.halving import plan_rungs
+from utils.prompt_corpora import load_corpus
+from utils.resource_sampler import ResourceSampler
+
+BENCH_ROOT = Path(__file__).resolve().parent.parent
+CONFIG_PATH = Path(os.environ.get('BENCH_PHASE2_CONFIG_PATH', str(BENCH_ROOT / 'harness' / 'phase2_config.json')))
+REPORTS = BENCH_ROOT / 'supervisor_runs' / 'tuning'
+
+OBJECTIVES = ('decode', 'prefill', 'throughput')
+DEFAULT_MAX_TOKENS = 128
+DEFAULT_MIN_GAIN = 0.03
+DEFAULT_MIN_PROMPTS = 2
+# Written to phase2_config.json model entries, keyed by backend.
+OPTION_KEYS = {'ollama': 'runtime_options', 'llama-server': 'llama_server_options'}
+TUNING_KEY = 'runtime_tuning'
+
+
+# =============================================================================
+# Samples and trials
+# =============================================================================
+
+@dataclass
+class Sample:
+    prompt_id: str
+    prompt_tokens: int = 0
+    prompt_s: float = 0.0
+    eval_tokens: int = 0
+    eval_s: float = 0.0
+    error: Optional[str] = None
+
+
+@dataclass
+class Trial:
+    """Everything measured for one option set; grows as the config climbs rungs."""
+    options: dict[str, Any]
+    samples: list[Sample] = field(default_factory=list)
+    wall_s: float = 0.0
+    peak_rss_kb: Optional[int] = None
+    error: Optional[str] = None
+
+    @property
+    def key(self) -> str:
+        return config_key(self.options)
+
+    def done_ids(self) -> set[str]:
+        return {s.prompt_id for s in self.samples}
+
+    def _ok(self) -> list[Sample]:
+        return [s for s in self.samples if s.error is None]
+
+    @property
+    def prefill_tps(self) -> Optional[float]:
+        ok = self._ok()
+        secs = sum(s.prompt_s for s in ok)
+        return sum(s.prompt_tokens for s in ok) / secs if secs > 0 else None
+
+    @property
+    def decode_tps(self) -> Optional[float]:
+        ok = self._ok()
+        secs = sum(s.eval_s for s in ok)
+        return sum(s.eval_tokens for s in ok) / secs if secs > 0 else None
+
+    @property
+    def throughput_tps(self) -> Optional[float]:
+        tokens = sum(s.eval_tokens for s in self._ok())
+        return tokens / self.wall_s if self.wall_s > 0 else None
+
+    def score(self, objective: str) -> float:
+        """Objective tok/s; -inf for configs that failed, so they always sort last."""
+        if self.error:
+            return -math.inf
+        value = getattr(self, f'{objective}_tps')
+        return value if value is not None else -math.inf
+
+    def summary(self) -> dict[str, Any]:
+        def r(x: Optional[float]) -> Optional[float]:
+            return round(x, 2) if x is not None else None
+        return {
+            'options': self.options,
+            'n_prompts': len(self.samples),
+            'prefill_tps': r(self.prefill_tps),
+            'decode_tps': r(self.decode_tps),
+            'throughput_tps': r(self.throughput_tps),
+            'peak_rss_mb': round(self.peak_rss_kb / 1024, 1) if self.peak_rss_kb else None,
+            'error': self.error,
+        }
+
+
+def config_key(options: dict[str, Any]) -> str:
+    return json.dumps(options, sort_keys=True)
+
+
+# =============================================================================
+# Backends
+# =============================================================================
+
+def _post_json(url: str, payload: dict[str, Any], timeout_s: float) -> dict[str, Any]:
+    req = urllib.request.Request(url, data=json.dumps(payload).encode('utf-8'), method='POST',
+                                 headers={'Content-Type': 'application/json'})
+    with urllib.request.urlopen(req, timeout=timeout_s) as resp:
+        return json.loads(resp.read().decode('utf-8') or '{}')
+
+
+def thread_candidates(cpu_count: Optional[int] = None) -> list[int]:
+    """Quarter steps of the logical CPU count; on SMT hosts the physical-core count is in the list."""
+    n = max(1, cpu_count or os.cpu_count() or 1)
+    return sorted({max(1, round(n * f)) for f in (0.25, 0.5, 0.75, 1.0)})
+
+
+def has_gpu() -> bool:
+    return any(os.path.exists(p) for p in ('/dev/nvidia0', '/dev/kfd', '/dev/dri/renderD128'))
+
+
+class OllamaTarget:
+    """Runtime options go in each /api/chat request; a changed value makes Ollama reload the model."""
+
+    name = 'ollama'
+    proc_prefix = 'ollama'
+
+    def __init__(self, base_url: str = 'http://localhost:11434', timeout_s: float = 300.0):
+        self.base_url = base_url.rstrip('/')
+        self.timeout_s = timeout_s
+
+    def space(self) -> dict[str, list[Any]]:
+        space: dict[str, list[Any]] = {
+            'num_thread': thread_candidates(),
+            'num_batch': [128, 256, 512, 1024],
+            'num_ctx': [2048, 4096, 8192],
+        }
+        if has_gpu():
+            space['num_gpu'] = [0, 16, 32, 999]
+        return space
+
+    def concurrency(self, options: dict[str, Any]) -> int:
+        return 1
+
+    def _chat(self, model: str, prompt: str, options: dict[str, Any], max_tokens: int) -> dict[str, Any]:
+        payload = {
+            'model': model,
+            'messages': [{'role': 'user', 'content': prompt}],
+            'stream': False,
+            'options': {'temperature': 0, 'num_predict': max_tokens, **options},
+        }
+        if 'glm' in model.lower() or 'qwen3.5' in model.lower():
+            payload['think'] = False
+        return _post_json(f'{self.base_url}/api/chat', payload, self.timeout_s)
+
+    def prepare(self, model: str, options: dict[str, Any]) -> Optional[str]:
+        """Load the model with `options` so the reload is not billed to the first prompt."""
+        try:
+            self._chat(model, 'Reply with OK.', options, 1)
+        except (urllib.error.URLError, OSError, ValueError) as e:
+            return f'load failed: {e}'[:200]
+        return None
+
+    def generate(self, model: str, prompt_id: str, prompt: str, options: dict[str, Any], max_tokens: int) -> Sample:
+        try:
+            resp = self._chat(model, prompt, options, max_tokens)
+        except (urllib.error.URLError, OSError, ValueError) as e:
+            return Sample(prompt_id, error=str(e)[:200])
+        return Sample(
+            prompt_id,
+            prompt_tokens=int(resp.get('prompt_eval_count') or 0),
+            prompt_s=float(resp.get('prompt_eval_duration') or 0) / 1e9,
+            eval_tokens=int(resp.get('eval_count') or 0),
+            eval_s=float(resp.get('eval_duration') or 0) / 1e9,
+        )
+
+    def close(self) -> None:
+        pass
+
+
+class LlamaServerTarget:
+    """Runtime options are launch flags, so every config restarts `server_cmd` on a private port."""
+
+    name = 'llama-server'
+    proc_prefix = 'llama-server'
+    FLAGS = {'threads': '--threads', 'batch_size': '--batch-size', 'ctx_size': '--ctx-size', 'parallel': '--parallel'}
+
+    def __init__(self, server_cmd: str, port: int = 8091, timeout_s: float = 300.0, start_timeout_s: float = 600.0):
+        self.server_cmd = shlex.split(server_cmd)
+        self.port = port
+        self.timeout_s = timeout_s
+        self.start_timeout_s = start_timeout_s
+        self._proc: Optional[subprocess.Popen] = None
+
+    @property
+    def base_url(self) -> str:
+        return f'http://127.0.0.1:{self.port}'
+
+    def space(self) -> dict[str, list[Any]]:
+        return {
+            'threads': thread_candidates(),
+            'batch_size': [256, 512, 1024, 2048],
+            'ctx_size': [2048, 4096, 8192],
+            'parallel': [1, 2, 4],
+        }
+
+    def concurrency(self, options: dict[str, Any]) -> int:
+        return int(options.get('parallel') or 1)
+
+    def command(self, options: dict[str, Any]) -> list[str]:
+        cmd = list(self.server_cmd) + ['--host', '127.0.0.1', '--port', str(self.port)]
+        for key, value in sorted(options.items()):
+            cmd += [self.FLAGS.get(key, '--' + key.replace('_', '-')), str(value)]
+        return cmd
+
+    def prepare(self, model: str, options: dict[str, Any]) -> Optional[str]:
+        self.close()
+        try:
+            self._proc = subprocess.Popen(self.command(options), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        except OSError as e:
+            return f'launch failed: {e}'[:200]
+        deadline = time.monotonic() + self.start_timeout_s
+        while time.monotonic() < deadline:
+            if self._proc.poll() is not None:
+                return f'llama-server exited with {self._proc.returncode}'
+            try:
+                with urllib.request.urlopen(f'{self.base_url}/health', timeout=5) as resp:
+                    if resp.status == 200:
+                        return None
+            except (urllib.error.URLError, OSError):
+                pass  # 503 while the model loads, refused before the socket is up
+            time.sleep(0.5)
+        return 'llama-server did not become healthy'
+
+    def generate(self, model: str, prompt_id: str, prompt: str, options: dict[str, Any], max_tokens: int) -> Sample:
+        payload = {'model': model, 'messages': [{'role': 'user', 'content': prompt}],
+                   'max_tokens': max_tokens, 'temperature': 0, 'stream': False}
+        try:
+            resp = _post_json(f'{self.base_url}/v1/chat/completions', payload, self.timeout_s)
+        except (urllib.error.URLError, OSError, ValueError) as e:
+            return Sample(prompt_id, error=str(e)[:200])
+        timings = resp.get('timings') or {}
+        return Sample(
+            prompt_id,
+            prompt_tokens=int(timings.get('prompt_n') or 0),
+            prompt_s=float(timings.get('prompt_ms') or 0) / 1000,
+            eval_tokens=int(timings.get('predicted_n') or 0),
+            eval_s=float(timings.get('predicted_ms') or 0) / 1000,
+        )
+
+    def close(self) -> None:
+        if self._proc is not None and self._proc.poll() is None:
+            self._proc.terminate()
+            try:
+                self._proc.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                self._proc.kill()
+        self._proc = None
+
+
+# =============================================================================
+# Search
+# =============================================================================
+
+class Tuner:
+    """Coordinate descent over `target.space()`, successive halving within each knob."""
+
+    def __init__(
+        self,
+        target: Any,
+        model: str,
+        prompts: list[dict[str, Any]],
+        *,
+        objective: str = 'throughput',
+        max_tokens: int = DEFAULT_MAX_TOKENS,
+        min_gain: float = DEFAULT_MIN_GAIN,
+        min_prompts: int = DEFAULT_MIN_PROMPTS,
+        max_rss_mb: Optional[float] = None,
+        space: Optional[dict[str, list[Any]]] = None,
+        sampler: Optional[ResourceSampler] = None,
+        log: Callable[[str], None] = print,
+    ) -> None:
+        if objective not in OBJECTIVES:
+            raise ValueError(f'objective must be one of {OBJECTIVES}, got {objective!r}')
+        self.target = target
+        self.model = model
+        self.prompts = prompts
+        self.objective = objective
+        self.max_tokens = max_tokens
+        self.min_gain = min_gain
+        self.min_prompts = min_prompts
+        self.max_rss_mb = max_rss_mb
+        self.space = space if space is not None else target.space()
+        self.sampler = sampler
+        self.log = log
+        self.trials: dict[str, Trial] = {}
+        self.history: list[dict[str, Any]] = []
+        self._loaded: Optional[str] = None
+
+    def measure(self, options: dict[str, Any], n_prompts: int) -> Trial:
+        """Run the first `n_prompts` prompts under `options`, skipping any already measured."""
+        trial = self.trials.setdefault(config_key(options), Trial(dict(options)))
+        todo = [p for p in self.prompts[:n_prompts] if p['id'] not in trial.done_ids()]
+        if trial.error or not todo:
+            return trial
+        if self._loaded != trial.key:
+            err = self.target.prepare(self.model, trial.options)
+            self._loaded = None if err else trial.key
+            if err:
+                trial.error = err
+                return trial
+        width = max(1, self.target.concurrency(trial.options))
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=width) as pool:
+            samples = list(pool.map(
+                lambda p: self.target.generate(self.model, p['id'], p['prompt'], trial.options, self.max_tokens), todo
+            ))
+        ended = time.perf_counter()
+        trial.samples.extend(samples)
+        trial.wall_s += ended - started
+        if self.sampler is not None:
+            rss = self.sampler.window(started, ended).get('proc_rss_kb_max')
+            if rss is not None:
+                trial.peak_rss_kb = max(trial.peak_rss_kb or 0, int(rss))
+        errors = [s.error for s in samples if s.error]
+        if errors and len(errors) == len(samples):
+            trial.error = errors[0]
+        elif self.max_rss_mb and trial.peak_rss_kb and trial.peak_rss_kb / 1024 > self.max_rss_mb:
+            trial.error = f'peak RSS {trial.peak_rss_kb / 1024:.0f} MB over --max-rss-mb {self.max_rss_mb:.0f}'
+        return trial
+
+    def _halve(self, configs: list[dict[str, Any]]) -> Trial:
+        """Successive halving over `configs` on growing prompt prefixes; returns the survivor."""
+        alive = configs
+        for rung in plan_rungs(len(configs), len(self.prompts), min_prompts=self.min_prompts):
+            trials = [self.measure(c, rung.n_prompts) for c in alive]
+            ranked = sorted(trials, key=lambda t: t.score(self.objective), reverse=True)
+            alive = [t.options for t in ranked[: rung.keep] if not t.error] or [ranked[0].options]
+        return self.trials[config_key(alive[0])]
+
+    def run(self) -> dict[str, Any]:
+        """Tune every knob once; returns the report (best options, baseline, every trial)."""
+        best = self.measure({}, len(self.prompts))  # server defaults
+        baseline = best
+        for knob, values in self.space.items():
+            configs = [best.options] + [{**best.options, knob: v} for v in values if best.options.get(knob) != v]
+            winner = self._halve(configs)
+            base_score = self.measure(best.options, len(self.prompts)).score(self.objective)
+            win_score = winner.score(self.objective)
+            accept = winner.key != best.key and win_score > max(base_score, 0) * (1 + self.min_gain)
+            self.history.append({
+                'knob': knob,
+                'tried': [config_key(c) for c in configs],
+                'winner': winner.options,
+                'winner_tps': _round(win_score),
+                'incumbent_tps': _round(base_score),
+                'accepted': accept,
+            })
+            self.log(f'[tune] {self.model} {knob}: {winner.options.get(knob, "default")} '
+                     f'{_round(win_score)} vs {_round(base_score)} tok/s -> {"keep" if accept else "skip"}')
+            if accept:
+                best = winner
+        best = self.measure(best.options, len(self.prompts))
+        base, top = baseline.score(self.objective), best.score(self.objective)
+        return {
+            'model': self.model,
+            'backend': self.target.name,
+            'objective': self.objective,
+            'best': best.summary(),
+            'baseline': baseline.summary(),
+            'gain_pct': round((top / base - 1) * 100, 1) if base > 0 and math.isfinite(top) else None,
+            'n_trials': len(self.trials),
+            'n_prompt_runs': sum(len(t.samples) for t in self.trials.values()),
+            'history': self.history,
+            'trials': [t.summary() for t in self.trials.values()],
+        }
+
+
+def _round(x: float) -> Optional[float]:
+    return round(x, 2) if math.isfinite(x) else None
+
+
+# =============================================================================
+# phase2_config.json write-back
+# =============================================================================
+
+def write_best(report: dict[str, Any], config_path: Path = CONFIG_PATH) -> bool:
+    """Store the winning options in the model's phase2_config.json entry; False if the model has none."""
+    config = json.loads(config_path.read_text())
+    entry = config.get('models', {}).get(report['model'])
+    if entry is None or report['best'].get('error'):
+        return False
+    entry[OPTION_KEYS[report['backend']]] = report['best']['options']
+    tuning = entry.setdefault(TUNING_KEY, {})
+    tuning[report['backend']] = {
+        'objective': report['objective'],
+        'prefill_tps': report['best']['prefill_tps'],
+        'decode_tps': report['best']['decode_tps'],
+        'throughput_tps': report['best']['throughput_tps'],
+        'peak_rss_mb': report['best']['peak_rss_mb'],
+        'gain_pct': report['gain_pct'],
+        'host': socket.gethostname(),
+        'cpu_count': os.cpu_count(),
+        'tuned_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+    }
+    tmp = config_path.with_suffix('.json.tmp')
+    tmp.write_text(json.dumps(config, indent=2, ensure_ascii=False))
+    os.replace(tmp, config_path)
+    return True
+
+
+# =============================================================================
+# CLI
+# =============================================================================
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Tune backend runtime options per model for tok/s')
+    parser.add_argument('models', nargs='+', help='Models to tune (phase2_config.json keys)')
+    parser.add_argument('--backend', choices=sorted(OPTION_KEYS), default='ollama')
+    parser.add_argument('--ollama-url', default=os.environ.get('OLLAMA_HOST', 'http://localhost:11434'))
+    parser.add_argument('--server-cmd', default='', help='llama-server command without --port/--host, e.g. "llama-server -m x.gguf"')
+    parser.add_argument('--port', type=int, default=8091, help='Private llama-server port for trials')
+    parser.add_argument('--objective', choices=OBJECTIVES, default='throughput',
+                        help='decode/prefill: server-reported tok/s; throughput: generated tokens per wall second')
+    parser.add_argument('--corpus', default='compare', help='compare, prompts_v1, or a JSON path')
+    parser.add_argument('--prompts', type=int, default=8, help='Prompts per full evaluation')
+    parser.add_argument('--max-tokens', type=int, default=DEFAULT_MAX_TOKENS)
+    parser.add_argument('--knobs', default='', help='Comma-separated subset of the backend search space')
+    parser.add_argument('--min-gain', type=float, default=DEFAULT_MIN_GAIN, help='Relative gain a knob change must show')
+    parser.add_argument('--max-rss-mb', type=float, default=None, help='Reject configs whose runner RSS peaks above this')
+    parser.add_argument('--config', default=str(CONFIG_PATH), help='phase2_config.json to update')
+    parser.add_argument('--dry-run', action='store_true', help='Report only; do not update the config')
+    args = parser.parse_args()
+
+    if args.backend == 'llama-server':
+        if not args.server_cmd:
+            parser.error('--server-cmd is required for --backend llama-server')
+        target: Any = LlamaServerTarget(args.server_cmd, port=args.port)
+    else:
+        target = OllamaTarget(args.ollama_url)
+    space = target.space()
+    if args.knobs.strip():
+        wanted = [k.strip() for k in args.knobs.split(',') if k.strip()]
+        unknown = [k for k in wanted if k not in space]
+        if unknown:
+            parser.error(f'unknown knobs {unknown}; {args.backend} has {sorted(space)}')
+        space = {k: space[k] for k in wanted}
+    prompts = load_corpus(args.corpus)[: max(1, args.prompts)]
+
+    REPORTS.mkdir(parents=True, exist_ok=True)
+    rc = 0
+    with ResourceSampler(proc_prefix=target.proc_prefix) as sampler:
+        try:
+            for model in args.models:
+                tuner = Tuner(target, model, prompts, objective=args.objective, max_tokens=args.max_tokens,
+                              min_gain=args.min_gain, max_rss_mb=args.max_rss_mb, space=space, sampler=sampler)
+                report = tuner.run()
+                slug = model.replace(':', '_').replace('/', '_')
+                (REPORTS / f'{slug}_{args.backend}.json').write_text(json.dumps(report, indent=2))
+                print(json.dumps({k: report[k] for k in ('model', 'backend', 'objective', 'best', 'gain_pct')}, indent=2))
+                if report['best'].get('error'):
+                    rc = 1
+                elif not args.dry_run and not write_best(report, Path(args.config)):
+                    print(f'[tune] {model} has no entry in {args.config}; options not written', file=sys.stderr)
+        finally:
+            target.close()
+    return rc
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
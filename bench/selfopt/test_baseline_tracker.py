@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""Unit tests for the supervisor's regression baseline."""
+
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# Allow importing selfopt package from bench/
+HERE = os.path.dirname(__file__)
+BENCH_ROOT = os.path.abspath(os.path.join(HERE, ".."))
+if BENCH_ROOT not in sys.path:
+    sys.path.insert(0, BENCH_ROOT)
+
+from selfopt.baseline_tracker import BaselineStore, BaselineTracker  # noqa: E402
+
+
+def _job(passed: int, total: int, **extra) -> dict:
+    job = {"model": "m", "phase": "atomic", "variant": "atomic", "passed": passed, "total": total}
+    job["accuracy"] = passed / total if total else extra.pop("accuracy", 0.0)
+    job.update(extra)
+    return job
+
+
+class TestRegression(unittest.TestCase):
+    def test_first_run_has_no_baseline(self) -> None:
+        check = BaselineTracker().check_regression(_job(12, 12))
+        self.assertFalse(check.regressed)
+        self.assertIsNone(check.baseline_accuracy)
+
+    def test_single_flip_is_not_significant(self) -> None:
+        tracker = BaselineTracker()
+        tracker.update_baseline(_job(12, 12))
+        check = tracker.check_regression(_job(11, 12))
+        self.assertFalse(check.regressed)
+        self.assertGreater(check.regression_pct, 5.0)
+        self.assertGreater(check.p_value, 0.05)
+        self.assertIn("not significant", check.message)
+
+    def test_repeated_runs_confirm_a_real_drop(self) -> None:
+        tracker = BaselineTracker()
+        tracker.update_baseline(_job(36, 36))
+        check = tracker.check_regression(_job(27, 36))
+        self.assertTrue(check.regressed)
+        self.assertLess(check.p_value, 0.05)
+        self.assertIn("p=", check.message)
+
+    def test_without_counts_threshold_alone_decides(self) -> None:
+        tracker = BaselineTracker()
+        tracker.update_baseline(_job(0, 0, accuracy=0.9))
+        check = tracker.check_regression(_job(0, 0, accuracy=0.8))
+        self.assertTrue(check.regressed)
+        self.assertIsNone(check.p_value)
+
+
+def _rows(latency_ms: float, tps: float = 20.0, fail: tuple[str, ...] = ()) -> list[dict]:
+    return [
+        {"prompt_id": f"P{i}", "correct": f"P{i}" not in fail, "latency_ms": latency_ms + i, "tokens_per_second": tps}
+        for i in range(1, 13)
+    ]
+
+
+def _seed(store: BaselineStore, runs: int = 6) -> None:
+    for n in range(runs):
+        store.record(_job(12, 12, run_id=f"r{n}"), _rows(1000.0 + 10 * (n % 3)))
+
+
+class TestBaselineStore(unittest.TestCase):
+    def test_windows_persist_and_are_bounded(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            path = Path(td, "baselines.json")
+            store = BaselineStore(path, window=4)
+            _seed(store)
+            reloaded = BaselineStore(path, window=4)
+            runs = reloaded.history("m", "atomic", "atomic")
+            self.assertEqual([r["run_id"] for r in runs], ["r2", "r3", "r4", "r5"])
+            self.assertEqual(len(reloaded.prompt_history("m", "atomic", "atomic", "P1")), 4)
+            self.assertEqual(reloaded.keys(), ["m|atomic|atomic"])
+            self.assertIsNone(reloaded.stats("m", "atomic", "atomic", "latency_p95_ms"))  # under MIN_HISTORY
+
+    def test_latency_and_throughput_regressions_are_caught(self) -> None:
+        store = BaselineStore()
+        _seed(store)
+        tracker = BaselineTracker(store=store)
+        same_acc = _job(12, 12)
+
+        steady = tracker.check_regression(same_acc, _rows(1015.0))
+        self.assertFalse(steady.regressed)
+        self.assertEqual(steady.metric_alerts, [])
+
+        slow = tracker.check_regression(same_acc, _rows(1400.0, tps=12.0))
+        self.assertTrue(slow.regressed)
+        metrics = {a["metric"] for a in slow.metric_alerts if "prompt_id" not in a}
+        self.assertEqual(metrics, {"latency_p50_ms", "latency_p95_ms", "tps_median"})
+        self.assertIn("P1.latency_ms", slow.message)
+        self.assertEqual(slow.p_value, 1.0)
+
+    def test_stable_prompt_flip_and_accuracy_limit(self) -> None:
+        store = BaselineStore()
+        _seed(store)
+        tracker = BaselineTracker(store=store)
+        one_flip = tracker.check_regression(_job(11, 12), _rows(1010.0, fail=("P4",)))
+        self.assertEqual([(a["metric"], a.get("prompt_id")) for a in one_flip.metric_alerts], [("correct", "P4")])
+        self.assertFalse(one_flip.regressed)
+
+        big_drop = tracker.check_regression(_job(8, 12), _rows(1010.0, fail=("P1", "P2", "P3", "P4")))
+        self.assertIn("accuracy", {a["metric"] for a in big_drop.metric_alerts})
+        self.assertTrue(big_drop.regressed)
+
+    def test_tracker_baseline_survives_restart(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            path = Path(td, "baselines.json")
+            BaselineTracker(store=BaselineStore(path)).update_baseline(_job(36, 36), _rows(1000.0))
+            check = BaselineTracker(store=BaselineStore(path)).check_regression(_job(27, 36))
+        self.assertEqual(check.baseline_accuracy, 1.0)
+        self.assertTrue(check.regressed)
+
+
+if __name__ == "__main__":
+    unittest.main()
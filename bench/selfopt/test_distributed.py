@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""Unit tests for the distributed coordinator, leases and pull workers."""
+
+from __future__ import annotations
+
+import json
+import multiprocessing as mp
+import os
+import signal
+import sys
+import tempfile
+import time
+import unittest
+import urllib.error
+from pathlib import Path
+
+# Allow importing selfopt package from bench/
+HERE = os.path.dirname(__file__)
+BENCH_ROOT = os.path.abspath(os.path.join(HERE, ".."))
+if BENCH_ROOT not in sys.path:
+    sys.path.insert(0, BENCH_ROOT)
+
+from selfopt.distributed import (  # noqa: E402
+    DONE,
+    FAILED,
+    PENDING,
+    CoordinatorClient,
+    CoordinatorServer,
+    WorkQueue,
+    make_items,
+    run_coordinator,
+    run_worker,
+)
+
+FAKE_TARGET = "selfopt.test_distributed:fake_run_phase"
+MARKER_ENV = "DIST_TEST_DIR"
+
+
+def fake_run_phase(model, phase, variant, timeout_s, max_retries, use_cache, prompt_ids=None):
+    """Stand-in backend: odd prompts pass; `dies` kills its worker host once, `slow` outlives a lease."""
+    marker = Path(os.environ.get(MARKER_ENV, "."), f"{model}.died")
+    if model == "dies" and not marker.exists():
+        marker.write_text(str(os.getppid()))
+        os.kill(os.getppid(), signal.SIGKILL)  # the worker loop process, i.e. the "host"
+        os._exit(0)
+    time.sleep(1.5 if model == "slow" else 0.05)
+    ids = prompt_ids or ["P1", "P2"]
+    rows = [{"prompt_id": pid, "correct": int(pid[1:]) % 2 == 1, "latency_ms": 100.0} for pid in ids]
+    return {
+        "passed": sum(r["correct"] for r in rows),
+        "total": len(rows),
+        "failed_prompts": [r["prompt_id"] for r in rows if not r["correct"]],
+        "results": rows,
+    }
+
+
+def _ids(phase: str) -> list[str]:
+    return [f"P{i}" for i in range(1, 8)]
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.t = 1000.0
+
+    def __call__(self) -> float:
+        return self.t
+
+
+def _result(n: int = 1) -> dict:
+    return {"passed": n, "total": 2, "failed_prompts": ["P2"], "results": [{"prompt_id": "P1", "correct": True}]}
+
+
+class TestWorkQueue(unittest.TestCase):
+    def test_make_items_shards_each_job(self) -> None:
+        items = make_items([("m", "atomic", "atomic"), ("n", "atomic", "atomic")], shard_size=3, prompt_ids_for=_ids)
+        self.assertEqual([len(it.prompt_ids) for it in items], [3, 3, 1, 3, 3, 1])
+        self.assertEqual(items[2].item_id, "m|atomic|atomic|2")
+        self.assertEqual({it.n_shards for it in items}, {3})
+        self.assertIsNone(make_items([("m", "atomic", "atomic")])[0].prompt_ids)
+
+    def test_expired_lease_is_requeued_and_first_result_wins(self) -> None:
+        clock = Clock()
+        with tempfile.TemporaryDirectory() as td:
+            q = WorkQueue(Path(td), make_items([("m", "atomic", "atomic")]), lease_s=10, clock=clock)
+            first = q.lease("w1")
+            clock.t += 5
+            self.assertTrue(q.heartbeat(first["lease_id"]))
+            clock.t += 11
+            self.assertEqual(q.reap(), ["m|atomic|atomic|0"])
+            self.assertFalse(q.heartbeat(first["lease_id"]))
+
+            second = q.lease("w2")
+            self.assertEqual(second["item"]["attempt"], 2)
+            # The presumed-dead worker finishes first; the re-lease's result is then a duplicate.
+            self.assertTrue(q.complete(first["lease_id"], "w1", "m|atomic|atomic|0", _result()))
+            self.assertFalse(q.complete(second["lease_id"], "w2", "m|atomic|atomic|0", _result()))
+            self.assertEqual(q.items["m|atomic|atomic|0"].state, DONE)
+            self.assertEqual(len(q.results_path.read_text().splitlines()), 1)
+            self.assertTrue(q.status()["drained"])
+
+    def test_failures_use_up_the_attempt_budget(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            q = WorkQueue(Path(td), make_items([("m", "atomic", "atomic")]), max_attempts=2)
+            for n in range(2):
+                g = q.lease(f"w{n}")
+                self.assertTrue(q.fail(g["lease_id"], f"w{n}", g["item"]["item_id"], "boom"))
+            item = q.items["m|atomic|atomic|0"]
+            self.assertEqual((item.state, len(item.errors)), (FAILED, 2))
+            self.assertIsNone(q.lease("w3"))
+            self.assertEqual(q.jobs()[0]["shards_failed"], 1)
+
+    def test_lease_prefers_loaded_model_then_idle_model(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            items = make_items([("a", "atomic", "atomic"), ("b", "atomic", "atomic")], shard_size=4, prompt_ids_for=_ids)
+            q = WorkQueue(Path(td), items)
+            self.assertEqual(q.lease("w1")["item"]["model"], "a")
+            self.assertEqual(q.lease("w2")["item"]["model"], "b")  # a is busy on w1
+            self.assertEqual(q.lease("w2", prefer_model="b")["item"]["model"], "b")
+            self.assertEqual(q.lease("w3", models=["a"])["item"]["model"], "a")
+            self.assertIsNone(q.lease("w4", models=["c"]))
+
+    def test_restart_keeps_done_items_and_merged_totals(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            jobs = [("m", "atomic", "atomic")]
+            q = WorkQueue(Path(td), make_items(jobs, shard_size=4, prompt_ids_for=_ids))
+            g = q.lease("w1")
+            q.complete(g["lease_id"], "w1", g["item"]["item_id"], _result())
+            q.lease("w1")  # in flight when the coordinator dies
+
+            q2 = WorkQueue(Path(td), make_items(jobs, shard_size=4, prompt_ids_for=_ids))
+            states = sorted(it.state for it in q2.items.values())
+            self.assertEqual(states, [DONE, PENDING])
+            job = q2.jobs()[0]
+            self.assertEqual((job["passed"], job["total"], job["shards_done"], job["complete"]), (1, 2, 1, False))
+
+    def test_rows_of_an_item_not_journaled_done_are_dropped_on_restart(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            jobs = [("m", "atomic", "atomic")]
+            q = WorkQueue(Path(td), make_items(jobs, shard_size=4, prompt_ids_for=_ids))
+            g = q.lease("w1")
+            q.complete(g["lease_id"], "w1", g["item"]["item_id"], _result())
+            g = q.lease("w1")
+            # Coordinator dies after streaming the rows but before the DONE line.
+            q._store_result(q.items[g["item"]["item_id"]], _result())
+            with q.results_path.open("a") as f:
+                f.write('{"item_id": "torn')
+
+            q2 = WorkQueue(Path(td), make_items(jobs, shard_size=4, prompt_ids_for=_ids))
+            g2 = q2.lease("w2")
+            self.assertEqual(g2["item"]["item_id"], g["item"]["item_id"])
+            q2.complete(g2["lease_id"], "w2", g2["item"]["item_id"], _result())
+            rows = [json.loads(ln) for ln in q2.results_path.read_text().splitlines()]
+            self.assertEqual(sorted(r["worker_id"] for r in rows), ["w1", "w2"])
+
+
+class TestCoordinatorApi(unittest.TestCase):
+    def test_missing_or_malformed_fields_are_a_400(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            queue = WorkQueue(Path(td), make_items([("m", "atomic", "atomic")], shard_size=4, prompt_ids_for=_ids))
+            server = CoordinatorServer(queue, "127.0.0.1", 0)
+            server.serve_in_thread()
+            try:
+                client = CoordinatorClient(server.url)
+                for path, body in (("/complete", {"lease_id": "x"}), ("/lease", {}), ("/heartbeat", []),
+                                   ("/fail", {"lease_id": "x", "worker_id": 1, "item_id": "i"}),
+                                   ("/complete", {"lease_id": "x", "worker_id": "w", "item_id": "i", "result": [1]})):
+                    with self.assertRaises(urllib.error.HTTPError) as ctx:
+                        client.post(path, body)
+                    self.assertEqual(ctx.exception.code, 400, (path, body))
+                self.assertIsNotNone(client.post("/lease", {"worker_id": "w1"})["item"])
+            finally:
+                server.shutdown()
+                server.server_close()
+
+
+class TestEndToEnd(unittest.TestCase):
+    def test_local_workers_survive_a_dead_host(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            os.environ[MARKER_ENV] = td
+            jobs = [("dies", "atomic", "atomic"), ("slow", "atomic", "atomic"), ("m", "atomic", "atomic"), ("n", "atomic", "atomic")]
+            queue = WorkQueue(Path(td, "run"), make_items(jobs, shard_size=4, prompt_ids_for=_ids), lease_s=1.0)
+            server = CoordinatorServer(queue, "127.0.0.1", 0, token="s3cret")
+            ctx = mp.get_context("spawn")
+            procs = [
+                ctx.Process(target=run_worker, args=(server.url, f"w{n}", FAKE_TARGET), kwargs={"token": "s3cret", "poll_s": 0.2})
+                for n in range(3)
+            ]
+            for p in procs:
+                p.start()
+            try:
+                manifest = run_coordinator(queue, server, poll_s=0.2)
+            finally:
+                for p in procs:
+                    p.join(timeout=20)
+                    if p.is_alive():
+                        p.kill()
+
+            self.assertEqual(manifest["status"], "complete")
+            self.assertEqual(manifest["queue"]["counts"][DONE], 8)
+            died = [it for it in queue.items.values() if it.model == "dies" and it.attempts > 1]
+            self.assertTrue(died, "the killed worker's item should have been re-leased")
+            self.assertIn("lease expired", died[0].errors[0]["error"])
+            self.assertNotEqual(died[0].errors[0]["worker_id"], died[0].worker_id)
+            # The slow item outlived one lease length but heartbeats kept it.
+            self.assertEqual({it.attempts for it in queue.items.values() if it.model == "slow"}, {1})
+
+            rows = [json.loads(ln) for ln in queue.results_path.read_text().splitlines()]
+            self.assertEqual(len(rows), 4 * 7)
+            by_job = {j["model"]: j for j in manifest["jobs"]}
+            self.assertEqual((by_job["m"]["passed"], by_job["m"]["total"], by_job["m"]["complete"]), (4, 7, True))
+            self.assertEqual(by_job["m"]["failed_prompts"], ["P2", "P4", "P6"])
+            self.assertTrue(Path(td, "run", "manifest.json").exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""Unit tests for the supervisor's long-lived worker executor."""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+import tempfile
+import time
+import unittest
+from dataclasses import dataclass, field
+from pathlib import Path
+from unittest.mock import patch
+
+# Allow importing selfopt package from bench/
+HERE = os.path.dirname(__file__)
+BENCH_ROOT = os.path.abspath(os.path.join(HERE, ".."))
+if BENCH_ROOT not in sys.path:
+    sys.path.insert(0, BENCH_ROOT)
+
+from selfopt.benchmark_supervisor import JobSpec, _run_once  # noqa: E402
+from selfopt.job_executor import PhaseRequest, PhaseWorker, WorkerUnavailable  # noqa: E402
+
+FAKE_TARGET = "selfopt.test_job_executor:fake_run_phase"
+
+
+@dataclass
+class FakePhaseResult:
+    model: str
+    passed: int
+    total: int
+    failed_prompts: list[str]
+    results: list[dict] = field(default_factory=list)
+    restraint_score: float | None = None
+
+
+def fake_run_phase(model, phase, variant, timeout_s, max_retries, use_cache):
+    """Stand-in for core.run_benchmark.run_phase, behaviour selected by model name."""
+    print(f"running {model} {phase} {variant}")
+    if model == "crash":
+        os._exit(3)
+    if model == "exit":
+        sys.exit(1)
+    if model == "slow":
+        time.sleep(30)
+    return FakePhaseResult(
+        model=model,
+        passed=2,
+        total=3,
+        failed_prompts=["P3"],
+        results=[
+            {"prompt_id": "P1", "correct": True},
+            {"prompt_id": "P2", "correct": True},
+            {"prompt_id": "P3", "correct": False},
+        ],
+        restraint_score=0.5,
+    )
+
+
+def _req(model: str, td: str = "") -> PhaseRequest:
+    return PhaseRequest(
+        model=model,
+        phase="atomic",
+        variant="atomic",
+        timeout_s=5,
+        max_retries=1,
+        stdout_log=os.path.join(td, f"{model}.stdout.log") if td else "",
+    )
+
+
+class TestPhaseWorker(unittest.TestCase):
+    def test_returns_structured_result_and_reuses_process(self) -> None:
+        with tempfile.TemporaryDirectory() as td, PhaseWorker(target=FAKE_TARGET) as worker:
+            first = worker.run(_req("m1", td))
+            second = worker.run(_req("m2", td))
+
+            self.assertTrue(first.ok)
+            self.assertEqual(first.phase_result["passed"], 2)
+            self.assertEqual(first.phase_result["failed_prompts"], ["P3"])
+            self.assertEqual(first.worker_pid, second.worker_pid)
+            self.assertEqual(second.worker_jobs_served, 2)
+            self.assertIn("running m1 atomic atomic", Path(td, "m1.stdout.log").read_text())
+
+    def test_job_error_keeps_worker(self) -> None:
+        with PhaseWorker(target=FAKE_TARGET) as worker:
+            bad = worker.run(_req("exit"))
+            good = worker.run(_req("m1"))
+
+        self.assertFalse(bad.ok)
+        self.assertFalse(bad.crashed)
+        self.assertIn("SystemExit", bad.error)
+        self.assertTrue(good.ok)
+        self.assertEqual(bad.worker_pid, good.worker_pid)
+
+    def test_crash_is_isolated_and_worker_replaced(self) -> None:
+        with PhaseWorker(target=FAKE_TARGET) as worker:
+            crashed = worker.run(_req("crash"))
+            after = worker.run(_req("m1"))
+
+            self.assertFalse(crashed.ok)
+            self.assertTrue(crashed.crashed)
+            self.assertIn("exitcode=3", crashed.error)
+            self.assertTrue(after.ok)
+            self.assertNotEqual(crashed.worker_pid, after.worker_pid)
+            self.assertEqual(worker.restarts, 1)
+
+    def test_deadline_kills_worker(self) -> None:
+        with PhaseWorker(target=FAKE_TARGET) as worker:
+            out = worker.run(_req("slow"), deadline_s=0.5)
+            self.assertTrue(out.timed_out)
+            self.assertIsNone(worker.pid)
+
+    def test_recycles_after_max_jobs(self) -> None:
+        with PhaseWorker(target=FAKE_TARGET, max_jobs=2) as worker:
+            pids = [worker.run(_req("m")).worker_pid for _ in range(3)]
+        self.assertEqual(pids[0], pids[1])
+        self.assertNotEqual(pids[1], pids[2])
+
+    def test_unloadable_target_marks_worker_unavailable(self) -> None:
+        worker = PhaseWorker(target="selfopt.no_such_module:run_phase")
+        with self.assertRaises(WorkerUnavailable):
+            worker.run(_req("m1"))
+        self.assertIn("no_such_module", worker.unavailable)
+
+
+class TestRunOnceWorkerMode(unittest.TestCase):
+    def test_summary_and_debug_log_come_from_phase_result(self) -> None:
+        with tempfile.TemporaryDirectory() as td, PhaseWorker(target=FAKE_TARGET) as worker:
+            res = _run_once(
+                run_dir=Path(td),
+                run_id="r-worker",
+                idx=1,
+                spec=JobSpec("lfm2.5-thinking:1.2b", "atomic", "atomic", [""]),
+                timeout_s=5,
+                retries=1,
+                suite=None,
+                executor=worker,
+            )
+            rows = [json.loads(line) for line in Path(res["debug_log"]).read_text().splitlines()]
+
+        self.assertEqual(res["executor"], "worker")
+        self.assertEqual(res["rc"], 0)
+        self.assertEqual(res["summary"]["passed"], 2)
+        self.assertEqual(res["summary"]["total"], 3)
+        self.assertEqual(res["summary"]["failed_prompts"], ["P3"])
+        self.assertEqual(res["served_by"], "lfm2.5-thinking:1.2b")
+        self.assertEqual([r["prompt_id"] for r in rows], ["P1", "P2", "P3"])
+
+    def test_flags_the_worker_cannot_express_go_to_the_subprocess(self) -> None:
+        class _CP:
+            returncode = 0
+            stdout = "Results: 1/1 passed\n"
+            stderr = ""
+
+        cases = [
+            ([""], False, "worker"),
+            (["--no-cache"], False, "worker"),
+            ([""], True, "subprocess"),
+            (["--prompt-ids", "P1"], False, "subprocess"),
+        ]
+        with tempfile.TemporaryDirectory() as td, PhaseWorker(target=FAKE_TARGET) as worker, \
+                patch("selfopt.benchmark_supervisor.subprocess.run", return_value=_CP()) as run:
+            for extra, warmup, executor in cases:
+                res = _run_once(
+                    run_dir=Path(td),
+                    run_id="r-route",
+                    idx=1,
+                    spec=JobSpec("lfm2.5-thinking:1.2b", "atomic", "atomic", extra),
+                    timeout_s=5,
+                    retries=1,
+                    suite=None,
+                    enable_warmup=warmup,
+                    executor=worker,
+                )
+                self.assertEqual(res["executor"], executor, (extra, warmup))
+        self.assertEqual(run.call_count, 2)
+        self.assertIn("--enable-warmup", run.call_args_list[0].args[0])
+        self.assertIn("--prompt-ids", run.call_args_list[1].args[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
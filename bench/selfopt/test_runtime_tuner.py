@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""Unit tests for the runtime-option auto-tuner."""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# Allow importing selfopt package from bench/
+HERE = os.path.dirname(__file__)
+BENCH_ROOT = os.path.abspath(os.path.join(HERE, ".."))
+for p in (BENCH_ROOT, os.path.join(BENCH_ROOT, "openclaw_llm_bench")):
+    if p not in sys.path:
+        sys.path.insert(0, p)
+
+from selfopt.runtime_tuner import (  # noqa: E402
+    OPTION_KEYS,
+    TUNING_KEY,
+    OllamaTarget,
+    Sample,
+    Tuner,
+    thread_candidates,
+    write_best,
+)
+from utils.mock_llm_server import MockConfig, MockLLMServer, Recording, RecordingStore  # noqa: E402
+import run_bench  # noqa: E402
+
+PROMPTS = [{"id": f"P{i}", "prompt": f"prompt {i}"} for i in range(8)]
+
+
+class FakeTarget:
+    """Decode speed peaks at 4 threads; batch size only helps prefill; 16 threads fails to load."""
+
+    name = "ollama"
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.loads: list[dict] = []
+
+    def space(self) -> dict:
+        return {"num_thread": [2, 4, 8, 16], "num_batch": [128, 512]}
+
+    def concurrency(self, options: dict) -> int:
+        return 1
+
+    def prepare(self, model: str, options: dict):
+        self.loads.append(dict(options))
+        return "out of memory" if options.get("num_thread") == 16 else None
+
+    def generate(self, model, prompt_id, prompt, options, max_tokens) -> Sample:
+        self.calls += 1
+        decode = {2: 8.0, 4: 12.0, 8: 10.0}.get(options.get("num_thread"), 9.0)
+        prefill = 200.0 if options.get("num_batch") == 512 else 100.0
+        return Sample(prompt_id, prompt_tokens=50, prompt_s=50 / prefill, eval_tokens=60, eval_s=60 / decode)
+
+
+class TestTuner(unittest.TestCase):
+    def test_picks_fastest_threads_and_ignores_knobs_without_gain(self) -> None:
+        target = FakeTarget()
+        report = Tuner(target, "m", PROMPTS, objective="decode", log=lambda _: None).run()
+        self.assertEqual(report["best"]["options"], {"num_thread": 4})
+        self.assertAlmostEqual(report["gain_pct"], 33.3, places=1)
+        self.assertEqual([h["accepted"] for h in report["history"]], [True, False])
+        failed = [t for t in report["trials"] if t["options"].get("num_thread") == 16]
+        self.assertEqual((failed[0]["error"], failed[0]["n_prompts"]), ("out of memory", 0))
+
+    def test_halving_prunes_prompt_runs(self) -> None:
+        target = FakeTarget()
+        report = Tuner(target, "m", PROMPTS, objective="prefill", log=lambda _: None).run()
+        self.assertEqual(report["best"]["options"], {"num_batch": 512})
+        # Full grid cost: every distinct config on every prompt.
+        self.assertLess(target.calls, report["n_trials"] * len(PROMPTS))
+        self.assertEqual(report["n_prompt_runs"], target.calls)
+        losers = [t for t in report["trials"] if t["options"].get("num_thread") == 2]
+        self.assertLess(losers[0]["n_prompts"], len(PROMPTS))
+
+    def test_thread_candidates(self) -> None:
+        self.assertEqual(thread_candidates(16), [4, 8, 12, 16])
+        self.assertEqual(thread_candidates(1), [1])
+
+    def test_ollama_target_reads_server_counters(self) -> None:
+        store = RecordingStore([Recording("m", "one two three four", output_tokens=4)])
+        server = MockLLMServer(store, port=0, config=MockConfig(ttft_ms=20, tokens_per_s=200))
+        server.start()
+        try:
+            target = OllamaTarget(server.url)
+            self.assertIsNone(target.prepare("m", {"num_thread": 4}))
+            sample = target.generate("m", "P1", "hello there", {"num_thread": 4}, 64)
+        finally:
+            server.shutdown()
+            server.server_close()
+        self.assertIsNone(sample.error)
+        self.assertEqual((sample.eval_tokens, sample.prompt_tokens), (4, 2))
+        self.assertGreater(sample.eval_s, 0.01)
+        self.assertGreater(sample.prompt_s, 0.01)
+
+
+class TestWriteBack(unittest.TestCase):
+    def test_write_best_updates_entry_and_harness_reads_it(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            path = Path(td, "phase2_config.json")
+            path.write_text(json.dumps({"models": {"qwen3.5:9b": {"temperature": 0.0, "variants": {}}},
+                                        "timeout_seconds": 60}, indent=2))
+            report = Tuner(FakeTarget(), "qwen3.5:9b", PROMPTS, objective="decode", log=lambda _: None).run()
+            self.assertTrue(write_best(report, path))
+            self.assertFalse(write_best({**report, "model": "absent"}, path))
+
+            entry = json.loads(path.read_text())["models"]["qwen3.5:9b"]
+            self.assertEqual(entry[OPTION_KEYS["ollama"]], {"num_thread": 4})
+            self.assertEqual(entry[TUNING_KEY]["ollama"]["objective"], "decode")
+            self.assertEqual(entry["variants"], {})
+
+            saved = run_bench.PHASE2_CONFIG_PATH
+            run_bench.PHASE2_CONFIG_PATH = str(path)
+            run_bench._RUNTIME_OPTIONS.clear()
+            try:
+                opts = run_bench.ollama_reasoning_profile("qwen3.5:9b", None)["options"]
+                untuned = run_bench.ollama_reasoning_profile("mistral:7b", None)["options"]
+            finally:
+                run_bench.PHASE2_CONFIG_PATH = saved
+                run_bench._RUNTIME_OPTIONS.clear()
+            self.assertEqual(opts, {"temperature": 0, "num_predict": 512, "num_thread": 4})
+            self.assertEqual(untuned, {"temperature": 0})
+
+
+if __name__ == "__main__":
+    unittest.main()
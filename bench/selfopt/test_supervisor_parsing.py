@@ -3,9 +3,11 @@
 
 from __future__ import annotations
 
+import json
 import os
 import sys
 import tempfile
+import textwrap
 import unittest
 from pathlib import Path
 from unittest.mock import patch
@@ -19,9 +21,23 @@ if BENCH_ROOT not in sys.path:
 from selfopt.benchmark_supervisor import (  # noqa: E402
     DEFAULT_JOBS,
     JobSpec,
+    _job_key,
+    _order_jobs,
     _parse_summary_from_stdout,
     _run_once,
 )
+from selfopt.baseline_tracker import run_metrics  # noqa: E402
+
+# Stands in for core/run_benchmark.py: honours --prompt-log and prints the summary box line.
+FAKE_RUNNER = textwrap.dedent("""
+    import json, sys
+    path = sys.argv[sys.argv.index("--prompt-log") + 1]
+    rows = [{"prompt_id": f"P{i}", "correct": i != 3, "latency_ms": 100.0 * i, "tokens_per_second": 20.0 + i}
+            for i in range(1, 5)]
+    with open(path, "w") as f:
+        f.writelines(json.dumps(r) + "\\n" for r in rows)
+    print("Results: 3/4 passed")
+""")
 
 
 class TestSupervisorSummaryParsing(unittest.TestCase):
@@ -91,6 +107,29 @@ class TestSupervisorSummaryParsing(unittest.TestCase):
             ["fallback_model", "original_model", "served_by", "used_fallback"],
         )
 
+    def test_subprocess_runner_writes_per_prompt_rows(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            runner = Path(td) / "fake_runner.py"
+            runner.write_text(FAKE_RUNNER)
+            with patch("selfopt.benchmark_supervisor.RUNNER", runner):
+                res = _run_once(
+                    run_dir=Path(td),
+                    run_id="r-subproc",
+                    idx=1,
+                    spec=JobSpec("lfm2.5-thinking:1.2b", "atomic", "atomic", []),
+                    timeout_s=5,
+                    retries=1,
+                    suite=None,
+                )
+            rows = [json.loads(line) for line in Path(res["debug_log"]).read_text().splitlines()]
+
+        self.assertEqual((res["executor"], res["rc"]), ("subprocess", 0))
+        self.assertEqual(res["cmd"][res["cmd"].index("--prompt-log") + 1], res["debug_log"])
+        self.assertEqual((res["summary"]["passed"], res["summary"]["total"]), (3, 4))
+        self.assertEqual(res["summary"]["failed_prompts"], ["P3"])
+        metrics = run_metrics({"accuracy": 0.75}, rows)
+        self.assertEqual((metrics["latency_p50_ms"], metrics["tps_median"]), (250.0, 22.5))
+
     def test_attribution_fields_can_represent_fallback_run(self) -> None:
         result = {
             "used_fallback": True,
@@ -104,6 +143,13 @@ class TestSupervisorSummaryParsing(unittest.TestCase):
         self.assertEqual(result["original_model"], "lfm2.5-thinking:1.2b")
         self.assertEqual(result["fallback_model"], "qwen2.5:3b")
 
+    def test_resumed_run_keeps_saved_job_order(self) -> None:
+        jobs = [JobSpec(*j) for j in DEFAULT_JOBS]
+        saved = [_job_key(j) for j in reversed(jobs)]
+
+        self.assertEqual(_order_jobs(jobs, None), jobs)
+        self.assertEqual([_job_key(j) for j in _order_jobs(jobs, None, saved)], saved)
+
     def test_parse_when_no_summary_present(self) -> None:
         sample = "No benchmark summary in this output"
         passed, total, failed = _parse_summary_from_stdout(sample)
@@ -0,0 +1,382 @@
+#!/usr/bin/env python3
+"""
+Content-addressed, compressed storage for large text fields in result archives.
+
+Provides:
+1. BlobStore: an append-only pack file of compressed blobs plus a fixed-width
+   binary index (sha256 -> offset, length, size, codec), deduplicated by
+   content, so a model answer repeated across reruns and cache files is
+   stored once
+2. Lazy reads: the pack is mmap'ed and a blob is located and decompressed
+   only when a reader resolves its reference
+3. Row helpers: pack_row() swaps `raw_output` / `assistant_content` values
+   above INLINE_MAX bytes for {"blob": <sha256>, "size": <bytes>} references,
+   and resolve() turns either form back into text
+4. find_store(): the `blobs/` directory in the nearest ancestor of an archive
+   file, so readers need no extra arguments
+5. A CLI to migrate existing results.jsonl / result JSON archives in place,
+   print store stats, or cat one blob
+
+Blobs are zstd frames when the optional `zstandard` package is importable,
+zlib otherwise; the codec is recorded per blob, so stores written on either
+kind of host stay readable wherever zstandard is installed. Summaries and
+reports that only need latencies and pass/fail flags never touch the pack.
+"""
+
+import argparse
+import fcntl
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+import threading
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+try:
+    import zstandard  # optional: pip install zstandard
+except ImportError:  # pragma: no cover - depends on the host
+    zstandard = None
+
+
+# =============================================================================
+# Configuration
+# =============================================================================
+
+STORE_DIRNAME = "blobs"
+PACK_FILE = "blobs.pack"
+INDEX_FILE = "blobs.idx"
+# Text fields of result rows that hold whole model outputs.
+TEXT_FIELDS = ("raw_output", "assistant_content")
+# Shorter values stay inline: a reference would not be smaller.
+INLINE_MAX = 256
+ZSTD_LEVEL = 9
+ZLIB_LEVEL = 6
+
+CODEC_RAW, CODEC_ZLIB, CODEC_ZSTD = 0, 1, 2
+CODEC_NAMES = {CODEC_RAW: "raw", CODEC_ZLIB: "zlib", CODEC_ZSTD: "zstd"}
+DEFAULT_CODEC = CODEC_ZSTD if zstandard is not None else CODEC_ZLIB
+
+# digest, pack offset, stored length, raw size, codec
+_RECORD = struct.Struct("<32sQIIB")
+
+
+# =============================================================================
+# Codecs
+# =============================================================================
+
+def compress(data: bytes, codec: int) -> Tuple[bytes, int]:
+    """(payload, codec actually used); data that does not shrink is stored raw."""
+    if codec == CODEC_ZSTD:
+        if zstandard is None:
+            raise RuntimeError("zstd codec requested but the zstandard package is not installed")
+        out = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+    elif codec == CODEC_ZLIB:
+        out = zlib.compress(data, ZLIB_LEVEL)
+    else:
+        return data, CODEC_RAW
+    return (out, codec) if len(out) < len(data) else (data, CODEC_RAW)
+
+
+def decompress(payload: bytes, codec: int, size: int) -> bytes:
+    if codec == CODEC_ZSTD:
+        if zstandard is None:
+            raise RuntimeError("blob is zstd-compressed; install zstandard to read it")
+        return zstandard.ZstdDecompressor().decompress(payload, max_output_size=size)
+    if codec == CODEC_ZLIB:
+        return zlib.decompress(payload)
+    return bytes(payload)
+
+
+# =============================================================================
+# Store
+# =============================================================================
+
+def is_ref(value: Any) -> bool:
+    return isinstance(value, dict) and isinstance(value.get("blob"), str) and set(value) <= {"blob", "size"}
+
+
+class BlobStore:
+    """
+    Append-only pack + index under `root`, deduplicated by sha256.
+
+    Writers append the compressed blob, then its index record, under an
+    exclusive flock on the pack, so several processes can share one store
+    and a crash leaves at most unreferenced pack bytes. Readers load the
+    index once (re-reading only its new tail on a miss) and slice blobs out
+    of an mmap of the pack.
+    """
+
+    def __init__(self, root: Path, codec: int = DEFAULT_CODEC):
+        self.root = Path(root)
+        self.codec = codec
+        self.pack_path = self.root / PACK_FILE
+        self.index_path = self.root / INDEX_FILE
+        self._index: Dict[bytes, Tuple[int, int, int, int]] = {}
+        self._index_bytes = 0
+        self._map: Optional[mmap.mmap] = None
+        self._map_file = None
+        self._lock = threading.Lock()
+        self.puts = 0
+        self.dedup_hits = 0
+
+    # -- index ----------------------------------------------------------------
+
+    def _refresh(self) -> None:
+        """Read index records appended since the last refresh (by any writer)."""
+        try:
+            with open(self.index_path, "rb") as f:
+                f.seek(self._index_bytes)
+                data = f.read()
+        except FileNotFoundError:
+            return
+        usable = len(data) - len(data) % _RECORD.size  # ignore a torn last record
+        for digest, offset, length, size, codec in _RECORD.iter_unpack(data[:usable]):
+            self._index[digest] = (offset, length, size, codec)
+        self._index_bytes += usable
+
+    def __contains__(self, digest: str) -> bool:
+        key = bytes.fromhex(digest)
+        if key not in self._index:
+            self._refresh()
+        return key in self._index
+
+    def __len__(self) -> int:
+        self._refresh()
+        return len(self._index)
+
+    # -- write ----------------------------------------------------------------
+
+    def put(self, text: str) -> str:
+        """Store `text` (once per distinct content) and return its sha256 hex digest."""
+        data = text.encode("utf-8")
+        key = hashlib.sha256(data).digest()
+        with self._lock:
+            self.puts += 1
+            if key in self._index:
+                self.dedup_hits += 1
+                return key.hex()
+            self.root.mkdir(parents=True, exist_ok=True)
+            with open(self.pack_path, "ab") as pack:
+                fcntl.flock(pack.fileno(), fcntl.LOCK_EX)
+                try:
+                    self._refresh()
+                    if key in self._index:
+                        self.dedup_hits += 1
+                        return key.hex()
+                    payload, codec = compress(data, self.codec)
+                    offset = pack.seek(0, os.SEEK_END)
+                    pack.write(payload)
+                    pack.flush()
+                    record = _RECORD.pack(key, offset, len(payload), len(data), codec)
+                    with open(self.index_path, "ab") as idx:
+                        if idx.tell() != self._index_bytes:
+                            # A crashed writer left a torn record; appending after it would misalign every later one.
+                            idx.truncate(self._index_bytes)
+                        idx.write(record)
+                    self._index[key] = (offset, len(payload), len(data), codec)
+                    self._index_bytes += _RECORD.size
+                finally:
+                    fcntl.flock(pack.fileno(), fcntl.LOCK_UN)
+        return key.hex()
+
+    def pack(self, value: Any, inline_max: int = INLINE_MAX) -> Any:
+        """`value` itself, or a blob reference when it is a string longer than `inline_max` bytes."""
+        if not isinstance(value, str) or len(value) <= inline_max:
+            return value
+        size = len(value.encode("utf-8"))
+        if size <= inline_max:
+            return value
+        return {"blob": self.put(value), "size": size}
+
+    # -- read -----------------------------------------------------------------
+
+    def _view(self, end: int) -> mmap.mmap:
+        if self._map is None or len(self._map) < end:
+            self.close()
+            self._map_file = open(self.pack_path, "rb")
+            self._map = mmap.mmap(self._map_file.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._map
+
+    def get(self, digest: str) -> str:
+        key = bytes.fromhex(digest)
+        with self._lock:
+            entry = self._index.get(key)
+            if entry is None:
+                self._refresh()
+                entry = self._index.get(key)
+            if entry is None:
+                raise KeyError(f"blob {digest} not in {self.root}")
+            offset, length, size, codec = entry
+            payload = self._view(offset + length)[offset:offset + length]
+        return decompress(payload, codec, size).decode("utf-8")
+
+    def resolve(self, value: Any) -> Any:
+        """Text behind a blob reference; any other value is returned unchanged."""
+        return self.get(value["blob"]) if is_ref(value) else value
+
+    def close(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._map_file is not None:
+            self._map_file.close()
+            self._map_file = None
+
+    def stats(self) -> Dict[str, Any]:
+        self._refresh()
+        raw = sum(e[2] for e in self._index.values())
+        stored = self.pack_path.stat().st_size if self.pack_path.exists() else 0
+        codecs: Dict[str, int] = {}
+        for e in self._index.values():
+            name = CODEC_NAMES.get(e[3], str(e[3]))
+            codecs[name] = codecs.get(name, 0) + 1
+        return {
+            "root": str(self.root),
+            "blobs": len(self._index),
+            "raw_bytes": raw,
+            "pack_bytes": stored,
+            "index_bytes": self._index_bytes,
+            "ratio": round(raw / stored, 2) if stored else None,
+            "codecs": codecs,
+            "default_codec": CODEC_NAMES[self.codec],
+        }
+
+
+# =============================================================================
+# Locating stores and rewriting rows
+# =============================================================================
+
+_STORES: Dict[str, BlobStore] = {}
+
+
+def open_store(root: Path) -> BlobStore:
+    """One shared BlobStore per directory (keeps a single mmap per reader process)."""
+    key = str(Path(root).resolve())
+    if key not in _STORES:
+        _STORES[key] = BlobStore(Path(key))
+    return _STORES[key]
+
+
+def find_store(path: Path) -> Optional[BlobStore]:
+    """Store in `<ancestor>/blobs` nearest to `path` (an archive file or directory), if any."""
+    path = Path(path).resolve()
+    for parent in ([path] if path.is_dir() else []) + list(path.parents):
+        if (parent / STORE_DIRNAME / INDEX_FILE).exists():
+            return open_store(parent / STORE_DIRNAME)
+    return None
+
+
+def resolve(value: Any, store: Optional[BlobStore]) -> Any:
+    """Text for a possibly-packed field; references without a store resolve to None."""
+    if not is_ref(value):
+        return value
+    return store.get(value["blob"]) if store is not None else None
+
+
+def pack_row(row: Dict[str, Any], store: BlobStore, fields: Iterable[str] = TEXT_FIELDS) -> Dict[str, Any]:
+    """Copy of `row` with its large text fields moved into `store`."""
+    out = dict(row)
+    for name in fields:
+        if name in out:
+            out[name] = store.pack(out[name])
+    return out
+
+
+def pack_results_jsonl(path: Path, store: BlobStore) -> int:
+    """Rewrite a results.jsonl in place with packed rows; returns rows changed."""
+    path = Path(path)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    changed = 0
+    with path.open(encoding="utf-8") as src, tmp.open("w", encoding="utf-8") as dst:
+        for line in src:
+            try:
+                row = json.loads(line)
+            except ValueError:
+                dst.write(line)
+                continue
+            packed = pack_row(row, store) if isinstance(row, dict) else row
+            if packed != row:
+                changed += 1
+                line = json.dumps(packed, ensure_ascii=False) + "\n"
+            dst.write(line)
+    os.replace(tmp, path)
+    return changed
+
+
+def pack_result_json(path: Path, store: BlobStore) -> int:
+    """Rewrite a result JSON (`results` list, or a cache file's `result.results`) in place."""
+    path = Path(path)
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return 0
+    holder = data.get("result") if isinstance(data, dict) and isinstance(data.get("result"), dict) else data
+    rows = holder.get("results") if isinstance(holder, dict) else None
+    if not isinstance(rows, list):
+        return 0
+    changed = 0
+    for i, row in enumerate(rows):
+        if isinstance(row, dict):
+            packed = pack_row(row, store)
+            if packed != row:
+                rows[i] = packed
+                changed += 1
+    if changed:
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        tmp.write_text(json.dumps(data, indent=2), encoding="utf-8")
+        os.replace(tmp, path)
+    return changed
+
+
+def pack_tree(paths: List[Path], store: BlobStore) -> Dict[str, int]:
+    """Pack every *.jsonl / *.json archive under `paths`, skipping the store itself."""
+    counts = {"files": 0, "rows": 0}
+    for top in paths:
+        top = Path(top)
+        files = [top] if top.is_file() else sorted(p for p in top.rglob("*") if p.is_file())
+        for f in files:
+            if store.root in f.parents or f.suffix not in (".jsonl", ".json"):
+                continue
+            n = pack_results_jsonl(f, store) if f.suffix == ".jsonl" else pack_result_json(f, store)
+            counts["files"] += 1 if n else 0
+            counts["rows"] += n
+    return counts
+
+
+# =============================================================================
+# CLI
+# =============================================================================
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Content-addressed blob store for result archives.")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    p_pack = sub.add_parser("pack", help="Move large text fields of existing archives into a store")
+    p_pack.add_argument("paths", nargs="+", type=Path, help="results.jsonl / result JSON files or directories")
+    p_pack.add_argument("--store", type=Path, default=None,
+                        help=f"Store directory (default: <first path's directory>/{STORE_DIRNAME})")
+    p_stats = sub.add_parser("stats", help="Blob count, raw vs packed bytes, codecs")
+    p_stats.add_argument("store", type=Path)
+    p_cat = sub.add_parser("cat", help="Print one blob")
+    p_cat.add_argument("store", type=Path)
+    p_cat.add_argument("digest")
+    args = ap.parse_args()
+
+    if args.cmd == "pack":
+        first = args.paths[0]
+        root = args.store or ((first if first.is_dir() else first.parent) / STORE_DIRNAME)
+        store = open_store(root)
+        counts = pack_tree(args.paths, store)
+        print(json.dumps({**counts, **store.stats()}, indent=2))
+    elif args.cmd == "stats":
+        print(json.dumps(open_store(args.store).stats(), indent=2))
+    else:
+        sys.stdout.write(open_store(args.store).get(args.digest))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
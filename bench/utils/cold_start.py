@@ -0,0 +1,462 @@
+#!/usr/bin/env python3
+"""
+Cold-start vs warm-state latency for Ollama models.
+
+Provides:
+1. Three start states measured on purpose, not by accident of job order:
+   - cold:            runner stopped and the weight files dropped from the page
+                      cache (optionally the server restarted), so the load reads disk
+   - evicted_cached:  runner stopped but the weights still in the page cache,
+                      so the load maps RAM
+   - warm:            model resident; steady-state requests
+2. Page-cache residency of the model's weight files before every sample
+   (mincore), plus targeted eviction (posix_fadvise DONTNEED) and priming
+3. Client TTFT, end-to-end latency, server-reported load time and decode
+   tok/s per sample from the native /api/chat NDJSON stream
+4. Per-model, per-state summaries with model file size and the cold and
+   cached penalties over warm TTFT
+
+`ensure_ollama_idle` followed by a normal suite folds whatever load the next
+request pays into P1 latency, and whether that load hits disk or RAM depends
+on what ran before. Bursty on-demand workloads care about each case apart.
+"""
+
+import argparse
+import ctypes
+import ctypes.util
+import json
+import mmap
+import os
+import shlex
+import statistics
+import subprocess
+import time
+import urllib.error
+import urllib.request
+import uuid
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from utils.model_residency import OllamaResidency
+from utils.prompt_corpora import COMPARE_PROMPTS
+
+
+# =============================================================================
+# Configuration
+# =============================================================================
+
+STATES = ("cold", "evicted_cached", "warm")
+DEFAULT_REPS = 3
+DEFAULT_WARM_REQUESTS = 3
+DEFAULT_MAX_TOKENS = 64
+DEFAULT_TIMEOUT_S = 900.0
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+# mincore() is run over windows of this size so the residency vector stays small.
+MINCORE_WINDOW = 1 << 30
+READ_CHUNK = 8 << 20
+
+
+# =============================================================================
+# Page cache
+# =============================================================================
+
+_libc = None
+
+
+def _load_libc():
+    global _libc
+    if _libc is None:
+        path = ctypes.util.find_library("c")
+        if not path:
+            _libc = False
+            return _libc
+        libc = ctypes.CDLL(path, use_errno=True)
+        libc.mmap.restype = ctypes.c_void_p
+        libc.mmap.argtypes = [ctypes.c_void_p, ctypes.c_size_t, ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_long]
+        libc.munmap.argtypes = [ctypes.c_void_p, ctypes.c_size_t]
+        libc.mincore.argtypes = [ctypes.c_void_p, ctypes.c_size_t, ctypes.POINTER(ctypes.c_ubyte)]
+        _libc = libc
+    return _libc
+
+
+def _resident_pages(fd: int, size: int) -> Optional[int]:
+    libc = _load_libc()
+    if not libc:
+        return None
+    resident = 0
+    for offset in range(0, size, MINCORE_WINDOW):
+        length = min(MINCORE_WINDOW, size - offset)
+        addr = libc.mmap(None, length, mmap.PROT_READ, mmap.MAP_SHARED, fd, offset)
+        if addr in (None, ctypes.c_void_p(-1).value):
+            return None
+        try:
+            n_pages = (length + PAGE_SIZE - 1) // PAGE_SIZE
+            vec = (ctypes.c_ubyte * n_pages)()
+            if libc.mincore(addr, length, vec) != 0:
+                return None
+            resident += sum(b & 1 for b in vec)
+        finally:
+            libc.munmap(addr, length)
+    return resident
+
+
+def page_cache_fraction(paths: Iterable[str]) -> Optional[float]:
+    """
+    Share of the files' pages currently in the page cache, or None if unknown.
+
+    Args:
+        paths: Weight files of one model
+
+    Returns:
+        0.0 (fully on disk) .. 1.0 (fully cached); None without mincore()
+    """
+    total = resident = 0
+    for path in paths:
+        try:
+            size = os.path.getsize(path)
+            if not size:
+                continue
+            fd = os.open(path, os.O_RDONLY)
+        except OSError:
+            return None
+        try:
+            pages = _resident_pages(fd, size)
+        finally:
+            os.close(fd)
+        if pages is None:
+            return None
+        total += (size + PAGE_SIZE - 1) // PAGE_SIZE
+        resident += pages
+    return round(resident / total, 4) if total else None
+
+
+def evict_page_cache(paths: Iterable[str]) -> bool:
+    """
+    Drop the files' clean pages from the page cache (no root needed).
+
+    Pages still mapped by a live runner stay, so stop the model first.
+    """
+    if not hasattr(os, "posix_fadvise"):
+        return False
+    ok = True
+    for path in paths:
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except OSError:
+            ok = False
+            continue
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        except OSError:
+            ok = False
+        finally:
+            os.close(fd)
+    return ok
+
+
+def prime_page_cache(paths: Iterable[str]) -> float:
+    """Read the files once so they are cached; returns seconds spent."""
+    started = time.perf_counter()
+    for path in paths:
+        try:
+            with open(path, "rb", buffering=0) as f:
+                while f.read(READ_CHUNK):
+                    pass
+        except OSError:
+            continue
+    return time.perf_counter() - started
+
+
+# =============================================================================
+# Measurement
+# =============================================================================
+
+@dataclass
+class StartSample:
+    """One request in one start state."""
+    model: str
+    state: str
+    rep: int
+    ttft_ms: Optional[float] = None
+    e2e_ms: Optional[float] = None
+    load_ms: Optional[float] = None
+    prompt_eval_ms: Optional[float] = None
+    eval_count: Optional[int] = None
+    decode_tps: Optional[float] = None
+    page_cache_frac: Optional[float] = None
+    server_start_ms: Optional[float] = None
+    error: Optional[str] = None
+
+
+def stream_ttft(
+    base_url: str,
+    model: str,
+    prompt: str,
+    max_tokens: int = DEFAULT_MAX_TOKENS,
+    timeout_s: float = DEFAULT_TIMEOUT_S,
+) -> Dict:
+    """
+    One streamed /api/chat request; client TTFT plus the final frame's counters.
+
+    Returns:
+        Dict with ttft_ms, e2e_ms, load_ms, prompt_eval_ms, eval_count,
+        decode_tps and error (None on success)
+    """
+    payload = {
+        "model": model,
+        "messages": [{"role": "user", "content": prompt}],
+        "stream": True,
+        "options": {"temperature": 0, "num_predict": max_tokens},
+    }
+    req = urllib.request.Request(
+        f"{base_url.rstrip('/')}/api/chat",
+        data=json.dumps(payload).encode("utf-8"),
+        method="POST",
+        headers={"Content-Type": "application/json"},
+    )
+    out: Dict = {"ttft_ms": None, "e2e_ms": None, "load_ms": None, "prompt_eval_ms": None,
+                 "eval_count": None, "decode_tps": None, "error": None}
+    started = time.perf_counter()
+    final: Dict = {}
+    try:
+        with urllib.request.urlopen(req, timeout=timeout_s) as resp:
+            for raw in resp:
+                if not raw.strip():
+                    continue
+                frame = json.loads(raw)
+                if frame.get("error"):
+                    out["error"] = str(frame["error"])[:200]
+                    break
+                if out["ttft_ms"] is None and (frame.get("message") or {}).get("content"):
+                    out["ttft_ms"] = round((time.perf_counter() - started) * 1000, 1)
+                if frame.get("done"):
+                    final = frame
+    except urllib.error.HTTPError as e:
+        out["error"] = f"HTTP {e.code}"
+    except (urllib.error.URLError, OSError, ValueError) as e:
+        out["error"] = f"{type(e).__name__}: {e}"[:200]
+    out["e2e_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    # Ollama durations are nanoseconds.
+    for src, dst in (("load_duration", "load_ms"), ("prompt_eval_duration", "prompt_eval_ms")):
+        if isinstance(final.get(src), (int, float)):
+            out[dst] = round(final[src] / 1e6, 1)
+    out["eval_count"] = final.get("eval_count")
+    if out["eval_count"] and isinstance(final.get("eval_duration"), (int, float)) and final["eval_duration"] > 0:
+        out["decode_tps"] = round(out["eval_count"] / (final["eval_duration"] / 1e9), 2)
+    return out
+
+
+def wait_for_server(base_url: str, timeout_s: float = 120.0) -> bool:
+    deadline = time.monotonic() + timeout_s
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(f"{base_url.rstrip('/')}/api/version", timeout=5):
+                return True
+        except (urllib.error.URLError, OSError):
+            time.sleep(0.25)
+    return False
+
+
+class ColdStartBench:
+    """
+    Runs cold -> warm x N -> evicted_cached for each repetition of each model.
+
+    That order needs only two loads per repetition: the cold request loads
+    the model for the warm requests, and its reads leave the weights cached
+    for the evicted_cached request after the next unload.
+
+    Every request leads with a fresh nonce so no state reuses the previous
+    request's KV prefix; warm TTFT then includes the full prompt eval, like
+    the cold and evicted_cached requests it is compared with.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        *,
+        prompt: Optional[str] = None,
+        max_tokens: int = DEFAULT_MAX_TOKENS,
+        warm_requests: int = DEFAULT_WARM_REQUESTS,
+        restart_cmd: Optional[str] = None,
+        timeout_s: float = DEFAULT_TIMEOUT_S,
+        residency: Optional[OllamaResidency] = None,
+        log=print,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.prompt = prompt or COMPARE_PROMPTS[0]["prompt"]
+        self.max_tokens = max_tokens
+        self.warm_requests = max(1, warm_requests)
+        self.restart_cmd = shlex.split(restart_cmd) if restart_cmd else None
+        self.timeout_s = timeout_s
+        self.residency = residency or OllamaResidency(self.base_url)
+        self.log = log
+
+    def _request(self, model: str, state: str, rep: int, files: List[str], **extra) -> StartSample:
+        frac = page_cache_fraction(files) if files else None
+        prompt = f"[{uuid.uuid4().hex[:12]}] {self.prompt}"
+        res = stream_ttft(self.base_url, model, prompt, self.max_tokens, self.timeout_s)
+        sample = StartSample(model, state, rep, page_cache_frac=frac, **extra,
+                             **{k: res[k] for k in ("ttft_ms", "e2e_ms", "load_ms", "prompt_eval_ms",
+                                                    "eval_count", "decode_tps", "error")})
+        self.log(f"[coldstart] {model} {state:<15} rep={rep} ttft={sample.ttft_ms} ms "
+                 f"load={sample.load_ms} ms cache={frac}")
+        return sample
+
+    def _stop_everything(self) -> None:
+        for r in self.residency.resident():
+            self.residency.unload(r.name, wait=True)
+
+    def run_model(self, model: str, reps: int = DEFAULT_REPS) -> List[StartSample]:
+        files = self.residency.model_files(model)
+        samples: List[StartSample] = []
+        for rep in range(1, reps + 1):
+            # cold: nothing resident, weights off the page cache, optionally a fresh server
+            self._stop_everything()
+            evict_page_cache(files)
+            extra: Dict = {}
+            if self.restart_cmd:
+                t0 = time.perf_counter()
+                subprocess.run(self.restart_cmd, capture_output=True, timeout=300)
+                ready = wait_for_server(self.base_url)
+                extra["server_start_ms"] = round((time.perf_counter() - t0) * 1000, 1)
+                if not ready:
+                    samples.append(StartSample(model, "cold", rep, error="server did not come back", **extra))
+                    continue
+            samples.append(self._request(model, "cold", rep, files, **extra))
+
+            for _ in range(self.warm_requests):
+                samples.append(self._request(model, "warm", rep, files))
+
+            # evicted_cached: runner stopped, weights left in (or put back into) the page cache
+            self.residency.unload(model, wait=True)
+            if files and (page_cache_fraction(files) or 0.0) < 0.99:
+                prime_page_cache(files)
+            samples.append(self._request(model, "evicted_cached", rep, files))
+        return samples
+
+    def run(self, models: List[str], reps: int = DEFAULT_REPS, out_dir: Optional[Path] = None) -> Dict:
+        samples: List[StartSample] = []
+        for model in models:
+            samples.extend(self.run_model(model, reps))
+        sizes = self.residency.sizes()
+        files = {m: self.residency.model_files(m) for m in models}
+        report = summarize(samples, sizes, files)
+        if out_dir is not None:
+            out_dir.mkdir(parents=True, exist_ok=True)
+            with (out_dir / "coldstart_samples.jsonl").open("w", encoding="utf-8") as f:
+                for s in samples:
+                    f.write(json.dumps(asdict(s)) + "\n")
+            (out_dir / "coldstart_summary.json").write_text(json.dumps(report, indent=2))
+            (out_dir / "coldstart_summary.md").write_text(format_markdown(report))
+        return report
+
+
+# =============================================================================
+# Summaries
+# =============================================================================
+
+def _stats(values: List[float]) -> Dict:
+    if not values:
+        return {"p50": None, "min": None, "max": None}
+    return {"p50": round(statistics.median(values), 1), "min": min(values), "max": max(values)}
+
+
+def summarize(
+    samples: List[StartSample],
+    sizes: Optional[Dict[str, int]] = None,
+    files: Optional[Dict[str, List[str]]] = None,
+) -> Dict:
+    """
+    Per-model, per-state TTFT / load / e2e summaries.
+
+    Args:
+        samples: StartSample rows from ColdStartBench
+        sizes: Model size in bytes (from the Ollama inventory)
+        files: Weight file paths per model; their on-disk size wins over `sizes`
+
+    Returns:
+        {"models": {model: {...}}} with cold_penalty_ms / cached_penalty_ms as
+        the p50 TTFT gap to the warm state
+    """
+    sizes, files = sizes or {}, files or {}
+    models: Dict[str, Dict] = {}
+    for model in dict.fromkeys(s.model for s in samples):
+        paths = files.get(model) or []
+        on_disk = sum(os.path.getsize(p) for p in paths if os.path.isfile(p))
+        entry: Dict = {"size_bytes": on_disk or sizes.get(model, 0), "files": paths, "states": {}}
+        for state in STATES:
+            rows = [s for s in samples if s.model == model and s.state == state]
+            ok = [s for s in rows if s.error is None and s.ttft_ms is not None]
+            fracs = [s.page_cache_frac for s in rows if s.page_cache_frac is not None]
+            entry["states"][state] = {
+                "n": len(rows),
+                "errors": len(rows) - len(ok),
+                "ttft_ms": _stats([s.ttft_ms for s in ok]),
+                "e2e_ms": _stats([s.e2e_ms for s in ok]),
+                "load_ms": _stats([s.load_ms for s in ok if s.load_ms is not None]),
+                "decode_tps_p50": _stats([s.decode_tps for s in ok if s.decode_tps])["p50"],
+                "page_cache_frac_mean": round(statistics.mean(fracs), 3) if fracs else None,
+                "server_start_ms": _stats([s.server_start_ms for s in rows if s.server_start_ms is not None])["p50"],
+            }
+        warm = entry["states"]["warm"]["ttft_ms"]["p50"]
+        for state, key in (("cold", "cold_penalty_ms"), ("evicted_cached", "cached_penalty_ms")):
+            p50 = entry["states"][state]["ttft_ms"]["p50"]
+            entry[key] = round(p50 - warm, 1) if p50 is not None and warm is not None else None
+        models[model] = entry
+    return {"states": list(STATES), "models": models}
+
+
+def format_markdown(report: Dict) -> str:
+    lines = [
+        "| Model | Size GB | State | n | TTFT p50 ms | TTFT max ms | Load p50 ms | Page cache | Decode tok/s |",
+        "|---|---|---|---|---|---|---|---|---|",
+    ]
+    fmt = lambda v: "-" if v is None else str(v)  # noqa: E731
+    for model, entry in report["models"].items():
+        size_gb = round(entry["size_bytes"] / 1e9, 2) if entry["size_bytes"] else None
+        for state in report["states"]:
+            st = entry["states"][state]
+            lines.append(
+                f"| {model} | {fmt(size_gb)} | {state} | {st['n']} | {fmt(st['ttft_ms']['p50'])} | "
+                f"{fmt(st['ttft_ms']['max'])} | {fmt(st['load_ms']['p50'])} | {fmt(st['page_cache_frac_mean'])} | "
+                f"{fmt(st['decode_tps_p50'])} |"
+            )
+    lines.append("")
+    for model, entry in report["models"].items():
+        lines.append(f"- {model}: cold +{fmt(entry['cold_penalty_ms'])} ms, "
+                     f"evicted-but-cached +{fmt(entry['cached_penalty_ms'])} ms over warm TTFT")
+    return "\n".join(lines) + "\n"
+
+
+# =============================================================================
+# CLI
+# =============================================================================
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Cold vs evicted-but-cached vs warm TTFT per model.")
+    ap.add_argument("--models", required=True, help="Comma-separated model names")
+    ap.add_argument("--base-url", default=os.environ.get("OLLAMA_HOST", "http://localhost:11434"))
+    ap.add_argument("--reps", type=int, default=DEFAULT_REPS, help="Cold/cached samples per model")
+    ap.add_argument("--warm-requests", type=int, default=DEFAULT_WARM_REQUESTS, help="Warm samples per rep")
+    ap.add_argument("--max-tokens", type=int, default=DEFAULT_MAX_TOKENS)
+    ap.add_argument("--restart-cmd", default="", help='Restart the server before each cold sample, e.g. "systemctl restart ollama"')
+    ap.add_argument("--timeout-s", type=float, default=DEFAULT_TIMEOUT_S)
+    ap.add_argument("--out-dir", default="coldstart_results")
+    args = ap.parse_args()
+
+    bench = ColdStartBench(
+        args.base_url,
+        max_tokens=args.max_tokens,
+        warm_requests=args.warm_requests,
+        restart_cmd=args.restart_cmd or None,
+        timeout_s=args.timeout_s,
+    )
+    models = [m.strip() for m in args.models.split(",") if m.strip()]
+    report = bench.run(models, reps=args.reps, out_dir=Path(args.out_dir))
+    print(format_markdown(report))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
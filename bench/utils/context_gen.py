@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""
+Exact-length long-context prompts for latency scaling benchmarks.
+
+Provides:
+1. Token counting with the target model's own tokenizer:
+   - llama-server:  POST /tokenize on the server that runs the model
+   - gguf:          the GGUF behind an Ollama model, loaded vocab-only through
+                    llama_cpp (optional dependency)
+   - ollama-probe:  prompt_eval_count of a one-token raw /api/generate, for
+                    Ollama hosts without llama_cpp
+2. A deterministic filler (seeded common-word sentences) fitted to an exact
+   token target for a given instruction suffix: secant steps on the word
+   count, bisection once bracketed, then single-token pads for the last gap
+3. A per-model JSON cache of fitted fillers, so a 32k point is searched once
+   per model and instruction instead of on every run
+
+Character-ratio fillers put the 1k/4k/8k points of a scaling curve off by
+a model-dependent amount, and large points overflow the context and are
+silently truncated. Here the x-axis is the count the model's tokenizer gives.
+"""
+
+import hashlib
+import json
+import os
+import random
+import re
+import urllib.error
+import urllib.request
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from utils.model_residency import OllamaResidency
+
+
+# =============================================================================
+# Configuration
+# =============================================================================
+
+BENCH_ROOT = Path(__file__).resolve().parents[1]
+CACHE_DIR = Path(os.environ.get("BENCH_CONTEXT_CACHE_DIR", str(BENCH_ROOT / ".cache" / "context")))
+CONTEXT_TARGETS = (1000, 4000, 8000, 16000, 32000)
+# Bump when the filler text changes; cached fits of older fillers are ignored.
+FILLER_VERSION = 1
+FILLER_SEED = 3
+# Appended one at a time to close the last gap below the target; one token in common vocabularies.
+PAD = " ."
+MAX_PADS = 16
+MAX_STEPS = 40
+DEFAULT_TIMEOUT_S = 600.0
+
+_WORDS = (
+    "the of and to in is it that was for on are as with they at be this from have or by one had not but "
+    "what all were when we there can an your which their said if do will each about how up out them then "
+    "she many some so these would other into has more her two like him see time could no make than first "
+    "been its who now people my made over did down only way find use may water long little very after "
+    "words called just where most know get through back much before go good new write our used me man "
+    "too any day same right look think also around another came come work three word must because does "
+    "part even place well such here take why things help put years different away again off went old"
+).split()
+
+
+# =============================================================================
+# Tokenizers
+# =============================================================================
+
+def _post_json(url: str, payload: Dict, timeout_s: float) -> Dict:
+    req = urllib.request.Request(
+        url,
+        data=json.dumps(payload).encode("utf-8"),
+        method="POST",
+        headers={"Content-Type": "application/json"},
+    )
+    with urllib.request.urlopen(req, timeout=timeout_s) as resp:
+        return json.loads(resp.read())
+
+
+class LlamaServerTokenizer:
+    """Counts with llama-server's /tokenize (the loaded model's vocabulary, no BOS)."""
+
+    kind = "llama-server"
+
+    def __init__(self, base_url: str, timeout_s: float = DEFAULT_TIMEOUT_S):
+        self.base_url = base_url.rstrip("/")
+        self.timeout_s = timeout_s
+
+    def count(self, text: str) -> int:
+        data = _post_json(f"{self.base_url}/tokenize", {"content": text, "add_special": False}, self.timeout_s)
+        return len(data["tokens"])
+
+
+class GGUFTokenizer:
+    """Counts with the GGUF's own vocabulary via llama_cpp, without loading weights."""
+
+    kind = "gguf"
+
+    def __init__(self, path: str):
+        import llama_cpp  # optional: pip install llama-cpp-python
+
+        self.path = path
+        self._llm = llama_cpp.Llama(model_path=path, vocab_only=True, verbose=False)
+
+    def count(self, text: str) -> int:
+        return len(self._llm.tokenize(text.encode("utf-8"), add_bos=False, special=False))
+
+
+class OllamaProbeTokenizer:
+    """
+    Counts with prompt_eval_count from a raw, one-token /api/generate.
+
+    Ollama has no tokenize endpoint, and a runner that still holds the
+    previous prompt only evaluates (and counts) the tokens past the shared
+    prefix. Probes therefore open with alternating lead-ins ("A" / "B" plus a
+    newline), so consecutive prompts diverge right after BOS, and the
+    lead-in's own count, taken in that same alternation, is subtracted.
+    Each probe prefills the whole text; fits are cached for that reason.
+    """
+
+    kind = "ollama-probe"
+    LEADS = ("A\n", "B\n")
+
+    def __init__(self, base_url: str, model: str, num_ctx: int = max(CONTEXT_TARGETS) + 1024,
+                 timeout_s: float = DEFAULT_TIMEOUT_S):
+        self.base_url = base_url.rstrip("/")
+        self.model = model
+        self.num_ctx = num_ctx
+        self.timeout_s = timeout_s
+        self._calls = 0
+        self._overhead: Optional[int] = None
+
+    def _probe(self, text: str) -> int:
+        lead = self.LEADS[self._calls % 2]
+        self._calls += 1
+        data = _post_json(f"{self.base_url}/api/generate", {
+            "model": self.model,
+            "prompt": lead + text,
+            "raw": True,
+            "stream": False,
+            "options": {"num_predict": 1, "temperature": 0, "num_ctx": self.num_ctx},
+        }, self.timeout_s)
+        return int(data["prompt_eval_count"])
+
+    def count(self, text: str) -> int:
+        if self._overhead is None:
+            self._probe("")  # loads the model and starts the alternation
+            self._overhead = self._probe("")
+        return self._probe(text) - self._overhead
+
+
+def resolve_tokenizer(model: str, backend: str = "ollama", base_url: Optional[str] = None):
+    """
+    Best available exact tokenizer for `model` on `backend`.
+
+    llama-server answers /tokenize itself. For Ollama the model's GGUF is
+    tokenized locally when llama_cpp is installed; otherwise the server is
+    probed.
+    """
+    if backend == "llama-server":
+        return LlamaServerTokenizer(base_url or os.environ.get("LLAMA_SERVER_URL", "http://127.0.0.1:8081"))
+    base_url = base_url or os.environ.get("OLLAMA_HOST", "http://localhost:11434")
+    files = [p for p in OllamaResidency(base_url).model_files(model) if os.path.isfile(p)]
+    if files:
+        try:
+            return GGUFTokenizer(max(files, key=os.path.getsize))
+        except Exception:  # llama_cpp missing or the blob is not a readable GGUF
+            pass
+    return OllamaProbeTokenizer(base_url, model)
+
+
+# =============================================================================
+# Filler fitting
+# =============================================================================
+
+@dataclass
+class ContextPrompt:
+    """A filler + suffix prompt and its measured length."""
+    text: str
+    tokens: int
+    target: int
+
+    @property
+    def exact(self) -> bool:
+        return self.tokens == self.target
+
+
+def filler_pieces(n: int, seed: int = FILLER_SEED) -> List[str]:
+    """First `n` pieces of the filler; each is one word with its leading space (some end a sentence)."""
+    rng = random.Random(seed)
+    pieces: List[str] = []
+    while len(pieces) < n:
+        sentence = [rng.choice(_WORDS) for _ in range(rng.randint(8, 14))]
+        sentence[0] = sentence[0].capitalize()
+        sentence[-1] += "."
+        pieces.extend(" " + w for w in sentence)
+    return pieces[:n]
+
+
+def fit_filler(count: Callable[[str], int], target: int, suffix: str = "",
+               pieces: Optional[List[str]] = None) -> Tuple[int, int, int]:
+    """
+    Largest filler that keeps filler + suffix at or under `target` tokens.
+
+    Args:
+        count: Token count of a full prompt
+        target: Token target for filler + suffix
+        suffix: Instruction text that follows the filler
+        pieces: Filler pieces to draw from (default: enough for `target`)
+
+    Returns:
+        (filler pieces, pads, tokens); tokens == target unless even one pad
+        overshoots, or the suffix alone is longer than the target
+    """
+    pieces = pieces if pieces is not None else filler_pieces(2 * target + 64)
+    cache: Dict[Tuple[int, int], int] = {}
+
+    def measure(w: int, pads: int = 0) -> int:
+        if (w, pads) not in cache:
+            cache[(w, pads)] = count("".join(pieces[:w]).lstrip() + PAD * pads + suffix)
+        return cache[(w, pads)]
+
+    lo, c_lo = 0, measure(0)
+    if c_lo >= target:
+        return 0, 0, c_lo
+    hi: Optional[int] = None
+    w = min(len(pieces), max(1, target - c_lo))
+    for _ in range(MAX_STEPS):
+        c = measure(w)
+        if c <= target:
+            lo, c_lo = w, c
+        else:
+            hi = w
+        if c_lo == target or (hi is not None and hi - lo <= 1) or lo == len(pieces):
+            break
+        per = (c - measure(0)) / w if w else 1.0
+        guess = lo + max(1, round((target - c_lo) / max(per, 1e-6)))
+        if hi is not None and not lo < guess < hi:
+            guess = (lo + hi) // 2
+        w = min(guess, len(pieces))
+
+    pads, tokens = 0, c_lo
+    while tokens < target and pads < MAX_PADS:
+        c = measure(lo, pads + 1)
+        if c > target:
+            break
+        pads, tokens = pads + 1, c
+    return lo, pads, tokens
+
+
+def _slug(model: str) -> str:
+    return re.sub(r"[^A-Za-z0-9._-]+", "_", model)
+
+
+class ContextGenerator:
+    """
+    Builds exact-length prompts for one model, caching each fitted filler.
+
+    The cache (one JSON file per model) maps target and suffix hash to the
+    filler length found, keyed by tokenizer kind and FILLER_VERSION, so a
+    rerun rebuilds the same text without touching the tokenizer.
+    """
+
+    def __init__(self, model: str, tokenizer, cache_dir: Optional[Path] = CACHE_DIR):
+        self.model = model
+        self.tokenizer = tokenizer
+        self.cache_path = Path(cache_dir) / f"{_slug(model)}.json" if cache_dir is not None else None
+        self._cache = self._load()
+
+    def _load(self) -> Dict:
+        if self.cache_path is None or not self.cache_path.exists():
+            return {}
+        try:
+            data = json.loads(self.cache_path.read_text())
+        except (OSError, ValueError):
+            return {}
+        if data.get("filler_version") != FILLER_VERSION or data.get("tokenizer") != self.tokenizer.kind:
+            return {}
+        return data.get("entries", {})
+
+    def _save(self) -> None:
+        if self.cache_path is None:
+            return
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.cache_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"model": self.model, "tokenizer": self.tokenizer.kind,
+                                   "filler_version": FILLER_VERSION, "entries": self._cache}, indent=2))
+        os.replace(tmp, self.cache_path)
+
+    def build(self, target: int, suffix: str = "") -> ContextPrompt:
+        """Filler + suffix at `target` tokens of this model's tokenizer (no BOS or chat template)."""
+        key = f"{target}:{hashlib.sha1(suffix.encode('utf-8')).hexdigest()[:12]}"
+        entry = self._cache.get(key)
+        if entry is None:
+            n, pads, tokens = fit_filler(self.tokenizer.count, target, suffix)
+            entry = self._cache[key] = {"pieces": n, "pads": pads, "tokens": tokens}
+            self._save()
+        filler = "".join(filler_pieces(entry["pieces"])).lstrip() + PAD * entry["pads"]
+        return ContextPrompt(filler + suffix, entry["tokens"], target)
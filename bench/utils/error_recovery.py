@@ -7,11 +7,12 @@ Provides:
 2. Retry logic with exponential backoff
 3. Graceful degradation: if model fails, try fallback
 4. Save partial results on crash
-5. Resume interrupted runs
+5. Resume interrupted runs (append-only checkpoint journal + compacted snapshot)
 6. Health check: verify Ollama is running before starting
 """
 
 import json
+import os
 import signal
 import subprocess
 import time
@@ -30,6 +31,11 @@ DEFAULT_MAX_RETRIES = 3
 DEFAULT_BACKOFF_BASE = 2.0  # seconds
 DEFAULT_BACKOFF_MAX = 30.0  # seconds
 CHECKPOINT_FILE = "checkpoint.json"
+JOURNAL_FILE = "checkpoint.journal.jsonl"
+# Compact once the journal holds this many records, or as many records as the
+# snapshot holds results if that is more. The growing threshold keeps the
+# total compaction cost linear in the run length.
+COMPACT_EVERY = 64
 
 
 # =============================================================================
@@ -65,6 +71,7 @@ class Checkpoint:
     partial_results: list[dict] = field(default_factory=list)
     last_update: float = field(default_factory=time.time)
     metadata: dict = field(default_factory=dict)
+    journal_seq: int = 0  # last journal record folded into this state
 
 
 @dataclass
@@ -296,58 +303,231 @@ def wait_for_ollama(timeout_s: int = 60, check_interval: float = 2.0) -> bool:
 # Checkpoint / Resume
 # =============================================================================
 
+def _checkpoint_from_dict(data: dict) -> Checkpoint:
+    return Checkpoint(
+        run_id=data.get('run_id', ''),
+        job_index=data.get('job_index', 0),
+        prompt_index=data.get('prompt_index', 0),
+        completed_prompts=data.get('completed_prompts', []),
+        partial_results=data.get('partial_results', []),
+        last_update=data.get('last_update', time.time()),
+        metadata=data.get('metadata', {}),
+        journal_seq=data.get('journal_seq', 0),
+    )
+
+
+def _replay_journal(journal_path: Path, checkpoint: Checkpoint) -> tuple[int, int]:
+    """
+    Fold journal records newer than the snapshot into `checkpoint`.
+
+    Stops at the first unreadable line: a torn final append from a crash
+    loses only that one record.
+
+    Returns:
+        (records applied, byte length of the readable prefix of the journal)
+    """
+    applied = 0
+    good_bytes = 0
+    with journal_path.open('rb') as f:
+        for raw in f:
+            if not raw.endswith(b'\n'):
+                break
+            try:
+                rec = json.loads(raw)
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                break
+            good_bytes += len(raw)
+            if rec.get('seq', 0) <= checkpoint.journal_seq:
+                continue
+            checkpoint.completed_prompts = checkpoint.completed_prompts[:rec.get('c_off', 0)] + rec.get('completed', [])
+            checkpoint.partial_results = checkpoint.partial_results[:rec.get('r_off', 0)] + rec.get('results', [])
+            checkpoint.job_index = rec.get('job_index', checkpoint.job_index)
+            checkpoint.prompt_index = rec.get('prompt_index', checkpoint.prompt_index)
+            if 'metadata' in rec:
+                checkpoint.metadata = rec['metadata']
+            checkpoint.last_update = rec.get('t', checkpoint.last_update)
+            checkpoint.journal_seq = rec['seq']
+            applied += 1
+    return applied, good_bytes
+
+
+class CheckpointJournal:
+    """
+    Append-only checkpoint log for one run directory.
+
+    Each append writes one JSON line with only what changed since the last
+    record (new completed ids and results, indices, metadata if it changed),
+    so a checkpoint costs O(1) instead of rewriting every partial result.
+    Periodically the full state is written to checkpoint.json via atomic
+    rename and the journal is truncated. Records carry a sequence number and
+    the snapshot records the last one it contains, so a crash between the two
+    steps never double-applies a record.
+    """
+
+    def __init__(self, run_dir: Path, compact_every: int = COMPACT_EVERY):
+        self.run_dir = Path(run_dir)
+        self.compact_every = compact_every
+        self._records = 0     # records in the journal since the last compaction
+        self._completed = 0   # completed_prompts already persisted
+        self._results = 0     # partial_results already persisted
+        self._metadata = None  # last persisted metadata (JSON text)
+
+    @property
+    def snapshot_path(self) -> Path:
+        return self.run_dir / CHECKPOINT_FILE
+
+    @property
+    def journal_path(self) -> Path:
+        return self.run_dir / JOURNAL_FILE
+
+    def _mark_persisted(self, checkpoint: Checkpoint) -> None:
+        self._completed = len(checkpoint.completed_prompts)
+        self._results = len(checkpoint.partial_results)
+        self._metadata = json.dumps(checkpoint.metadata, sort_keys=True, default=str)
+
+    def load(self) -> Optional[Checkpoint]:
+        """Snapshot (if any) plus replayed journal; None when neither exists."""
+        checkpoint = None
+        if self.snapshot_path.exists():
+            checkpoint = _checkpoint_from_dict(json.loads(self.snapshot_path.read_text()))
+        if self.journal_path.exists():
+            if checkpoint is None:
+                checkpoint = Checkpoint()
+            self._records, good_bytes = _replay_journal(self.journal_path, checkpoint)
+            if good_bytes < self.journal_path.stat().st_size:
+                # Cut the torn tail so the next append starts on a fresh line
+                # instead of being glued onto the fragment (and lost on replay).
+                with self.journal_path.open('r+b') as f:
+                    f.truncate(good_bytes)
+                    f.flush()
+                    os.fsync(f.fileno())
+        if checkpoint is not None:
+            self._mark_persisted(checkpoint)
+        return checkpoint
+
+    def append(self, checkpoint: Checkpoint) -> None:
+        """Journal the changes since the last append/compaction; compact when due."""
+        checkpoint.last_update = time.time()
+        # A caller may have replaced the lists; fall back to a full delta then.
+        c_off = min(self._completed, len(checkpoint.completed_prompts))
+        r_off = min(self._results, len(checkpoint.partial_results))
+        rec = {
+            'seq': checkpoint.journal_seq + 1,
+            't': checkpoint.last_update,
+            'job_index': checkpoint.job_index,
+            'prompt_index': checkpoint.prompt_index,
+            'c_off': c_off,
+            'completed': checkpoint.completed_prompts[c_off:],
+            'r_off': r_off,
+            'results': checkpoint.partial_results[r_off:],
+        }
+        metadata = json.dumps(checkpoint.metadata, sort_keys=True, default=str)
+        if metadata != self._metadata:
+            rec['metadata'] = checkpoint.metadata
+        if self._records == 0 and not self.snapshot_path.exists():
+            # The first record of a run carries run_id via a snapshot so a
+            # journal-only directory still resumes under the right id.
+            self.compact(checkpoint)
+            return
+        line = json.dumps(rec, separators=(',', ':'), default=str) + '\n'
+        with self.journal_path.open('a', encoding='utf-8') as f:
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+        checkpoint.journal_seq = rec['seq']
+        self._records += 1
+        self._mark_persisted(checkpoint)
+        if self._records >= max(self.compact_every, len(checkpoint.partial_results)):
+            self.compact(checkpoint)
+
+    def compact(self, checkpoint: Checkpoint) -> None:
+        """Write the full state to checkpoint.json atomically, then truncate the journal."""
+        checkpoint.last_update = time.time()
+        tmp = self.snapshot_path.with_name(CHECKPOINT_FILE + '.tmp')
+        with tmp.open('w', encoding='utf-8') as f:
+            json.dump(asdict(checkpoint), f, indent=2, default=str)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.snapshot_path)
+        # Records up to journal_seq now live in the snapshot; replay skips them
+        # even if we crash before the truncate below.
+        with self.journal_path.open('w', encoding='utf-8'):
+            pass
+        self._records = 0
+        self._mark_persisted(checkpoint)
+
+    def clear(self) -> None:
+        for path in (self.snapshot_path, self.journal_path):
+            if path.exists():
+                path.unlink()
+        self._records = 0
+        self._completed = self._results = 0
+        self._metadata = None
+
+
+_JOURNALS: dict[str, CheckpointJournal] = {}
+
+
+def _journal(run_dir: Path) -> CheckpointJournal:
+    key = str(Path(run_dir).resolve())
+    if key not in _JOURNALS:
+        _JOURNALS[key] = CheckpointJournal(Path(run_dir))
+    return _JOURNALS[key]
+
+
 def load_checkpoint(run_dir: Path) -> Optional[Checkpoint]:
     """
     Load checkpoint from disk if it exists.
     
+    Reads the compacted snapshot and replays the journal on top of it; an
+    old-style checkpoint.json without a journal loads unchanged.
+    
     Args:
         run_dir: Directory containing the run
     
     Returns:
         Checkpoint if found, None otherwise
     """
-    checkpoint_path = run_dir / CHECKPOINT_FILE
-    if not checkpoint_path.exists():
-        return None
-    
     try:
-        data = json.loads(checkpoint_path.read_text())
-        return Checkpoint(
-            run_id=data.get('run_id', ''),
-            job_index=data.get('job_index', 0),
-            prompt_index=data.get('prompt_index', 0),
-            completed_prompts=data.get('completed_prompts', []),
-            partial_results=data.get('partial_results', []),
-            last_update=data.get('last_update', time.time()),
-            metadata=data.get('metadata', {}),
-        )
+        return _journal(run_dir).load()
     except Exception as e:
         print(f"[checkpoint] Failed to load checkpoint: {e}", file=sys.stderr)
         return None
 
 
+def journal_checkpoint(run_dir: Path, checkpoint: Checkpoint) -> None:
+    """
+    Record checkpoint progress by appending to the run's journal.
+    
+    Use after each completed prompt/job; only the new entries are written.
+    
+    Args:
+        run_dir: Directory containing the run
+        checkpoint: Checkpoint data (already updated by the caller)
+    """
+    try:
+        _journal(run_dir).append(checkpoint)
+    except Exception as e:
+        print(f"[checkpoint] Failed to journal checkpoint: {e}", file=sys.stderr)
+
+
 def save_checkpoint(run_dir: Path, checkpoint: Checkpoint) -> None:
     """
-    Save checkpoint to disk.
+    Save the full checkpoint to disk (atomic snapshot, journal truncated).
     
     Args:
         run_dir: Directory containing the run
         checkpoint: Checkpoint data to save
     """
-    checkpoint_path = run_dir / CHECKPOINT_FILE
-    checkpoint.last_update = time.time()
-    
     try:
-        checkpoint_path.write_text(json.dumps(asdict(checkpoint), indent=2))
+        _journal(run_dir).compact(checkpoint)
     except Exception as e:
         print(f"[checkpoint] Failed to save checkpoint: {e}", file=sys.stderr)
 
 
 def clear_checkpoint(run_dir: Path) -> None:
-    """Remove checkpoint file when run completes."""
-    checkpoint_path = run_dir / CHECKPOINT_FILE
-    if checkpoint_path.exists():
-        checkpoint_path.unlink()
+    """Remove checkpoint snapshot and journal when run completes."""
+    _journal(run_dir).clear()
 
 
 # =============================================================================
@@ -434,7 +614,9 @@ def load_partial_results(run_dir: Path) -> list[dict]:
     """
     partial_path = run_dir / 'partial_results.json'
     if not partial_path.exists():
-        return []
+        # Killed without a chance to write the file: the journal still has them.
+        checkpoint = load_checkpoint(run_dir)
+        return list(checkpoint.partial_results) if checkpoint else []
     
     try:
         return json.loads(partial_path.read_text())
@@ -0,0 +1,445 @@
+#!/usr/bin/env python3
+"""
+Open-loop load generation against OpenAI-compatible chat endpoints.
+
+Provides:
+1. Poisson or fixed-rate arrival schedules at a target QPS
+2. An open-loop driver: requests are released on schedule whether or not
+   earlier ones finished, bounded by a concurrency cap (excess arrivals queue)
+3. Per-request queueing, TTFT and end-to-end latency from streamed responses
+4. Rate sweeps per backend x model, with saturation curves and knee detection
+
+Closed-loop runs (one request at a time) only measure single-stream speed.
+On a shared service the useful number is the highest rate the backend keeps
+up with before latency blows up, which only shows under open-loop arrivals.
+
+Both Ollama (>= 0.1.24) and llama-server expose /v1/chat/completions, so one
+streaming client covers every backend.
+"""
+
+import argparse
+import json
+import math
+import random
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from utils.prompt_corpora import load_corpus
+
+
+# =============================================================================
+# Configuration
+# =============================================================================
+
+DEFAULT_RATES = (0.25, 0.5, 1.0, 2.0, 4.0)
+DEFAULT_DURATION_S = 60.0
+DEFAULT_CONCURRENCY = 8
+DEFAULT_TIMEOUT_S = 120.0
+# A level is saturated once it can no longer serve the offered rate, or its
+# p95 latency has grown this much over the lightest level in the sweep.
+ACHIEVED_FRAC = 0.95
+LATENCY_BLOWUP = 2.0
+
+
+# =============================================================================
+# Arrivals
+# =============================================================================
+
+def arrival_times(
+    rate_qps: float,
+    duration_s: float,
+    process: str = "poisson",
+    seed: Optional[int] = None,
+) -> List[float]:
+    """
+    Offsets (seconds from start) at which requests are released.
+
+    Args:
+        rate_qps: Mean arrival rate
+        duration_s: Schedule length; no arrival is at or past it
+        process: "poisson" (exponential gaps) or "fixed" (constant gaps)
+        seed: RNG seed for reproducible Poisson schedules
+    """
+    if rate_qps <= 0 or duration_s <= 0:
+        return []
+    if process == "fixed":
+        gap = 1.0 / rate_qps
+        return [i * gap for i in range(int(math.ceil(duration_s * rate_qps))) if i * gap < duration_s]
+    if process != "poisson":
+        raise ValueError(f"unknown arrival process: {process}")
+    rng = random.Random(seed)
+    out: List[float] = []
+    t = rng.expovariate(rate_qps)
+    while t < duration_s:
+        out.append(t)
+        t += rng.expovariate(rate_qps)
+    return out
+
+
+# =============================================================================
+# Streaming client
+# =============================================================================
+
+def _sse_events(resp) -> Iterable[Dict]:
+    for raw in resp:
+        line = raw.decode("utf-8", errors="replace").strip()
+        if not line.startswith("data:"):
+            continue
+        datum = line[len("data:"):].strip()
+        if datum == "[DONE]":
+            return
+        try:
+            yield json.loads(datum)
+        except json.JSONDecodeError:
+            continue
+
+
+def stream_chat(
+    base_url: str,
+    model: str,
+    prompt: str,
+    max_tokens: int,
+    timeout_s: float = DEFAULT_TIMEOUT_S,
+) -> Dict:
+    """
+    One streamed chat completion; returns perf_counter timestamps and token counts.
+
+    Output tokens come from the final usage chunk when the server sends one,
+    otherwise from the number of non-empty content deltas.
+    """
+    payload = {
+        "model": model,
+        "messages": [{"role": "user", "content": prompt}],
+        "max_tokens": max_tokens,
+        "temperature": 0,
+        "stream": True,
+        "stream_options": {"include_usage": True},
+    }
+    req = urllib.request.Request(
+        f"{base_url.rstrip('/')}/v1/chat/completions",
+        data=json.dumps(payload).encode("utf-8"),
+        method="POST",
+        headers={"Content-Type": "application/json", "Accept": "text/event-stream"},
+    )
+    out: Dict = {"first_token_t": None, "output_tokens": None, "chunks": 0, "error": None}
+    try:
+        with urllib.request.urlopen(req, timeout=timeout_s) as resp:
+            for event in _sse_events(resp):
+                for choice in event.get("choices") or []:
+                    if (choice.get("delta") or {}).get("content"):
+                        if out["first_token_t"] is None:
+                            out["first_token_t"] = time.perf_counter()
+                        out["chunks"] += 1
+                usage = event.get("usage")
+                if usage and usage.get("completion_tokens") is not None:
+                    out["output_tokens"] = int(usage["completion_tokens"])
+    except urllib.error.HTTPError as e:
+        out["error"] = f"HTTP {e.code}"
+    except Exception as e:
+        out["error"] = f"{type(e).__name__}: {e}"
+    if out["output_tokens"] is None:
+        out["output_tokens"] = out["chunks"]
+    out["end_t"] = time.perf_counter()
+    return out
+
+
+# =============================================================================
+# Open-loop driver
+# =============================================================================
+
+def _ms(a: Optional[float], b: Optional[float]) -> Optional[float]:
+    if a is None or b is None:
+        return None
+    return round((b - a) * 1000.0, 2)
+
+
+def run_level(
+    base_url: str,
+    model: str,
+    prompts: List[Dict],
+    rate_qps: float,
+    duration_s: float = DEFAULT_DURATION_S,
+    process: str = "poisson",
+    concurrency: int = DEFAULT_CONCURRENCY,
+    max_queue: Optional[int] = None,
+    timeout_s: float = DEFAULT_TIMEOUT_S,
+    seed: Optional[int] = None,
+    send=stream_chat,
+) -> List[Dict]:
+    """
+    Drive one offered rate and return one record per arrival.
+
+    The scheduler thread releases each arrival at its scheduled time; a pool
+    of `concurrency` workers serves them. Latencies are measured from the
+    scheduled arrival, so time spent waiting for a worker counts (no
+    coordinated omission). Arrivals that find `max_queue` requests already
+    waiting are dropped and recorded as such.
+    """
+    schedule = arrival_times(rate_qps, duration_s, process, seed)
+    records: List[Dict] = []
+    lock = threading.Lock()
+    waiting = [0]
+
+    def serve(i: int, scheduled_t: float) -> None:
+        with lock:
+            waiting[0] -= 1
+        item = prompts[i % len(prompts)]
+        start_t = time.perf_counter()
+        res = send(base_url, model, item["prompt"], item["max_tokens"], timeout_s)
+        rec = {
+            "i": i,
+            "prompt_id": item["id"],
+            "scheduled_s": round(schedule[i], 4),
+            "queue_ms": _ms(scheduled_t, start_t),
+            "ttft_ms": _ms(scheduled_t, res["first_token_t"]),
+            "e2e_ms": _ms(scheduled_t, res["end_t"]),
+            "service_ms": _ms(start_t, res["end_t"]),
+            "output_tokens": res["output_tokens"],
+            "ok": res["error"] is None,
+            "error": res["error"],
+        }
+        with lock:
+            records.append(rec)
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        for i, offset in enumerate(schedule):
+            delay = t0 + offset - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            with lock:
+                dropped = max_queue is not None and waiting[0] >= max_queue
+                if not dropped:
+                    waiting[0] += 1
+            if dropped:
+                item = prompts[i % len(prompts)]
+                with lock:
+                    records.append({
+                        "i": i, "prompt_id": item["id"], "scheduled_s": round(offset, 4),
+                        "queue_ms": None, "ttft_ms": None, "e2e_ms": None, "service_ms": None,
+                        "output_tokens": 0, "ok": False, "error": "dropped",
+                    })
+                continue
+            pool.submit(serve, i, t0 + offset)
+    # The offered window is the denominator even if the schedule ended early;
+    # requests still finishing after it stretch the wall time instead.
+    wall_s = max(duration_s, time.perf_counter() - t0)
+    records.sort(key=lambda r: r["i"])
+    for r in records:
+        r["wall_s"] = round(wall_s, 3)
+    return records
+
+
+# =============================================================================
+# Summaries
+# =============================================================================
+
+def percentile(values: List[float], q: float) -> Optional[float]:
+    """Nearest-rank percentile (q in [0, 100]); None for an empty list."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    k = max(0, min(len(ordered) - 1, int(math.ceil(q / 100.0 * len(ordered))) - 1))
+    return ordered[k]
+
+
+def summarize_level(records: List[Dict], rate_qps: float, duration_s: float) -> Dict:
+    """Offered vs achieved rate, error rate and latency percentiles for one level."""
+    ok = [r for r in records if r["ok"]]
+    wall_s = records[0]["wall_s"] if records else duration_s
+    out: Dict = {
+        "offered_qps": rate_qps,
+        "n": len(records),
+        "ok": len(ok),
+        "dropped": sum(1 for r in records if r["error"] == "dropped"),
+        "error_rate": round(1 - len(ok) / len(records), 4) if records else None,
+        "achieved_qps": round(len(ok) / wall_s, 4) if wall_s else None,
+        "tokens_per_s": round(sum(r["output_tokens"] for r in ok) / wall_s, 2) if wall_s else None,
+    }
+    for field in ("queue_ms", "ttft_ms", "e2e_ms"):
+        vals = [r[field] for r in ok if r[field] is not None]
+        for q in (50, 95, 99):
+            out[f"{field[:-3]}_p{q}_ms"] = percentile(vals, q)
+    return out
+
+
+def find_knee(levels: List[Dict]) -> Optional[float]:
+    """
+    Highest offered rate the backend still sustains.
+
+    A level is sustained when achieved >= ACHIEVED_FRAC x offered and its
+    p95 e2e is within LATENCY_BLOWUP x the lightest level's p95. Returns
+    None when even the lightest level is saturated.
+    """
+    ordered = sorted((lv for lv in levels if lv.get("e2e_p95_ms") is not None), key=lambda lv: lv["offered_qps"])
+    if not ordered:
+        return None
+    base_p95 = ordered[0]["e2e_p95_ms"]
+    knee = None
+    for lv in ordered:
+        if (lv["achieved_qps"] or 0) < ACHIEVED_FRAC * lv["offered_qps"]:
+            break
+        if lv["e2e_p95_ms"] > LATENCY_BLOWUP * base_p95:
+            break
+        knee = lv["offered_qps"]
+    return knee
+
+
+# =============================================================================
+# Sweeps
+# =============================================================================
+
+def sweep(
+    base_url: str,
+    model: str,
+    prompts: List[Dict],
+    rates: Iterable[float] = DEFAULT_RATES,
+    duration_s: float = DEFAULT_DURATION_S,
+    process: str = "poisson",
+    concurrency: int = DEFAULT_CONCURRENCY,
+    max_queue: Optional[int] = None,
+    timeout_s: float = DEFAULT_TIMEOUT_S,
+    warmup: int = 1,
+    stop_on_saturation: bool = True,
+    seed: int = 0,
+    send=stream_chat,
+    log=print,
+) -> Dict:
+    """
+    Run increasing offered rates against one backend/model.
+
+    Returns {"levels": [summary...], "records": {rate: [record...]}, "knee_qps"}.
+    With `stop_on_saturation`, the sweep ends after the first level past the
+    knee, since heavier levels only add queueing time.
+    """
+    for i in range(warmup):
+        item = prompts[i % len(prompts)]
+        send(base_url, model, item["prompt"], item["max_tokens"], timeout_s)
+
+    levels: List[Dict] = []
+    records: Dict[str, List[Dict]] = {}
+    for rate in sorted(rates):
+        recs = run_level(base_url, model, prompts, rate, duration_s, process,
+                         concurrency, max_queue, timeout_s, seed, send)
+        summary = summarize_level(recs, rate, duration_s)
+        levels.append(summary)
+        records[str(rate)] = recs
+        log(f"  {rate:>6.2f} qps: achieved {summary['achieved_qps']}, "
+            f"p95 e2e {summary['e2e_p95_ms']} ms, p95 queue {summary['queue_p95_ms']} ms, "
+            f"errors {summary['error_rate']}")
+        if stop_on_saturation and len(levels) > 1 and find_knee(levels) != rate:
+            break
+    return {"levels": levels, "records": records, "knee_qps": find_knee(levels)}
+
+
+def format_markdown(results: Dict[str, Dict[str, Dict]]) -> str:
+    """Saturation table: one row per backend/model/rate."""
+    lines = [
+        "| backend | model | offered qps | achieved qps | err | p50 e2e ms | p95 e2e ms | p99 e2e ms "
+        "| p95 ttft ms | p95 queue ms | tok/s |",
+        "|---|---|---:|---:|---:|---:|---:|---:|---:|---:|---:|",
+    ]
+    knees = []
+    for backend, per_model in results.items():
+        for model, res in per_model.items():
+            knees.append(f"- {backend} / {model}: knee at {res['knee_qps']} qps")
+            for lv in res["levels"]:
+                lines.append(
+                    f"| {backend} | {model} | {lv['offered_qps']} | {lv['achieved_qps']} | {lv['error_rate']} "
+                    f"| {lv['e2e_p50_ms']} | {lv['e2e_p95_ms']} | {lv['e2e_p99_ms']} "
+                    f"| {lv['ttft_p95_ms']} | {lv['queue_p95_ms']} | {lv['tokens_per_s']} |"
+                )
+    return "\n".join(lines + [""] + knees) + "\n"
+
+
+def write_results(out_dir: Path, results: Dict[str, Dict[str, Dict]], meta: Dict) -> Path:
+    """Write load_summary.json, load_requests.jsonl and load_summary.md under out_dir."""
+    out_dir.mkdir(parents=True, exist_ok=True)
+    summary = {"meta": meta, "results": {
+        b: {m: {"knee_qps": r["knee_qps"], "levels": r["levels"]} for m, r in per.items()}
+        for b, per in results.items()
+    }}
+    (out_dir / "load_summary.json").write_text(json.dumps(summary, indent=2), encoding="utf-8")
+    with (out_dir / "load_requests.jsonl").open("w", encoding="utf-8") as f:
+        for backend, per_model in results.items():
+            for model, res in per_model.items():
+                for rate, recs in res["records"].items():
+                    for rec in recs:
+                        f.write(json.dumps({"backend": backend, "model": model, "offered_qps": float(rate), **rec}) + "\n")
+    (out_dir / "load_summary.md").write_text(format_markdown(results), encoding="utf-8")
+    return out_dir / "load_summary.json"
+
+
+def run_load_test(
+    backends: Dict[str, str],
+    models: List[str],
+    corpus: str = "compare",
+    out_dir: Optional[Path] = None,
+    **sweep_kwargs,
+) -> Dict[str, Dict[str, Dict]]:
+    """Sweep every backend x model; write results when out_dir is given."""
+    prompts = load_corpus(corpus)
+    results: Dict[str, Dict[str, Dict]] = {}
+    for backend, url in backends.items():
+        for model in models:
+            print(f"[load] {backend} ({url}) model={model}")
+            results.setdefault(backend, {})[model] = sweep(url, model, prompts, **sweep_kwargs)
+    if out_dir is not None:
+        meta = {"backends": backends, "models": models, "corpus": corpus,
+                **{k: v for k, v in sweep_kwargs.items() if k not in ("send", "log")}}
+        write_results(Path(out_dir), results, meta)
+    return results
+
+
+def parse_backends(spec: str) -> Dict[str, str]:
+    """"ollama=http://localhost:11434,llama=http://127.0.0.1:8081" -> {name: url}."""
+    out: Dict[str, str] = {}
+    for part in filter(None, (p.strip() for p in spec.split(","))):
+        name, sep, url = part.partition("=")
+        if not sep:
+            raise ValueError(f"backend must be name=url: {part}")
+        out[name.strip()] = url.strip()
+    return out
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Open-loop QPS sweep against OpenAI-compatible endpoints.")
+    ap.add_argument("--backends", default="ollama=http://localhost:11434", help="name=url,name=url")
+    ap.add_argument("--models", required=True, help="Comma-separated model names")
+    ap.add_argument("--rates", default=",".join(str(r) for r in DEFAULT_RATES), help="Offered QPS levels")
+    ap.add_argument("--duration-s", type=float, default=DEFAULT_DURATION_S, help="Seconds per level")
+    ap.add_argument("--arrival", choices=["poisson", "fixed"], default="poisson")
+    ap.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="Max in-flight requests")
+    ap.add_argument("--max-queue", type=int, default=None, help="Drop arrivals when this many are waiting")
+    ap.add_argument("--corpus", default="compare", help="compare, prompts_v1, or a JSON path")
+    ap.add_argument("--timeout-s", type=float, default=DEFAULT_TIMEOUT_S)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--no-stop", action="store_true", help="Run every rate even past saturation")
+    ap.add_argument("--out-dir", default="load_results")
+    args = ap.parse_args()
+
+    results = run_load_test(
+        parse_backends(args.backends),
+        [m.strip() for m in args.models.split(",") if m.strip()],
+        corpus=args.corpus,
+        out_dir=Path(args.out_dir),
+        rates=[float(r) for r in args.rates.split(",") if r.strip()],
+        duration_s=args.duration_s,
+        process=args.arrival,
+        concurrency=args.concurrency,
+        max_queue=args.max_queue,
+        timeout_s=args.timeout_s,
+        seed=args.seed,
+        stop_on_saturation=not args.no_stop,
+    )
+    print(format_markdown(results))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,472 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmarks for the harness's own hot paths.
+
+Provides:
+1. A registry of cases swept over input sizes (1 KB-1 MB model outputs,
+   10-100k result rows): every tool-call parser strategy and the fallback
+   chain, run_bench's detect_tool_calls and validate_output validators,
+   ResultCache hashing, the streaming summarize() and checkpoint
+   journal/snapshot saves
+2. Inputs from a seeded generator, or recorded model outputs (results.jsonl
+   rows / result JSON, blob references resolved) tiled to each size
+3. measure(): ops/sec from the best of several timed rounds (timeit
+   autorange), plus the tracemalloc peak and retained bytes of one call
+4. Baselines per host and input set (bench/.cache/microbench/baselines.json)
+   and compare(), which flags ops/sec drops and allocation growth beyond a
+   tolerance; `--check` exits 1 on any regression
+
+Timings depend on the host and on the text being parsed, so a baseline is
+only compared against runs on the host (name, machine, Python version) that
+recorded it, with the same inputs (synthetic seed or recorded-set digest).
+"""
+
+import argparse
+import contextlib
+import hashlib
+import io
+import json
+import os
+import platform
+import random
+import re
+import sys
+import tempfile
+import time
+import timeit
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+HERE = Path(__file__).resolve().parent
+BENCH_ROOT = HERE.parent
+for _path in (BENCH_ROOT, BENCH_ROOT / "openclaw_llm_bench"):
+    if str(_path) not in sys.path:
+        sys.path.insert(0, str(_path))
+
+import run_bench  # noqa: E402
+from parsers import tool_call_parsers as parsers  # noqa: E402
+from utils import result_cache  # noqa: E402
+from utils.error_recovery import Checkpoint, journal_checkpoint, save_checkpoint  # noqa: E402
+from utils.mock_llm_server import iter_recordings  # noqa: E402
+
+
+# =============================================================================
+# Configuration
+# =============================================================================
+
+OUTPUT_SIZES = [1_024, 32_768, 1_048_576]
+ROW_COUNTS = [10, 1_000, 100_000]
+BASELINE_PATH = BENCH_ROOT / ".cache" / "microbench" / "baselines.json"
+MIN_TIME_S = 0.2      # timeit autorange target per round
+ROUNDS = 5            # best-of rounds for ops/sec
+MAX_CASE_S = 5.0      # fewer rounds for cases slower than this budget allows
+TOLERANCE = 0.25      # allowed fractional ops/sec drop / allocation growth
+ALLOC_SLACK = 16_384  # bytes of allocation growth never flagged (tracemalloc noise)
+SEED = 1234
+
+PROSE = [
+    "The gateway restarted cleanly after the config reload.",
+    "Memory looks fine: run `free -h` to confirm the available column.",
+    "Disk usage on / is at 71%, so no cleanup is needed yet.",
+    "I checked the journal with $ journalctl -u ollama --since today and saw no OOM kills.",
+    "Latency stayed under 400 ms for the whole window!",
+    "Next, compare the two runs side by side.",
+    "The nginx 502s line up with the upstream timeouts, not with load.",
+    "Use 'df -h /' for a quick look, then `du -sh /root/.ollama` for the model store.",
+    "Nothing else stands out in the logs?",
+    "Summary: healthy, one warning about swap.",
+]
+TOOL_SNIPPETS = {
+    "tag": '<tool_call>{"name": "get_weather", "arguments": {"city": "Paris"}}</tool_call>',
+    "bare_json": '{"name": "search_files", "arguments": {"pattern": "*.log"}}',
+    "bracket": '[schedule_meeting(title="Sync", time="10:00", attendees=["ana", "li"])]',
+    "bare_funcall": 'get_weather("Berlin")',
+}
+JSON_TAIL = '\n```json\n{"route": "local", "confidence": 0.92, "reason": "routine ops question"}\n```'
+
+
+# =============================================================================
+# Inputs
+# =============================================================================
+
+class Inputs:
+    """Model outputs and result rows of a requested size, synthetic or recorded."""
+
+    def __init__(self, recorded: Optional[List[str]] = None, seed: int = SEED):
+        self.recorded = [t for t in recorded or [] if t]
+        self.seed = seed
+
+    @property
+    def kind(self) -> str:
+        """Baseline key for these inputs: the synthetic seed, or a digest of the recorded set."""
+        if not self.recorded:
+            return f"synthetic:{self.seed}"
+        digest = hashlib.sha256()
+        for text in self.recorded:
+            digest.update(text.encode("utf-8") + b"\0")
+        return f"recorded:{digest.hexdigest()[:16]}"
+
+    def output(self, size: int, tail: str = "") -> str:
+        """About `size` bytes of model output ending in `tail` (so parsers scan all of it)."""
+        rng = random.Random(f"{self.seed}:{size}")
+        pool = self.recorded or PROSE
+        parts: List[str] = []
+        total = len(tail)
+        i = rng.randrange(len(pool))
+        while total < size:
+            piece = pool[i % len(pool)] if self.recorded else rng.choice(pool)
+            parts.append(piece)
+            total += len(piece) + 1
+            i += 1
+        return " ".join(parts)[: max(0, size - len(tail))] + tail
+
+    def result_rows(self, n: int) -> List[Dict[str, Any]]:
+        rng = random.Random(f"{self.seed}:rows:{n}")
+        rows = []
+        for i in range(n):
+            e2e = rng.randint(80, 4000)
+            ok = rng.random() > 0.05
+            rows.append({
+                "record_type": "result",
+                "provider": "ollama_native",
+                "model": f"m{i % 3}",
+                "thinking_level": None,
+                "prompt_id": f"P{i % 30}",
+                "availability_status": "ok" if ok else "error",
+                "success": ok,
+                "objective_pass": (i % 4 != 0) if ok else None,
+                "violation": None,
+                "started_at_ms": 1000 * i,
+                "ended_at_ms": 1000 * i + e2e,
+                "e2e_ms": e2e,
+                "ttft_ms": e2e // 5,
+                "raw_output": self.output(200),
+                "resources": {"n_samples": 3, "proc_cpu_pct_mean": 40.0, "proc_rss_kb_max": 900_000 + i},
+            })
+        return rows
+
+    def prompts(self, n: int) -> List[Dict[str, Any]]:
+        return [{"id": f"P{i}", "prompt": PROSE[i % len(PROSE)], "expected_tool_calls": ["free"],
+                 "validator": {"type": "tool_invocation", "expected_tools": ["free"]}} for i in range(n)]
+
+
+def load_recorded(paths: List[Path]) -> List[str]:
+    """Recorded model outputs (the mock server's loader, so blob refs resolve)."""
+    texts: List[str] = []
+    for path in paths:
+        texts.extend(rec.content for rec in iter_recordings(path) if rec.content)
+    return texts
+
+
+# =============================================================================
+# Cases
+# =============================================================================
+
+@dataclass
+class Case:
+    name: str
+    unit: str  # "bytes" or "rows"
+    sizes: List[int]
+    # (size, inputs, scratch dir, exit stack) -> the operation to time
+    setup: Callable[[int, Inputs, Path, contextlib.ExitStack], Callable[[], Any]]
+
+
+def _parser_case(fn: Callable[[str], Any], snippet: str) -> Callable:
+    def setup(size, inputs, tmp, stack):
+        text = inputs.output(size, tail=" " + snippet)
+        return lambda: fn(text)
+    return setup
+
+
+def _validator_case(validator: Dict[str, Any], tail: str = "") -> Callable:
+    def setup(size, inputs, tmp, stack):
+        text = inputs.output(size, tail=tail)
+        return lambda: run_bench.validate_output(text, validator)
+    return setup
+
+
+def _detect_setup(size, inputs, tmp, stack):
+    text = inputs.output(size)
+    return lambda: run_bench.detect_tool_calls(text, ["free", "du"])
+
+
+def _config_hash_setup(size, inputs, tmp, stack):
+    # compute_config_hash reads the module-level config paths; point them at files of this size.
+    config, suite = tmp / "phase2_config.json", tmp / "extended_benchmark_suite.json"
+    config.write_text(json.dumps({"notes": inputs.output(size // 2)}))
+    suite.write_text(json.dumps({"notes": inputs.output(size - size // 2)}))
+    saved = (result_cache.CONFIG_PATH, result_cache.SUITE_PATH)
+    result_cache.CONFIG_PATH, result_cache.SUITE_PATH = config, suite
+    stack.callback(lambda: setattr(result_cache, "CONFIG_PATH", saved[0]))
+    stack.callback(lambda: setattr(result_cache, "SUITE_PATH", saved[1]))
+    return result_cache.compute_config_hash
+
+
+def _prompt_hash_setup(n, inputs, tmp, stack):
+    prompts = inputs.prompts(n)
+    return lambda: result_cache.compute_prompt_hash(prompts)
+
+
+def _summarize_setup(n, inputs, tmp, stack):
+    with open(tmp / "results.jsonl", "w", encoding="utf-8") as f:
+        for row in inputs.result_rows(n):
+            f.write(json.dumps(row) + "\n")
+    return lambda: run_bench.summarize(str(tmp))
+
+
+def _checkpoint(n, inputs) -> Checkpoint:
+    rows = inputs.result_rows(n)
+    for row in rows:
+        row.pop("raw_output")
+    return Checkpoint(run_id="bench", completed_prompts=[r["prompt_id"] for r in rows], partial_results=rows)
+
+
+def _journal_setup(n, inputs, tmp, stack):
+    checkpoint = _checkpoint(n, inputs)
+    save_checkpoint(tmp, checkpoint)
+    row = dict(checkpoint.partial_results[-1]) if n else {"prompt_id": "P0"}
+
+    def op():
+        checkpoint.prompt_index += 1
+        checkpoint.completed_prompts.append(row["prompt_id"])
+        checkpoint.partial_results.append(row)
+        journal_checkpoint(tmp, checkpoint)
+        # Back to n rows: every call journals one row against the same checkpoint size,
+        # however many calls autorange makes.
+        checkpoint.completed_prompts.pop()
+        checkpoint.partial_results.pop()
+    return op
+
+
+def _snapshot_setup(n, inputs, tmp, stack):
+    checkpoint = _checkpoint(n, inputs)
+    return lambda: save_checkpoint(tmp, checkpoint)
+
+
+CASES: List[Case] = [
+    *[Case(f"parsers.{fn.__name__}", "bytes", OUTPUT_SIZES, _parser_case(fn, TOOL_SNIPPETS[kind]))
+      for fn, kind in (
+          (parsers.parse_all_tag_based, "tag"),
+          (parsers.parse_all_bare_json, "bare_json"),
+          (parsers.parse_all_bracket_notation, "bracket"),
+          (parsers.parse_all_bare_funcall, "bare_funcall"),
+          # Falls through every strategy before the last one matches.
+          (parsers.parse_all_tool_calls, "bare_funcall"),
+      )],
+    Case("run_bench.detect_tool_calls", "bytes", OUTPUT_SIZES, _detect_setup),
+    Case("run_bench.validate_output[json_keys]", "bytes", OUTPUT_SIZES, _validator_case(
+        {"type": "json_keys", "required_keys": ["route", "confidence"],
+         "key_rules": {"route": {"type": "one_of", "values": ["local", "premium"]}, "confidence": {"type": "number"}}},
+        JSON_TAIL)),
+    Case("run_bench.validate_output[max_sentences]", "bytes", OUTPUT_SIZES,
+         _validator_case({"type": "max_sentences", "value": 3})),
+    Case("run_bench.validate_output[max_words]", "bytes", OUTPUT_SIZES,
+         _validator_case({"type": "max_words", "value": 50})),
+    Case("run_bench.validate_output[tool_invocation]", "bytes", OUTPUT_SIZES,
+         _validator_case({"type": "tool_invocation", "expected_tools": ["free"]})),
+    Case("result_cache.compute_config_hash", "bytes", OUTPUT_SIZES, _config_hash_setup),
+    Case("result_cache.compute_prompt_hash", "rows", ROW_COUNTS, _prompt_hash_setup),
+    Case("run_bench.summarize", "rows", ROW_COUNTS, _summarize_setup),
+    Case("error_recovery.journal_checkpoint", "rows", ROW_COUNTS, _journal_setup),
+    Case("error_recovery.save_checkpoint", "rows", ROW_COUNTS, _snapshot_setup),
+]
+
+
+def select_cases(pattern: str = "") -> List[Case]:
+    return [c for c in CASES if not pattern or re.search(pattern, c.name)]
+
+
+# =============================================================================
+# Measurement
+# =============================================================================
+
+def measure(fn: Callable[[], Any], min_time: float = MIN_TIME_S, rounds: int = ROUNDS,
+            max_time: float = MAX_CASE_S) -> Dict[str, float]:
+    """Best-of-rounds seconds per call, plus tracemalloc peak/retained bytes of one call."""
+    timer = timeit.Timer(fn)
+    number, elapsed = 1, 0.0
+    while True:
+        elapsed = timer.timeit(number)
+        if elapsed >= min_time:
+            break
+        number *= 10 if elapsed < min_time / 10 else 2
+    best = elapsed / number
+    extra = max(0, min(rounds - 1, int(max_time / max(elapsed, 1e-9)) - 1))
+    if extra:
+        best = min(best, min(timer.repeat(repeat=extra, number=number)) / number)
+
+    tracemalloc.start()
+    try:
+        start = tracemalloc.get_traced_memory()[0]
+        fn()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        "s_per_op": best,
+        "calls": number * (1 + extra),
+        "alloc_peak_bytes": max(0, peak - start),
+        "alloc_retained_bytes": max(0, current - start),
+    }
+
+
+def run_case(case: Case, size: int, inputs: Inputs, **measure_kwargs: float) -> Dict[str, Any]:
+    with tempfile.TemporaryDirectory(prefix="microbench_") as td, contextlib.ExitStack() as stack:
+        fn = case.setup(size, inputs, Path(td), stack)
+        # summarize() and checkpoint helpers print; keep the report readable.
+        with contextlib.redirect_stdout(io.StringIO()):
+            fn()  # warm-up: regex compilation, first file creation
+            m = measure(fn, **measure_kwargs)
+    ops = 1.0 / m["s_per_op"] if m["s_per_op"] > 0 else float("inf")
+    return {
+        "case": case.name,
+        "size": size,
+        "unit": case.unit,
+        "ops_per_s": round(ops, 2),
+        "us_per_op": round(m["s_per_op"] * 1e6, 2),
+        "throughput_per_s": round(ops * size, 1),
+        "calls": m["calls"],
+        "alloc_peak_bytes": m["alloc_peak_bytes"],
+        "alloc_retained_bytes": m["alloc_retained_bytes"],
+    }
+
+
+def run_suite(cases: List[Case], inputs: Inputs, n_sizes: Optional[int] = None,
+              log: Callable[[str], None] = print, **measure_kwargs: float) -> List[Dict[str, Any]]:
+    """Run each case at its first `n_sizes` sizes (all when None)."""
+    rows = []
+    for case in cases:
+        for size in case.sizes[:n_sizes]:
+            row = run_case(case, size, inputs, **measure_kwargs)
+            log(f"  {row['case']:<46} {size:>9} {case.unit:<5} {row['ops_per_s']:>12.1f} ops/s "
+                f"{row['alloc_peak_bytes'] / 1024:>10.1f} KiB peak")
+            rows.append(row)
+    return rows
+
+
+# =============================================================================
+# Baselines
+# =============================================================================
+
+def host_key() -> str:
+    return f"{platform.node()}|{platform.machine()}|py{sys.version_info.major}.{sys.version_info.minor}"
+
+
+def _row_key(row: Dict[str, Any]) -> str:
+    return f"{row['case']}@{row['size']}"
+
+
+def load_baseline(path: Path = BASELINE_PATH, host: Optional[str] = None,
+                  inputs: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+    """The host's baseline cases for one input set (`Inputs.kind`; synthetic by default)."""
+    try:
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    entry = data.get("hosts", {}).get(host or host_key(), {}).get("inputs", {})
+    return entry.get(inputs or Inputs().kind, {}).get("cases", {})
+
+
+def save_baseline(rows: List[Dict[str, Any]], path: Path = BASELINE_PATH, host: Optional[str] = None,
+                  inputs: Optional[str] = None) -> None:
+    """Merge `rows` into the host's baseline for one input set (cases not re-run keep their old values)."""
+    path = Path(path)
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        data = {}
+    host_entry = data.setdefault("hosts", {}).setdefault(host or host_key(), {})
+    entry = host_entry.setdefault("inputs", {}).setdefault(inputs or Inputs().kind, {"cases": {}})
+    entry["updated_at"] = time.time()
+    for row in rows:
+        entry["cases"][_row_key(row)] = {k: row[k] for k in ("ops_per_s", "alloc_peak_bytes")}
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_text(json.dumps(data, indent=2, sort_keys=True), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def compare(rows: List[Dict[str, Any]], baseline: Dict[str, Dict[str, Any]],
+            tolerance: float = TOLERANCE) -> List[Dict[str, Any]]:
+    """Cases slower or allocating more than the baseline allows."""
+    regressions = []
+    for row in rows:
+        base = baseline.get(_row_key(row))
+        if not base:
+            continue
+        if row["ops_per_s"] < base["ops_per_s"] * (1 - tolerance):
+            regressions.append({"case": row["case"], "size": row["size"], "metric": "ops_per_s",
+                                "baseline": base["ops_per_s"], "current": row["ops_per_s"]})
+        if row["alloc_peak_bytes"] > base["alloc_peak_bytes"] * (1 + tolerance) + ALLOC_SLACK:
+            regressions.append({"case": row["case"], "size": row["size"], "metric": "alloc_peak_bytes",
+                                "baseline": base["alloc_peak_bytes"], "current": row["alloc_peak_bytes"]})
+    for r in regressions:
+        r["change_pct"] = round((r["current"] - r["baseline"]) / r["baseline"] * 100, 1) if r["baseline"] else None
+    return regressions
+
+
+# =============================================================================
+# CLI
+# =============================================================================
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Micro-benchmarks for harness hot paths (parsers, validators, hashing, summaries, checkpoints).")
+    ap.add_argument("--cases", default="", help="Regex on case names (e.g. 'parsers|validate')")
+    ap.add_argument("--list", action="store_true", help="List cases and sizes, then exit")
+    ap.add_argument("--quick", action="store_true", help="Skip the largest size of each case (1 MB outputs, 100k rows)")
+    ap.add_argument("--recorded", nargs="+", type=Path, default=[],
+                    help="results.jsonl / result JSON files or directories whose model outputs replace the synthetic text")
+    ap.add_argument("--min-time", type=float, default=MIN_TIME_S, help="Seconds per timed round")
+    ap.add_argument("--rounds", type=int, default=ROUNDS, help="Best-of rounds per case")
+    ap.add_argument("--baseline", type=Path, default=BASELINE_PATH, help="Baseline file (per host and input set)")
+    ap.add_argument("--update-baseline", action="store_true", help="Store this run as the baseline for this host and inputs")
+    ap.add_argument("--check", action="store_true", help="Exit 1 when a case regresses against the baseline")
+    ap.add_argument("--tolerance", type=float, default=TOLERANCE, help="Allowed fractional ops/sec drop or allocation growth")
+    ap.add_argument("--out", type=Path, default=None, help="Write the report as JSON")
+    args = ap.parse_args()
+
+    cases = select_cases(args.cases)
+    if args.list:
+        for case in cases:
+            print(f"{case.name:<46} {case.unit:<5} {', '.join(str(s) for s in case.sizes)}")
+        return 0
+    if not cases:
+        raise SystemExit(f"no case matches {args.cases!r}")
+
+    recorded = load_recorded(args.recorded)
+    if args.recorded and not recorded:
+        raise SystemExit("no model outputs found in --recorded paths")
+    inputs = Inputs(recorded)
+    print(f"microbench on {host_key()} ({inputs.kind} inputs)")
+    rows = run_suite(cases, inputs, n_sizes=2 if args.quick else None, min_time=args.min_time, rounds=args.rounds)
+
+    baseline = load_baseline(args.baseline, inputs=inputs.kind)
+    regressions = compare(rows, baseline, args.tolerance)
+    report = {
+        "host": host_key(),
+        "generated_at": time.time(),
+        "inputs": inputs.kind,
+        "rows": rows,
+        "baseline": str(args.baseline) if baseline else None,
+        "regressions": regressions,
+    }
+    if args.out:
+        args.out.parent.mkdir(parents=True, exist_ok=True)
+        args.out.write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+    if not baseline:
+        print(f"no baseline for this host and inputs in {args.baseline}")
+    for r in regressions:
+        print(f"REGRESSION {r['case']}@{r['size']} {r['metric']}: {r['baseline']} -> {r['current']} ({r['change_pct']:+}%)")
+    if baseline and not regressions:
+        print(f"no regressions against {args.baseline} (tolerance {args.tolerance:.0%})")
+    if args.update_baseline:
+        save_baseline(rows, args.baseline, inputs=inputs.kind)
+        print(f"baseline updated: {args.baseline}")
+    return 1 if args.check and regressions else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
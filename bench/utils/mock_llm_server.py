@@ -0,0 +1,715 @@
+#!/usr/bin/env python3
+"""
+Recorded-response stand-in for Ollama and OpenAI-compatible servers.
+
+Provides:
+1. Ollama native routes: /api/chat and /api/generate (JSON or NDJSON
+   streaming), /api/tags, /api/ps, /api/show, /api/version
+2. OpenAI-compatible routes: /v1/chat/completions (JSON or SSE with a usage
+   chunk and `data: [DONE]`), /v1/models, and llama-server's /tokenize
+3. Replay of recorded outputs from run_bench results.jsonl rows and
+   core PromptResult / PhaseResult JSON, matched by model and prompt
+4. Recorded or configured TTFT and per-token pacing, with a time scale
+   (0 replays as fast as the socket allows)
+5. Seeded fault injection: HTTP 500, HTTP 429 with Retry-After, and hung
+   requests that are dropped without a response
+6. Cold loads: the first request to a non-resident model pays `load_ms`,
+   and keep_alive=0 unloads it
+7. Optional prompt cache: with `prefill_tps` set, each model keeps its last
+   prompt and only the tokens past the shared prefix are "evaluated", as
+   Ollama's resident context and llama-server's cache_prompt slot do
+   (prompt_eval_count / prompt_eval_duration and llama-server `timings`)
+8. /mock/stats: request counts by route and status, peak in-flight requests
+
+The harness's concurrency, caching, retry and load-generation code can then
+be exercised (and benchmarked at thousands of requests per second) on a
+machine without a GPU or any model pulled:
+
+    python3 -m utils.mock_llm_server --record openclaw_llm_bench/runs --time-scale 0
+    OLLAMA_HOST=http://127.0.0.1:11435 python3 core/run_benchmark.py ...
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+import zlib
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from utils.blob_store import BlobStore, find_store, resolve
+from utils.prompt_corpora import load_corpus
+
+
+# =============================================================================
+# Configuration
+# =============================================================================
+
+DEFAULT_PORT = 11435
+DEFAULT_MODEL = "mock:latest"
+# Used when nothing was recorded for a request.
+FALLBACK_CONTENT = "MOCK_OK"
+FAULTS = ("error", "rate_limit", "timeout")
+# Lets a client pin a recording when the prompt text is not in a known corpus.
+PROMPT_ID_HEADER = "X-Mock-Prompt-Id"
+# Forces a fault on one request, for deterministic retry tests.
+FAULT_HEADER = "X-Mock-Fault"
+
+
+@dataclass
+class MockConfig:
+    """Pacing and fault-injection knobs; None timings fall back to recordings."""
+    ttft_ms: Optional[float] = None
+    tokens_per_s: Optional[float] = None
+    time_scale: float = 1.0
+    load_ms: float = 0.0
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    timeout_rate: float = 0.0
+    hang_s: float = 30.0
+    retry_after_s: int = 1
+    seed: Optional[int] = 0
+    # Prompt tokens per second; enables the per-model prompt cache.
+    prefill_tps: Optional[float] = None
+
+
+# =============================================================================
+# Recordings
+# =============================================================================
+
+@dataclass
+class Recording:
+    model: str
+    content: str
+    prompt_id: Optional[str] = None
+    tool_calls: List[str] = field(default_factory=list)
+    ttft_ms: Optional[float] = None
+    e2e_ms: Optional[float] = None
+    output_tokens: Optional[int] = None
+    input_tokens: Optional[int] = None
+
+
+def split_chunks(text: str) -> List[str]:
+    """Word-sized stream pieces that join back to exactly `text`."""
+    return re.findall(r"\s*\S+|\s+", text)
+
+
+def _from_result_row(row: Dict, blobs: Optional[BlobStore] = None) -> Optional[Recording]:
+    """run_bench results.jsonl row -> Recording (successful calls only)."""
+    if row.get("record_type", "result") != "result" or not row.get("success"):
+        return None
+    return Recording(
+        model=row.get("model") or DEFAULT_MODEL,
+        content=str(resolve(row.get("raw_output"), blobs) or ""),
+        prompt_id=row.get("prompt_id"),
+        tool_calls=[t for t in (row.get("tool_calls") or []) if isinstance(t, str)],
+        ttft_ms=row.get("ttft_ms"),
+        e2e_ms=row.get("e2e_ms"),
+        output_tokens=row.get("output_tokens"),
+        input_tokens=row.get("input_tokens"),
+    )
+
+
+def _from_prompt_result(model: str, row: Dict, blobs: Optional[BlobStore] = None) -> Optional[Recording]:
+    """core PromptResult dict -> Recording (skips errors and timeouts)."""
+    if row.get("error") or row.get("timeout"):
+        return None
+    return Recording(
+        model=model,
+        content=str(resolve(row.get("assistant_content"), blobs) or ""),
+        prompt_id=row.get("prompt_id"),
+        tool_calls=list(row.get("got") or []),
+        ttft_ms=row.get("ttft_ms"),
+        e2e_ms=row.get("latency_ms"),
+        output_tokens=row.get("tokens_generated"),
+        input_tokens=row.get("prompt_tokens"),
+    )
+
+
+def iter_recordings(path: Path) -> Iterable[Recording]:
+    """
+    Recordings from one archive file or every *.jsonl / *.json under a directory.
+
+    Unrecognised JSON (configs, summaries) is skipped rather than rejected, so
+    a whole runs directory can be passed as-is. Outputs packed into a blob
+    store (utils/blob_store.py) are read from the nearest `blobs/` above the file.
+    """
+    path = Path(path)
+    if path.is_dir():
+        for child in sorted(path.rglob("*")):
+            if child.suffix in (".jsonl", ".json") and child.is_file():
+                yield from iter_recordings(child)
+        return
+    blobs = find_store(path)
+    if path.suffix == ".jsonl":
+        with path.open(encoding="utf-8") as f:
+            for line in f:
+                try:
+                    row = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                rec = _from_result_row(row, blobs) if isinstance(row, dict) else None
+                if rec is not None:
+                    yield rec
+        return
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return
+    if isinstance(data, dict) and isinstance(data.get("results"), list):
+        model, rows = data.get("model") or DEFAULT_MODEL, data["results"]
+    elif isinstance(data, list):
+        model, rows = DEFAULT_MODEL, data
+    else:
+        return
+    for row in rows:
+        if isinstance(row, dict) and "prompt_id" in row and "assistant_content" in row:
+            rec = _from_prompt_result(row.get("model") or model, row, blobs)
+            if rec is not None:
+                yield rec
+
+
+class RecordingStore:
+    """
+    Recordings indexed by (model, prompt_id) and by model.
+
+    Prompt text is mapped to an id through the harness corpora, so an
+    unmodified client asking a prompt from prompts_v1 or COMPARE_PROMPTS gets
+    that prompt's recorded answer. Anything else picks a recording of the same
+    model (or any model) by a stable hash of the prompt.
+    """
+
+    def __init__(self, recordings: Iterable[Recording] = (), corpora: Iterable[str] = ("compare", "prompts_v1")):
+        self.by_key: Dict[Tuple[str, str], List[Recording]] = {}
+        self.by_model: Dict[str, List[Recording]] = {}
+        self.all: List[Recording] = []
+        self.prompt_ids: Dict[str, str] = {}
+        for name in corpora:
+            try:
+                items = load_corpus(name)
+            except (OSError, ValueError):
+                continue
+            for item in items:
+                self.prompt_ids.setdefault(item["prompt"].strip(), item["id"])
+        for rec in recordings:
+            self.add(rec)
+
+    @classmethod
+    def from_paths(cls, paths: Iterable[Path]) -> "RecordingStore":
+        store = cls()
+        for path in paths:
+            for rec in iter_recordings(path):
+                store.add(rec)
+        return store
+
+    def add(self, rec: Recording) -> None:
+        self.all.append(rec)
+        self.by_model.setdefault(rec.model, []).append(rec)
+        if rec.prompt_id:
+            self.by_key.setdefault((rec.model, rec.prompt_id), []).append(rec)
+
+    def models(self) -> List[str]:
+        return sorted(self.by_model) or [DEFAULT_MODEL]
+
+    def match(self, model: str, prompt: str, prompt_id: Optional[str] = None) -> Recording:
+        """Best recording for a request; a synthetic one when the store is empty."""
+        digest = int(hashlib.sha1(f"{model}\0{prompt}".encode("utf-8")).hexdigest()[:8], 16)
+        pid = prompt_id or self.prompt_ids.get(prompt.strip())
+        for pool in (self.by_key.get((model, pid)) if pid else None, self.by_model.get(model), self.all):
+            if pool:
+                return pool[digest % len(pool)]
+        return Recording(model=model, content=FALLBACK_CONTENT, prompt_id=pid)
+
+
+# =============================================================================
+# Pacing and faults
+# =============================================================================
+
+def pacing(rec: Recording, n_chunks: int, config: MockConfig) -> Tuple[float, float]:
+    """
+    (seconds before the first chunk, seconds between later chunks).
+
+    Configured values win. Otherwise the recording's TTFT is kept and the rest
+    of its end-to-end latency is spread over the remaining chunks; without a
+    recorded TTFT the whole latency is spent before the first chunk.
+    """
+    recorded_e2e = float(rec.e2e_ms or 0.0)
+    if config.ttft_ms is not None:
+        ttft_ms = config.ttft_ms
+    elif rec.ttft_ms is not None:
+        ttft_ms = float(rec.ttft_ms)
+    else:
+        ttft_ms = recorded_e2e
+    if config.tokens_per_s:
+        gap_ms = 1000.0 / config.tokens_per_s
+    elif n_chunks > 1 and recorded_e2e > ttft_ms:
+        gap_ms = (recorded_e2e - ttft_ms) / (n_chunks - 1)
+    else:
+        gap_ms = 0.0
+    scale = max(0.0, config.time_scale) / 1000.0
+    return ttft_ms * scale, gap_ms * scale
+
+
+class FaultInjector:
+    """Seeded per-request fault draw; thread-safe so replays are repeatable."""
+
+    def __init__(self, config: MockConfig):
+        self.config = config
+        self._rng = random.Random(config.seed)
+        self._lock = threading.Lock()
+
+    def draw(self, forced: Optional[str] = None) -> Optional[str]:
+        if forced in FAULTS:
+            return forced
+        cfg = self.config
+        if not (cfg.error_rate or cfg.rate_limit_rate or cfg.timeout_rate):
+            return None
+        with self._lock:
+            r = self._rng.random()
+        for fault, rate in (("error", cfg.error_rate), ("rate_limit", cfg.rate_limit_rate), ("timeout", cfg.timeout_rate)):
+            if r < rate:
+                return fault
+            r -= rate
+        return None
+
+
+# =============================================================================
+# Server
+# =============================================================================
+
+def _last_user_text(messages: List[Dict]) -> str:
+    for msg in reversed(messages or []):
+        if msg.get("role") == "user":
+            content = msg.get("content")
+            if isinstance(content, list):  # OpenAI content parts
+                return "".join(p.get("text", "") for p in content if isinstance(p, dict))
+            return str(content or "")
+    return ""
+
+
+def _prompt_tokens(body: Dict, chat: bool) -> List[str]:
+    """Whitespace tokens of everything the request sends, in order (tools first, as templates put them)."""
+    if not chat:
+        return (str(body.get("system") or "") + " " + str(body.get("prompt") or "")).split()
+    parts = [json.dumps(body["tools"], sort_keys=True)] if body.get("tools") else []
+    for msg in body.get("messages") or []:
+        content = msg.get("content")
+        if isinstance(content, list):
+            content = "".join(p.get("text", "") for p in content if isinstance(p, dict))
+        parts.append(f"<{msg.get('role')}> {content or ''}")
+    return " ".join(parts).split()
+
+
+class MockLLMServer(ThreadingHTTPServer):
+    """
+    Threaded HTTP server replaying a RecordingStore.
+
+    Bind port 0 for an ephemeral port; `url` has the resolved address. Run
+    with serve_forever() (in a thread for tests) and stop with shutdown().
+    """
+
+    daemon_threads = True
+    request_queue_size = 1024
+
+    def __init__(self, store: RecordingStore, host: str = "127.0.0.1", port: int = DEFAULT_PORT,
+                 config: Optional[MockConfig] = None):
+        super().__init__((host, port), _Handler)
+        self.store = store
+        self.config = config or MockConfig()
+        self.faults = FaultInjector(self.config)
+        self.resident: Dict[str, float] = {}
+        # Weight-file paths reported by /api/show, per model.
+        self.model_files: Dict[str, List[str]] = {}
+        # Last prompt per model, for the simulated prompt cache.
+        self.prompt_cache: Dict[str, List[str]] = {}
+        self._lock = threading.Lock()
+        self.requests: Dict[str, int] = {}
+        self.statuses: Dict[str, int] = {}
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> threading.Thread:
+        """serve_forever() on a daemon thread; returns the thread."""
+        thread = threading.Thread(target=self.serve_forever, name="mock-llm", daemon=True)
+        thread.start()
+        return thread
+
+    def enter(self, route: str) -> None:
+        with self._lock:
+            self.requests[route] = self.requests.get(route, 0) + 1
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+
+    def leave(self, status: int) -> None:
+        with self._lock:
+            self.in_flight -= 1
+            self.statuses[str(status)] = self.statuses.get(str(status), 0) + 1
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "requests": dict(self.requests),
+                "statuses": dict(self.statuses),
+                "in_flight": self.in_flight,
+                "max_in_flight": self.max_in_flight,
+                "resident": sorted(self.resident),
+                "recordings": len(self.store.all),
+            }
+
+    def load(self, model: str, keep_alive=None) -> float:
+        """Mark `model` resident; returns the simulated load time in ms (0 when warm)."""
+        with self._lock:
+            if keep_alive in (0, "0", "0s"):
+                self.resident.pop(model, None)
+                self.prompt_cache.pop(model, None)
+                return 0.0
+            cold = model not in self.resident
+            self.resident[model] = time.time()
+        if not cold or not self.config.load_ms:
+            return 0.0
+        time.sleep(self.config.load_ms * max(0.0, self.config.time_scale) / 1000.0)
+        return self.config.load_ms
+
+    def prefill(self, model: str, tokens: List[str], reuse: bool = True) -> Tuple[int, int]:
+        """(tokens to evaluate, tokens served from the cache) for one prompt; remembers it for the next."""
+        with self._lock:
+            cached = (self.prompt_cache.get(model) or []) if reuse else []
+            n = 0
+            limit = min(len(cached), len(tokens) - 1)  # at least one token is always evaluated
+            while n < limit and cached[n] == tokens[n]:
+                n += 1
+            self.prompt_cache[model] = tokens
+        return len(tokens) - n, n
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: MockLLMServer
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, fmt, *args) -> None:  # keep stdout quiet under load
+        pass
+
+    # -- plumbing ------------------------------------------------------------
+
+    def _send_json(self, status: int, body: Dict, headers: Optional[Dict[str, str]] = None) -> None:
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(data)
+        self._status = status
+
+    def _start_stream(self, content_type: str) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+        self._status = 200
+
+    def _read_body(self) -> Dict:
+        length = int(self.headers.get("Content-Length") or 0)
+        if not length:
+            return {}
+        try:
+            body = json.loads(self.rfile.read(length).decode("utf-8"))
+        except (UnicodeDecodeError, json.JSONDecodeError):
+            return {}
+        return body if isinstance(body, dict) else {}
+
+    def _dispatch(self, routes: Dict) -> None:
+        route = self.path.split("?", 1)[0].rstrip("/") or "/"
+        handler = routes.get(route)
+        self.server.enter(route)
+        self._status = 0
+        try:
+            if handler is None:
+                self._send_json(404, {"error": f"unknown route {route}"})
+            else:
+                handler()
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True
+        finally:
+            self.server.leave(self._status)
+
+    def do_GET(self) -> None:
+        self._dispatch({
+            "/api/tags": self._tags,
+            "/api/ps": self._ps,
+            "/api/version": lambda: self._send_json(200, {"version": "0.0.0-mock"}),
+            "/v1/models": self._models,
+            "/mock/stats": lambda: self._send_json(200, self.server.stats()),
+            "/": lambda: self._send_json(200, {"status": "Ollama is running"}),
+        })
+
+    def do_POST(self) -> None:
+        self._dispatch({
+            "/api/chat": self._ollama_chat,
+            "/api/generate": self._ollama_generate,
+            "/api/show": self._show,
+            "/v1/chat/completions": self._openai_chat,
+            "/tokenize": self._tokenize,
+        })
+
+    # -- shared request path -------------------------------------------------
+
+    def _fault(self) -> bool:
+        """Apply a drawn fault; True when the request has been answered (or dropped)."""
+        fault = self.server.faults.draw(self.headers.get(FAULT_HEADER))
+        if fault == "error":
+            self._send_json(500, {"error": "mock injected server error"})
+        elif fault == "rate_limit":
+            retry_after = str(self.server.config.retry_after_s)
+            self._send_json(429, {"error": "mock injected rate limit"}, {"Retry-After": retry_after})
+        elif fault == "timeout":
+            time.sleep(self.server.config.hang_s)
+            self.close_connection = True
+            self._status = 0
+        return fault is not None
+
+    def _prepare(self, body: Dict, prompt: str, max_tokens: Optional[int], chat: bool = True):
+        model = body.get("model") or DEFAULT_MODEL
+        load_ms = self.server.load(model, body.get("keep_alive"))
+        rec = self.server.store.match(model, prompt, self.headers.get(PROMPT_ID_HEADER))
+        chunks = split_chunks(rec.content)
+        truncated = bool(max_tokens) and len(chunks) > int(max_tokens)
+        if truncated:
+            chunks = chunks[: int(max_tokens)]
+        ttft_s, gap_s = pacing(rec, len(chunks), self.server.config)
+        n_out = len(chunks) if truncated or rec.output_tokens is None else int(rec.output_tokens)
+        n_in = int(rec.input_tokens) if rec.input_tokens is not None else len(prompt.split())
+        n_cached = 0
+        config = self.server.config
+        if config.prefill_tps:
+            n_in, n_cached = self.server.prefill(model, _prompt_tokens(body, chat), body.get("cache_prompt", True))
+            ttft_s += n_in / config.prefill_tps * max(0.0, config.time_scale)
+        return model, rec, chunks, truncated, ttft_s, gap_s, load_ms, n_in, n_out, n_cached
+
+    def _paced(self, chunks: List[str], ttft_s: float, gap_s: float) -> Iterable[str]:
+        for i, piece in enumerate(chunks):
+            delay = ttft_s if i == 0 else gap_s
+            if delay > 0:
+                time.sleep(delay)
+            yield piece
+
+    def _ollama_metrics(self, started: float, load_ms: float, ttft_s: float, n_in: int, n_out: int) -> Dict:
+        total_ns = int((time.perf_counter() - started) * 1e9)
+        load_ns = int(load_ms * max(0.0, self.server.config.time_scale) * 1e6)
+        prompt_ns = int(ttft_s * 1e9)
+        return {
+            "total_duration": total_ns,
+            "load_duration": load_ns,
+            "prompt_eval_count": n_in,
+            "prompt_eval_duration": prompt_ns,
+            "eval_count": n_out,
+            "eval_duration": max(0, total_ns - load_ns - prompt_ns),
+        }
+
+    # -- GET routes ----------------------------------------------------------
+
+    def _tags(self) -> None:
+        models = [
+            {"name": m, "model": m, "size": 0, "details": {"parameter_size": "", "quantization_level": ""}}
+            for m in self.server.store.models()
+        ]
+        self._send_json(200, {"models": models})
+
+    def _ps(self) -> None:
+        rows = [{"name": m, "model": m, "size": 0, "size_vram": 0} for m in sorted(self.server.resident)]
+        self._send_json(200, {"models": rows})
+
+    def _show(self) -> None:
+        model = self._read_body().get("model") or DEFAULT_MODEL
+        paths = self.server.model_files.get(model) or [model]
+        modelfile = "# Modelfile generated by mock_llm_server\n" + "".join(f"FROM {p}\n" for p in paths)
+        self._send_json(200, {"modelfile": modelfile, "details": {"format": "gguf"}})
+
+    def _tokenize(self) -> None:
+        # llama-server's route; one id per whitespace token, as the prompt cache counts them
+        tokens = str(self._read_body().get("content") or "").split()
+        self._send_json(200, {"tokens": [zlib.crc32(t.encode("utf-8")) & 0xFFFF for t in tokens]})
+
+    def _models(self) -> None:
+        data = [{"id": m, "object": "model", "owned_by": "mock"} for m in self.server.store.models()]
+        self._send_json(200, {"object": "list", "data": data})
+
+    # -- Ollama native -------------------------------------------------------
+
+    def _ollama_chat(self) -> None:
+        self._ollama(self._read_body(), chat=True)
+
+    def _ollama_generate(self) -> None:
+        self._ollama(self._read_body(), chat=False)
+
+    def _ollama(self, body: Dict, chat: bool) -> None:
+        started = time.perf_counter()
+        prompt = _last_user_text(body.get("messages") or []) if chat else str(body.get("prompt") or "")
+        if not prompt and not (chat and body.get("messages")):
+            # Empty request: load or unload the model only, as Ollama does.
+            model = body.get("model") or DEFAULT_MODEL
+            load_ms = self.server.load(model, body.get("keep_alive"))
+            unload = body.get("keep_alive") in (0, "0", "0s")
+            done = {"model": model, "created_at": _now(), "done": True, "done_reason": "unload" if unload else "load",
+                    "load_duration": int(load_ms * max(0.0, self.server.config.time_scale) * 1e6)}
+            if chat:
+                done["message"] = {"role": "assistant", "content": ""}
+            else:
+                done["response"] = ""
+            self._send_json(200, done)
+            return
+        if self._fault():
+            return
+        options = body.get("options") or {}
+        model, rec, chunks, truncated, ttft_s, gap_s, load_ms, n_in, n_out, _ = self._prepare(
+            body, prompt, options.get("num_predict") if (options.get("num_predict") or 0) > 0 else None, chat
+        )
+        tool_calls = [{"function": {"name": name, "arguments": {}}} for name in rec.tool_calls] if body.get("tools") else []
+        reason = "length" if truncated else "stop"
+
+        def frame(text: str) -> Dict:
+            if chat:
+                return {"model": model, "created_at": _now(), "message": {"role": "assistant", "content": text}}
+            return {"model": model, "created_at": _now(), "response": text}
+
+        if body.get("stream", True):
+            self._start_stream("application/x-ndjson")
+            for piece in self._paced(chunks, ttft_s, gap_s):
+                self.wfile.write((json.dumps({**frame(piece), "done": False}) + "\n").encode("utf-8"))
+            final = {**frame(""), "done": True, "done_reason": reason,
+                     **self._ollama_metrics(started, load_ms, ttft_s, n_in, n_out)}
+            if tool_calls:
+                final["message"]["tool_calls"] = tool_calls
+            self.wfile.write((json.dumps(final) + "\n").encode("utf-8"))
+            return
+
+        text = "".join(self._paced(chunks, ttft_s, gap_s))
+        resp = {**frame(text), "done": True, "done_reason": reason,
+                **self._ollama_metrics(started, load_ms, ttft_s, n_in, n_out)}
+        if tool_calls:
+            resp["message"]["tool_calls"] = tool_calls
+        self._send_json(200, resp)
+
+    # -- OpenAI-compatible ---------------------------------------------------
+
+    def _openai_chat(self) -> None:
+        body = self._read_body()
+        if self._fault():
+            return
+        prompt = _last_user_text(body.get("messages") or [])
+        max_tokens = body.get("max_tokens") or body.get("max_completion_tokens")
+        model, rec, chunks, truncated, ttft_s, gap_s, _, n_in, n_out, n_cached = self._prepare(body, prompt, max_tokens)
+        completion_id = "chatcmpl-mock-" + hashlib.sha1(f"{time.time_ns()}{id(self)}".encode()).hexdigest()[:12]
+        created = int(time.time())
+        usage = {"prompt_tokens": n_in + n_cached, "completion_tokens": n_out, "total_tokens": n_in + n_cached + n_out}
+        tool_calls = [
+            {"id": f"call_{i}", "type": "function", "function": {"name": name, "arguments": "{}"}}
+            for i, name in enumerate(rec.tool_calls)
+        ] if body.get("tools") else []
+        reason = "tool_calls" if tool_calls else ("length" if truncated else "stop")
+
+        if body.get("stream"):
+            self._start_stream("text/event-stream")
+
+            def send(obj) -> None:
+                payload = obj if isinstance(obj, str) else json.dumps(obj)
+                self.wfile.write(f"data: {payload}\n\n".encode("utf-8"))
+
+            def chunk(delta: Dict, finish: Optional[str] = None) -> Dict:
+                return {"id": completion_id, "object": "chat.completion.chunk", "created": created, "model": model,
+                        "choices": [{"index": 0, "delta": delta, "finish_reason": finish}]}
+
+            send(chunk({"role": "assistant", "content": ""}))
+            for piece in self._paced(chunks, ttft_s, gap_s):
+                send(chunk({"content": piece}))
+            if tool_calls:
+                send(chunk({"tool_calls": [{"index": i, **tc} for i, tc in enumerate(tool_calls)]}))
+            send(chunk({}, reason))
+            if (body.get("stream_options") or {}).get("include_usage"):
+                send({"id": completion_id, "object": "chat.completion.chunk", "created": created, "model": model,
+                      "choices": [], "usage": usage})
+            send("[DONE]")
+            return
+
+        message: Dict = {"role": "assistant", "content": "".join(self._paced(chunks, ttft_s, gap_s))}
+        if tool_calls:
+            message["tool_calls"] = tool_calls
+        self._send_json(200, {
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": created,
+            "model": model,
+            "choices": [{"index": 0, "message": message, "finish_reason": reason}],
+            "usage": usage,
+            # llama-server's per-request counters
+            "timings": {"prompt_n": n_in, "prompt_ms": round(ttft_s * 1000, 3), "cache_n": n_cached,
+                        "predicted_n": n_out},
+        })
+
+
+def _now() -> str:
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+
+
+# =============================================================================
+# CLI
+# =============================================================================
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Replay recorded LLM responses over Ollama and OpenAI-compatible APIs.")
+    ap.add_argument("--record", action="append", default=[],
+                    help="results.jsonl, PhaseResult JSON, or a directory of them (repeatable)")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=DEFAULT_PORT)
+    ap.add_argument("--ttft-ms", type=float, default=None, help="Fixed TTFT (default: recorded)")
+    ap.add_argument("--tokens-per-s", type=float, default=None, help="Fixed decode rate (default: recorded)")
+    ap.add_argument("--time-scale", type=float, default=1.0, help="Multiply every delay; 0 disables pacing")
+    ap.add_argument("--load-ms", type=float, default=0.0, help="Cold-load cost for a non-resident model")
+    ap.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with HTTP 500")
+    ap.add_argument("--rate-limit-rate", type=float, default=0.0, help="Fraction answered with HTTP 429")
+    ap.add_argument("--timeout-rate", type=float, default=0.0, help="Fraction that hang and are dropped")
+    ap.add_argument("--hang-s", type=float, default=30.0, help="How long a timed-out request hangs")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--prefill-tps", type=float, default=None,
+                    help="Simulated prompt tokens/s; enables per-model prompt caching")
+    args = ap.parse_args()
+
+    config = MockConfig(
+        ttft_ms=args.ttft_ms,
+        tokens_per_s=args.tokens_per_s,
+        time_scale=args.time_scale,
+        load_ms=args.load_ms,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        timeout_rate=args.timeout_rate,
+        hang_s=args.hang_s,
+        seed=args.seed,
+        prefill_tps=args.prefill_tps,
+    )
+    store = RecordingStore.from_paths(Path(p) for p in args.record)
+    server = MockLLMServer(store, args.host, args.port, config)
+    print(f"mock LLM server on {server.url}: {len(store.all)} recordings, models {', '.join(store.models())}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,445 @@
+#!/usr/bin/env python3
+"""
+Model residency planning for Ollama-backed benchmark runs.
+
+Provides:
+1. Job ordering that runs every job of a model back to back (one load per model)
+2. Model inventory (size, quantization) and resident-set queries via the Ollama API
+3. Co-residency decisions against free RAM / VRAM
+4. Explicit warm-up / unload with load time measured separately from inference
+5. The on-disk weight files behind a model (for page-cache inspection)
+
+Loading a 35B model takes minutes; evicting it between suites and paying that
+again is pure overhead. The controller only stops other runners when the next
+model does not fit next to them.
+"""
+
+import json
+import os
+import re
+import subprocess
+import time
+import urllib.error
+import urllib.request
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, Optional, Sequence, TypeVar
+
+
+# =============================================================================
+# Configuration
+# =============================================================================
+
+OLLAMA_BASE_URL = os.environ.get("OLLAMA_HOST", "http://localhost:11434")
+DEFAULT_KEEP_ALIVE_S = 1800
+DEFAULT_HEADROOM_FRAC = 0.85
+DEFAULT_RESERVE_BYTES = 2 * 1024 ** 3
+# Loaded footprint vs. file size (KV cache, runtime buffers) when `ollama ps` has no figure yet.
+LOAD_OVERHEAD = 1.2
+
+_UNITS = {"B": 1, "KB": 1000, "MB": 1000 ** 2, "GB": 1000 ** 3, "TB": 1000 ** 4}
+_SIZE_RE = re.compile(r"(\d+(?:\.\d+)?)\s*(TB|GB|MB|KB|B)\b", re.IGNORECASE)
+_QUANT_RE = re.compile(r"(q\d[_a-z0-9]*|fp16|f16|bf16|fp32|f32)", re.IGNORECASE)
+OLLAMA_MODELS_DIR = os.environ.get("OLLAMA_MODELS", os.path.expanduser("~/.ollama/models"))
+# Manifest layers that hold weights (the model itself and any vision projector).
+WEIGHT_MEDIA_TYPES = ("application/vnd.ollama.image.model", "application/vnd.ollama.image.projector")
+
+J = TypeVar("J")
+
+
+# =============================================================================
+# Data Classes
+# =============================================================================
+
+@dataclass
+class ModelInfo:
+    """Installed model as reported by `ollama list` / `/api/tags`."""
+    name: str
+    size_bytes: int = 0
+    quantization: str = ""
+    parameter_size: str = ""
+
+
+@dataclass
+class ResidentModel:
+    """Loaded model as reported by `ollama ps` / `/api/ps`."""
+    name: str
+    size_bytes: int = 0
+    size_vram_bytes: int = 0
+
+
+@dataclass
+class MemoryBudget:
+    """Free memory that a new model may occupy without evicting anything."""
+    ram_available_bytes: int = 0
+    vram_free_bytes: Optional[int] = None  # None when no GPU was detected
+
+    @property
+    def has_gpu(self) -> bool:
+        return self.vram_free_bytes is not None
+
+
+@dataclass
+class LoadEvent:
+    """One model warm-up: `load_ms` is Ollama's own load_duration, `wall_ms` the round trip."""
+    model: str
+    load_ms: float
+    wall_ms: float
+    already_resident: bool
+    evicted: list[str] = field(default_factory=list)
+    error: Optional[str] = None
+
+
+# =============================================================================
+# Parsing
+# =============================================================================
+
+def parse_size(text: str) -> int:
+    """Parse a human size like '2.0 GB' or '807 MB' into bytes (0 if absent)."""
+    m = _SIZE_RE.search(text or "")
+    if not m:
+        return 0
+    return int(float(m.group(1)) * _UNITS[m.group(2).upper()])
+
+
+def quantization_from_name(name: str) -> str:
+    """Best-effort quantization from a tag such as 'qwen2.5:7b-instruct-q4_K_M'."""
+    tag = name.split(":", 1)[1] if ":" in name else ""
+    m = _QUANT_RE.search(tag)
+    return m.group(1).upper() if m else ""
+
+
+def _table_rows(output: str) -> list[str]:
+    lines = [ln.rstrip() for ln in (output or "").splitlines() if ln.strip()]
+    if lines and lines[0].lower().startswith("name"):
+        lines = lines[1:]
+    return lines
+
+
+def parse_ollama_list(output: str) -> list[ModelInfo]:
+    """Parse `ollama list` (NAME ID SIZE MODIFIED)."""
+    models = []
+    for ln in _table_rows(output):
+        parts = ln.split()
+        if not parts:
+            continue
+        # Size sits after the ID column; search from there so digits in names don't match.
+        rest = ln.split(None, 2)[2] if len(parts) >= 3 else ""
+        models.append(ModelInfo(parts[0], parse_size(rest), quantization_from_name(parts[0])))
+    return models
+
+
+def parse_ollama_ps(output: str) -> list[ResidentModel]:
+    """Parse `ollama ps` (NAME ID SIZE PROCESSOR UNTIL)."""
+    models = []
+    for ln in _table_rows(output):
+        parts = ln.split()
+        if not parts:
+            continue
+        rest = ln.split(None, 2)[2] if len(parts) >= 3 else ""
+        size = parse_size(rest)
+        vram = size if re.search(r"100%\s+GPU", rest) else 0
+        models.append(ResidentModel(parts[0], size, vram))
+    return models
+
+
+def parse_modelfile_paths(modelfile: str) -> list[str]:
+    """Absolute `FROM` paths in a Modelfile as returned by `/api/show` (base-model names are skipped)."""
+    paths = []
+    for ln in (modelfile or "").splitlines():
+        parts = ln.strip().split(None, 1)
+        if len(parts) == 2 and parts[0].upper() == "FROM" and parts[1].startswith("/"):
+            paths.append(parts[1].strip())
+    return paths
+
+
+def manifest_blob_paths(model: str, models_dir: str = OLLAMA_MODELS_DIR) -> list[str]:
+    """Weight blobs listed in the local manifest of `model` ("name:tag", "ns/name:tag" or "host/ns/name:tag")."""
+    name, _, tag = model.partition(":")
+    parts = name.split("/")
+    if len(parts) == 1:
+        parts = ["registry.ollama.ai", "library"] + parts
+    elif len(parts) == 2:
+        parts = ["registry.ollama.ai"] + parts
+    path = os.path.join(models_dir, "manifests", *parts, tag or "latest")
+    try:
+        with open(path, encoding="utf-8") as f:
+            layers = json.load(f).get("layers") or []
+    except (OSError, ValueError):
+        return []
+    return [
+        os.path.join(models_dir, "blobs", layer["digest"].replace(":", "-"))
+        for layer in layers
+        if layer.get("mediaType") in WEIGHT_MEDIA_TYPES and layer.get("digest")
+    ]
+
+
+# =============================================================================
+# Scheduling
+# =============================================================================
+
+def group_by_model(
+    jobs: Sequence[J],
+    model_of: Callable[[J], str],
+    sizes: Optional[dict[str, int]] = None,
+) -> list[tuple[str, list[J]]]:
+    """
+    Group jobs so each model runs once, contiguously.
+
+    Groups are ordered smallest model first (unknown sizes last, then by first
+    appearance); job order inside a group is preserved. Running the largest
+    model last means nothing has to evict it afterwards.
+    """
+    sizes = sizes or {}
+    groups: dict[str, list[J]] = {}
+    for job in jobs:
+        groups.setdefault(model_of(job), []).append(job)
+    first_seen = {m: i for i, m in enumerate(groups)}
+
+    def key(model: str) -> tuple[int, int, int]:
+        size = sizes.get(model, 0)
+        return (0 if size else 1, size, first_seen[model])
+
+    return [(m, groups[m]) for m in sorted(groups, key=key)]
+
+
+def fits_alongside(
+    size_bytes: int,
+    budget: MemoryBudget,
+    *,
+    headroom_frac: float = DEFAULT_HEADROOM_FRAC,
+    reserve_bytes: int = DEFAULT_RESERVE_BYTES,
+) -> bool:
+    """
+    Whether a model of `size_bytes` (loaded footprint) can be added without evicting.
+
+    With a GPU the model must fit in free VRAM (a partial CPU offload would
+    distort the measurement); otherwise it must fit in available RAM.
+    """
+    if size_bytes <= 0:
+        return False
+    free = budget.vram_free_bytes if budget.has_gpu else budget.ram_available_bytes
+    return size_bytes <= max(0, int(free * headroom_frac) - reserve_bytes)
+
+
+# =============================================================================
+# Host probes
+# =============================================================================
+
+def read_meminfo(path: str = "/proc/meminfo") -> dict[str, int]:
+    """Return /proc/meminfo fields in bytes."""
+    out: dict[str, int] = {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                key, _, rest = line.partition(":")
+                parts = rest.split()
+                if parts and parts[0].isdigit():
+                    mult = 1024 if len(parts) > 1 and parts[1].lower() == "kb" else 1
+                    out[key.strip()] = int(parts[0]) * mult
+    except OSError:
+        pass
+    return out
+
+
+def read_vram_free() -> Optional[int]:
+    """Free VRAM summed over NVIDIA GPUs, or None when nvidia-smi is unavailable."""
+    try:
+        cp = subprocess.run(
+            ["nvidia-smi", "--query-gpu=memory.free", "--format=csv,noheader,nounits"],
+            capture_output=True, text=True, timeout=10,
+        )
+    except (FileNotFoundError, subprocess.TimeoutExpired, OSError):
+        return None
+    if cp.returncode != 0:
+        return None
+    total = 0
+    for ln in cp.stdout.splitlines():
+        ln = ln.strip()
+        if ln.isdigit():
+            total += int(ln) * 1024 ** 2  # MiB
+    return total
+
+
+def memory_budget() -> MemoryBudget:
+    info = read_meminfo()
+    return MemoryBudget(
+        ram_available_bytes=info.get("MemAvailable", info.get("MemFree", 0)),
+        vram_free_bytes=read_vram_free(),
+    )
+
+
+# =============================================================================
+# Controller
+# =============================================================================
+
+class OllamaResidency:
+    """
+    Keeps track of which models Ollama has loaded and loads/unloads them on purpose.
+
+    `prepare(model)` makes `model` resident: already-loaded models stay if the
+    new one fits next to them, otherwise they are unloaded (oldest first) until
+    it does. The warm-up request's `load_duration` is recorded as a LoadEvent so
+    load time is reported apart from inference time.
+    """
+
+    def __init__(
+        self,
+        base_url: str = OLLAMA_BASE_URL,
+        *,
+        keep_alive_s: int = DEFAULT_KEEP_ALIVE_S,
+        headroom_frac: float = DEFAULT_HEADROOM_FRAC,
+        reserve_bytes: int = DEFAULT_RESERVE_BYTES,
+        timeout_s: int = 900,
+        budget_fn: Callable[[], MemoryBudget] = memory_budget,
+    ) -> None:
+        self.base_url = base_url.rstrip("/")
+        self.keep_alive_s = keep_alive_s
+        self.headroom_frac = headroom_frac
+        self.reserve_bytes = reserve_bytes
+        self.timeout_s = timeout_s
+        self.budget_fn = budget_fn
+        self.events: list[LoadEvent] = []
+        self._inventory: Optional[dict[str, ModelInfo]] = None
+        self._loaded_sizes: dict[str, int] = {}
+
+    # --- Ollama API -----------------------------------------------------------
+
+    def _request(self, path: str, payload: Optional[dict] = None, timeout_s: Optional[int] = None) -> dict:
+        data = json.dumps(payload).encode("utf-8") if payload is not None else None
+        req = urllib.request.Request(f"{self.base_url}{path}", data=data, method="POST" if data else "GET")
+        req.add_header("Content-Type", "application/json")
+        with urllib.request.urlopen(req, timeout=timeout_s or 30) as resp:
+            return json.loads(resp.read().decode("utf-8") or "{}")
+
+    def inventory(self, refresh: bool = False) -> dict[str, ModelInfo]:
+        """Installed models keyed by name (`/api/tags`, falling back to `ollama list`)."""
+        if self._inventory is not None and not refresh:
+            return self._inventory
+        models: list[ModelInfo] = []
+        try:
+            for m in self._request("/api/tags").get("models", []):
+                details = m.get("details") or {}
+                name = m.get("name") or m.get("model") or ""
+                models.append(ModelInfo(
+                    name=name,
+                    size_bytes=int(m.get("size") or 0),
+                    quantization=details.get("quantization_level") or quantization_from_name(name),
+                    parameter_size=details.get("parameter_size") or "",
+                ))
+        except (urllib.error.URLError, OSError, ValueError):
+            try:
+                cp = subprocess.run(["ollama", "list"], capture_output=True, text=True, timeout=30)
+                if cp.returncode == 0:
+                    models = parse_ollama_list(cp.stdout)
+            except (FileNotFoundError, subprocess.TimeoutExpired, OSError):
+                pass
+        self._inventory = {m.name: m for m in models}
+        return self._inventory
+
+    def resident(self) -> list[ResidentModel]:
+        """Currently loaded models (`/api/ps`, falling back to `ollama ps`)."""
+        try:
+            rows = self._request("/api/ps").get("models", [])
+            out = [
+                ResidentModel(r.get("name") or r.get("model") or "", int(r.get("size") or 0), int(r.get("size_vram") or 0))
+                for r in rows
+            ]
+        except (urllib.error.URLError, OSError, ValueError):
+            try:
+                cp = subprocess.run(["ollama", "ps"], capture_output=True, text=True, timeout=10)
+                out = parse_ollama_ps(cp.stdout) if cp.returncode == 0 else []
+            except (FileNotFoundError, subprocess.TimeoutExpired, OSError):
+                out = []
+        for r in out:
+            if r.size_bytes:
+                self._loaded_sizes[r.name] = r.size_bytes
+        return out
+
+    # --- Planning helpers -----------------------------------------------------
+
+    def sizes(self) -> dict[str, int]:
+        return {name: m.size_bytes for name, m in self.inventory().items()}
+
+    def footprint(self, model: str) -> int:
+        """Expected loaded size: last observed `ollama ps` size, else file size * overhead."""
+        if model in self._loaded_sizes:
+            return self._loaded_sizes[model]
+        info = self.inventory().get(model)
+        return int(info.size_bytes * LOAD_OVERHEAD) if info else 0
+
+    def order(self, jobs: Sequence[J], model_of: Callable[[J], str]) -> list[tuple[str, list[J]]]:
+        return group_by_model(jobs, model_of, self.sizes())
+
+    def model_files(self, model: str) -> list[str]:
+        """Weight files on disk for `model` (`/api/show`, falling back to the local manifest)."""
+        try:
+            paths = parse_modelfile_paths(self._request("/api/show", {"model": model}).get("modelfile", ""))
+        except (urllib.error.URLError, OSError, ValueError):
+            paths = []
+        return [p for p in paths if os.path.isfile(p)] or [p for p in manifest_blob_paths(model) if os.path.isfile(p)]
+
+    # --- Actions --------------------------------------------------------------
+
+    def unload(self, model: str, *, wait: bool = False) -> bool:
+        """Stop `model`'s runner; with `wait`, poll until it has left the resident set."""
+        try:
+            self._request("/api/generate", {"model": model, "keep_alive": 0}, timeout_s=60)
+            if wait:
+                self._wait_unloaded(model)
+            return True
+        except (urllib.error.URLError, OSError, ValueError):
+            try:
+                cp = subprocess.run(["ollama", "stop", model], capture_output=True, text=True, timeout=30)
+                return cp.returncode == 0
+            except (FileNotFoundError, subprocess.TimeoutExpired, OSError):
+                return False
+
+    def prepare(self, model: str, *, pinned: Iterable[str] = ()) -> LoadEvent:
+        """Make `model` resident, evicting other (non-pinned) models only if it does not fit."""
+        resident = self.resident()
+        names = [r.name for r in resident]
+        evicted: list[str] = []
+        if model not in names:
+            keep = set(pinned) | {model}
+            # /api/ps lists most recently used first; evict from the end.
+            candidates = [n for n in reversed(names) if n not in keep]
+            need = self.footprint(model)
+            while candidates and not fits_alongside(
+                need, self.budget_fn(), headroom_frac=self.headroom_frac, reserve_bytes=self.reserve_bytes
+            ):
+                victim = candidates.pop(0)
+                if self.unload(victim):
+                    evicted.append(victim)
+                    self._wait_unloaded(victim)
+        event = self.warm(model, already_resident=model in names)
+        event.evicted = evicted
+        return event
+
+    def warm(self, model: str, *, already_resident: bool = False) -> LoadEvent:
+        """Load `model` with an empty prompt and pin it for `keep_alive_s`."""
+        started = time.perf_counter()
+        try:
+            resp = self._request(
+                "/api/generate",
+                {"model": model, "prompt": "", "keep_alive": f"{self.keep_alive_s}s"},
+                timeout_s=self.timeout_s,
+            )
+            load_ns = resp.get("load_duration")
+            wall_ms = (time.perf_counter() - started) * 1000
+            load_ms = load_ns / 1e6 if isinstance(load_ns, (int, float)) else wall_ms
+            event = LoadEvent(model, round(load_ms, 1), round(wall_ms, 1), already_resident)
+        except (urllib.error.URLError, OSError, ValueError) as e:
+            wall_ms = (time.perf_counter() - started) * 1000
+            event = LoadEvent(model, 0.0, round(wall_ms, 1), already_resident, error=str(e)[:200])
+        self.events.append(event)
+        return event
+
+    def _wait_unloaded(self, model: str, attempts: int = 5) -> None:
+        # Unload is asynchronous on the server side.
+        for attempt in range(1, attempts + 1):
+            if model not in {r.name for r in self.resident()}:
+                return
+            time.sleep(0.5 * attempt)
+
+    def total_load_ms(self) -> float:
+        return round(sum(e.load_ms for e in self.events), 1)
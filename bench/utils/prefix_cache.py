@@ -0,0 +1,427 @@
+#!/usr/bin/env python3
+"""
+Prefix / KV-cache reuse on the multi-turn extended suite.
+
+Provides:
+1. Turn-by-turn replay of the extended suite: each user turn of an item is
+   its own request carrying the conversation so far, behind a system prompt
+   padded to each requested prefix length
+2. Two passes per prefix length:
+   - cold:  a fresh nonce opens the system prompt of every request, so no
+            backend can match a cached prefix and every token is prefilled
+   - warm:  one stable prefix throughout; Ollama reuses the resident
+            runner's context (model kept alive), llama-server reuses its
+            slot through cache_prompt
+3. Prompt-eval time and evaluated-token counts per request, in the
+   `extract_ollama_metrics` shape (llama-server `timings` mapped onto it)
+4. Per-prefix-length savings: cold vs warm prompt_eval_duration paired by
+   (item, turn), tokens evaluated vs sent, first turns (shared system
+   prefix only) and follow-ups (whole conversation prefix) apart
+
+`run_extended_phase` resends the full message list for every item, so
+whatever a backend saves on a long repeated system prompt never shows up in
+its numbers. Agent workloads are dominated by exactly that prefix.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import time
+import urllib.error
+import urllib.request
+import uuid
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+# =============================================================================
+# Configuration
+# =============================================================================
+
+BENCH_ROOT = Path(__file__).resolve().parents[1]
+SUITE_PATH = Path(os.environ.get("BENCH_EXTENDED_SUITE_PATH", str(BENCH_ROOT / "extended_benchmark_suite.json")))
+PASSES = ("cold", "warm")
+DEFAULT_PREFIX_TOKENS = (0, 1024, 4096)
+DEFAULT_MAX_TOKENS = 64
+DEFAULT_TIMEOUT_S = 300.0
+DEFAULT_KEEP_ALIVE = "30m"
+# Rough chars-per-token for padding; the cold pass reports the real count.
+CHARS_PER_TOKEN = 4
+DEFAULT_SYSTEM_PROMPT = "You are a helpful assistant with access to tools. Call a tool only when the request needs one."
+
+_FILLER = (
+    "Guideline {n}: keep answers short, confirm dates and places before acting, never invent tool "
+    "results, prefer one precise tool call over several vague ones, and say so when a request is ambiguous."
+)
+
+METRIC_KEYS = ("prompt_tokens", "prompt_eval_duration_ms", "total_duration_ms", "load_duration_ms", "cached_tokens")
+
+
+# =============================================================================
+# Workload
+# =============================================================================
+
+def build_prefix(system_prompt: str, target_tokens: int) -> str:
+    """
+    Pad `system_prompt` with numbered guidelines to roughly `target_tokens`.
+
+    The padding is deterministic, so every call with the same arguments
+    returns the same text and a backend can cache it.
+    """
+    target_chars = max(0, int(target_tokens)) * CHARS_PER_TOKEN
+    lines = [system_prompt]
+    size = len(system_prompt)
+    n = 1
+    while size < target_chars:
+        line = _FILLER.format(n=n)
+        lines.append(line)
+        size += len(line) + 1
+        n += 1
+    return "\n".join(lines)
+
+
+def load_suite(path: Optional[Path] = None, prompt_ids: Optional[Iterable[str]] = None) -> List[Tuple[str, Dict]]:
+    """(category, item) pairs from the extended suite, optionally filtered by id."""
+    suite = json.loads(Path(path or SUITE_PATH).read_text())
+    wanted = set(prompt_ids) if prompt_ids is not None else None
+    return [
+        (category, item)
+        for category, items in suite.items()
+        for item in items
+        if wanted is None or item["id"] in wanted
+    ]
+
+
+def turn_steps(turns: List[Dict]) -> List[List[Dict]]:
+    """One message list per user turn: the conversation up to and including it."""
+    history = [{"role": t["role"], "content": t["content"]} for t in turns]
+    return [history[: i + 1] for i, t in enumerate(history) if t["role"] == "user"]
+
+
+# =============================================================================
+# Backends
+# =============================================================================
+
+def _post_json(url: str, payload: Dict, timeout_s: float) -> Dict:
+    req = urllib.request.Request(
+        url,
+        data=json.dumps(payload).encode("utf-8"),
+        method="POST",
+        headers={"Content-Type": "application/json"},
+    )
+    with urllib.request.urlopen(req, timeout=timeout_s) as resp:
+        return json.loads(resp.read())
+
+
+def _ms(ns) -> Optional[float]:
+    return ns / 1e6 if isinstance(ns, (int, float)) else None
+
+
+class OllamaChatClient:
+    """
+    Non-streaming native /api/chat, read like `extract_ollama_metrics`.
+
+    Ollama keeps one KV context per runner slot and skips the tokens it
+    shares with the previous prompt, as long as the model stays resident.
+    """
+
+    name = "ollama"
+
+    def __init__(self, base_url: str, *, tools: Optional[List[Dict]] = None, keep_alive: str = DEFAULT_KEEP_ALIVE,
+                 timeout_s: float = DEFAULT_TIMEOUT_S):
+        self.base_url = base_url.rstrip("/")
+        self.tools = tools
+        self.keep_alive = keep_alive
+        self.timeout_s = timeout_s
+
+    def chat(self, model: str, messages: List[Dict], max_tokens: int) -> Dict:
+        payload: Dict = {
+            "model": model,
+            "messages": messages,
+            "stream": False,
+            "keep_alive": self.keep_alive,
+            "options": {"temperature": 0, "num_predict": max_tokens},
+        }
+        if self.tools:
+            payload["tools"] = self.tools
+        data = _post_json(f"{self.base_url}/api/chat", payload, self.timeout_s)
+        return {
+            "prompt_tokens": data.get("prompt_eval_count") if isinstance(data.get("prompt_eval_count"), int) else None,
+            "prompt_eval_duration_ms": _ms(data.get("prompt_eval_duration")),
+            "total_duration_ms": _ms(data.get("total_duration")),
+            "load_duration_ms": _ms(data.get("load_duration")),
+            "cached_tokens": None,
+        }
+
+
+class LlamaServerChatClient:
+    """
+    llama-server /v1/chat/completions with cache_prompt; reads its `timings`.
+
+    prompt_n counts the tokens actually evaluated and cache_n the ones reused
+    from the slot.
+    """
+
+    name = "llama-server"
+
+    def __init__(self, base_url: str, *, tools: Optional[List[Dict]] = None, timeout_s: float = DEFAULT_TIMEOUT_S):
+        self.base_url = base_url.rstrip("/")
+        self.tools = tools
+        self.timeout_s = timeout_s
+
+    def chat(self, model: str, messages: List[Dict], max_tokens: int) -> Dict:
+        payload: Dict = {
+            "model": model,
+            "messages": messages,
+            "stream": False,
+            "temperature": 0,
+            "max_tokens": max_tokens,
+            "cache_prompt": True,
+        }
+        if self.tools:
+            payload["tools"] = self.tools
+        started = time.perf_counter()
+        data = _post_json(f"{self.base_url}/v1/chat/completions", payload, self.timeout_s)
+        timings = data.get("timings") or {}
+        prompt_n = timings.get("prompt_n")
+        if prompt_n is None:
+            prompt_n = (data.get("usage") or {}).get("prompt_tokens")
+        return {
+            "prompt_tokens": prompt_n,
+            "prompt_eval_duration_ms": timings.get("prompt_ms"),
+            "total_duration_ms": (time.perf_counter() - started) * 1000,
+            "load_duration_ms": None,
+            "cached_tokens": timings.get("cache_n"),
+        }
+
+
+# =============================================================================
+# Measurement
+# =============================================================================
+
+@dataclass
+class PrefixSample:
+    """One request of one pass."""
+    model: str
+    backend: str
+    prefix_tokens: int
+    pass_name: str
+    rep: int
+    category: str
+    prompt_id: str
+    turn: int
+    sent_chars: int
+    prompt_tokens: Optional[int] = None
+    cached_tokens: Optional[int] = None
+    prompt_eval_duration_ms: Optional[float] = None
+    total_duration_ms: Optional[float] = None
+    load_duration_ms: Optional[float] = None
+    error: Optional[str] = None
+
+
+class PrefixCacheBench:
+    """
+    Runs the cold pass then the warm pass over the suite for each prefix length.
+
+    The model is loaded before the cold pass and kept resident, so load time
+    never lands in prompt evaluation. The warm pass starts with one unrecorded
+    request that puts the stable prefix into the cache.
+    """
+
+    def __init__(
+        self,
+        client,
+        *,
+        system_prompt: Optional[str] = None,
+        max_tokens: int = DEFAULT_MAX_TOKENS,
+        log=print,
+    ):
+        self.client = client
+        self.system_prompt = system_prompt or DEFAULT_SYSTEM_PROMPT
+        self.max_tokens = max_tokens
+        self.log = log
+
+    def _send(self, model: str, messages: List[Dict]) -> Dict:
+        try:
+            metrics = self.client.chat(model, messages, self.max_tokens)
+            return {k: metrics.get(k) for k in METRIC_KEYS}
+        except urllib.error.HTTPError as e:
+            return {"error": f"HTTP {e.code}"}
+        except Exception as e:  # injected clients (the ollama package) raise their own types
+            return {"error": f"{type(e).__name__}: {e}"[:200]}
+
+    def run_pass(self, model: str, items: List[Tuple[str, Dict]], prefix_tokens: int, pass_name: str,
+                 rep: int = 1) -> List[PrefixSample]:
+        prefix = build_prefix(self.system_prompt, prefix_tokens)
+        samples: List[PrefixSample] = []
+        if pass_name == "warm":
+            self._send(model, [{"role": "system", "content": prefix}, {"role": "user", "content": "Ready?"}])
+        for category, item in items:
+            for turn, history in enumerate(turn_steps(item["turns"]), start=1):
+                system = prefix if pass_name == "warm" else f"[session {uuid.uuid4().hex}]\n{prefix}"
+                messages = [{"role": "system", "content": system}] + history
+                res = self._send(model, messages)
+                sample = PrefixSample(
+                    model, getattr(self.client, "name", "ollama"), prefix_tokens, pass_name, rep, category,
+                    item["id"], turn, sum(len(m["content"]) for m in messages), **res,
+                )
+                samples.append(sample)
+                self.log(f"[prefix] {model} {prefix_tokens:>6} {pass_name:<4} {item['id']}#{turn} "
+                         f"evaluated={sample.prompt_tokens} prompt_eval={_fmt_ms(sample.prompt_eval_duration_ms)} ms")
+        return samples
+
+    def run_model(self, model: str, items: List[Tuple[str, Dict]], prefix_lengths: Iterable[int],
+                  reps: int = 1) -> List[PrefixSample]:
+        # Load outside the measured requests.
+        self._send(model, [{"role": "user", "content": "Ready?"}])
+        samples: List[PrefixSample] = []
+        for prefix_tokens in prefix_lengths:
+            for rep in range(1, reps + 1):
+                for pass_name in PASSES:
+                    samples.extend(self.run_pass(model, items, prefix_tokens, pass_name, rep))
+        return samples
+
+    def run(self, models: List[str], items: List[Tuple[str, Dict]], prefix_lengths: Iterable[int] = DEFAULT_PREFIX_TOKENS,
+            reps: int = 1, out_dir: Optional[Path] = None) -> Dict:
+        prefix_lengths = list(prefix_lengths)
+        samples: List[PrefixSample] = []
+        for model in models:
+            samples.extend(self.run_model(model, items, prefix_lengths, reps))
+        report = summarize(samples)
+        if out_dir is not None:
+            out_dir.mkdir(parents=True, exist_ok=True)
+            with (out_dir / "prefix_samples.jsonl").open("w", encoding="utf-8") as f:
+                for s in samples:
+                    f.write(json.dumps(asdict(s)) + "\n")
+            (out_dir / "prefix_summary.json").write_text(json.dumps(report, indent=2))
+            (out_dir / "prefix_summary.md").write_text(format_markdown(report))
+        return report
+
+
+def _fmt_ms(v: Optional[float]) -> str:
+    return "-" if v is None else f"{v:.1f}"
+
+
+# =============================================================================
+# Summaries
+# =============================================================================
+
+def _p50(values: List[float]) -> Optional[float]:
+    return round(statistics.median(values), 1) if values else None
+
+
+def _savings(pairs: List[Tuple[PrefixSample, PrefixSample]]) -> Dict:
+    cold_ms = [c.prompt_eval_duration_ms for c, _ in pairs]
+    warm_ms = [w.prompt_eval_duration_ms for _, w in pairs]
+    cold_tok = [c.prompt_tokens for c, w in pairs if c.prompt_tokens is not None and w.prompt_tokens is not None]
+    warm_tok = [w.prompt_tokens for c, w in pairs if c.prompt_tokens is not None and w.prompt_tokens is not None]
+    return {
+        "n_pairs": len(pairs),
+        "cold_prompt_eval_ms_p50": _p50(cold_ms),
+        "warm_prompt_eval_ms_p50": _p50(warm_ms),
+        "saved_ms_p50": _p50([c - w for c, w in zip(cold_ms, warm_ms)]),
+        "saved_pct": round(100.0 * (1 - sum(warm_ms) / sum(cold_ms)), 1) if sum(cold_ms) > 0 else None,
+        "cold_tokens_p50": _p50(cold_tok),
+        "warm_tokens_p50": _p50(warm_tok),
+        "reused_token_pct": round(100.0 * (1 - sum(warm_tok) / sum(cold_tok)), 1) if sum(cold_tok) > 0 else None,
+        "e2e_saved_ms_p50": _p50([c.total_duration_ms - w.total_duration_ms for c, w in pairs
+                                  if c.total_duration_ms is not None and w.total_duration_ms is not None]),
+    }
+
+
+def summarize(samples: List[PrefixSample]) -> Dict:
+    """
+    Cold vs warm prompt evaluation per model, backend and prefix length.
+
+    Requests are paired by (rep, prompt id, turn); a pair counts only when
+    both sides succeeded and reported a prompt_eval duration. The cold side's
+    evaluated tokens are what was sent, so reused_token_pct is the share of
+    the prompt the warm side did not have to evaluate.
+
+    Returns:
+        {"rows": [...]} with one row per (model, backend, prefix_tokens), and
+        "first_turn" / "follow_up" breakdowns inside each row
+    """
+    groups: Dict[Tuple, Dict[str, Dict]] = {}
+    errors: Dict[Tuple, int] = {}
+    for s in samples:
+        key = (s.model, s.backend, s.prefix_tokens)
+        if s.error is not None or s.prompt_eval_duration_ms is None:
+            errors[key] = errors.get(key, 0) + 1
+        groups.setdefault(key, {p: {} for p in PASSES})[s.pass_name][(s.rep, s.prompt_id, s.turn)] = s
+
+    rows = []
+    for (model, backend, prefix_tokens), passes in groups.items():
+        pairs = [
+            (cold, passes["warm"][k])
+            for k, cold in passes["cold"].items()
+            if k in passes["warm"]
+            and cold.error is None and passes["warm"][k].error is None
+            and cold.prompt_eval_duration_ms is not None and passes["warm"][k].prompt_eval_duration_ms is not None
+        ]
+        row = {"model": model, "backend": backend, "prefix_tokens": prefix_tokens,
+               "errors": errors.get((model, backend, prefix_tokens), 0), **_savings(pairs)}
+        row["first_turn"] = _savings([(c, w) for c, w in pairs if c.turn == 1])
+        row["follow_up"] = _savings([(c, w) for c, w in pairs if c.turn > 1])
+        rows.append(row)
+    return {"passes": list(PASSES), "rows": rows}
+
+
+def format_markdown(report: Dict) -> str:
+    lines = [
+        "| Model | Backend | Prefix tok | Pairs | Sent tok p50 | Evaluated warm p50 | Cold prompt_eval p50 ms "
+        "| Warm prompt_eval p50 ms | Saved | Tokens reused | Follow-up saved |",
+        "|---|---|---|---|---|---|---|---|---|---|---|",
+    ]
+    fmt = lambda v: "-" if v is None else str(v)  # noqa: E731
+    pct = lambda v: "-" if v is None else f"{v}%"  # noqa: E731
+    for row in report["rows"]:
+        lines.append(
+            f"| {row['model']} | {row['backend']} | {row['prefix_tokens']} | {row['n_pairs']} | "
+            f"{fmt(row['cold_tokens_p50'])} | {fmt(row['warm_tokens_p50'])} | {fmt(row['cold_prompt_eval_ms_p50'])} | "
+            f"{fmt(row['warm_prompt_eval_ms_p50'])} | {pct(row['saved_pct'])} | {pct(row['reused_token_pct'])} | "
+            f"{pct(row['follow_up']['saved_pct'])} |"
+        )
+    return "\n".join(lines) + "\n"
+
+
+# =============================================================================
+# CLI
+# =============================================================================
+
+def parse_lengths(spec: str) -> List[int]:
+    return [int(v) for v in spec.split(",") if v.strip()]
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Prompt-prefix cache savings on the multi-turn extended suite.")
+    ap.add_argument("--models", required=True, help="Comma-separated model names")
+    ap.add_argument("--backend", choices=["ollama", "llama-server"], default="ollama")
+    ap.add_argument("--base-url", default=None, help="Default: $OLLAMA_HOST or http://localhost:8080 for llama-server")
+    ap.add_argument("--prefix-lengths", default=",".join(str(n) for n in DEFAULT_PREFIX_TOKENS),
+                    help="Comma-separated approximate system-prefix sizes in tokens")
+    ap.add_argument("--reps", type=int, default=1)
+    ap.add_argument("--prompt-ids", default="", help="Comma-separated subset of suite ids (default: all)")
+    ap.add_argument("--max-tokens", type=int, default=DEFAULT_MAX_TOKENS)
+    ap.add_argument("--timeout-s", type=float, default=DEFAULT_TIMEOUT_S)
+    ap.add_argument("--out-dir", default="prefix_results")
+    args = ap.parse_args()
+
+    if args.backend == "llama-server":
+        client = LlamaServerChatClient(args.base_url or "http://localhost:8080", timeout_s=args.timeout_s)
+    else:
+        base_url = args.base_url or os.environ.get("OLLAMA_HOST", "http://localhost:11434")
+        client = OllamaChatClient(base_url, timeout_s=args.timeout_s)
+    ids = [p.strip() for p in args.prompt_ids.split(",") if p.strip()] or None
+    bench = PrefixCacheBench(client, max_tokens=args.max_tokens)
+    models = [m.strip() for m in args.models.split(",") if m.strip()]
+    report = bench.run(models, load_suite(prompt_ids=ids), parse_lengths(args.prefix_lengths),
+                       reps=args.reps, out_dir=Path(args.out_dir))
+    print(format_markdown(report))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Shared prompt corpora for generation-style benchmarks.
+
+Provides:
+1. COMPARE_PROMPTS - the backend/model compare set used by run_benchmark.py
+2. prompts_v1.json  - the OpenClaw bench suite (openclaw_llm_bench/)
+3. load_corpus()    - one loader so load tests and compares draw from the same prompts
+
+Kept stdlib-only so tools that do not import the full runner (and its
+ollama/requests dependencies) can reuse the same corpora.
+"""
+
+import json
+from pathlib import Path
+from typing import Dict, List
+
+
+# =============================================================================
+# Corpora
+# =============================================================================
+
+BENCH_ROOT = Path(__file__).resolve().parents[1]
+PROMPTS_V1_PATH = BENCH_ROOT / "openclaw_llm_bench" / "prompts_v1.json"
+DEFAULT_MAX_TOKENS = 128
+
+COMPARE_PROMPTS = [
+    {"id": "simple_qa_1", "category": "simple_qa", "prompt": "What is the capital of France?", "expected_keywords": ["paris", "Paris"], "max_tokens": 50},
+    {"id": "simple_qa_2", "category": "simple_qa", "prompt": "Explain what photosynthesis is in one sentence.", "expected_keywords": ["light", "plant", "energy", "convert"], "max_tokens": 60},
+    {"id": "reasoning_1", "category": "reasoning", "prompt": "If all roses are flowers and some flowers fade quickly, what can we conclude about roses?", "expected_keywords": ["may", "might", "some", "could", "fade"], "max_tokens": 80},
+    {"id": "reasoning_2", "category": "reasoning", "prompt": "A train travels 60 mph. Another train travels 80 mph. They start 280 miles apart heading toward each other. How long until they meet?", "expected_keywords": ["2", "hours"], "max_tokens": 60},
+    {"id": "coding_1", "category": "coding", "prompt": "Write a Python function to check if a number is prime. Include comments.", "expected_keywords": ["def", "prime", "return", "%", "range"], "max_tokens": 100},
+    {"id": "coding_2", "category": "coding", "prompt": "Write a simple JavaScript function that reverses a string.", "expected_keywords": ["function", "return", "reverse"], "max_tokens": 80},
+    {"id": "math_1", "category": "math", "prompt": "What is the square root of 144?", "expected_keywords": ["12"], "max_tokens": 30},
+    {"id": "long_context_1", "category": "long_context", "prompt": "Summarize: AI evolved from 1950s symbolic systems to ML in the 1990s, deep learning in the 2010s, and transformers in 2017. LLMs now demonstrate emergent reasoning. Challenges: efficiency, hallucination, AGI.", "expected_keywords": ["ai", "deep learning", "transformer"], "max_tokens": 80},
+]
+
+
+# =============================================================================
+# Loading
+# =============================================================================
+
+def load_corpus(name: str, max_tokens: int = DEFAULT_MAX_TOKENS) -> List[Dict]:
+    """
+    Load a corpus as [{id, prompt, max_tokens, category}].
+
+    Args:
+        name: "compare", "prompts_v1", or a path to a JSON list of {id, prompt}
+        max_tokens: Default generation cap for prompts without their own
+
+    Returns:
+        Prompt dicts in corpus order
+    """
+    if name == "compare":
+        items = COMPARE_PROMPTS
+    else:
+        path = PROMPTS_V1_PATH if name == "prompts_v1" else Path(name)
+        items = json.loads(path.read_text(encoding="utf-8"))
+    out = []
+    for item in items:
+        out.append({
+            "id": item["id"],
+            "prompt": item["prompt"],
+            "max_tokens": int(item.get("max_tokens") or max_tokens),
+            "category": item.get("category") or item.get("name") or "",
+        })
+    return out
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Repeated prompt runs with confidence intervals and adaptive early stopping.
+
+Provides:
+1. Wilson score intervals for per-prompt pass rates
+2. Adaptive repetition: each prompt is re-run up to K times, but only until
+   its outcome is settled (its pass-rate interval excludes 0.5)
+3. Hierarchical bootstrap CIs (prompts, then repetitions within a prompt) for
+   suite accuracy and latency percentiles
+4. A one-sided Fisher exact test for "accuracy dropped" regression checks
+
+Most prompts are deterministic enough that 3 agreeing runs settle them at the
+default 90% confidence, so only the flaky ones use the full K repetitions.
+"""
+
+import math
+import random
+from statistics import NormalDist
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+
+# =============================================================================
+# Configuration
+# =============================================================================
+
+DEFAULT_MAX_REPS = 5
+DEFAULT_CONFIDENCE = 0.90
+DEFAULT_N_BOOT = 1000
+LATENCY_PERCENTILES = (50, 95)
+
+
+# =============================================================================
+# Intervals and tests
+# =============================================================================
+
+def _z(confidence: float) -> float:
+    return NormalDist().inv_cdf(0.5 + confidence / 2.0)
+
+
+def wilson_interval(passed: int, n: int, confidence: float = DEFAULT_CONFIDENCE) -> Tuple[float, float]:
+    """
+    Wilson score interval for a binomial proportion.
+
+    Args:
+        passed: Successes
+        n: Trials
+        confidence: Two-sided coverage
+
+    Returns:
+        (low, high); (0.0, 1.0) when n == 0
+    """
+    if n <= 0:
+        return (0.0, 1.0)
+    z = _z(confidence)
+    p = passed / n
+    denom = 1 + z * z / n
+    centre = (p + z * z / (2 * n)) / denom
+    half = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / denom
+    return (max(0.0, centre - half), min(1.0, centre + half))
+
+
+def outcome_settled(outcomes: Sequence[bool], confidence: float = DEFAULT_CONFIDENCE) -> bool:
+    """True once the pass-rate interval lies entirely above or below 0.5."""
+    low, high = wilson_interval(sum(outcomes), len(outcomes), confidence)
+    return low > 0.5 or high < 0.5
+
+
+def fisher_drop_pvalue(base_passed: int, base_total: int, new_passed: int, new_total: int) -> float:
+    """
+    One-sided Fisher exact p-value that the new pass rate is below the baseline.
+
+    Conditions on the pooled number of passes; the p-value is the chance of
+    the new run getting `new_passed` or fewer of them under equal rates.
+    """
+    if base_total <= 0 or new_total <= 0:
+        return 1.0
+    n = base_total + new_total
+    k = base_passed + new_passed
+    denom = math.comb(n, new_total)
+    lo = max(0, k - base_total)
+    return min(1.0, sum(
+        math.comb(k, x) * math.comb(n - k, new_total - x) for x in range(lo, new_passed + 1)
+    ) / denom)
+
+
+def _percentile(values: Sequence[float], q: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    pos = (len(ordered) - 1) * q / 100.0
+    lo = int(math.floor(pos))
+    hi = min(lo + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (pos - lo)
+
+
+def bootstrap_ci(
+    groups: List[List[float]],
+    stat: Callable[[List[List[float]]], Optional[float]],
+    n_boot: int = DEFAULT_N_BOOT,
+    confidence: float = DEFAULT_CONFIDENCE,
+    seed: int = 0,
+) -> Tuple[Optional[float], Optional[float]]:
+    """
+    Percentile bootstrap CI, resampling groups (prompts) then values within each.
+
+    Resampling at both levels keeps prompt-to-prompt spread in the interval;
+    pooling all repetitions would treat 5 runs of one prompt as 5 prompts.
+    """
+    groups = [g for g in groups if g]
+    if not groups:
+        return (None, None)
+    rng = random.Random(seed)
+    stats = []
+    for _ in range(n_boot):
+        picked = [groups[rng.randrange(len(groups))] for _ in groups]
+        sample = [[g[rng.randrange(len(g))] for _ in g] for g in picked]
+        value = stat(sample)
+        if value is not None:
+            stats.append(value)
+    if not stats:
+        return (None, None)
+    tail = (1 - confidence) / 2 * 100
+    return (_percentile(stats, tail), _percentile(stats, 100 - tail))
+
+
+# =============================================================================
+# Repetition
+# =============================================================================
+
+def run_repeated(
+    run_round: Callable[[List[str]], List[Dict]],
+    prompt_ids: List[str],
+    max_reps: int = DEFAULT_MAX_REPS,
+    min_reps: int = 1,
+    confidence: float = DEFAULT_CONFIDENCE,
+) -> Dict[str, List[Dict]]:
+    """
+    Re-run unsettled prompts until each is settled or has max_reps rows.
+
+    Args:
+        run_round: Runs the given prompt ids once; returns rows with
+            `prompt_id` and `correct` (other fields are kept as-is)
+        prompt_ids: Suite order
+        max_reps: Upper bound K on runs per prompt
+        min_reps: Runs every prompt gets regardless of agreement
+        confidence: Settling confidence (see outcome_settled)
+
+    Returns:
+        {prompt_id: [row per repetition]}
+    """
+    rows: Dict[str, List[Dict]] = {pid: [] for pid in prompt_ids}
+    pending = list(prompt_ids)
+    for rep in range(max(1, max_reps)):
+        if not pending:
+            break
+        for row in run_round(pending):
+            if row.get("prompt_id") in rows:
+                rows[row["prompt_id"]].append(row)
+        pending = [
+            pid for pid in prompt_ids
+            if len(rows[pid]) < max_reps
+            and (len(rows[pid]) < min_reps
+                 or not outcome_settled([bool(r.get("correct")) for r in rows[pid]], confidence))
+        ]
+    return rows
+
+
+def summarize_repetitions(
+    rows: Dict[str, List[Dict]],
+    max_reps: int,
+    confidence: float = DEFAULT_CONFIDENCE,
+    n_boot: int = DEFAULT_N_BOOT,
+    seed: int = 0,
+) -> Dict:
+    """
+    Per-prompt pass rates and suite-level bootstrap CIs.
+
+    `passed`/`total` count individual runs, so a regression test on them has
+    the statistical power of every repetition rather than one run per prompt.
+    """
+    outcomes = {pid: [1.0 if r.get("correct") else 0.0 for r in rs] for pid, rs in rows.items()}
+    latencies = {
+        pid: [float(r["latency_ms"]) for r in rs if r.get("latency_ms") is not None and not r.get("timeout")]
+        for pid, rs in rows.items()
+    }
+
+    prompts = []
+    for pid, vals in outcomes.items():
+        low, high = wilson_interval(int(sum(vals)), len(vals), confidence)
+        prompts.append({
+            "prompt_id": pid,
+            "reps": len(vals),
+            "pass_rate": round(sum(vals) / len(vals), 4) if vals else None,
+            "pass_rate_ci": [round(low, 4), round(high, 4)],
+            "settled": outcome_settled([v > 0 for v in vals], confidence) if vals else False,
+        })
+
+    def accuracy(sample: List[List[float]]) -> float:
+        return sum(sum(g) / len(g) for g in sample) / len(sample)
+
+    runs = sum(len(v) for v in outcomes.values())
+    acc_groups = [v for v in outcomes.values() if v]
+    summary: Dict = {
+        "confidence": confidence,
+        "max_reps": max_reps,
+        "prompts": len(rows),
+        "runs": runs,
+        "runs_saved": len(rows) * max_reps - runs,
+        "passed": int(sum(sum(v) for v in outcomes.values())),
+        "total": runs,
+        "accuracy": round(accuracy(acc_groups), 4) if acc_groups else 0.0,
+        "accuracy_ci": [round(x, 4) if x is not None else None for x in bootstrap_ci(acc_groups, accuracy, n_boot, confidence, seed)],
+        "flaky_prompts": [p["prompt_id"] for p in prompts if not p["settled"]],
+        "per_prompt": prompts,
+    }
+    lat_groups = [v for v in latencies.values() if v]
+    for q in LATENCY_PERCENTILES:
+        def pct(sample: List[List[float]], q: float = q) -> Optional[float]:
+            return _percentile([x for g in sample for x in g], q)
+
+        point = pct(lat_groups)
+        summary[f"latency_p{q}_ms"] = round(point, 2) if point is not None else None
+        summary[f"latency_p{q}_ci_ms"] = [
+            round(x, 2) if x is not None else None for x in bootstrap_ci(lat_groups, pct, n_boot, confidence, seed)
+        ]
+    return summary
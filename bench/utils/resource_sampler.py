@@ -0,0 +1,515 @@
+#!/usr/bin/env python3
+"""
+Continuous in-process resource sampling for benchmark runs.
+
+Provides:
+1. A background thread reading /proc and /sys at a fixed rate (no subprocesses)
+2. A bounded ring buffer of compact samples (system CPU, iowait, saturated
+   cores, memory, swap, memory PSI, target process CPU/RSS, thermal zones,
+   CPU frequency)
+3. Per-call window summaries to attach to result rows, so a latency spike can
+   be matched with throttling or memory pressure at per-prompt resolution
+4. Point-in-time snapshots replacing the `free -h` / `df -h` / `ollama ps`
+   shell-outs around each suite
+
+A tick is a handful of small file reads, well under a millisecond on typical
+hosts; `stats()` reports the measured sampling overhead.
+"""
+
+import argparse
+import json
+import os
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+
+# =============================================================================
+# Configuration
+# =============================================================================
+
+DEFAULT_INTERVAL_S = 0.25
+DEFAULT_CAPACITY = 14400  # 1h at 4 Hz
+DEFAULT_PROC_PREFIX = "ollama"
+PID_RESCAN_S = 5.0
+# A window counts as throttled when the CPU runs below this share of its
+# nominal max frequency while busy, or a thermal zone reaches its trip point.
+THROTTLE_FREQ_FRAC = 0.85
+THROTTLE_BUSY_PCT = 50.0
+# A core counts as saturated in a tick at or above this busy share.
+CORE_BUSY_PCT = 90.0
+DEFAULT_TEMP_LIMIT_C = 85.0
+
+CLK_TCK = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+
+# Column order of one ring-buffer sample.
+SAMPLE_FIELDS = (
+    "t",                 # time.perf_counter() seconds
+    "cpu_pct",           # system-wide busy %
+    "iowait_pct",
+    "mem_available_kb",
+    "swap_used_kb",
+    "mem_psi_some",      # /proc/pressure/memory some avg10 (None if unsupported)
+    "proc_cpu_pct",      # target processes, % of one core (summed)
+    "proc_rss_kb",       # target processes, VmRSS summed
+    "temp_c",            # hottest thermal zone
+    "freq_mhz",          # mean scaling_cur_freq over CPUs
+    "cores_busy",        # CPUs at or above CORE_BUSY_PCT since the previous tick
+)
+_IDX = {name: i for i, name in enumerate(SAMPLE_FIELDS)}
+
+
+# =============================================================================
+# /proc and /sys readers
+# =============================================================================
+
+def _read(path: str) -> Optional[str]:
+    try:
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def parse_proc_stat(text: str) -> Optional[Tuple[int, int, int]]:
+    """Aggregate CPU jiffies from /proc/stat as (total, idle, iowait)."""
+    for line in (text or "").splitlines():
+        if line.startswith("cpu "):
+            vals = [int(v) for v in line.split()[1:]]
+            # user nice system idle iowait irq softirq steal [guest guest_nice]
+            # guest time is already included in user/nice.
+            total = sum(vals[:8])
+            return total, vals[3], vals[4] if len(vals) > 4 else 0
+    return None
+
+
+def parse_proc_stat_cores(text: str) -> List[Tuple[int, int]]:
+    """Per-CPU jiffies from the `cpuN` lines of /proc/stat as (total, idle + iowait)."""
+    cores = []
+    for line in (text or "").splitlines():
+        if line.startswith("cpu") and line[3:4].isdigit():
+            vals = [int(v) for v in line.split()[1:]]
+            cores.append((sum(vals[:8]), vals[3] + (vals[4] if len(vals) > 4 else 0)))
+    return cores
+
+
+def parse_meminfo_kb(text: str) -> Dict[str, int]:
+    """Return /proc/meminfo fields in kB."""
+    out: Dict[str, int] = {}
+    for line in (text or "").splitlines():
+        key, _, rest = line.partition(":")
+        parts = rest.split()
+        if parts and parts[0].isdigit():
+            out[key.strip()] = int(parts[0])
+    return out
+
+
+def parse_psi_some_avg10(text: str) -> Optional[float]:
+    for line in (text or "").splitlines():
+        if line.startswith("some "):
+            for tok in line.split()[1:]:
+                key, _, val = tok.partition("=")
+                if key == "avg10":
+                    return float(val)
+    return None
+
+
+def parse_pid_stat_cpu(text: str) -> Optional[int]:
+    """utime + stime jiffies from /proc/<pid>/stat (comm may contain spaces)."""
+    if not text:
+        return None
+    rest = text[text.rfind(")") + 2:].split()
+    # rest[0] is field 3 (state); utime/stime are fields 14/15.
+    if len(rest) < 13:
+        return None
+    return int(rest[11]) + int(rest[12])
+
+
+def parse_status_rss_kb(text: str) -> Optional[int]:
+    for line in (text or "").splitlines():
+        if line.startswith("VmRSS:"):
+            parts = line.split()
+            if len(parts) >= 2 and parts[1].isdigit():
+                return int(parts[1])
+    return None
+
+
+def find_pids(prefix: str, proc_root: str = "/proc") -> List[int]:
+    """PIDs whose comm starts with `prefix` (catches `ollama` and its runners)."""
+    pids: List[int] = []
+    try:
+        entries = os.listdir(proc_root)
+    except OSError:
+        return pids
+    for name in entries:
+        if not name.isdigit():
+            continue
+        comm = _read(os.path.join(proc_root, name, "comm"))
+        if comm and comm.strip().startswith(prefix):
+            pids.append(int(name))
+    return sorted(pids)
+
+
+def thermal_zones(sys_root: str = "/sys") -> List[Tuple[str, Optional[float]]]:
+    """(temp path, trip point °C or None) for every thermal zone."""
+    base = os.path.join(sys_root, "class", "thermal")
+    zones = []
+    try:
+        names = sorted(os.listdir(base))
+    except OSError:
+        return zones
+    for name in names:
+        if not name.startswith("thermal_zone"):
+            continue
+        trip = None
+        for i in range(8):
+            kind = _read(os.path.join(base, name, f"trip_point_{i}_type"))
+            if kind is None:
+                break
+            if kind.strip() in ("passive", "hot", "critical"):
+                raw = _read(os.path.join(base, name, f"trip_point_{i}_temp"))
+                if raw and raw.strip().lstrip("-").isdigit():
+                    trip = int(raw) / 1000.0
+                    break
+        zones.append((os.path.join(base, name, "temp"), trip))
+    return zones
+
+
+def cpufreq_paths(sys_root: str = "/sys") -> Tuple[List[str], Optional[float]]:
+    """(scaling_cur_freq paths, nominal max MHz) for every CPU with cpufreq."""
+    base = os.path.join(sys_root, "devices", "system", "cpu")
+    paths: List[str] = []
+    max_mhz: Optional[float] = None
+    try:
+        names = os.listdir(base)
+    except OSError:
+        return paths, None
+    for name in sorted(names):
+        if not (name.startswith("cpu") and name[3:].isdigit()):
+            continue
+        cur = os.path.join(base, name, "cpufreq", "scaling_cur_freq")
+        if os.path.exists(cur):
+            paths.append(cur)
+            raw = _read(os.path.join(base, name, "cpufreq", "cpuinfo_max_freq"))
+            if raw and raw.strip().isdigit():
+                max_mhz = max(max_mhz or 0.0, int(raw) / 1000.0)
+    return paths, max_mhz
+
+
+# =============================================================================
+# Sampler
+# =============================================================================
+
+class ResourceSampler:
+    """Background sampler with a bounded ring buffer of SAMPLE_FIELDS tuples."""
+
+    def __init__(
+        self,
+        interval_s: float = DEFAULT_INTERVAL_S,
+        capacity: int = DEFAULT_CAPACITY,
+        proc_prefix: Optional[str] = DEFAULT_PROC_PREFIX,
+        proc_root: str = "/proc",
+        sys_root: str = "/sys",
+        temp_limit_c: Optional[float] = None,
+    ):
+        self.interval_s = max(0.01, float(interval_s))
+        self.proc_prefix = proc_prefix
+        self.proc_root = proc_root
+        self.sys_root = sys_root
+        self._buf: deque = deque(maxlen=max(1, int(capacity)))
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self._zones = thermal_zones(sys_root)
+        trips = [t for _, t in self._zones if t is not None]
+        self.temp_limit_c = temp_limit_c if temp_limit_c is not None else (min(trips) if trips else DEFAULT_TEMP_LIMIT_C)
+        self._freq_paths, self.nominal_mhz = cpufreq_paths(sys_root)
+
+        self._prev_cpu: Optional[Tuple[int, int, int]] = None
+        self._prev_cores: List[Tuple[int, int]] = []
+        self._prev_proc: Dict[int, int] = {}
+        self._prev_t: Optional[float] = None
+        self._pids: List[int] = []
+        self._pids_at = -PID_RESCAN_S
+        self._started_at: Optional[float] = None
+        self.busy_s = 0.0
+        self.ticks = 0
+
+    # -- sampling -------------------------------------------------------------
+
+    def _target_pids(self, now: float) -> List[int]:
+        if not self.proc_prefix:
+            return []
+        gone = any(not os.path.exists(os.path.join(self.proc_root, str(p))) for p in self._pids)
+        if gone or now - self._pids_at >= PID_RESCAN_S:
+            self._pids = find_pids(self.proc_prefix, self.proc_root)
+            self._pids_at = now
+        return self._pids
+
+    def sample_once(self) -> tuple:
+        """Take one sample, append it to the ring buffer and return it."""
+        t = time.perf_counter()
+        stat = _read(os.path.join(self.proc_root, "stat")) or ""
+        cpu = parse_proc_stat(stat)
+        cores = parse_proc_stat_cores(stat)
+        mem = parse_meminfo_kb(_read(os.path.join(self.proc_root, "meminfo")) or "")
+        psi = parse_psi_some_avg10(_read(os.path.join(self.proc_root, "pressure", "memory")) or "")
+
+        cpu_pct = iowait_pct = None
+        if cpu and self._prev_cpu:
+            d_total = cpu[0] - self._prev_cpu[0]
+            if d_total > 0:
+                cpu_pct = round(100.0 * (1 - ((cpu[1] - self._prev_cpu[1]) + (cpu[2] - self._prev_cpu[2])) / d_total), 1)
+                iowait_pct = round(100.0 * (cpu[2] - self._prev_cpu[2]) / d_total, 1)
+        self._prev_cpu = cpu
+        cores_busy = None
+        if cores and len(cores) == len(self._prev_cores):
+            cores_busy = sum(
+                1 for (tot, idle), (ptot, pidle) in zip(cores, self._prev_cores)
+                if tot > ptot and 100.0 * (1 - (idle - pidle) / (tot - ptot)) >= CORE_BUSY_PCT
+            )
+        self._prev_cores = cores
+
+        proc_cpu = proc_rss = None
+        pids = self._target_pids(t)
+        if pids:
+            jiffies: Dict[int, int] = {}
+            rss_total = 0
+            for pid in pids:
+                base = os.path.join(self.proc_root, str(pid))
+                j = parse_pid_stat_cpu(_read(os.path.join(base, "stat")) or "")
+                rss = parse_status_rss_kb(_read(os.path.join(base, "status")) or "")
+                if j is not None:
+                    jiffies[pid] = j
+                rss_total += rss or 0
+            proc_rss = rss_total
+            if self._prev_t is not None and t > self._prev_t:
+                delta = sum(j - self._prev_proc[p] for p, j in jiffies.items() if p in self._prev_proc)
+                proc_cpu = round(100.0 * delta / CLK_TCK / (t - self._prev_t), 1)
+            self._prev_proc = jiffies
+
+        temps = []
+        for path, _ in self._zones:
+            raw = _read(path)
+            if raw and raw.strip().lstrip("-").isdigit():
+                temps.append(int(raw) / 1000.0)
+        freqs = []
+        for path in self._freq_paths:
+            raw = _read(path)
+            if raw and raw.strip().isdigit():
+                freqs.append(int(raw) / 1000.0)
+
+        swap_used = None
+        if "SwapTotal" in mem and "SwapFree" in mem:
+            swap_used = mem["SwapTotal"] - mem["SwapFree"]
+        sample = (
+            t,
+            cpu_pct,
+            iowait_pct,
+            mem.get("MemAvailable"),
+            swap_used,
+            psi,
+            proc_cpu,
+            proc_rss,
+            max(temps) if temps else None,
+            round(sum(freqs) / len(freqs)) if freqs else None,
+            cores_busy,
+        )
+        self._prev_t = t
+        with self._lock:
+            self._buf.append(sample)
+        self.ticks += 1
+        self.busy_s += time.perf_counter() - t
+        return sample
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.sample_once()
+            except Exception:
+                # Never let a transient /proc read error kill the sampler thread.
+                pass
+            self._stop.wait(self.interval_s)
+
+    def start(self) -> "ResourceSampler":
+        if self._thread is None:
+            self._started_at = time.perf_counter()
+            self.sample_once()  # prime CPU deltas
+            self._thread = threading.Thread(target=self._run, name="resource-sampler", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2 * self.interval_s + 1)
+            self._thread = None
+
+    def __enter__(self) -> "ResourceSampler":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    # -- queries --------------------------------------------------------------
+
+    def samples(self, t0: Optional[float] = None, t1: Optional[float] = None) -> List[tuple]:
+        with self._lock:
+            buf = list(self._buf)
+        return [s for s in buf if (t0 is None or s[0] >= t0) and (t1 is None or s[0] <= t1)]
+
+    def window(self, t0: float, t1: float) -> Dict[str, object]:
+        """
+        Summarize samples in [t0, t1] (perf_counter seconds).
+
+        Calls shorter than one interval have no sample inside them; the latest
+        sample taken before t1 stands in so every row gets a reading.
+        """
+        rows = self.samples(t0, t1)
+        if not rows:
+            before = self.samples(None, t1)
+            rows = before[-1:]
+        if not rows:
+            return {"n_samples": 0}
+
+        def col(name: str) -> List[float]:
+            i = _IDX[name]
+            return [r[i] for r in rows if r[i] is not None]
+
+        def mean(xs: List[float]) -> Optional[float]:
+            return round(sum(xs) / len(xs), 1) if xs else None
+
+        cpu, proc_cpu = col("cpu_pct"), col("proc_cpu_pct")
+        temps, freqs = col("temp_c"), col("freq_mhz")
+        out = {
+            "n_samples": len(rows),
+            "cpu_pct_mean": mean(cpu),
+            "cpu_pct_max": max(cpu, default=None),
+            "iowait_pct_max": max(col("iowait_pct"), default=None),
+            "cores_busy_max": max(col("cores_busy"), default=None),
+            "proc_cpu_pct_mean": mean(proc_cpu),
+            "proc_cpu_pct_max": max(proc_cpu, default=None),
+            "proc_rss_kb_max": max(col("proc_rss_kb"), default=None),
+            "mem_available_kb_min": min(col("mem_available_kb"), default=None),
+            "swap_used_kb_max": max(col("swap_used_kb"), default=None),
+            "mem_psi_some_max": max(col("mem_psi_some"), default=None),
+            "temp_c_max": max(temps, default=None),
+            "freq_mhz_min": min(freqs, default=None),
+        }
+        out["throttled"] = self._throttled(rows, temps)
+        return out
+
+    def _throttled(self, rows: List[tuple], temps: List[float]) -> bool:
+        if temps and max(temps) >= self.temp_limit_c:
+            return True
+        if not self.nominal_mhz:
+            return False
+        ci, fi = _IDX["cpu_pct"], _IDX["freq_mhz"]
+        limit = THROTTLE_FREQ_FRAC * self.nominal_mhz
+        # Idle cores clock down by design; only a low clock under load is throttling.
+        return any(
+            r[fi] is not None and r[ci] is not None and r[ci] >= THROTTLE_BUSY_PCT and r[fi] < limit
+            for r in rows
+        )
+
+    def snapshot(self, disk_path: str = "/") -> Dict[str, object]:
+        """Point-in-time host/process view for suite before/after records."""
+        mem = parse_meminfo_kb(_read(os.path.join(self.proc_root, "meminfo")) or "")
+        snap: Dict[str, object] = {
+            "taken_at_ms": time.time_ns() // 1_000_000,
+            "mem_total_kb": mem.get("MemTotal"),
+            "mem_available_kb": mem.get("MemAvailable"),
+            "mem_used_kb": (mem["MemTotal"] - mem["MemAvailable"]) if "MemTotal" in mem and "MemAvailable" in mem else None,
+            "swap_used_kb": (mem["SwapTotal"] - mem["SwapFree"]) if "SwapTotal" in mem and "SwapFree" in mem else None,
+        }
+        try:
+            st = os.statvfs(disk_path)
+            size = st.f_blocks * st.f_frsize
+            avail = st.f_bavail * st.f_frsize
+            used = size - st.f_bfree * st.f_frsize
+            snap["disk_root"] = {
+                "size_kb": size // 1024,
+                "used_kb": used // 1024,
+                "avail_kb": avail // 1024,
+                # Same convention as df: used / (used + avail)
+                "use_pct": f"{round(100.0 * used / (used + avail))}%" if used + avail else None,
+            }
+        except OSError:
+            snap["disk_root"] = {}
+        pids = find_pids(self.proc_prefix, self.proc_root) if self.proc_prefix else []
+        snap["proc_pids"] = pids
+        snap["proc_rss_kb"] = sum(
+            parse_status_rss_kb(_read(os.path.join(self.proc_root, str(p), "status")) or "") or 0 for p in pids
+        )
+        latest = self.samples()[-1:] if self._buf else []
+        if latest:
+            snap["temp_c"] = latest[0][_IDX["temp_c"]]
+            snap["freq_mhz"] = latest[0][_IDX["freq_mhz"]]
+        return snap
+
+    def stats(self) -> Dict[str, object]:
+        elapsed = (time.perf_counter() - self._started_at) if self._started_at else 0.0
+        return {
+            "interval_s": self.interval_s,
+            "ticks": self.ticks,
+            "buffered": len(self._buf),
+            "capacity": self._buf.maxlen,
+            "tick_ms_mean": round(1000.0 * self.busy_s / self.ticks, 3) if self.ticks else None,
+            "overhead_pct": round(100.0 * self.busy_s / elapsed, 3) if elapsed > 0 else None,
+            "nominal_mhz": self.nominal_mhz,
+            "temp_limit_c": self.temp_limit_c,
+        }
+
+    def to_columns(self) -> Dict[str, list]:
+        """Ring buffer as columns (compact JSON); `t` is relative to start()."""
+        rows = self.samples()
+        t0 = self._started_at or (rows[0][0] if rows else 0.0)
+        cols: Dict[str, list] = {name: [] for name in SAMPLE_FIELDS}
+        for r in rows:
+            for name, v in zip(SAMPLE_FIELDS, r):
+                cols[name].append(round(v - t0, 3) if name == "t" else v)
+        return cols
+
+
+def format_kb(kb: Optional[int]) -> str:
+    """`free -h` style rendering (binary units) for summary tables."""
+    if kb is None:
+        return ""
+    value = float(kb)
+    for unit in ("Ki", "Mi", "Gi", "Ti"):
+        if value < 1024 or unit == "Ti":
+            return f"{value:.1f}{unit}" if unit != "Ki" else f"{value:.0f}{unit}"
+        value /= 1024
+    return ""
+
+
+# =============================================================================
+# CLI
+# =============================================================================
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Sample host + process resources without shelling out.")
+    ap.add_argument("--interval-ms", type=int, default=int(DEFAULT_INTERVAL_S * 1000))
+    ap.add_argument("--duration-s", type=float, default=10.0)
+    ap.add_argument("--proc-prefix", default=DEFAULT_PROC_PREFIX, help="Track processes whose comm starts with this")
+    ap.add_argument("--out", default=None, help="Write {stats, window, samples} JSON here (default: stdout summary)")
+    args = ap.parse_args()
+
+    sampler = ResourceSampler(interval_s=args.interval_ms / 1000.0, proc_prefix=args.proc_prefix)
+    with sampler:
+        start = time.perf_counter()
+        time.sleep(args.duration_s)
+        end = time.perf_counter()
+    payload = {"stats": sampler.stats(), "window": sampler.window(start, end)}
+    if args.out:
+        payload["samples"] = sampler.to_columns()
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(payload, f, indent=2)
+    print(json.dumps(payload, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -12,6 +12,8 @@ from typing import Optional, Dict, Any, Tuple
 from dataclasses import dataclass, asdict
 from datetime import datetime
 
+from utils.blob_store import STORE_DIRNAME, open_store, pack_row
+
 
 # =============================================================================
 # CONFIGURATION
@@ -122,8 +124,13 @@ class ResultCache:
         # Add metadata
         result_data["cached_at"] = time.time()
         result_data["config_hash"] = self._config_hash
+        # Model outputs go to the content-addressed store next to the cache dir,
+        # shared with the result JSON files, so reruns store them once.
+        blobs = open_store(self.cache_dir.parent / STORE_DIRNAME)
+        result_data["results"] = [pack_row(r, blobs) if isinstance(r, dict) else r
+                                  for r in result_data.get("results", [])]
         
-        cache_path.write_text(json.dumps(result_data, indent=2))
+        cache_path.write_text(json.dumps(result_data, separators=(",", ":")))
     
     def check(
         self,
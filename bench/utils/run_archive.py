@@ -0,0 +1,405 @@
+#!/usr/bin/env python3
+"""
+Compressed, indexed bundles for archived supervisor runs.
+
+Provides:
+1. bundle_run(): pack one run directory into `<archive>/<run_id>.tar.zst`
+   (`.tar.xz` without zstandard) whose first member, MANIFEST.json, lists
+   every file with its size, mtime and sha256 next to the run's status,
+   timing and per-job route attribution
+2. An append-only index (`<archive>/index.jsonl`, one line per bundle)
+   carrying the same metadata, so retention and route reports answer from
+   one small file without opening any bundle
+3. archive_runs(): the supervisor's retention pass -- loose legacy files go
+   into one bundle per pass, finished run directories older than the
+   retention window into one bundle each
+4. read_member() / extract_bundle(): stream one file out of a bundle, or
+   restore the whole run directory
+5. reindex(): rebuild the index from the manifests embedded in the bundles
+   (only the head of each stream is decompressed)
+6. A CLI to list the index, bundle existing `.archive/<run>/` directories,
+   cat one member, extract a run, or reindex
+
+Bundles are written to a temporary name and renamed into place before their
+index line is appended and the source is removed, so an interrupted pass
+leaves either the original directory or a complete bundle (reindex picks up
+a bundle whose index line is missing).
+"""
+
+import argparse
+import fcntl
+import hashlib
+import io
+import json
+import os
+import shutil
+import sys
+import tarfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+try:
+    import zstandard  # optional: pip install zstandard
+except ImportError:  # pragma: no cover - depends on the host
+    zstandard = None
+
+
+# =============================================================================
+# Configuration
+# =============================================================================
+
+INDEX_FILE = "index.jsonl"
+MANIFEST_MEMBER = "MANIFEST.json"
+BUNDLE_FORMAT = 1
+ZSTD_LEVEL = 10
+# Suffix -> tarfile compression for the stdlib codecs; zstd is streamed by hand.
+SUFFIXES = {"zst": ".tar.zst", "xz": ".tar.xz", "gz": ".tar.gz"}
+DEFAULT_CODEC = "zst" if zstandard is not None else "xz"
+# Run statuses that mean nothing is writing into the directory any more.
+FINISHED = {"completed", "failed", "interrupted"}
+# Job fields route_trace_report needs to attribute each job without the bundle.
+ROUTE_FIELDS = ("job_index", "model", "phase", "variant", "rc", "used_fallback",
+                "served_by", "original_model", "fallback_model")
+
+
+def _load_json(path: Path) -> Dict[str, Any]:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def bundle_codec(path: Path) -> str:
+    for codec, suffix in SUFFIXES.items():
+        if path.name.endswith(suffix):
+            return codec
+    raise ValueError(f"not a run bundle: {path}")
+
+
+def is_bundle(path: Path) -> bool:
+    return path.is_file() and any(path.name.endswith(s) for s in SUFFIXES.values())
+
+
+# =============================================================================
+# Tar streams
+# =============================================================================
+
+@contextmanager
+def _open_tar(path: Path, mode: str, codec: str) -> Iterator[tarfile.TarFile]:
+    """Sequential tar stream over a bundle (`mode` is "r" or "w")."""
+    if codec == "zst":
+        if zstandard is None:
+            raise RuntimeError(f"{path.name} needs the zstandard package")
+        with open(path, mode + "b") as raw:
+            if mode == "w":
+                stream = zstandard.ZstdCompressor(level=ZSTD_LEVEL).stream_writer(raw, closefd=False)
+            else:
+                stream = zstandard.ZstdDecompressor().stream_reader(raw, closefd=False)
+            with stream, tarfile.open(fileobj=stream, mode=mode + "|") as tar:
+                yield tar
+    else:
+        with tarfile.open(path, mode=f"{mode}|{codec}") as tar:
+            yield tar
+
+
+def _sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _file_list(paths: List[Path], base: Path) -> List[Dict[str, Any]]:
+    files = []
+    for p in paths:
+        st = p.stat()
+        files.append({
+            "path": p.relative_to(base).as_posix(),
+            "size": st.st_size,
+            "mtime": st.st_mtime,
+            "sha256": _sha256(p),
+        })
+    return files
+
+
+# =============================================================================
+# Bundles
+# =============================================================================
+
+def run_metadata(run_dir: Path) -> Dict[str, Any]:
+    """Status, timing and route attribution of a supervisor run directory."""
+    manifest = _load_json(run_dir / "manifest.json")
+    summary = _load_json(run_dir / "summary.json")
+    jobs = [j for j in manifest.get("jobs") or [] if isinstance(j, dict)]
+    trace = run_dir / "fallback_trace.jsonl"
+    trace_events = 0
+    if trace.is_file():
+        with open(trace, "rb") as f:
+            trace_events = sum(1 for line in f if line.strip())
+    return {
+        "status": summary.get("status") or manifest.get("status") or "unknown",
+        "started_at": manifest.get("started_at"),
+        "ended_at": manifest.get("ended_at"),
+        "suite": manifest.get("suite"),
+        "job_count": len(jobs),
+        "route": [{k: j.get(k) for k in ROUTE_FIELDS if k in j} for j in jobs],
+        "trace_events": trace_events,
+        "regression_alerts": len(summary.get("regression_alerts") or manifest.get("regression_alerts") or []),
+    }
+
+
+def _free_name(archive_dir: Path, name: str, codec: str, now: float) -> Path:
+    dst = archive_dir / (name + SUFFIXES[codec])
+    if dst.exists():
+        dst = archive_dir / (f"{int(now)}_{name}" + SUFFIXES[codec])
+    return dst
+
+
+def write_bundle(dst: Path, files: List[Path], base: Path, meta: Dict[str, Any],
+                 codec: str = DEFAULT_CODEC) -> Dict[str, Any]:
+    """Write `files` (paths under `base`) to bundle `dst`; returns its index entry."""
+    listing = _file_list(files, base)
+    entry = {
+        **meta,
+        "bundle": dst.name,
+        "codec": codec,
+        "format": BUNDLE_FORMAT,
+        "files": len(listing),
+        "raw_bytes": sum(f["size"] for f in listing),
+    }
+    head = json.dumps({**entry, "file_list": listing}, indent=2).encode("utf-8")
+    tmp = dst.with_name(dst.name + ".tmp")
+    with _open_tar(tmp, "w", codec) as tar:
+        info = tarfile.TarInfo(MANIFEST_MEMBER)
+        info.size, info.mtime = len(head), int(time.time())
+        tar.addfile(info, io.BytesIO(head))
+        for p in files:
+            tar.add(str(p), arcname=p.relative_to(base).as_posix(), recursive=False)
+    os.replace(tmp, dst)
+    entry["packed_bytes"] = dst.stat().st_size
+    return entry
+
+
+def bundle_run(run_dir: Path, archive_dir: Path, codec: str = DEFAULT_CODEC,
+               now: Optional[float] = None) -> Dict[str, Any]:
+    """Bundle `run_dir`, index it, then remove the directory; returns the index entry."""
+    now = time.time() if now is None else now
+    archive_dir.mkdir(parents=True, exist_ok=True)
+    files = sorted(p for p in run_dir.rglob("*") if p.is_file())
+    meta = {
+        "run_id": run_dir.name,
+        "kind": "run",
+        "archived_at": now,
+        "mtime": run_dir.stat().st_mtime,
+        **run_metadata(run_dir),
+    }
+    entry = write_bundle(_free_name(archive_dir, run_dir.name, codec, now), files, run_dir.parent, meta, codec)
+    append_index(archive_dir, entry)
+    shutil.rmtree(run_dir)
+    return entry
+
+
+def bundle_files(files: List[Path], archive_dir: Path, name: str, codec: str = DEFAULT_CODEC,
+                 now: Optional[float] = None) -> Dict[str, Any]:
+    """Bundle loose files (all in one directory) under `name`, index it, then remove them."""
+    now = time.time() if now is None else now
+    archive_dir.mkdir(parents=True, exist_ok=True)
+    meta = {
+        "run_id": name,
+        "kind": "legacy",
+        "archived_at": now,
+        "mtime": max(p.stat().st_mtime for p in files),
+        "status": "legacy",
+    }
+    entry = write_bundle(_free_name(archive_dir, name, codec, now), files, files[0].parent, meta, codec)
+    append_index(archive_dir, entry)
+    for p in files:
+        p.unlink()
+    return entry
+
+
+def read_manifest(bundle: Path) -> Dict[str, Any]:
+    """The embedded MANIFEST.json (decompresses only the head of the stream)."""
+    with _open_tar(bundle, "r", bundle_codec(bundle)) as tar:
+        info = tar.next()
+        if info is None or info.name != MANIFEST_MEMBER:
+            raise ValueError(f"{bundle.name} has no embedded manifest")
+        return json.loads(tar.extractfile(info).read())
+
+
+def read_member(bundle: Path, name: str) -> Optional[bytes]:
+    """One file out of a bundle (path relative to the archive, e.g. `<run_id>/manifest.json`)."""
+    with _open_tar(bundle, "r", bundle_codec(bundle)) as tar:
+        for info in tar:
+            if info.name == name:
+                return tar.extractfile(info).read()
+    return None
+
+
+def extract_bundle(bundle: Path, dest: Path) -> List[str]:
+    """Restore a bundle's files under `dest`; returns the restored paths."""
+    restored = []
+    with _open_tar(bundle, "r", bundle_codec(bundle)) as tar:
+        for info in tar:
+            if info.name == MANIFEST_MEMBER or not info.isfile():
+                continue
+            tar.extract(info, dest, filter="data")
+            restored.append(info.name)
+    return restored
+
+
+# =============================================================================
+# Index
+# =============================================================================
+
+def append_index(archive_dir: Path, entry: Dict[str, Any]) -> None:
+    with open(archive_dir / INDEX_FILE, "a", encoding="utf-8") as f:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        finally:
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def load_index(archive_dir: Path) -> List[Dict[str, Any]]:
+    """Index entries of bundles still present, newest line per bundle; torn lines are skipped."""
+    path = archive_dir / INDEX_FILE
+    entries: Dict[str, Dict[str, Any]] = {}
+    try:
+        lines = path.read_text(encoding="utf-8").splitlines()
+    except OSError:
+        return []
+    for line in lines:
+        try:
+            entry = json.loads(line)
+        except ValueError:
+            continue
+        if isinstance(entry, dict) and entry.get("bundle"):
+            entries[entry["bundle"]] = entry
+    return [e for e in entries.values() if (archive_dir / e["bundle"]).exists()]
+
+
+def find_run(archive_dir: Path, run_id: str) -> Optional[Dict[str, Any]]:
+    matches = [e for e in load_index(archive_dir) if e.get("run_id") == run_id]
+    return max(matches, key=lambda e: e.get("archived_at") or 0) if matches else None
+
+
+def reindex(archive_dir: Path) -> int:
+    """Rewrite the index from every bundle's embedded manifest; returns the entry count."""
+    entries = []
+    for bundle in sorted(p for p in archive_dir.iterdir() if is_bundle(p)):
+        try:
+            head = read_manifest(bundle)
+        except (OSError, ValueError, tarfile.TarError, RuntimeError):
+            continue
+        head.pop("file_list", None)
+        head["bundle"] = bundle.name
+        head["packed_bytes"] = bundle.stat().st_size
+        entries.append(head)
+    tmp = archive_dir / (INDEX_FILE + ".tmp")
+    tmp.write_text("".join(json.dumps(e, ensure_ascii=False) + "\n" for e in entries), encoding="utf-8")
+    os.replace(tmp, archive_dir / INDEX_FILE)
+    return len(entries)
+
+
+# =============================================================================
+# Retention pass
+# =============================================================================
+
+def is_legacy_file(path: Path) -> bool:
+    return path.is_file() and ("_manifest.json" in path.name or "_job" in path.name)
+
+
+def archive_runs(runs_dir: Path, archive_dir: Path, retain_days: int, now: Optional[float] = None,
+                 codec: str = DEFAULT_CODEC) -> Dict[str, int]:
+    """
+    Bundle loose legacy files and run directories older than `retain_days`.
+
+    A run whose manifest still says "running" is left in place whatever its
+    age; directories without a manifest (e.g. `tuning/`) follow the age rule.
+    """
+    now = time.time() if now is None else now
+    max_age_s = max(0, retain_days) * 86400
+    stats = {"archived_legacy_files": 0, "archived_old_runs": 0, "raw_bytes": 0, "packed_bytes": 0}
+
+    legacy = sorted(p for p in runs_dir.iterdir() if not p.name.startswith(".") and is_legacy_file(p))
+    if legacy:
+        entry = bundle_files(legacy, archive_dir, f"legacy_{int(now)}", codec, now)
+        stats["archived_legacy_files"] = len(legacy)
+        stats["raw_bytes"] += entry["raw_bytes"]
+        stats["packed_bytes"] += entry["packed_bytes"]
+
+    for p in sorted(runs_dir.iterdir()):
+        if not p.is_dir() or p.name.startswith("."):
+            continue
+        if not (max_age_s > 0 and now - p.stat().st_mtime > max_age_s):
+            continue
+        status = _load_json(p / "manifest.json").get("status")
+        if status is not None and status not in FINISHED:
+            continue
+        entry = bundle_run(p, archive_dir, codec, now)
+        stats["archived_old_runs"] += 1
+        stats["raw_bytes"] += entry["raw_bytes"]
+        stats["packed_bytes"] += entry["packed_bytes"]
+    return stats
+
+
+# =============================================================================
+# CLI
+# =============================================================================
+
+def _default_archive() -> Path:
+    return Path(__file__).resolve().parents[1] / "supervisor_runs" / ".archive"
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Compressed, indexed bundles for archived supervisor runs.")
+    ap.add_argument("--archive", type=Path, default=_default_archive(),
+                    help="Archive directory (default: bench/supervisor_runs/.archive)")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    sub.add_parser("list", help="Print the index as JSON lines")
+    sub.add_parser("pack", help="Bundle run directories already moved into the archive")
+    sub.add_parser("reindex", help="Rebuild the index from the bundles' embedded manifests")
+    p_cat = sub.add_parser("cat", help="Print one member of a run's bundle")
+    p_cat.add_argument("run_id")
+    p_cat.add_argument("member", help="Path inside the run, e.g. manifest.json")
+    p_ext = sub.add_parser("extract", help="Restore a run directory from its bundle")
+    p_ext.add_argument("run_id")
+    p_ext.add_argument("--dest", type=Path, default=Path("."))
+    args = ap.parse_args()
+    archive = args.archive
+
+    if args.cmd == "list":
+        for entry in sorted(load_index(archive), key=lambda e: e.get("archived_at") or 0):
+            print(json.dumps(entry, ensure_ascii=False))
+    elif args.cmd == "pack":
+        dirs = sorted(p for p in archive.iterdir() if p.is_dir() and not p.name.startswith("."))
+        entries = [bundle_run(p, archive) for p in dirs]
+        print(json.dumps({
+            "bundled_runs": len(entries),
+            "raw_bytes": sum(e["raw_bytes"] for e in entries),
+            "packed_bytes": sum(e["packed_bytes"] for e in entries),
+        }, indent=2))
+    elif args.cmd == "reindex":
+        print(json.dumps({"entries": reindex(archive)}))
+    else:
+        entry = find_run(archive, args.run_id)
+        if entry is None:
+            raise SystemExit(f"{args.run_id} is not in {archive / INDEX_FILE}")
+        bundle = archive / entry["bundle"]
+        if args.cmd == "cat":
+            data = read_member(bundle, f"{args.run_id}/{args.member}")
+            if data is None:
+                raise SystemExit(f"{args.member} is not in {bundle.name}")
+            sys.stdout.buffer.write(data)
+        else:
+            print("\n".join(extract_bundle(bundle, args.dest)))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
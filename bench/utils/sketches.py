@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Mergeable streaming sketches for latency percentiles.
+
+Provides:
+1. DDSketch: log-bucketed quantile sketch with a relative-accuracy guarantee
+   (every reported quantile is within ±1% of a true sample value by default)
+2. Exact count / sum / min / max / mean / stdev alongside the buckets
+   (Welford updates, Chan's formula on merge)
+3. merge(): sketches built on different runs or shards combine losslessly,
+   so a multi-run report never needs the raw rows
+4. to_dict() / from_dict(): compact JSON form for summary files
+
+Memory is O(log(max/min) / accuracy): at 1% accuracy, latencies from 1 ms
+to 3 hours fit in under 850 buckets regardless of how many values are added.
+"""
+
+import math
+from typing import Dict, Iterable, Optional
+
+
+# =============================================================================
+# Configuration
+# =============================================================================
+
+DEFAULT_RELATIVE_ACCURACY = 0.01
+# Values at or below this go to a dedicated zero bucket (log is undefined).
+MIN_INDEXABLE = 1e-9
+
+
+# =============================================================================
+# DDSketch
+# =============================================================================
+
+class DDSketch:
+    """
+    Quantile sketch over non-negative values (DDSketch, Masson et al. 2019).
+
+    Bucket i covers (gamma^(i-1), gamma^i]; reporting the bucket's midpoint in
+    log space keeps the relative error under `relative_accuracy`.
+    """
+
+    def __init__(self, relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY):
+        if not 0.0 < relative_accuracy < 1.0:
+            raise ValueError(f"relative_accuracy must be in (0, 1), got {relative_accuracy}")
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.bins: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.sum = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+        self._mean = 0.0
+        self._m2 = 0.0
+
+    def _key(self, value: float) -> int:
+        return math.ceil(math.log(value) / self._log_gamma)
+
+    def _value(self, key: int) -> float:
+        return 2.0 * self.gamma ** key / (self.gamma + 1.0)
+
+    def add(self, value: float) -> None:
+        """Add one value; negative values are clamped to the zero bucket."""
+        value = float(value)
+        if value <= MIN_INDEXABLE:
+            self.zero_count += 1
+        else:
+            key = self._key(value)
+            self.bins[key] = self.bins.get(key, 0) + 1
+        self.count += 1
+        self.sum += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+        delta = value - self._mean
+        self._mean += delta / self.count
+        self._m2 += delta * (value - self._mean)
+
+    def update(self, values: Iterable[float]) -> "DDSketch":
+        for value in values:
+            self.add(value)
+        return self
+
+    def merge(self, other: "DDSketch") -> "DDSketch":
+        """Fold `other` into this sketch in place; both must share an accuracy."""
+        if not math.isclose(self.gamma, other.gamma):
+            raise ValueError(
+                f"cannot merge sketches with accuracy {self.relative_accuracy} and {other.relative_accuracy}"
+            )
+        if not other.count:
+            return self
+        for key, n in other.bins.items():
+            self.bins[key] = self.bins.get(key, 0) + n
+        self.zero_count += other.zero_count
+        total = self.count + other.count
+        delta = other._mean - self._mean
+        self._m2 += other._m2 + delta * delta * self.count * other.count / total
+        self._mean += delta * other.count / total
+        self.count = total
+        self.sum += other.sum
+        self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = other.max if self.max is None else max(self.max, other.max)
+        return self
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Approximate q-quantile (0 <= q <= 1), or None when empty.
+
+        Uses the lower rank convention, so quantile(0) and quantile(1) are the
+        exact min and max.
+        """
+        if not self.count:
+            return None
+        if q <= 0:
+            return self.min
+        if q >= 1:
+            return self.max
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return max(self.min, 0.0)
+        for key in sorted(self.bins):
+            seen += self.bins[key]
+            if rank < seen:
+                return min(max(self._value(key), self.min), self.max)
+        return self.max
+
+    def percentile(self, p: float) -> Optional[float]:
+        """Same as quantile(p / 100), matching the harness percentile() signature."""
+        return self.quantile(p / 100.0)
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self._mean if self.count else None
+
+    @property
+    def stdev(self) -> Optional[float]:
+        """Sample standard deviation (n - 1), or None below two values."""
+        return math.sqrt(self._m2 / (self.count - 1)) if self.count > 1 else None
+
+    def to_dict(self) -> Dict:
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "count": self.count,
+            "sum": self.sum,
+            "min": self.min,
+            "max": self.max,
+            "mean": self._mean,
+            "m2": self._m2,
+            "zero_count": self.zero_count,
+            "bins": {str(k): n for k, n in sorted(self.bins.items())},
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "DDSketch":
+        sketch = cls(data.get("relative_accuracy", DEFAULT_RELATIVE_ACCURACY))
+        sketch.bins = {int(k): int(n) for k, n in (data.get("bins") or {}).items()}
+        sketch.zero_count = int(data.get("zero_count", 0))
+        sketch.count = int(data.get("count", 0))
+        sketch.sum = float(data.get("sum", 0.0))
+        sketch.min = data.get("min")
+        sketch.max = data.get("max")
+        sketch._mean = float(data.get("mean", sketch.sum / sketch.count if sketch.count else 0.0))
+        sketch._m2 = float(data.get("m2", 0.0))
+        return sketch
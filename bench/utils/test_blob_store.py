@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""Unit tests for the content-addressed blob store."""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# Allow importing utils package from bench/
+HERE = os.path.dirname(__file__)
+BENCH_ROOT = os.path.abspath(os.path.join(HERE, ".."))
+if BENCH_ROOT not in sys.path:
+    sys.path.insert(0, BENCH_ROOT)
+
+from utils.blob_store import (  # noqa: E402
+    CODEC_ZLIB,
+    CODEC_ZSTD,
+    INDEX_FILE,
+    BlobStore,
+    find_store,
+    is_ref,
+    pack_tree,
+    resolve,
+    zstandard,
+)
+from utils.mock_llm_server import iter_recordings  # noqa: E402
+from openclaw_llm_bench.analyze_comprehensive import load_results  # noqa: E402
+
+ANSWER = "Running `free -h`: Mem total 62Gi, used 18Gi, available 44Gi. " * 40 + "Done ✓"
+
+
+class TestStore(unittest.TestCase):
+    def test_roundtrip_dedup_and_inline_threshold(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            store = BlobStore(Path(td), codec=CODEC_ZLIB)
+            ref = store.pack(ANSWER)
+            self.assertTrue(is_ref(ref))
+            self.assertEqual(ref["size"], len(ANSWER.encode("utf-8")))
+            size = store.pack_path.stat().st_size
+            self.assertEqual(store.pack(ANSWER), ref)
+            self.assertEqual((store.pack_path.stat().st_size, store.dedup_hits), (size, 1))
+            self.assertLess(size * 10, ref["size"])
+            self.assertEqual(store.resolve(ref), ANSWER)
+            self.assertEqual(store.pack("short"), "short")
+            self.assertEqual(store.resolve("short"), "short")
+            self.assertIsNone(resolve(ref, None))
+            store.close()
+
+    def test_second_writer_and_torn_index(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            a, b = BlobStore(Path(td)), BlobStore(Path(td))
+            digest_a = a.put(ANSWER)
+            digest_b = b.put(ANSWER + " again")
+            self.assertEqual(b.put(ANSWER), digest_a)  # b sees a's record before appending
+            self.assertEqual(a.get(digest_b), ANSWER + " again")  # a remaps the grown pack
+            a.close()
+            with open(Path(td) / INDEX_FILE, "ab") as f:
+                f.write(b"\x00" * 7)
+            self.assertEqual(len(BlobStore(Path(td))), 2)
+            digest_c = b.put(ANSWER + " after the tear")  # b's next append drops the torn tail first
+            fresh = BlobStore(Path(td))
+            self.assertEqual(len(fresh), 3)
+            self.assertEqual(fresh.get(digest_c), ANSWER + " after the tear")
+            self.assertEqual(fresh.get(digest_b), ANSWER + " again")
+            b.close()
+            fresh.close()
+
+    @unittest.skipIf(zstandard is None, "zstandard not installed")
+    def test_zstd_codec(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            store = BlobStore(Path(td), codec=CODEC_ZSTD)
+            self.assertEqual(store.get(store.put(ANSWER)), ANSWER)
+            self.assertEqual(store.stats()["codecs"], {"zstd": 1})
+
+
+class TestArchives(unittest.TestCase):
+    def test_pack_tree_shrinks_archives_and_readers_resolve(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            runs = Path(td) / "runs"
+            rows = [{"record_type": "result", "model": "m", "prompt_id": f"P{i % 3}", "success": True,
+                     "e2e_ms": 10, "raw_output": ANSWER if i % 2 else "ok"} for i in range(60)]
+            for run in ("r1", "r2"):
+                (runs / run).mkdir(parents=True)
+                (runs / run / "results.jsonl").write_text("".join(json.dumps(r) + "\n" for r in rows))
+            core = {"model": "m", "results": [{"prompt_id": "P1", "assistant_content": ANSWER, "got": []}]}
+            (runs / "atomic_result_m.json").write_text(json.dumps(core, indent=2))
+            before = sum(p.stat().st_size for p in runs.rglob("*") if p.is_file())
+
+            store = BlobStore(runs / "blobs", codec=CODEC_ZLIB)
+            counts = pack_tree([runs], store)
+            self.assertEqual(counts, {"files": 3, "rows": 61})
+            self.assertEqual(len(store), 1)
+            after = sum(p.stat().st_size for p in runs.rglob("*") if p.is_file())
+            self.assertLess(after * 5, before)
+
+            found = find_store(runs / "r1" / "results.jsonl")
+            self.assertEqual(found.root, store.root.resolve())
+            self.assertEqual({r.content for r in iter_recordings(runs)}, {"ok", ANSWER})
+            # Packed and inline outputs are both measured in characters, not UTF-8 bytes.
+            lengths = {r.output_length for r in load_results(str(runs / "r1" / "results.jsonl"))}
+            self.assertEqual(lengths, {len("ok"), len(ANSWER)})
+            found.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""Unit tests for the cold-start / warm-state latency benchmark."""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# Allow importing utils package from bench/
+HERE = os.path.dirname(__file__)
+BENCH_ROOT = os.path.abspath(os.path.join(HERE, ".."))
+if BENCH_ROOT not in sys.path:
+    sys.path.insert(0, BENCH_ROOT)
+
+from utils.cold_start import (  # noqa: E402
+    ColdStartBench,
+    StartSample,
+    evict_page_cache,
+    format_markdown,
+    page_cache_fraction,
+    prime_page_cache,
+    summarize,
+)
+from utils.mock_llm_server import MockConfig, MockLLMServer, Recording, RecordingStore  # noqa: E402
+from utils.model_residency import manifest_blob_paths, parse_modelfile_paths  # noqa: E402
+
+
+def _weights(td: str, size: int = 4 << 20) -> str:
+    path = os.path.join(td, "sha256-abc")
+    with open(path, "wb") as f:
+        f.write(os.urandom(size))
+        f.flush()
+        os.fsync(f.fileno())
+    return path
+
+
+class TestPageCache(unittest.TestCase):
+    def test_evict_and_prime(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            path = _weights(td)
+            if page_cache_fraction([path]) is None:
+                self.skipTest("mincore() unavailable")
+            self.assertTrue(evict_page_cache([path]))
+            self.assertLess(page_cache_fraction([path]), 0.5)
+            prime_page_cache([path])
+            self.assertEqual(page_cache_fraction([path]), 1.0)
+            self.assertIsNone(page_cache_fraction([os.path.join(td, "missing")]))
+
+    def test_model_file_discovery(self) -> None:
+        modelfile = "# comment\nFROM /models/blobs/sha256-1\nTEMPLATE x\nFROM llama3\nADAPTER /a\n"
+        self.assertEqual(parse_modelfile_paths(modelfile), ["/models/blobs/sha256-1"])
+        with tempfile.TemporaryDirectory() as td:
+            mdir = Path(td, "manifests", "registry.ollama.ai", "library", "qwen2.5")
+            mdir.mkdir(parents=True)
+            (mdir / "3b").write_text(json.dumps({"layers": [
+                {"mediaType": "application/vnd.ollama.image.model", "digest": "sha256:aa"},
+                {"mediaType": "application/vnd.ollama.image.template", "digest": "sha256:bb"},
+            ]}))
+            self.assertEqual(manifest_blob_paths("qwen2.5:3b", td), [os.path.join(td, "blobs", "sha256-aa")])
+            self.assertEqual(manifest_blob_paths("other:1b", td), [])
+
+
+class TestColdStartBench(unittest.TestCase):
+    def test_states_are_measured_apart(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            weights = _weights(td)
+            store = RecordingStore([Recording("m", "one two three", output_tokens=3)])
+            config = MockConfig(ttft_ms=10, tokens_per_s=500, load_ms=250, prefill_tps=1e6)
+            server = MockLLMServer(store, port=0, config=config)
+            server.model_files["m"] = [weights]
+            prefill, reused = server.prefill, []
+
+            def record_prefill(*args, **kwargs):
+                n_eval, n_cached = prefill(*args, **kwargs)
+                reused.append(n_cached)
+                return n_eval, n_cached
+
+            server.prefill = record_prefill
+            server.start()
+            try:
+                bench = ColdStartBench(server.url, warm_requests=2, log=lambda _: None)
+                report = bench.run(["m"], reps=2, out_dir=Path(td, "out"))
+            finally:
+                server.shutdown()
+                server.server_close()
+
+            entry = report["models"]["m"]
+            self.assertEqual(entry["files"], [weights])
+            self.assertEqual(entry["size_bytes"], 4 << 20)
+            states = entry["states"]
+            self.assertEqual([states[s]["n"] for s in ("cold", "evicted_cached", "warm")], [2, 2, 4])
+            self.assertGreaterEqual(states["cold"]["ttft_ms"]["min"], 250)
+            self.assertGreaterEqual(states["evicted_cached"]["load_ms"]["p50"], 250)
+            self.assertLess(states["warm"]["ttft_ms"]["max"], 150)
+            self.assertEqual(states["warm"]["load_ms"]["p50"], 0.0)
+            self.assertEqual(len(reused), 8)
+            self.assertLessEqual(max(reused), 1)  # only the role tag precedes the per-request nonce
+            self.assertGreater(entry["cold_penalty_ms"], 200)
+            if states["cold"]["page_cache_frac_mean"] is not None:
+                self.assertLess(states["cold"]["page_cache_frac_mean"], 0.5)
+                self.assertEqual(states["evicted_cached"]["page_cache_frac_mean"], 1.0)
+            rows = Path(td, "out", "coldstart_samples.jsonl").read_text().splitlines()
+            self.assertEqual(len(rows), 8)
+            self.assertIn("| m |", Path(td, "out", "coldstart_summary.md").read_text())
+
+    def test_summary_handles_errors_and_missing_states(self) -> None:
+        samples = [
+            StartSample("m", "cold", 1, error="HTTP 500"),
+            StartSample("m", "warm", 1, ttft_ms=40.0, e2e_ms=90.0, load_ms=0.0, decode_tps=30.0),
+        ]
+        report = summarize(samples, sizes={"m": 123})
+        entry = report["models"]["m"]
+        self.assertEqual((entry["size_bytes"], entry["cold_penalty_ms"]), (123, None))
+        self.assertEqual(entry["states"]["cold"]["errors"], 1)
+        self.assertEqual(entry["states"]["evicted_cached"]["n"], 0)
+        self.assertIn("cold +- ms", format_markdown(report))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""Unit tests for the exact-length context generator."""
+
+from __future__ import annotations
+
+import os
+import re
+import sys
+import tempfile
+import unittest
+
+# Allow importing utils package from bench/
+HERE = os.path.dirname(__file__)
+BENCH_ROOT = os.path.abspath(os.path.join(HERE, ".."))
+if BENCH_ROOT not in sys.path:
+    sys.path.insert(0, BENCH_ROOT)
+
+from utils.context_gen import (  # noqa: E402
+    ContextGenerator,
+    LlamaServerTokenizer,
+    OllamaProbeTokenizer,
+    fit_filler,
+    resolve_tokenizer,
+)
+from utils.mock_llm_server import MockConfig, MockLLMServer, Recording, RecordingStore  # noqa: E402
+
+SUFFIX = '\n\nReturn ONLY JSON: {"route":"local|premium"} for: Debug intermittent nginx 502.'
+
+
+class CountingTokenizer:
+    """Words and punctuation are tokens; every 6 letters of a word add one more."""
+
+    kind = "fake"
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def count(self, text: str) -> int:
+        self.calls += 1
+        return sum(1 + len(m) // 6 for m in re.findall(r"\w+|[^\w\s]|\n", text))
+
+
+class TestFit(unittest.TestCase):
+    def test_hits_exact_targets_in_few_counts(self) -> None:
+        for target in (1000, 8000, 32000):
+            tok = CountingTokenizer()
+            _, _, tokens = fit_filler(tok.count, target, SUFFIX)
+            self.assertEqual(tokens, target)
+            self.assertLess(tok.calls, 15)
+
+    def test_pads_close_a_gap_no_word_fits(self) -> None:
+        def three_per_word(text: str) -> int:
+            return 3 * len(re.findall(r"\w+", text)) + text.count(".")
+
+        n, pads, tokens = fit_filler(three_per_word, 301)
+        self.assertEqual(tokens, 301)
+        self.assertGreater(pads, 0)
+        self.assertEqual(fit_filler(three_per_word, 2, "one two")[::2], (0, 6))
+
+
+class TestGenerator(unittest.TestCase):
+    def test_cache_skips_the_tokenizer_and_rebuilds_same_text(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            tok = CountingTokenizer()
+            first = ContextGenerator("qwen2.5:3b", tok, cache_dir=td).build(4000, SUFFIX)
+            self.assertTrue(first.exact and first.text.endswith(SUFFIX))
+            self.assertEqual(tok.count(first.text), 4000)
+
+            again = CountingTokenizer()
+            second = ContextGenerator("qwen2.5:3b", again, cache_dir=td).build(4000, SUFFIX)
+            self.assertEqual((second.text, again.calls), (first.text, 0))
+
+            other = CountingTokenizer()
+            other.kind = "gguf"
+            ContextGenerator("qwen2.5:3b", other, cache_dir=td).build(4000, SUFFIX)
+            self.assertGreater(other.calls, 0)
+
+
+class TestBackends(unittest.TestCase):
+    def setUp(self) -> None:
+        config = MockConfig(time_scale=0, prefill_tps=1e6)
+        self.server = MockLLMServer(RecordingStore([Recording("m", "ok")]), port=0, config=config)
+        self.server.start()
+
+    def tearDown(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_ollama_probe_counts_whole_text_despite_prompt_cache(self) -> None:
+        tok = resolve_tokenizer("m", "ollama", self.server.url)
+        self.assertIsInstance(tok, OllamaProbeTokenizer)
+        text = "alpha beta gamma delta " * 50
+        self.assertEqual([tok.count(text), tok.count(text), tok.count(text + "x y")], [200, 200, 202])
+
+        prompt = ContextGenerator("m", tok, cache_dir=None).build(300, SUFFIX)
+        self.assertEqual((prompt.tokens, len(prompt.text.split())), (300, 300))
+
+    def test_llama_server_tokenize(self) -> None:
+        tok = resolve_tokenizer("m", "llama-server", self.server.url)
+        self.assertIsInstance(tok, LlamaServerTokenizer)
+        self.assertEqual(tok.count("one two three"), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
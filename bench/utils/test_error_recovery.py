@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""Unit tests for the append-only checkpoint journal."""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+# Allow importing utils package from bench/
+HERE = os.path.dirname(__file__)
+BENCH_ROOT = os.path.abspath(os.path.join(HERE, ".."))
+if BENCH_ROOT not in sys.path:
+    sys.path.insert(0, BENCH_ROOT)
+
+from utils.error_recovery import (  # noqa: E402
+    CHECKPOINT_FILE,
+    JOURNAL_FILE,
+    Checkpoint,
+    CheckpointJournal,
+    clear_checkpoint,
+    journal_checkpoint,
+    load_checkpoint,
+    load_partial_results,
+)
+
+
+def _complete(cp: Checkpoint, i: int) -> None:
+    cp.prompt_index = i + 1
+    cp.completed_prompts.append(f"P{i}")
+    cp.partial_results.append({"prompt_id": f"P{i}", "correct": i % 2 == 0, "pad": "x" * 200})
+
+
+class TestJournal(unittest.TestCase):
+    def test_replay_matches_in_memory_state(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            run_dir = Path(td)
+            journal = CheckpointJournal(run_dir, compact_every=8)
+            cp = Checkpoint(run_id="r1", metadata={"model": "m"})
+            for i in range(30):
+                _complete(cp, i)
+                if i == 10:
+                    cp.metadata["note"] = "changed"
+                journal.append(cp)
+
+            loaded = CheckpointJournal(run_dir).load()
+            self.assertEqual(loaded.run_id, "r1")
+            self.assertEqual(loaded.prompt_index, 30)
+            self.assertEqual(loaded.completed_prompts, cp.completed_prompts)
+            self.assertEqual(loaded.partial_results, cp.partial_results)
+            self.assertEqual(loaded.metadata, {"model": "m", "note": "changed"})
+
+    def test_appends_write_only_the_delta_and_compaction_is_rare(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            run_dir = Path(td)
+            journal = CheckpointJournal(run_dir, compact_every=16)
+            cp = Checkpoint(run_id="r1")
+            sizes = []
+            with mock.patch.object(journal, "compact", wraps=journal.compact) as compact:
+                for i in range(500):
+                    _complete(cp, i)
+                    before = journal.journal_path.stat().st_size if journal.journal_path.exists() else 0
+                    journal.append(cp)
+                    after = journal.journal_path.stat().st_size
+                    if after > before:
+                        sizes.append(after - before)
+            # Every record is one prompt's worth, not the whole history.
+            self.assertLess(max(sizes) - min(sizes), 16)
+            # Threshold grows with the snapshot: ~log(n) compactions, not n/16.
+            self.assertLessEqual(compact.call_count, 8)
+            self.assertEqual(CheckpointJournal(run_dir).load().partial_results, cp.partial_results)
+
+    def test_crash_between_snapshot_and_truncate_does_not_double_apply(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            run_dir = Path(td)
+            journal = CheckpointJournal(run_dir, compact_every=1000)
+            cp = Checkpoint(run_id="r1")
+            for i in range(5):
+                _complete(cp, i)
+                journal.append(cp)
+            stale = journal.journal_path.read_text()
+            journal.compact(cp)
+            # Simulate the truncate never happening, then one more record.
+            journal.journal_path.write_text(stale)
+            _complete(cp, 5)
+            journal.append(cp)
+
+            loaded = CheckpointJournal(run_dir).load()
+            self.assertEqual(loaded.completed_prompts, [f"P{i}" for i in range(6)])
+
+    def test_torn_tail_loses_only_last_record(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            run_dir = Path(td)
+            journal = CheckpointJournal(run_dir, compact_every=1000)
+            cp = Checkpoint(run_id="r1")
+            for i in range(4):
+                _complete(cp, i)
+                journal.append(cp)
+            with journal.journal_path.open("a") as f:
+                f.write('{"seq": 99, "completed": ["P')
+            loaded = CheckpointJournal(run_dir).load()
+            self.assertEqual(loaded.prompt_index, 4)
+            self.assertEqual(len(loaded.partial_results), 4)
+
+    def test_append_after_torn_tail_survives_the_next_resume(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            run_dir = Path(td)
+            journal = CheckpointJournal(run_dir, compact_every=1000)
+            cp = Checkpoint(run_id="r1")
+            for i in range(3):
+                _complete(cp, i)
+                journal.append(cp)
+            with journal.journal_path.open("a") as f:
+                f.write('{"seq": 99, "completed": ["P')
+
+            resumed_journal = CheckpointJournal(run_dir, compact_every=1000)
+            resumed = resumed_journal.load()
+            self.assertEqual(resumed.prompt_index, 3)
+            for i in range(3, 6):
+                _complete(resumed, i)
+                resumed_journal.append(resumed)
+
+            loaded = CheckpointJournal(run_dir).load()
+            self.assertEqual(loaded.prompt_index, 6)
+            self.assertEqual(loaded.partial_results, resumed.partial_results)
+            self.assertEqual(loaded.completed_prompts, [f"P{i}" for i in range(6)])
+
+
+class TestModuleApi(unittest.TestCase):
+    def test_legacy_snapshot_and_resume_appends(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            run_dir = Path(td)
+            legacy = {"run_id": "old", "job_index": 2, "prompt_index": 0,
+                      "completed_prompts": ["job_1", "job_2"], "partial_results": [{"rc": 0}, {"rc": 0}],
+                      "last_update": 1.0, "metadata": {}}
+            (run_dir / CHECKPOINT_FILE).write_text(json.dumps(legacy))
+
+            cp = load_checkpoint(run_dir)
+            self.assertEqual((cp.run_id, cp.job_index, cp.journal_seq), ("old", 2, 0))
+            cp.job_index = 3
+            cp.completed_prompts.append("job_3")
+            cp.partial_results.append({"rc": 1})
+            journal_checkpoint(run_dir, cp)
+
+            line = (run_dir / JOURNAL_FILE).read_text().splitlines()[-1]
+            self.assertEqual(json.loads(line)["results"], [{"rc": 1}])
+            self.assertEqual(load_partial_results(run_dir), [{"rc": 0}, {"rc": 0}, {"rc": 1}])
+            self.assertEqual(load_checkpoint(run_dir).job_index, 3)
+
+            clear_checkpoint(run_dir)
+            self.assertFalse((run_dir / CHECKPOINT_FILE).exists())
+            self.assertFalse((run_dir / JOURNAL_FILE).exists())
+            self.assertIsNone(load_checkpoint(run_dir))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""Unit tests for the open-loop load generator."""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# Allow importing utils package from bench/
+HERE = os.path.dirname(__file__)
+BENCH_ROOT = os.path.abspath(os.path.join(HERE, ".."))
+if BENCH_ROOT not in sys.path:
+    sys.path.insert(0, BENCH_ROOT)
+
+from utils.load_generator import (  # noqa: E402
+    arrival_times,
+    find_knee,
+    parse_backends,
+    run_level,
+    stream_chat,
+    summarize_level,
+    sweep,
+    write_results,
+)
+from utils.prompt_corpora import COMPARE_PROMPTS, load_corpus  # noqa: E402
+
+SERVICE_S = 0.04
+PROMPTS = [{"id": "p", "prompt": "hi", "max_tokens": 8}]
+
+
+class _SingleSlotHandler(BaseHTTPRequestHandler):
+    """Streams three tokens; one request at a time, like a single-slot llama-server."""
+
+    slot = threading.Semaphore(1)
+
+    def do_POST(self) -> None:
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        with self.slot:
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.end_headers()
+            for tok in ("a", "b", "c"):
+                time.sleep(SERVICE_S / 3)
+                chunk = {"choices": [{"delta": {"content": tok}}]}
+                self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+                self.wfile.flush()
+            if body.get("stream_options", {}).get("include_usage"):
+                usage = {"choices": [], "usage": {"completion_tokens": 3}}
+                self.wfile.write(f"data: {json.dumps(usage)}\n\n".encode())
+            self.wfile.write(b"data: [DONE]\n\n")
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+class TestArrivals(unittest.TestCase):
+    def test_fixed_and_poisson_schedules(self) -> None:
+        self.assertEqual(arrival_times(2.0, 2.0, "fixed"), [0.0, 0.5, 1.0, 1.5])
+        poisson = arrival_times(50.0, 20.0, "poisson", seed=1)
+        self.assertEqual(poisson, arrival_times(50.0, 20.0, "poisson", seed=1))
+        self.assertAlmostEqual(len(poisson) / 20.0, 50.0, delta=5.0)
+        self.assertTrue(all(0 <= t < 20.0 for t in poisson))
+        with self.assertRaises(ValueError):
+            arrival_times(1.0, 1.0, "bursty")
+
+
+class TestCorpora(unittest.TestCase):
+    def test_both_corpora_load_with_max_tokens(self) -> None:
+        self.assertEqual(len(load_corpus("compare")), len(COMPARE_PROMPTS))
+        v1 = load_corpus("prompts_v1", max_tokens=64)
+        self.assertTrue(v1)
+        self.assertTrue(all(p["max_tokens"] == 64 and p["prompt"] for p in v1))
+
+
+class TestAgainstServer(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), _SingleSlotHandler)
+        cls.server.daemon_threads = True
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.url = f"http://127.0.0.1:{cls.server.server_address[1]}"
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def test_stream_records_ttft_and_usage_tokens(self) -> None:
+        t0 = time.perf_counter()
+        res = stream_chat(self.url, "m", "hi", 8)
+        self.assertIsNone(res["error"])
+        self.assertEqual(res["output_tokens"], 3)
+        self.assertLess(res["first_token_t"], res["end_t"])
+        self.assertGreater(res["first_token_t"], t0)
+
+    def test_overload_shows_up_as_queueing(self) -> None:
+        light = summarize_level(run_level(self.url, "m", PROMPTS, 5.0, 0.6, "fixed", concurrency=4), 5.0, 0.6)
+        heavy = summarize_level(run_level(self.url, "m", PROMPTS, 60.0, 0.3, "fixed", concurrency=4), 60.0, 0.3)
+        self.assertEqual(light["error_rate"], 0.0)
+        self.assertLess(light["e2e_p95_ms"], SERVICE_S * 1000 * 2)
+        # 60 qps against ~25 qps of capacity: latency must include waiting.
+        self.assertGreater(heavy["e2e_p95_ms"], 2 * light["e2e_p95_ms"])
+        self.assertLess(heavy["achieved_qps"], 0.95 * 60.0)
+
+    def test_concurrency_cap_counts_as_queue_time_and_drops(self) -> None:
+        recs = run_level(self.url, "m", PROMPTS, 100.0, 0.1, "fixed", concurrency=1, max_queue=2)
+        self.assertTrue(any(r["error"] == "dropped" for r in recs))
+        served = [r for r in recs if r["ok"]]
+        self.assertGreater(max(r["queue_ms"] for r in served), SERVICE_S * 1000 * 0.5)
+
+    def test_sweep_stops_past_the_knee_and_writes_outputs(self) -> None:
+        res = sweep(self.url, "m", PROMPTS, rates=[2.0, 5.0, 80.0, 160.0], duration_s=0.4,
+                    process="fixed", concurrency=4, warmup=0, log=lambda _msg: None)
+        self.assertEqual([lv["offered_qps"] for lv in res["levels"]], [2.0, 5.0, 80.0])
+        self.assertEqual(res["knee_qps"], 5.0)
+        with tempfile.TemporaryDirectory() as td:
+            write_results(Path(td), {"local": {"m": res}}, {"corpus": "test"})
+            summary = json.loads(Path(td, "load_summary.json").read_text())
+            lines = Path(td, "load_requests.jsonl").read_text().splitlines()
+            self.assertEqual(summary["results"]["local"]["m"]["knee_qps"], 5.0)
+            self.assertEqual(len(lines), sum(lv["n"] for lv in res["levels"]))
+            self.assertIn("knee at 5.0 qps", Path(td, "load_summary.md").read_text())
+
+
+class TestKnee(unittest.TestCase):
+    def test_knee_is_last_sustained_rate(self) -> None:
+        levels = [
+            {"offered_qps": 1.0, "achieved_qps": 1.0, "e2e_p95_ms": 100.0},
+            {"offered_qps": 2.0, "achieved_qps": 1.98, "e2e_p95_ms": 150.0},
+            {"offered_qps": 4.0, "achieved_qps": 3.9, "e2e_p95_ms": 450.0},
+            {"offered_qps": 8.0, "achieved_qps": 4.0, "e2e_p95_ms": 900.0},
+        ]
+        self.assertEqual(find_knee(levels), 2.0)
+        self.assertIsNone(find_knee([]))
+
+    def test_parse_backends(self) -> None:
+        self.assertEqual(parse_backends("a=http://x:1, b=http://y:2"), {"a": "http://x:1", "b": "http://y:2"})
+        with self.assertRaises(ValueError):
+            parse_backends("nourl")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""Unit tests for the harness micro-benchmark suite."""
+
+from __future__ import annotations
+
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# Allow importing utils package from bench/
+HERE = os.path.dirname(__file__)
+BENCH_ROOT = os.path.abspath(os.path.join(HERE, ".."))
+if BENCH_ROOT not in sys.path:
+    sys.path.insert(0, BENCH_ROOT)
+
+from utils import result_cache  # noqa: E402
+from utils.blob_store import BlobStore  # noqa: E402
+from utils.error_recovery import load_checkpoint  # noqa: E402
+from utils.microbench import (  # noqa: E402
+    ALLOC_SLACK,
+    CASES,
+    Inputs,
+    compare,
+    load_baseline,
+    load_recorded,
+    run_suite,
+    save_baseline,
+    select_cases,
+)
+
+FAST = {"min_time": 0.001, "rounds": 1}
+
+
+def _row(case: str, ops: float, alloc: int, size: int = 1024) -> dict:
+    return {"case": case, "size": size, "ops_per_s": ops, "alloc_peak_bytes": alloc}
+
+
+class TestSuite(unittest.TestCase):
+    def test_every_case_runs_at_its_smallest_size(self) -> None:
+        config_paths = (result_cache.CONFIG_PATH, result_cache.SUITE_PATH)
+        rows = run_suite(CASES, Inputs(), n_sizes=1, log=lambda _: None, **FAST)
+        self.assertEqual([(r["case"], r["size"]) for r in rows], [(c.name, c.sizes[0]) for c in CASES])
+        self.assertTrue(all(r["ops_per_s"] > 0 and r["alloc_peak_bytes"] >= 0 for r in rows))
+        self.assertEqual((result_cache.CONFIG_PATH, result_cache.SUITE_PATH), config_paths)
+
+    def test_journal_case_appends_against_a_fixed_size_checkpoint(self) -> None:
+        journal = next(c for c in CASES if c.name == "error_recovery.journal_checkpoint")
+        with tempfile.TemporaryDirectory() as td, contextlib.ExitStack() as stack, \
+                contextlib.redirect_stdout(io.StringIO()):
+            op = journal.setup(10, Inputs(), Path(td), stack)
+            for _ in range(200):
+                op()
+            self.assertEqual(len(load_checkpoint(Path(td)).partial_results), 11)
+        self.assertIn("parsers.parse_all_tool_calls", {c.name for c in select_cases("parsers")})
+
+    def test_inputs_reach_size_and_tile_recorded_outputs(self) -> None:
+        self.assertEqual(len(Inputs().output(32768, tail="[x()]")), 32768)
+        self.assertTrue(Inputs().output(1024, tail="[x()]").endswith("[x()]"))
+        self.assertEqual(Inputs().output(4096), Inputs().output(4096))
+
+        with tempfile.TemporaryDirectory() as td:
+            run = Path(td) / "runs" / "r1"
+            run.mkdir(parents=True)
+            answer = "Recorded answer: run `free -h` first. " * 20
+            ref = BlobStore(Path(td) / "runs" / "blobs").pack(answer)
+            (run / "results.jsonl").write_text(json.dumps(
+                {"record_type": "result", "model": "m", "prompt_id": "P1", "success": True, "raw_output": ref}) + "\n")
+            recorded = load_recorded([Path(td) / "runs"])
+        self.assertEqual(recorded, [answer])
+        text = Inputs(recorded).output(5000)
+        self.assertEqual(len(text), 5000)
+        self.assertIn(answer.strip()[:40], text)
+
+
+class TestBaselines(unittest.TestCase):
+    def test_compare_flags_slowdowns_and_allocation_growth(self) -> None:
+        baseline = {"a@1024": {"ops_per_s": 1000.0, "alloc_peak_bytes": 100_000},
+                    "b@1024": {"ops_per_s": 1000.0, "alloc_peak_bytes": 100}}
+        rows = [_row("a", 800.0, 120_000), _row("b", 760.0, 100 + ALLOC_SLACK), _row("new", 1.0, 10**9)]
+        self.assertEqual(compare(rows, baseline, tolerance=0.25), [])
+        regressions = compare([_row("a", 700.0, 150_000)], baseline, tolerance=0.25)
+        self.assertEqual([(r["metric"], r["change_pct"]) for r in regressions],
+                         [("ops_per_s", -30.0), ("alloc_peak_bytes", 50.0)])
+
+    def test_baselines_are_kept_per_host_and_inputs_and_merged(self) -> None:
+        recorded = Inputs(["a recorded answer"]).kind
+        self.assertNotEqual(recorded, Inputs().kind)
+        self.assertEqual(recorded, Inputs(["a recorded answer"]).kind)
+        self.assertNotEqual(recorded, Inputs(["another recorded answer"]).kind)
+        with tempfile.TemporaryDirectory() as td:
+            path = Path(td) / "baselines.json"
+            save_baseline([_row("a", 10.0, 5), _row("b", 20.0, 6)], path, host="h1")
+            save_baseline([_row("a", 12.0, 7)], path, host="h1")
+            save_baseline([_row("a", 99.0, 1)], path, host="h2")
+            save_baseline([_row("a", 55.0, 3)], path, host="h1", inputs=recorded)
+            self.assertEqual(load_baseline(path, host="h1"),
+                             {"a@1024": {"ops_per_s": 12.0, "alloc_peak_bytes": 7},
+                              "b@1024": {"ops_per_s": 20.0, "alloc_peak_bytes": 6}})
+            self.assertEqual(load_baseline(path, host="h1", inputs=recorded),
+                             {"a@1024": {"ops_per_s": 55.0, "alloc_peak_bytes": 3}})
+            self.assertEqual(load_baseline(path, host="h2", inputs=recorded), {})
+            self.assertEqual(load_baseline(path, host="h3"), {})
+            self.assertEqual(load_baseline(Path(td) / "missing.json"), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""Unit tests for the recorded-response mock LLM server."""
+
+from __future__ import annotations
+
+import json
+import os
+import socket
+import sys
+import tempfile
+import time
+import unittest
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Allow importing utils package from bench/ (and run_bench's providers)
+HERE = os.path.dirname(__file__)
+BENCH_ROOT = os.path.abspath(os.path.join(HERE, ".."))
+for p in (BENCH_ROOT, os.path.join(BENCH_ROOT, "openclaw_llm_bench")):
+    if p not in sys.path:
+        sys.path.insert(0, p)
+
+from utils.load_generator import stream_chat  # noqa: E402
+from utils.mock_llm_server import (  # noqa: E402
+    FALLBACK_CONTENT,
+    FAULT_HEADER,
+    MockConfig,
+    MockLLMServer,
+    Recording,
+    RecordingStore,
+    iter_recordings,
+    pacing,
+    split_chunks,
+)
+from utils.model_residency import OllamaResidency  # noqa: E402
+from utils.prompt_corpora import load_corpus  # noqa: E402
+import run_bench  # noqa: E402
+
+P0 = load_corpus("prompts_v1")[0]
+
+
+def _write_archives(root: Path) -> None:
+    rows = [
+        {"record_type": "run_meta", "run_id": "r"},
+        {"record_type": "result", "model": "m1", "prompt_id": P0["id"], "success": True,
+         "raw_output": "HEARTBEAT_OK", "ttft_ms": 40, "e2e_ms": 90, "output_tokens": 3, "input_tokens": 12},
+        {"record_type": "result", "model": "m1", "prompt_id": "P1", "success": False, "raw_output": "boom"},
+    ]
+    (root / "results.jsonl").write_text("\n".join(json.dumps(r) for r in rows) + "\n{torn")
+    phase = {"model": "tools:7b", "phase": "atomic", "results": [
+        {"prompt_id": "P3", "expected": ["get_weather"], "got": ["get_weather"], "correct": True,
+         "latency_ms": 300.0, "assistant_content": "Checking the weather.", "ttft_ms": 120.0, "tokens_generated": 4},
+        {"prompt_id": "P4", "expected": [], "got": [], "correct": False, "latency_ms": 9.0,
+         "assistant_content": None, "error": "TIMEOUT(30s)"},
+    ]}
+    (root / "phase_atomic.json").write_text(json.dumps(phase))
+    (root / "config.json").write_text(json.dumps({"unrelated": True}))
+
+
+def _post(url: str, payload: dict, headers: dict | None = None, timeout: float = 5.0):
+    req = urllib.request.Request(url, data=json.dumps(payload).encode(), method="POST",
+                                 headers={"Content-Type": "application/json", **(headers or {})})
+    return urllib.request.urlopen(req, timeout=timeout)
+
+
+class ServerCase(unittest.TestCase):
+    config = MockConfig(time_scale=0)
+
+    def setUp(self) -> None:
+        self._td = tempfile.TemporaryDirectory()
+        _write_archives(Path(self._td.name))
+        self.store = RecordingStore.from_paths([Path(self._td.name)])
+        self.server = MockLLMServer(self.store, port=0, config=self.config)
+        self.server.start()
+
+    def tearDown(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+        self._td.cleanup()
+
+
+class TestRecordings(unittest.TestCase):
+    def test_archives_load_successful_calls_only(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            _write_archives(Path(td))
+            recs = list(iter_recordings(Path(td)))
+        self.assertEqual(sorted((r.model, r.prompt_id) for r in recs), [("m1", P0["id"]), ("tools:7b", "P3")])
+        tool = [r for r in recs if r.model == "tools:7b"][0]
+        self.assertEqual((tool.tool_calls, tool.e2e_ms, tool.output_tokens), (["get_weather"], 300.0, 4))
+
+    def test_match_by_corpus_text_then_model_then_any(self) -> None:
+        a = Recording("m1", "A", prompt_id=P0["id"])
+        b = Recording("m1", "B", prompt_id="P9")
+        store = RecordingStore([a, b, Recording("m2", "C")])
+        self.assertIs(store.match("m1", P0["prompt"]), a)
+        self.assertIs(store.match("m1", "free text", prompt_id="P9"), b)
+        self.assertIn(store.match("m1", "free text").content, {"A", "B"})
+        self.assertEqual(store.match("m1", "free text"), store.match("m1", "free text"))
+        self.assertIn(store.match("unknown", "x").model, {"m1", "m2"})
+        self.assertEqual(RecordingStore().match("m", "x").content, FALLBACK_CONTENT)
+
+    def test_chunks_and_pacing(self) -> None:
+        text = " Hello,  world\nagain "
+        self.assertEqual("".join(split_chunks(text)), text)
+        self.assertEqual(len(split_chunks(text)), 4)
+        rec = Recording("m", "a b c d e", ttft_ms=100, e2e_ms=500)
+        self.assertEqual(pacing(rec, 5, MockConfig()), (0.1, 0.1))
+        self.assertEqual(pacing(rec, 5, MockConfig(time_scale=0.5, tokens_per_s=20)), (0.05, 0.025))
+        self.assertEqual(pacing(Recording("m", "x", e2e_ms=80), 1, MockConfig()), (0.08, 0.0))
+
+
+class TestProtocols(ServerCase):
+    def test_openai_sse_and_json_with_harness_clients(self) -> None:
+        out = stream_chat(self.server.url, "m1", P0["prompt"], max_tokens=64)
+        self.assertIsNone(out["error"])
+        self.assertEqual((out["chunks"], out["output_tokens"]), (1, 3))
+
+        provider = run_bench.OllamaOpenAIProvider(self.server.url + "/v1")
+        res = provider.call(model="m1", prompt=P0["prompt"], thinking_level=None, timeout_s=5, stream=True)
+        self.assertEqual((res.success, res.raw_output), (True, "HEARTBEAT_OK"))
+        self.assertIsNotNone(res.ttft_ms)
+        res = provider.call(model="m1", prompt=P0["prompt"], thinking_level=None, timeout_s=5, stream=False)
+        self.assertEqual((res.raw_output, res.output_tokens, res.input_tokens), ("HEARTBEAT_OK", 3, 12))
+
+    def test_ollama_native_chat_tools_and_stream(self) -> None:
+        native = run_bench.OllamaNativeProvider(self.server.url)
+        res = native.call(model="m1", prompt=P0["prompt"], thinking_level=None, timeout_s=5, stream=False)
+        self.assertEqual((res.raw_output, res.output_tokens), ("HEARTBEAT_OK", 3))
+
+        body = {"model": "tools:7b", "messages": [{"role": "user", "content": "weather?"}], "stream": False,
+                "tools": [{"type": "function", "function": {"name": "get_weather"}}]}
+        with _post(self.server.url + "/api/chat", body) as resp:
+            data = json.loads(resp.read())
+        self.assertEqual([tc["function"]["name"] for tc in data["message"]["tool_calls"]], ["get_weather"])
+        self.assertEqual(data["eval_count"], 4)
+
+        body.update(stream=True, tools=None)
+        with _post(self.server.url + "/api/chat", body) as resp:
+            frames = [json.loads(line) for line in resp if line.strip()]
+        self.assertEqual("".join(f["message"]["content"] for f in frames), "Checking the weather.")
+        self.assertTrue(frames[-1]["done"])
+        self.assertNotIn("tool_calls", frames[-1]["message"])
+
+    def test_residency_warm_unload_and_tags(self) -> None:
+        res = OllamaResidency(base_url=self.server.url)
+        self.assertEqual(set(res.inventory()), {"m1", "tools:7b"})
+        self.assertIsNone(res.warm("m1").error)
+        self.assertEqual([r.name for r in res.resident()], ["m1"])
+        self.assertTrue(res.unload("m1"))
+        self.assertEqual(res.resident(), [])
+
+
+class TestFaultsAndLoad(ServerCase):
+    config = MockConfig(time_scale=0, hang_s=1.0, retry_after_s=3)
+
+    def test_forced_faults(self) -> None:
+        url = self.server.url + "/v1/chat/completions"
+        body = {"model": "m1", "messages": [{"role": "user", "content": "hi"}]}
+        with self.assertRaises(urllib.error.HTTPError) as ctx:
+            _post(url, body, {FAULT_HEADER: "rate_limit"})
+        self.assertEqual((ctx.exception.code, ctx.exception.headers["Retry-After"]), (429, "3"))
+        with self.assertRaises(urllib.error.HTTPError) as ctx:
+            _post(url, body, {FAULT_HEADER: "error"})
+        self.assertEqual(ctx.exception.code, 500)
+        with self.assertRaises((urllib.error.URLError, socket.timeout, ConnectionError)):
+            _post(url, body, {FAULT_HEADER: "timeout"}, timeout=0.3)
+
+    def test_seeded_fault_rates_are_repeatable(self) -> None:
+        def outcomes() -> list:
+            server = MockLLMServer(RecordingStore(), port=0, config=MockConfig(time_scale=0, error_rate=0.3, seed=7))
+            draws = [server.faults.draw() for _ in range(200)]
+            server.server_close()
+            return draws
+
+        first = outcomes()
+        self.assertEqual(first, outcomes())
+        self.assertTrue(40 <= first.count("error") <= 80)
+
+    def test_concurrent_requests_and_stats(self) -> None:
+        def one(i: int) -> str:
+            out = stream_chat(self.server.url, "m1", f"prompt {i}", max_tokens=8)
+            return out["error"] or "ok"
+
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            results = list(pool.map(one, range(200)))
+        self.assertEqual(results.count("ok"), 200)
+        stats = self.server.stats()
+        self.assertEqual(stats["requests"]["/v1/chat/completions"], 200)
+        self.assertEqual(stats["statuses"], {"200": 200})
+        self.assertEqual(stats["in_flight"], 0)
+
+
+class TestPacing(unittest.TestCase):
+    def test_configured_ttft_and_cold_load_are_observed(self) -> None:
+        store = RecordingStore([Recording("m", "one two three")])
+        server = MockLLMServer(store, port=0, config=MockConfig(ttft_ms=150, tokens_per_s=50, load_ms=200))
+        server.start()
+        try:
+            started = time.perf_counter()
+            cold = stream_chat(server.url, "m", "x", max_tokens=8)
+            warm = stream_chat(server.url, "m", "x", max_tokens=8)
+        finally:
+            server.shutdown()
+            server.server_close()
+        cold_ttft = cold["first_token_t"] - started
+        warm_e2e = warm["end_t"] - cold["end_t"]
+        self.assertGreaterEqual(cold_ttft, 0.33)
+        self.assertGreaterEqual(warm_e2e, 0.15 + 2 * 0.02)
+        self.assertLess(warm_e2e, 0.33)
+
+
+if __name__ == "__main__":
+    unittest.main()
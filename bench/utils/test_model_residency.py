@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""Unit tests for model residency planning."""
+
+from __future__ import annotations
+
+import os
+import sys
+import unittest
+
+# Allow importing utils package from bench/
+HERE = os.path.dirname(__file__)
+BENCH_ROOT = os.path.abspath(os.path.join(HERE, ".."))
+if BENCH_ROOT not in sys.path:
+    sys.path.insert(0, BENCH_ROOT)
+
+from utils.model_residency import (  # noqa: E402
+    LoadEvent,
+    MemoryBudget,
+    ModelInfo,
+    OllamaResidency,
+    ResidentModel,
+    fits_alongside,
+    group_by_model,
+    parse_ollama_list,
+    parse_ollama_ps,
+)
+
+GB = 1000 ** 3
+
+OLLAMA_LIST = """NAME                    ID              SIZE      MODIFIED
+qwen3.5:35b             a1b2c3d4e5f6    23 GB     2 days ago
+lfm2.5-thinking:1.2b    0f1e2d3c4b5a    731 MB    3 weeks ago
+qwen2.5:7b-instruct-q4_K_M  123456789abc  4.7 GB  5 weeks ago
+"""
+
+OLLAMA_PS = """NAME          ID              SIZE      PROCESSOR    UNTIL
+mistral:7b    6577803aa9a0    5.4 GB    100% GPU     4 minutes from now
+qwen2.5:3b    357c53fb659c    3.4 GB    48%/52% CPU/GPU    Forever
+"""
+
+
+class _FakeResidency(OllamaResidency):
+    """Controller with the Ollama API replaced by in-memory state."""
+
+    def __init__(self, loaded: list[str], sizes: dict[str, int], free: int) -> None:
+        super().__init__(budget_fn=lambda: MemoryBudget(ram_available_bytes=self.free), reserve_bytes=0, headroom_frac=1.0)
+        self.loaded = list(loaded)
+        self.free = free
+        self._inventory = {m: ModelInfo(m, s) for m, s in sizes.items()}
+        self._loaded_sizes = dict(sizes)
+
+    def resident(self) -> list[ResidentModel]:
+        return [ResidentModel(m, self._loaded_sizes[m]) for m in self.loaded]
+
+    def unload(self, model: str) -> bool:
+        self.loaded.remove(model)
+        self.free += self._loaded_sizes[model]
+        return True
+
+    def warm(self, model: str, *, already_resident: bool = False) -> LoadEvent:
+        if model not in self.loaded:
+            self.loaded.insert(0, model)
+            self.free -= self._loaded_sizes[model]
+        ev = LoadEvent(model, 0.0 if already_resident else 1000.0, 1.0, already_resident)
+        self.events.append(ev)
+        return ev
+
+
+class TestParsing(unittest.TestCase):
+    def test_parse_ollama_list_sizes_and_quant(self) -> None:
+        models = {m.name: m for m in parse_ollama_list(OLLAMA_LIST)}
+        self.assertEqual(models["qwen3.5:35b"].size_bytes, 23 * GB)
+        self.assertEqual(models["lfm2.5-thinking:1.2b"].size_bytes, 731 * 1000 ** 2)
+        self.assertEqual(models["qwen2.5:7b-instruct-q4_K_M"].quantization, "Q4_K_M")
+
+    def test_parse_ollama_ps_vram(self) -> None:
+        rows = {r.name: r for r in parse_ollama_ps(OLLAMA_PS)}
+        self.assertEqual(rows["mistral:7b"].size_bytes, int(5.4 * GB))
+        self.assertEqual(rows["mistral:7b"].size_vram_bytes, int(5.4 * GB))
+        self.assertEqual(rows["qwen2.5:3b"].size_vram_bytes, 0)
+
+
+class TestPlanning(unittest.TestCase):
+    def test_group_by_model_smallest_first_keeps_inner_order(self) -> None:
+        jobs = [("big", "atomic"), ("small", "atomic"), ("big", "extended"), ("unknown", "atomic"), ("small", "extended")]
+        groups = group_by_model(jobs, lambda j: j[0], {"big": 20 * GB, "small": 1 * GB})
+        self.assertEqual([m for m, _ in groups], ["small", "big", "unknown"])
+        self.assertEqual([j[1] for j in groups[1][1]], ["atomic", "extended"])
+
+    def test_fits_alongside_prefers_vram_when_gpu_present(self) -> None:
+        self.assertTrue(fits_alongside(4 * GB, MemoryBudget(64 * GB, None), reserve_bytes=0))
+        self.assertFalse(fits_alongside(4 * GB, MemoryBudget(64 * GB, 3 * GB), reserve_bytes=0))
+        self.assertFalse(fits_alongside(0, MemoryBudget(64 * GB, None)))
+
+
+class TestController(unittest.TestCase):
+    def test_keeps_other_model_when_both_fit(self) -> None:
+        ctl = _FakeResidency(["small"], {"small": 2 * GB, "mid": 5 * GB}, free=10 * GB)
+        ev = ctl.prepare("mid")
+        self.assertEqual(ev.evicted, [])
+        self.assertEqual(sorted(ctl.loaded), ["mid", "small"])
+
+    def test_evicts_least_recent_until_model_fits(self) -> None:
+        sizes = {"a": 4 * GB, "b": 4 * GB, "big": 7 * GB}
+        ctl = _FakeResidency(["a", "b"], sizes, free=4 * GB)  # "a" most recently used
+        ev = ctl.prepare("big")
+        self.assertEqual(ev.evicted, ["b"])
+        self.assertIn("a", ctl.loaded)
+
+    def test_pinned_model_is_not_evicted(self) -> None:
+        ctl = _FakeResidency(["primary"], {"primary": 6 * GB, "fallback": 6 * GB}, free=2 * GB)
+        ev = ctl.prepare("fallback", pinned=["primary"])
+        self.assertEqual(ev.evicted, [])
+
+    def test_already_resident_model_is_not_reloaded(self) -> None:
+        ctl = _FakeResidency(["small"], {"small": 2 * GB}, free=1 * GB)
+        ev = ctl.prepare("small")
+        self.assertTrue(ev.already_resident)
+        self.assertEqual(ctl.total_load_ms(), 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
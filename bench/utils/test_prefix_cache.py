@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""Unit tests for the prefix / KV-cache reuse benchmark."""
+
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# Allow importing utils package from bench/
+HERE = os.path.dirname(__file__)
+BENCH_ROOT = os.path.abspath(os.path.join(HERE, ".."))
+if BENCH_ROOT not in sys.path:
+    sys.path.insert(0, BENCH_ROOT)
+
+from utils.mock_llm_server import MockConfig, MockLLMServer, Recording, RecordingStore  # noqa: E402
+from utils.prefix_cache import (  # noqa: E402
+    CHARS_PER_TOKEN,
+    LlamaServerChatClient,
+    OllamaChatClient,
+    PrefixCacheBench,
+    PrefixSample,
+    build_prefix,
+    format_markdown,
+    load_suite,
+    summarize,
+    turn_steps,
+)
+
+
+class TestWorkload(unittest.TestCase):
+    def test_prefix_is_stable_and_sized(self) -> None:
+        text = build_prefix("Be brief.", 500)
+        self.assertEqual(text, build_prefix("Be brief.", 500))
+        self.assertTrue(text.startswith("Be brief."))
+        self.assertGreaterEqual(len(text), 500 * CHARS_PER_TOKEN)
+        self.assertLess(len(text), 500 * CHARS_PER_TOKEN + 250)
+        self.assertEqual(build_prefix("Be brief.", 0), "Be brief.")
+
+    def test_turn_steps_grow_the_conversation(self) -> None:
+        turns = [{"role": "user", "content": "a"}, {"role": "assistant", "content": "b"},
+                 {"role": "user", "content": "c"}]
+        self.assertEqual([len(s) for s in turn_steps(turns)], [1, 3])
+        items = load_suite(prompt_ids=["P13", "P19"])
+        self.assertEqual([item["id"] for _, item in items], ["P13", "P19"])
+
+
+class TestSummaries(unittest.TestCase):
+    def test_pairs_by_turn_and_counts_errors(self) -> None:
+        def s(pass_name, turn, ms, tokens, error=None):
+            return PrefixSample("m", "ollama", 1024, pass_name, 1, "c", "P13", turn, 100, prompt_tokens=tokens,
+                                prompt_eval_duration_ms=None if error else ms, total_duration_ms=ms + 50,
+                                error=error)
+
+        report = summarize([
+            s("cold", 1, 100.0, 1000), s("warm", 1, 20.0, 200),
+            s("cold", 2, 120.0, 1200), s("warm", 2, 6.0, 60),
+            s("cold", 3, 90.0, 900), s("warm", 3, 0.0, 0, error="HTTP 500"),
+        ])
+        row = report["rows"][0]
+        self.assertEqual((row["n_pairs"], row["errors"]), (2, 1))
+        self.assertEqual(row["saved_pct"], round(100 * (1 - 26 / 220), 1))
+        self.assertEqual(row["reused_token_pct"], round(100 * (1 - 260 / 2200), 1))
+        self.assertEqual((row["first_turn"]["saved_pct"], row["follow_up"]["saved_pct"]), (80.0, 95.0))
+        self.assertIn("| m | ollama | 1024 | 2 |", format_markdown(report))
+
+
+class TestAgainstMock(unittest.TestCase):
+    def setUp(self) -> None:
+        store = RecordingStore([Recording("m", "Sure, checking that now.")])
+        config = MockConfig(ttft_ms=0, tokens_per_s=100000, prefill_tps=100000)
+        self.server = MockLLMServer(store, port=0, config=config)
+        self.server.start()
+        self.items = load_suite(prompt_ids=["P13", "P14", "P19"])
+
+    def tearDown(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_warm_prefix_skips_prefill_and_grows_with_length(self) -> None:
+        bench = PrefixCacheBench(OllamaChatClient(self.server.url), log=lambda _: None)
+        with tempfile.TemporaryDirectory() as td:
+            report = bench.run(["m"], self.items, [0, 2000], out_dir=Path(td))
+            self.assertTrue((Path(td) / "prefix_summary.md").exists())
+            n_lines = len((Path(td) / "prefix_samples.jsonl").read_text().splitlines())
+        short, long = report["rows"]
+        self.assertEqual(n_lines, 2 * 2 * short["n_pairs"])
+        self.assertEqual(long["errors"], 0)
+        self.assertGreater(long["cold_tokens_p50"], 1000)
+        self.assertLess(long["warm_tokens_p50"], 50)
+        self.assertGreater(long["saved_pct"], short["saved_pct"])
+        self.assertGreater(long["follow_up"]["n_pairs"], 0)
+
+    def test_llama_server_reports_cached_tokens(self) -> None:
+        bench = PrefixCacheBench(LlamaServerChatClient(self.server.url), log=lambda _: None)
+        samples = bench.run_model("m", self.items, [1000])
+        warm = [s for s in samples if s.pass_name == "warm"]
+        cold = [s for s in samples if s.pass_name == "cold"]
+        self.assertTrue(all(s.cached_tokens > 500 for s in warm))
+        self.assertTrue(all(s.cached_tokens < 5 for s in cold))
+        self.assertEqual({s.backend for s in samples}, {"llama-server"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""Unit tests for repeated runs, early stopping and bootstrap intervals."""
+
+from __future__ import annotations
+
+import os
+import sys
+import unittest
+
+# Allow importing utils package from bench/
+HERE = os.path.dirname(__file__)
+BENCH_ROOT = os.path.abspath(os.path.join(HERE, ".."))
+if BENCH_ROOT not in sys.path:
+    sys.path.insert(0, BENCH_ROOT)
+
+from utils.repetition import (  # noqa: E402
+    fisher_drop_pvalue,
+    outcome_settled,
+    run_repeated,
+    summarize_repetitions,
+    wilson_interval,
+)
+
+
+class FakeSuite:
+    """Deterministic prompts always give the same answer; P3 alternates."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.count = {"P1": 0, "P2": 0, "P3": 0}
+
+    def run_round(self, pending: list[str]) -> list[dict]:
+        rows = []
+        for pid in pending:
+            self.calls += 1
+            n = self.count[pid]
+            self.count[pid] += 1
+            correct = {"P1": True, "P2": False, "P3": n % 2 == 0}[pid]
+            rows.append({"prompt_id": pid, "correct": correct, "latency_ms": 100.0 + 10 * n})
+        return rows
+
+
+class TestIntervals(unittest.TestCase):
+    def test_wilson_interval(self) -> None:
+        low, high = wilson_interval(3, 3, 0.90)
+        self.assertGreater(low, 0.5)
+        self.assertEqual(high, 1.0)
+        self.assertEqual(wilson_interval(0, 0), (0.0, 1.0))
+
+    def test_settling_needs_agreement(self) -> None:
+        self.assertFalse(outcome_settled([True, True]))
+        self.assertTrue(outcome_settled([True, True, True]))
+        self.assertTrue(outcome_settled([False, False, False]))
+        self.assertFalse(outcome_settled([True, False, True, False, True]))
+
+    def test_fisher_drop_pvalue(self) -> None:
+        # One flip out of 12 is noise; 36/36 -> 24/36 is not.
+        self.assertGreater(fisher_drop_pvalue(12, 12, 11, 12), 0.4)
+        self.assertLess(fisher_drop_pvalue(36, 36, 24, 36), 0.001)
+        self.assertEqual(fisher_drop_pvalue(5, 10, 10, 10), 1.0)
+        self.assertEqual(fisher_drop_pvalue(1, 0, 1, 1), 1.0)
+
+
+class TestRepetition(unittest.TestCase):
+    def test_settled_prompts_stop_early_and_flaky_ones_run_to_k(self) -> None:
+        suite = FakeSuite()
+        rows = run_repeated(suite.run_round, ["P1", "P2", "P3"], max_reps=7)
+        self.assertEqual({pid: len(rs) for pid, rs in rows.items()}, {"P1": 3, "P2": 3, "P3": 7})
+        self.assertEqual(suite.calls, 13)
+
+        summary = summarize_repetitions(rows, max_reps=7, n_boot=300)
+        self.assertEqual(summary["runs"], 13)
+        self.assertEqual(summary["runs_saved"], 8)
+        self.assertEqual(summary["flaky_prompts"], ["P3"])
+        self.assertEqual(summary["passed"], 3 + 4)
+        low, high = summary["accuracy_ci"]
+        self.assertLessEqual(low, summary["accuracy"])
+        self.assertGreaterEqual(high, summary["accuracy"])
+        p95_low, p95_high = summary["latency_p95_ci_ms"]
+        self.assertLessEqual(p95_low, summary["latency_p95_ms"])
+        self.assertLessEqual(summary["latency_p95_ms"], p95_high)
+
+    def test_min_reps_and_single_rep(self) -> None:
+        rows = run_repeated(FakeSuite().run_round, ["P1"], max_reps=5, min_reps=4)
+        self.assertEqual(len(rows["P1"]), 4)
+        rows = run_repeated(FakeSuite().run_round, ["P1", "P3"], max_reps=1)
+        self.assertEqual([len(r) for r in rows.values()], [1, 1])
+
+    def test_bootstrap_is_seeded(self) -> None:
+        rows = run_repeated(FakeSuite().run_round, ["P1", "P2", "P3"], max_reps=5)
+        a = summarize_repetitions(rows, max_reps=5, n_boot=200, seed=3)
+        b = summarize_repetitions(rows, max_reps=5, n_boot=200, seed=3)
+        self.assertEqual(a["accuracy_ci"], b["accuracy_ci"])
+
+
+if __name__ == "__main__":
+    unittest.main()
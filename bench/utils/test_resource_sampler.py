@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""Unit tests for the /proc resource sampler."""
+
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+import time
+import unittest
+
+# Allow importing utils package from bench/
+HERE = os.path.dirname(__file__)
+BENCH_ROOT = os.path.abspath(os.path.join(HERE, ".."))
+if BENCH_ROOT not in sys.path:
+    sys.path.insert(0, BENCH_ROOT)
+
+from utils.resource_sampler import (  # noqa: E402
+    CLK_TCK,
+    ResourceSampler,
+    find_pids,
+    format_kb,
+    parse_pid_stat_cpu,
+    parse_proc_stat,
+    parse_proc_stat_cores,
+)
+
+MEMINFO = """MemTotal:       16000000 kB
+MemFree:         2000000 kB
+MemAvailable:    {avail} kB
+SwapTotal:       1000000 kB
+SwapFree:         900000 kB
+"""
+
+
+def _write(root: str, rel: str, text: str) -> None:
+    path = os.path.join(root, rel)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+
+class FakeHost:
+    """Minimal /proc + /sys tree whose counters the test advances by hand."""
+
+    def __init__(self, root: str) -> None:
+        self.proc = os.path.join(root, "proc")
+        self.sys = os.path.join(root, "sys")
+        _write(self.proc, "4242/comm", "ollama_llama_se\n")
+        _write(self.proc, "99/comm", "bash\n")
+        _write(self.sys, "class/thermal/thermal_zone0/trip_point_0_type", "passive\n")
+        _write(self.sys, "class/thermal/thermal_zone0/trip_point_0_temp", "90000\n")
+        _write(self.sys, "devices/system/cpu/cpu0/cpufreq/cpuinfo_max_freq", "3000000\n")
+        _write(self.proc, "pressure/memory", "some avg10=1.50 avg60=0.20 avg300=0.00 total=1\nfull avg10=0.00\n")
+        self.set(busy=0, idle=0, proc_jiffies=0, avail=8000000, temp_mc=50000, freq_khz=3000000)
+
+    def set(self, busy: int, idle: int, proc_jiffies: int, avail: int, temp_mc: int, freq_khz: int) -> None:
+        _write(self.proc, "stat", f"cpu  {busy} 0 0 {idle} 0 0 0 0 0 0\ncpu0 {busy} 0 0 {idle} 0 0 0 0 0 0\n")
+        _write(self.proc, "meminfo", MEMINFO.format(avail=avail))
+        _write(self.proc, "4242/stat", f"4242 (ollama runner) S 1 1 1 0 -1 0 0 0 0 0 {proc_jiffies} 0 0 0 20 0\n")
+        _write(self.proc, "4242/status", "Name:\tollama\nVmRSS:\t 5242880 kB\n")
+        _write(self.sys, "class/thermal/thermal_zone0/temp", f"{temp_mc}\n")
+        _write(self.sys, "devices/system/cpu/cpu0/cpufreq/scaling_cur_freq", f"{freq_khz}\n")
+
+
+class TestParsers(unittest.TestCase):
+    def test_proc_stat_and_pid_stat(self) -> None:
+        self.assertEqual(parse_proc_stat("cpu  10 0 5 80 5 0 0 0 3 0\n"), (100, 80, 5))
+        stat = "cpu  20 0 0 160 10 0 0 0 0 0\ncpu0 10 0 0 80 5 0 0 0 0 0\ncpu1 10 0 0 80 5 0 0 0 0 0\n"
+        self.assertEqual(parse_proc_stat_cores(stat), [(95, 85), (95, 85)])
+        self.assertEqual(parse_pid_stat_cpu("7 (a (b) c) S 1 1 1 0 -1 0 0 0 0 0 30 12 0 0"), 42)
+
+    def test_find_pids_matches_comm_prefix(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            host = FakeHost(td)
+            self.assertEqual(find_pids("ollama", host.proc), [4242])
+
+    def test_format_kb(self) -> None:
+        self.assertEqual(format_kb(5242880), "5.0Gi")
+        self.assertEqual(format_kb(None), "")
+
+
+class TestSampler(unittest.TestCase):
+    def test_window_reports_load_pressure_and_throttling(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            host = FakeHost(td)
+            sampler = ResourceSampler(proc_root=host.proc, sys_root=host.sys)
+            self.assertEqual(sampler.temp_limit_c, 90.0)
+            self.assertEqual(sampler.nominal_mhz, 3000.0)
+
+            first = sampler.sample_once()
+            # 75% busy, the runner used two cores' worth of jiffies, clock dropped under load.
+            host.set(busy=75, idle=25, proc_jiffies=2 * CLK_TCK, avail=6000000, temp_mc=70000, freq_khz=2000000)
+            sampler._prev_t = first[0] - 1.0  # pretend a second elapsed
+            second = sampler.sample_once()
+
+            window = sampler.window(second[0], second[0])
+            self.assertEqual(window["n_samples"], 1)
+            self.assertEqual(window["cpu_pct_max"], 75.0)
+            self.assertEqual(window["cores_busy_max"], 0)
+            self.assertAlmostEqual(window["proc_cpu_pct_max"], 200.0, delta=1.0)
+            self.assertEqual(window["proc_rss_kb_max"], 5242880)
+            self.assertEqual(window["mem_available_kb_min"], 6000000)
+            self.assertEqual(window["swap_used_kb_max"], 100000)
+            self.assertEqual(window["mem_psi_some_max"], 1.5)
+            self.assertTrue(window["throttled"])
+
+    def test_short_call_uses_latest_prior_sample(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            host = FakeHost(td)
+            sampler = ResourceSampler(proc_root=host.proc, sys_root=host.sys)
+            s = sampler.sample_once()
+            window = sampler.window(s[0] + 1.0, s[0] + 1.1)
+            self.assertEqual(window["n_samples"], 1)
+            self.assertFalse(window["throttled"])
+
+    def test_ring_buffer_is_bounded_and_thread_runs(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            host = FakeHost(td)
+            with ResourceSampler(interval_s=0.01, capacity=5, proc_root=host.proc, sys_root=host.sys) as sampler:
+                while sampler.ticks < 10:
+                    time.sleep(0.005)
+            self.assertEqual(len(sampler.samples()), 5)
+            self.assertEqual(len(sampler.to_columns()["t"]), 5)
+            self.assertIsNotNone(sampler.stats()["overhead_pct"])
+
+    def test_snapshot_replaces_free_and_df(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            host = FakeHost(td)
+            snap = ResourceSampler(proc_root=host.proc, sys_root=host.sys).snapshot(disk_path=td)
+        self.assertEqual(snap["mem_used_kb"], 8000000)
+        self.assertEqual(snap["proc_pids"], [4242])
+        self.assertTrue(snap["disk_root"]["use_pct"].endswith("%"))
+
+
+if __name__ == "__main__":
+    unittest.main()
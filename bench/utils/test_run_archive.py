@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""Unit tests for compressed, indexed supervisor run bundles."""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# Allow importing utils package from bench/
+HERE = os.path.dirname(__file__)
+BENCH_ROOT = os.path.abspath(os.path.join(HERE, ".."))
+if BENCH_ROOT not in sys.path:
+    sys.path.insert(0, BENCH_ROOT)
+
+from utils.run_archive import (  # noqa: E402
+    INDEX_FILE,
+    archive_runs,
+    bundle_codec,
+    extract_bundle,
+    find_run,
+    load_index,
+    read_manifest,
+    read_member,
+    reindex,
+)
+
+DAY = 86400
+NOW = 1_800_000_000.0
+JOB = {"job_index": 1, "model": "lfm2.5-thinking:1.2b", "phase": "atomic", "variant": "atomic", "rc": 0,
+       "used_fallback": True, "served_by": "qwen2.5:3b", "fallback_model": "qwen2.5:3b",
+       "stdout_tail": "x" * 2000}
+
+
+def _make_run(runs: Path, run_id: str, status: str, age_days: float) -> Path:
+    run = runs / run_id
+    (run / "jobs").mkdir(parents=True)
+    (run / "manifest.json").write_text(json.dumps({"run_id": run_id, "status": status, "started_at": NOW - age_days * DAY,
+                                                   "ended_at": NOW - age_days * DAY + 60, "jobs": [JOB]}))
+    (run / "summary.json").write_text(json.dumps({"run_id": run_id, "status": status}))
+    (run / "jobs" / "job1.stdout").write_text("Results: 10/12 passed\n" * 500)
+    (run / "fallback_trace.jsonl").write_text(json.dumps({"run_id": run_id, "job_index": 1, "event": "fallback_succeeded"}) + "\n")
+    os.utime(run, (NOW - age_days * DAY, NOW - age_days * DAY))
+    return run
+
+
+class TestArchiveRuns(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.runs = Path(self.tmp.name) / "supervisor_runs"
+        self.archive = self.runs / ".archive"
+        self.runs.mkdir()
+        _make_run(self.runs, "old_done", "completed", 10)
+        _make_run(self.runs, "old_running", "running", 10)
+        _make_run(self.runs, "fresh", "completed", 1)
+        (self.runs / "abc_manifest.json").write_text("{}")
+        (self.runs / "index.json").write_text(json.dumps({"runs": []}))
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_bundles_finished_old_runs_and_legacy_files(self) -> None:
+        stats = archive_runs(self.runs, self.archive, retain_days=7, now=NOW)
+        self.assertEqual((stats["archived_old_runs"], stats["archived_legacy_files"]), (1, 1))
+        self.assertLess(stats["packed_bytes"] * 5, stats["raw_bytes"])
+        self.assertEqual(sorted(p.name for p in self.runs.iterdir()), [".archive", "fresh", "index.json", "old_running"])
+
+        entry = find_run(self.archive, "old_done")
+        self.assertEqual((entry["status"], entry["job_count"], entry["trace_events"], entry["files"]), ("completed", 1, 1, 4))
+        self.assertEqual(entry["route"], [{k: JOB[k] for k in JOB if k != "stdout_tail"}])
+        self.assertEqual(entry["mtime"], NOW - 10 * DAY)
+        self.assertEqual({e["kind"] for e in load_index(self.archive)}, {"run", "legacy"})
+
+    def test_members_manifest_extract_and_reindex(self) -> None:
+        archive_runs(self.runs, self.archive, retain_days=7, now=NOW)
+        entry = find_run(self.archive, "old_done")
+        bundle = self.archive / entry["bundle"]
+        self.assertEqual(bundle_codec(bundle), entry["codec"])
+
+        head = read_manifest(bundle)
+        self.assertEqual(head["run_id"], "old_done")
+        self.assertIn("old_done/jobs/job1.stdout", {f["path"] for f in head["file_list"]})
+        self.assertEqual(json.loads(read_member(bundle, "old_done/summary.json"))["status"], "completed")
+        self.assertIsNone(read_member(bundle, "old_done/missing.json"))
+
+        restored = Path(self.tmp.name) / "restored"
+        self.assertEqual(len(extract_bundle(bundle, restored)), 4)
+        self.assertEqual((restored / "old_done" / "jobs" / "job1.stdout").read_text(), "Results: 10/12 passed\n" * 500)
+
+        before = {e["bundle"]: e for e in load_index(self.archive)}
+        (self.archive / INDEX_FILE).write_text('{"bundle": "gone.tar.xz"}\n{"torn')
+        self.assertEqual(load_index(self.archive), [])
+        self.assertEqual(reindex(self.archive), 2)
+        self.assertEqual({e["bundle"]: e for e in load_index(self.archive)}, before)
+
+    def test_same_run_id_twice_gets_a_new_bundle_name(self) -> None:
+        archive_runs(self.runs, self.archive, retain_days=7, now=NOW)
+        _make_run(self.runs, "old_done", "failed", 9)
+        archive_runs(self.runs, self.archive, retain_days=7, now=NOW + 1)
+        self.assertEqual(sorted(e["status"] for e in load_index(self.archive) if e["run_id"] == "old_done"),
+                         ["completed", "failed"])
+        self.assertEqual(find_run(self.archive, "old_done")["status"], "failed")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""Unit tests for the mergeable DDSketch."""
+
+from __future__ import annotations
+
+import json
+import os
+import random
+import statistics
+import sys
+import unittest
+
+# Allow importing utils package from bench/
+HERE = os.path.dirname(__file__)
+BENCH_ROOT = os.path.abspath(os.path.join(HERE, ".."))
+if BENCH_ROOT not in sys.path:
+    sys.path.insert(0, BENCH_ROOT)
+
+from utils.sketches import DDSketch  # noqa: E402
+
+
+def _exact(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[int(q * (len(ordered) - 1))]
+
+
+class TestDDSketch(unittest.TestCase):
+    def setUp(self) -> None:
+        rng = random.Random(7)
+        # Long-tailed, like e2e latencies: mostly ~1s with a few 30s outliers.
+        self.values = [rng.lognormvariate(7.0, 0.6) for _ in range(5000)] + [30000.0 + i for i in range(50)]
+
+    def test_quantiles_within_relative_accuracy(self) -> None:
+        sketch = DDSketch().update(self.values)
+        for q in (0.0, 0.5, 0.95, 0.99, 1.0):
+            exact = _exact(self.values, q)
+            self.assertLessEqual(abs(sketch.quantile(q) - exact), 0.01 * exact + 1e-9, q)
+        self.assertEqual(sketch.quantile(0), min(self.values))
+        self.assertEqual(sketch.quantile(1), max(self.values))
+        self.assertAlmostEqual(sketch.mean, statistics.mean(self.values), places=6)
+        self.assertAlmostEqual(sketch.stdev, statistics.stdev(self.values), places=6)
+        self.assertLess(len(sketch.bins), 400)
+
+    def test_merge_of_shards_equals_single_sketch(self) -> None:
+        whole = DDSketch().update(self.values)
+        shards = [DDSketch().update(self.values[i::3]) for i in range(3)]
+        merged = DDSketch()
+        for shard in shards:
+            merged.merge(shard)
+        self.assertEqual(merged.bins, whole.bins)
+        self.assertEqual(merged.count, whole.count)
+        self.assertAlmostEqual(merged.stdev, whole.stdev, places=6)
+        self.assertEqual(merged.quantile(0.95), whole.quantile(0.95))
+
+    def test_round_trip_through_json(self) -> None:
+        sketch = DDSketch().update([0, 0, 5, 120, 4000])
+        loaded = DDSketch.from_dict(json.loads(json.dumps(sketch.to_dict())))
+        self.assertEqual(loaded.to_dict(), sketch.to_dict())
+        self.assertEqual(loaded.percentile(50), sketch.percentile(50))
+        self.assertEqual(loaded.percentile(10), 0.0)
+
+    def test_empty_and_mismatched(self) -> None:
+        empty = DDSketch()
+        self.assertIsNone(empty.quantile(0.5))
+        self.assertIsNone(empty.mean)
+        self.assertIsNone(empty.stdev)
+        self.assertEqual(DDSketch().update([3.0]).merge(empty).count, 1)
+        with self.assertRaises(ValueError):
+            DDSketch(0.01).merge(DDSketch(0.02).update([1.0]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,10 +1,12 @@
 from __future__ import annotations
 
 import time
-from typing import Any, Optional
+from typing import Any, Optional, Sequence
+
+import ccxt
 
 from .types import Mode, OrderAck, OrderRequest, OrderType, Side
-from .venue import PositionSnapshot, VenueAdapter
+from .venue import OrderNotFound, PositionSnapshot, VenueAdapter
 
 
 class CcxtProVenueAdapter(VenueAdapter):
@@ -22,6 +24,8 @@ class CcxtProVenueAdapter(VenueAdapter):
         # exchange should be an initialized ccxt.pro exchange instance
         self._exchange = exchange
         self._mode = mode
+        # Per-market name of the position-size field, resolved on first snapshot.
+        self._qty_field: dict[str, str] = {}
 
     @property
     def venue(self) -> str:
@@ -33,6 +37,41 @@ class CcxtProVenueAdapter(VenueAdapter):
         return self._mode
 
     async def place_order(self, req: OrderRequest) -> OrderAck:
+        symbol, typ, side, params = self._order_args(req)
+        created = await self._exchange.create_order(symbol, typ, side, req.qty, req.limit_price, params)
+        return self._to_ack(req, created)
+
+    async def place_orders(self, reqs: Sequence[OrderRequest]) -> list[OrderAck]:
+        """Use ccxt `create_orders` (one request) when the venue supports it."""
+        if not self._has("createOrders"):
+            return await super().place_orders(reqs)
+        orders = []
+        for req in reqs:
+            symbol, typ, side, params = self._order_args(req)
+            orders.append(
+                {"symbol": symbol, "type": typ, "side": side, "amount": req.qty, "price": req.limit_price, "params": params}
+            )
+        created = await self._exchange.create_orders(orders)
+        # ccxt returns one entry per request, in request order; rejected legs carry no id.
+        return [self._to_ack(req, c or {}) for req, c in zip(reqs, created)]
+
+    async def cancel_order(self, venue_order_id: str, asset: str) -> None:
+        try:
+            await self._exchange.cancel_order(venue_order_id, asset)
+        except ccxt.OrderNotFound as exc:
+            raise OrderNotFound(venue_order_id) from exc
+
+    async def cancel_orders(self, venue_order_ids: Sequence[str], asset: str) -> None:
+        """Use ccxt `cancel_orders` (one request) when the venue supports it."""
+        if not self._has("cancelOrders"):
+            await super().cancel_orders(venue_order_ids, asset)
+            return
+        await self._exchange.cancel_orders(list(venue_order_ids), asset)
+
+    def _has(self, capability: str) -> bool:
+        return bool((getattr(self._exchange, "has", None) or {}).get(capability))
+
+    def _order_args(self, req: OrderRequest) -> tuple[str, str, str, dict[str, Any]]:
         symbol = req.asset
         side = "buy" if req.side == Side.BUY else "sell"
         typ = "market" if req.order_type == OrderType.MARKET else "limit"
@@ -45,11 +84,12 @@ class CcxtProVenueAdapter(VenueAdapter):
         if req.client_order_id:
             # many venues: "clientOrderId" (binance), "orderLinkId" (bybit)
             params["clientOrderId"] = req.client_order_id
+        return symbol, typ, side, params
 
-        created = await self._exchange.create_order(symbol, typ, side, req.qty, req.limit_price, params)
-        oid = str(created.get("id", ""))
+    def _to_ack(self, req: OrderRequest, created: dict[str, Any]) -> OrderAck:
+        oid = str(created.get("id") or "")
         ts_ms = int(created.get("timestamp") or time.time() * 1000)
-        status = str(created.get("status") or "NEW")
+        status = str(created.get("status") or ("NEW" if oid else "REJECTED"))
 
         return OrderAck(
             venue_order_id=oid,
@@ -66,9 +106,6 @@ class CcxtProVenueAdapter(VenueAdapter):
             ts_ms=ts_ms,
         )
 
-    async def cancel_order(self, venue_order_id: str, asset: str) -> None:
-        await self._exchange.cancel_order(venue_order_id, asset)
-
     async def fetch_position(self, asset: str) -> PositionSnapshot:
         """
         Best-effort position snapshot.
@@ -76,7 +113,6 @@ class CcxtProVenueAdapter(VenueAdapter):
         IMPORTANT: confirm which field is the signed position quantity for your venue/market type.
         """
         ts_ms = int(time.time() * 1000)
-        qty = 0.0
 
         pos: Optional[dict[str, Any]] = None
         try:
@@ -93,29 +129,85 @@ class CcxtProVenueAdapter(VenueAdapter):
             except Exception:
                 pos = None
 
-        if pos:
-            ts_ms = int(pos.get("timestamp") or ts_ms)
-            # Common ccxt unified field: 'contracts' or 'size' varies; try several.
-            raw = (
-                pos.get("contracts")
-                if pos.get("contracts") is not None
-                else pos.get("contractSize")
-                if pos.get("contractSize") is not None
-                else pos.get("size")
-                if pos.get("size") is not None
-                else pos.get("positionAmt")
-                if pos.get("positionAmt") is not None
-                else pos.get("info", {}).get("size")
-            )
-            try:
-                qty = float(raw or 0.0)
-            except Exception:
-                qty = 0.0
+        if not pos:
+            return PositionSnapshot(asset=asset, qty=0.0, ts_ms=ts_ms)
+        return self._normalize_position(asset, pos, ts_ms)
+
+    async def fetch_positions_snapshot(self, assets: Sequence[str]) -> dict[str, PositionSnapshot]:
+        """
+        Snapshot positions for all `assets` with a single `fetch_positions(symbols)` call.
+
+        Symbols missing from the response are reported flat (qty=0) at the request timestamp,
+        which matches how most venues omit closed positions. If the venue does not support the
+        bulk endpoint (`ccxt.NotSupported`), fall back to one exchange `fetch_position` call per
+        asset. Any other error, including one from the fallback calls, propagates so that
+        reconciliation never mistakes a failed call for flat positions.
+        """
+        symbols = list(dict.fromkeys(assets))
+        ts_ms = int(time.time() * 1000)
+        try:
+            positions = await self._exchange.fetch_positions(symbols)
+        except ccxt.NotSupported:
+            # Unlike `self.fetch_position`, which is best-effort, errors here propagate.
+            out: dict[str, PositionSnapshot] = {}
+            for a in symbols:
+                pos = await self._exchange.fetch_position(a)
+                out[a] = (
+                    self._normalize_position(a, pos, ts_ms) if pos else PositionSnapshot(asset=a, qty=0.0, ts_ms=ts_ms)
+                )
+            return out
+
+        out = {a: PositionSnapshot(asset=a, qty=0.0, ts_ms=ts_ms) for a in symbols}
+        for pos in positions or []:
+            symbol = pos.get("symbol")
+            if symbol not in out:
+                continue
+            snap = self._normalize_position(symbol, pos, ts_ms)
+            prev = out[symbol]
+            # Hedge-mode venues can report a long and a short leg for one symbol; net them.
+            if prev.qty != 0.0:
+                snap = PositionSnapshot(asset=symbol, qty=prev.qty + snap.qty, ts_ms=max(prev.ts_ms, snap.ts_ms))
+            out[symbol] = snap
+        return out
+
+    def _normalize_position(self, asset: str, pos: dict[str, Any], default_ts_ms: int) -> PositionSnapshot:
+        ts_ms = int(pos.get("timestamp") or default_ts_ms)
+
+        # Common ccxt unified field: 'contracts' or 'size' varies. The field is cached per market
+        # only once it carries a non-zero size (a flat snapshot may leave the real field unset),
+        # and re-probed whenever the cached field is missing from a snapshot.
+        key = self._qty_field.get(asset)
+        raw = _lookup(pos, key) if key is not None else None
+        if raw is None:
+            key, raw = next(((k, v) for k in _QTY_FIELDS if (v := _lookup(pos, k)) is not None), (None, None))
+            if key is not None and _is_nonzero(raw):
+                self._qty_field[asset] = key
+        try:
+            qty = float(raw or 0.0)
+        except Exception:
+            qty = 0.0
 
-            # If the unified data includes a side field, apply sign (venue-specific; verify!).
-            side = (pos.get("side") or pos.get("info", {}).get("side") or "").lower()
-            if side in {"short", "sell"}:
-                qty = -abs(qty)
+        # If the unified data includes a side field, apply sign (venue-specific; verify!).
+        side = (pos.get("side") or pos.get("info", {}).get("side") or "").lower()
+        if side in {"short", "sell"}:
+            qty = -abs(qty)
 
         return PositionSnapshot(asset=asset, qty=qty, ts_ms=ts_ms)
 
+
+# Candidate position-size fields, in preference order ("info.size" is the raw venue payload).
+# "contractSize" is deliberately absent: it is the contract multiplier, not a position size.
+_QTY_FIELDS = ("contracts", "size", "positionAmt", "info.size")
+
+
+def _lookup(pos: dict[str, Any], key: str) -> Any:
+    if key.startswith("info."):
+        return (pos.get("info") or {}).get(key[len("info."):])
+    return pos.get(key)
+
+
+def _is_nonzero(raw: Any) -> bool:
+    try:
+        return float(raw) != 0.0
+    except (TypeError, ValueError):
+        return False
@@ -44,6 +44,7 @@ def load_oms_config_from_env(base: Optional[OMSConfig] = None) -> OMSConfig:
             "ATS_FLIPFLOP_MAX_PAIRS_PER_WINDOW",
             cfg.flipflop_max_pairs_per_window,
         ),
+        fill_dedupe_window=_get_int("ATS_FILL_DEDUPE_WINDOW", cfg.fill_dedupe_window),
     )
     return cfg
 
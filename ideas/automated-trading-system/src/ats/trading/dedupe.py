@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass, field
+
+
+@dataclass(slots=True)
+class FillIdWindow:
+    """
+    Bounded fill-id dedupe: a FIFO ring of the last `capacity` ids plus a set for O(1) lookup.
+
+    Behaviour:
+    - No false positives: an id is reported as seen only if it is still inside the window.
+    - False negatives are possible by design: a duplicate that arrives after more than
+      `capacity` newer distinct fills has been evicted and is accepted again. Size the window
+      well above the venue's maximum fill-replay depth (WS reconnect backfill, REST catch-up).
+    - Memory is O(capacity) for the life of the process.
+    """
+
+    capacity: int = 10_000
+    _ring: deque[str] = field(default_factory=deque)
+    _ids: set[str] = field(default_factory=set)
+
+    def __post_init__(self) -> None:
+        if self.capacity <= 0:
+            raise ValueError("FillIdWindow capacity must be positive")
+
+    def __contains__(self, fill_id: object) -> bool:
+        return fill_id in self._ids
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def add(self, fill_id: str) -> bool:
+        """Record `fill_id`; return False if it is already inside the window."""
+        if fill_id in self._ids:
+            return False
+        if len(self._ring) >= self.capacity:
+            self._ids.discard(self._ring.popleft())
+        self._ring.append(fill_id)
+        self._ids.add(fill_id)
+        return True
@@ -32,11 +32,15 @@ class FlipFlopDetector:
         self._trim(q, now_s)
 
     def should_halt(self, instrument: str, now_s: Optional[float] = None) -> bool:
+        return self.pair_count(instrument, now_s=now_s) >= self.max_pairs_per_window
+
+    def pair_count(self, instrument: str, now_s: Optional[float] = None) -> int:
+        """Cancel-after-place pairs for `instrument` inside the current window."""
         if now_s is None:
             now_s = time.time()
         q = self._events.get(instrument)
         if not q:
-            return False
+            return 0
         self._trim(q, now_s)
 
         # Count cancel-after-place pairs within pair_max_delay_s.
@@ -48,7 +52,7 @@ class FlipFlopDetector:
             elif ev == "CANCEL":
                 if last_place_ts is not None and 0.0 <= (ts - last_place_ts) <= self.pair_max_delay_s:
                     pairs += 1
-        return pairs >= self.max_pairs_per_window
+        return pairs
 
     def _trim(self, q: Deque[tuple[float, EventType]], now_s: float) -> None:
         cutoff = now_s - self.window_s
@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+# Log-linear bucketing (HDR-histogram style): exact below 2**SUB_BITS, then 2**(SUB_BITS-1)
+# linear sub-buckets per power of two, i.e. <1% relative error at any magnitude.
+_SUB_BITS = 8
+_SUB = 1 << _SUB_BITS
+_HALF = _SUB >> 1
+
+_QUANTILES = (0.5, 0.9, 0.99, 0.999)
+
+
+def _bucket(v: int) -> int:
+    if v < _SUB:
+        return v
+    shift = v.bit_length() - _SUB_BITS
+    return shift * _HALF + (v >> shift)
+
+
+def _bucket_upper(idx: int) -> int:
+    # Highest value that maps into bucket `idx`.
+    if idx < _SUB:
+        return idx
+    shift = idx // _HALF - 1
+    return ((idx - shift * _HALF + 1) << shift) - 1
+
+
+class LatencyHistogram:
+    """
+    Sparse log-linear latency histogram in integer microseconds.
+
+    Recording is O(1) (one bit_length and one dict update); memory grows with the number of
+    distinct buckets hit, which is bounded by the value range, not by the sample count.
+    Percentiles report the upper bound of the bucket (capped at the observed max).
+    """
+
+    __slots__ = ("_counts", "count", "total_us", "min_us", "max_us")
+
+    def __init__(self) -> None:
+        self._counts: dict[int, int] = {}
+        self.count = 0
+        self.total_us = 0
+        self.min_us = 0
+        self.max_us = 0
+
+    def record(self, value_us: int) -> None:
+        if value_us < 0:
+            value_us = 0
+        idx = _bucket(value_us)
+        self._counts[idx] = self._counts.get(idx, 0) + 1
+        if self.count == 0 or value_us < self.min_us:
+            self.min_us = value_us
+        if value_us > self.max_us:
+            self.max_us = value_us
+        self.count += 1
+        self.total_us += value_us
+
+    def percentile(self, q: float) -> int:
+        if self.count == 0:
+            return 0
+        rank = max(1, int(q * self.count + 0.5))
+        seen = 0
+        for idx in sorted(self._counts):
+            seen += self._counts[idx]
+            if seen >= rank:
+                return min(_bucket_upper(idx), self.max_us)
+        return self.max_us
+
+    def snapshot(self) -> dict:
+        out: dict = {
+            "count": self.count,
+            "mean_us": self.total_us / self.count if self.count else 0.0,
+            "min_us": self.min_us,
+            "max_us": self.max_us,
+        }
+        for q in _QUANTILES:
+            out[f"p{q * 100:g}_us"] = self.percentile(q)
+        return out
+
+
+class LatencyRecorder:
+    """
+    Latency histograms keyed by (stage, venue, asset).
+
+    Stages recorded by the OMS:
+    - `guardrails`: pre-trade checks (`_check_can_place*`)
+    - `venue_place` / `venue_cancel`: venue round-trip (single or batch)
+    - `order_path`: `place_order(s)` entry until the ack is audited
+    - `fill_to_position`: venue fill timestamp until the internal position is updated
+    - `reconcile`: REST snapshot + compare (asset "*" for a bulk reconcile)
+    """
+
+    def __init__(self) -> None:
+        self._hists: dict[tuple[str, str, str], LatencyHistogram] = {}
+
+    def record_us(self, stage: str, venue: str, asset: str, value_us: int) -> None:
+        key = (stage, venue, asset)
+        h = self._hists.get(key)
+        if h is None:
+            h = self._hists[key] = LatencyHistogram()
+        h.record(value_us)
+
+    @contextmanager
+    def time(self, stage: str, venue: str, asset: str) -> Iterator[None]:
+        """Record the wall time of the block (also when it raises)."""
+        t0 = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.record_us(stage, venue, asset, (time.perf_counter_ns() - t0) // 1000)
+
+    def get(self, stage: str, venue: str, asset: str) -> Optional[LatencyHistogram]:
+        return self._hists.get((stage, venue, asset))
+
+    def snapshot(self) -> list[dict]:
+        return [
+            {"stage": stage, "venue": venue, "asset": asset, **h.snapshot()}
+            for (stage, venue, asset), h in sorted(self._hists.items())
+        ]
+
+    def render_prometheus(self, metric: str = "ats_oms_latency_seconds") -> str:
+        """Prometheus text exposition (summary per stage/venue/asset, values in seconds)."""
+        lines = [
+            f"# HELP {metric} OMS order-path latency by stage.",
+            f"# TYPE {metric} summary",
+        ]
+        for (stage, venue, asset), h in sorted(self._hists.items()):
+            labels = f'stage="{_esc(stage)}",venue="{_esc(venue)}",asset="{_esc(asset)}"'
+            for q in _QUANTILES:
+                lines.append(f'{metric}{{{labels},quantile="{q:g}"}} {h.percentile(q) / 1e6:.6f}')
+            lines.append(f"{metric}_sum{{{labels}}} {h.total_us / 1e6:.6f}")
+            lines.append(f"{metric}_count{{{labels}}} {h.count}")
+        return "\n".join(lines) + "\n"
+
+
+def _esc(v: str) -> str:
+    return v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+async def serve_prometheus(
+    recorder: LatencyRecorder,
+    *,
+    host: str = "127.0.0.1",
+    port: int = 9108,
+) -> asyncio.Server:
+    """
+    Serve `recorder` as Prometheus text on http://host:port/metrics (any path works).
+
+    Minimal HTTP/1.0 responder meant for a local scraper; bind to loopback unless the host is
+    otherwise protected.
+    """
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            # Drain request headers; the request itself is not inspected.
+            while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                pass
+            body = recorder.render_prometheus().encode("utf-8")
+            writer.write(
+                b"HTTP/1.0 200 OK\r\n"
+                b"Content-Type: text/plain; version=0.0.4; charset=utf-8\r\n"
+                + f"Content-Length: {len(body)}\r\n\r\n".encode("ascii")
+                + body
+            )
+            await writer.drain()
+        finally:
+            writer.close()
+
+    return await asyncio.start_server(handle, host, port)
@@ -2,21 +2,29 @@ from __future__ import annotations
 
 import asyncio
 import time
-from dataclasses import asdict, dataclass, field
-from typing import Callable, Optional
+from dataclasses import dataclass, field, fields
+from typing import Callable, Optional, Sequence
 
 from .audit import AuditLogger
+from .dedupe import FillIdWindow
 from .flipflop import FlipFlopDetector
+from .latency import LatencyRecorder
 from .rate_limit import SlidingWindowRateLimiter
+from .risk import PreTradeRiskEngine, RiskBreach
 from .types import (
     FillEvent,
     InstrumentSafetyState,
     Mode,
+    OpenOrder,
     OrderAck,
     OrderRequest,
     Side,
 )
-from .venue import VenueAdapter
+from .venue import OrderNotFound, PartialBatchError, PositionSnapshot, VenueAdapter
+
+
+# Ack statuses (ccxt unified and venue-native spellings) that mean the order is not resting.
+_TERMINAL_ORDER_STATUSES = frozenset({"CLOSED", "FILLED", "CANCELED", "CANCELLED", "REJECTED", "EXPIRED"})
 
 
 class SafetyHalt(Exception):
@@ -27,6 +35,14 @@ class OrderBlocked(Exception):
     """Raised when a specific order attempt is blocked by a guardrail."""
 
 
+class RiskBlocked(OrderBlocked):
+    """Raised when the pre-trade risk engine blocks an order; `breach` names the limit."""
+
+    def __init__(self, breach: RiskBreach) -> None:
+        super().__init__(f"Risk limit {breach.limit} would be exceeded")
+        self.breach = breach
+
+
 @dataclass
 class OMSConfig:
     # Reconciliation
@@ -54,6 +70,9 @@ class OMSConfig:
     flipflop_pair_max_delay_s: float = 5.0
     flipflop_max_pairs_per_window: int = 15
 
+    # Fill-id dedupe window per instrument (most recent N distinct fill ids).
+    fill_dedupe_window: int = 10_000
+
     # Position limits (per asset, absolute qty).
     # For futures, interpret this as absolute position size in base units/contracts.
     max_abs_position_qty: dict[str, float] = field(default_factory=dict)
@@ -79,17 +98,23 @@ class OMS:
         audit: AuditLogger,
         config: Optional[OMSConfig] = None,
         *,
+        risk: Optional[PreTradeRiskEngine] = None,
+        latency: Optional[LatencyRecorder] = None,
         now_ms: Optional[Callable[[], int]] = None,
         now_s: Optional[Callable[[], float]] = None,
     ) -> None:
         self._venue = venue
         self._audit = audit
         self._cfg = config or OMSConfig()
+        self._risk = risk
+        self._latency = latency or LatencyRecorder()
 
         self._now_ms = now_ms or (lambda: int(time.time() * 1000))
         self._now_s = now_s or time.time
 
         self._states: dict[str, InstrumentSafetyState] = {}
+        # asset -> venue_order_id -> resting order
+        self._open_orders: dict[str, dict[str, OpenOrder]] = {}
         self._safe_mode = False
         self._halt_reason: str = ""
         self._armed = False
@@ -111,6 +136,18 @@ class OMS:
     def venue(self) -> VenueAdapter:
         return self._venue
 
+    @property
+    def risk(self) -> Optional[PreTradeRiskEngine]:
+        return self._risk
+
+    @property
+    def latency(self) -> LatencyRecorder:
+        return self._latency
+
+    @property
+    def flipflop(self) -> FlipFlopDetector:
+        return self._flipflop
+
     @property
     def safe_mode(self) -> bool:
         return self._safe_mode
@@ -129,7 +166,9 @@ class OMS:
 
     def ensure_instrument(self, asset: str) -> None:
         if asset not in self._states:
-            self._states[asset] = InstrumentSafetyState()
+            self._states[asset] = InstrumentSafetyState(
+                seen_fill_ids=FillIdWindow(capacity=self._cfg.fill_dedupe_window),
+            )
 
     def mark_ws_event(self, asset: str) -> None:
         self.ensure_instrument(asset)
@@ -173,8 +212,22 @@ class OMS:
         self._audit.log("SAFE_MODE", payload)
 
     def _check_can_place(self, req: OrderRequest) -> None:
-        self.ensure_instrument(req.asset)
-        st = self._states[req.asset]
+        self._check_can_place_batch(req.asset, (req,))
+
+    def _check_can_place_batch(self, asset: str, reqs: Sequence[OrderRequest]) -> None:
+        """
+        Guardrails for one or more new orders on a single asset.
+
+        Every order in the batch consumes a rate-limit token (venues without a batch endpoint
+        really send one request per order); position and exposure limits are evaluated against
+        the whole batch resting at once.
+        """
+        with self._latency.time("guardrails", self._venue.venue, asset):
+            self._run_guardrails(asset, reqs)
+
+    def _run_guardrails(self, asset: str, reqs: Sequence[OrderRequest]) -> None:
+        self.ensure_instrument(asset)
+        st = self._states[asset]
 
         if self._safe_mode:
             raise SafetyHalt(f"SAFE_MODE: {self._halt_reason}")
@@ -182,8 +235,8 @@ class OMS:
         if self._venue.mode == Mode.LIVE and self._cfg.require_armed_for_live and not self._armed:
             raise OrderBlocked("LIVE requires arming; order blocked")
 
-        if self._cfg.require_ws_healthy_for_new_orders and not self._ws_healthy(req.asset):
-            self._enter_safe_mode("WS_STALE_BLOCK_NEW_ORDERS", asset=req.asset)
+        if self._cfg.require_ws_healthy_for_new_orders and not self._ws_healthy(asset):
+            self._enter_safe_mode("WS_STALE_BLOCK_NEW_ORDERS", asset=asset)
             raise OrderBlocked("WebSocket feed stale; blocking new orders")
 
         if self._cfg.block_orders_while_dirty and st.dirty:
@@ -193,41 +246,126 @@ class OMS:
                 if dirty_age_s >= self._cfg.dirty_max_age_s:
                     self._enter_safe_mode(
                         "DIRTY_POSITION_TOO_LONG",
-                        asset=req.asset,
+                        asset=asset,
                         extra={"dirty_age_s": dirty_age_s},
                     )
             raise OrderBlocked("Position is dirty (awaiting confirmation); order blocked")
 
-        if not self._rate.allow(req.asset, now_s=self._now_s()):
+        if not self._rate.allow(asset, now_s=self._now_s(), cost=len(reqs)):
             self._audit.log(
                 "ORDER_RATE_LIMIT",
-                {"asset": req.asset, "limit": self._cfg.max_orders_per_s, "window_s": self._cfg.order_rate_window_s},
+                {
+                    "asset": asset,
+                    "limit": self._cfg.max_orders_per_s,
+                    "window_s": self._cfg.order_rate_window_s,
+                    "orders": len(reqs),
+                },
             )
             if self._cfg.rate_limit_breach_enters_safe:
-                self._enter_safe_mode("ORDER_RATE_LIMIT_BREACH", asset=req.asset)
+                self._enter_safe_mode("ORDER_RATE_LIMIT_BREACH", asset=asset)
             raise OrderBlocked("Order rate limit exceeded")
 
         # Position limit sanity check using internal running sum (fast).
-        lim = self._cfg.max_abs_position_qty.get(req.asset)
+        lim = self._cfg.max_abs_position_qty.get(asset)
         if lim is not None and lim > 0:
-            projected = st.internal_pos_qty + (req.qty if req.side == Side.BUY else -req.qty)
-            if abs(projected) > lim:
+            buy_qty = sum(r.qty for r in reqs if r.side == Side.BUY)
+            sell_qty = sum(r.qty for r in reqs if r.side != Side.BUY)
+            for projected in (
+                st.internal_pos_qty + buy_qty if buy_qty else None,
+                st.internal_pos_qty - sell_qty if sell_qty else None,
+            ):
+                if projected is not None and abs(projected) > lim:
+                    self._audit.log(
+                        "RISK_BLOCK_MAX_POSITION",
+                        {"asset": asset, "projected": projected, "limit": lim, "internal_pos": st.internal_pos_qty},
+                    )
+                    raise OrderBlocked("Max position limit would be exceeded")
+
+        # Portfolio/exposure limits (optional pluggable engine).
+        if self._risk is not None:
+            breach = self._risk.check(reqs[0]) if len(reqs) == 1 else self._risk.check_batch(asset, reqs)
+            if breach is not None:
                 self._audit.log(
-                    "RISK_BLOCK_MAX_POSITION",
-                    {"asset": req.asset, "projected": projected, "limit": lim, "internal_pos": st.internal_pos_qty},
+                    "RISK_BLOCK",
+                    {
+                        "asset": asset,
+                        "limit": breach.limit,
+                        "projected": breach.projected,
+                        "threshold": breach.threshold,
+                    },
                 )
-                raise OrderBlocked("Max position limit would be exceeded")
+                raise RiskBlocked(breach)
 
         # Flip-flop check happens after recording events; here we only pre-check window status.
-        if self._flipflop.should_halt(req.asset, now_s=self._now_s()):
-            self._enter_safe_mode("FLIPFLOP_DETECTED", asset=req.asset)
+        if self._flipflop.should_halt(asset, now_s=self._now_s()):
+            self._enter_safe_mode("FLIPFLOP_DETECTED", asset=asset)
             raise SafetyHalt("Flip-flop detected; strategy halted")
 
     async def place_order(self, req: OrderRequest) -> OrderAck:
+        venue = self._venue.venue
+        t0 = time.perf_counter_ns()
         self._check_can_place(req)
         self._flipflop.record(req.asset, "PLACE", now_s=self._now_s())
 
-        ack = await self._venue.place_order(req)
+        with self._latency.time("venue_place", venue, req.asset):
+            ack = await self._venue.place_order(req)
+        self._on_ack(ack)
+        self._latency.record_us("order_path", venue, req.asset, (time.perf_counter_ns() - t0) // 1000)
+        return ack
+
+    async def place_orders(self, reqs: Sequence[OrderRequest]) -> list[OrderAck]:
+        """
+        Place several orders on one asset (e.g. a quote ladder) in one venue batch.
+
+        The batch gets one guardrail pass and one flip-flop PLACE record, but consumes one
+        rate-limit token per order, so a ladder cannot exceed `max_orders_per_s`.
+        """
+        if not reqs:
+            return []
+        asset = reqs[0].asset
+        if any(r.asset != asset for r in reqs):
+            raise ValueError("place_orders batch must target a single asset")
+        venue = self._venue.venue
+        t0 = time.perf_counter_ns()
+        self._check_can_place_batch(asset, reqs)
+        self._flipflop.record(asset, "PLACE", now_s=self._now_s())
+
+        try:
+            with self._latency.time("venue_place", venue, asset):
+                acks = await self._venue.place_orders(reqs)
+        except PartialBatchError as exc:
+            # The accepted legs are resting: track them so cancel_all and the risk engine see them.
+            for ack in exc.acks:
+                self._on_ack(ack)
+            self._audit.log(
+                "ORDER_BATCH_PARTIAL",
+                {
+                    "venue": venue,
+                    "asset": asset,
+                    "placed": [a.venue_order_id for a in exc.acks],
+                    "errors": {str(i): f"{type(e).__name__}: {e}" for i, e in exc.errors.items()},
+                },
+            )
+            raise
+        for ack in acks:
+            self._on_ack(ack)
+        self._latency.record_us("order_path", venue, asset, (time.perf_counter_ns() - t0) // 1000)
+        return acks
+
+    def _on_ack(self, ack: OrderAck) -> None:
+        if ack.venue_order_id and ack.status.upper() not in _TERMINAL_ORDER_STATUSES:
+            self._open_orders.setdefault(ack.asset, {})[ack.venue_order_id] = OpenOrder(
+                venue_order_id=ack.venue_order_id,
+                asset=ack.asset,
+                side=ack.side,
+                qty=ack.qty,
+                remaining_qty=ack.qty,
+                limit_price=ack.limit_price,
+                client_order_id=ack.client_order_id,
+                ts_ms=ack.ts_ms,
+            )
+            if self._risk is not None:
+                self._risk.order_opened(ack.venue_order_id, ack.asset, ack.side, ack.qty)
         # Audit in the spec-compatible "Order" shape (plus a few extras).
         self._audit.log(
             "ORDER",
@@ -249,20 +387,98 @@ class OMS:
                 "client_order_id": ack.client_order_id,
             },
         )
-        return ack
+
+    def open_orders(self, asset: str) -> list[OpenOrder]:
+        """Orders the OMS believes are resting on `asset` (from acks, fills and cancels)."""
+        return list(self._open_orders.get(asset, {}).values())
 
     async def cancel_order(self, venue_order_id: str, asset: str) -> None:
         self.ensure_instrument(asset)
         if self._safe_mode:
             # Cancels are still allowed in SAFE mode.
             pass
-        await self._venue.cancel_order(venue_order_id, asset=asset)
+        with self._latency.time("venue_cancel", self._venue.venue, asset):
+            await self._venue.cancel_order(venue_order_id, asset=asset)
+        self._forget_order(asset, venue_order_id)
         self._flipflop.record(asset, "CANCEL", now_s=self._now_s())
         self._audit.log("CANCEL", {"venue": self._venue.venue, "asset": asset, "order_id": venue_order_id})
 
         if self._flipflop.should_halt(asset, now_s=self._now_s()):
             self._enter_safe_mode("FLIPFLOP_DETECTED", asset=asset)
 
+    async def cancel_all(self, asset: str) -> list[str]:
+        """
+        Cancel every tracked open order on `asset` in one venue batch.
+
+        Counts as a single flip-flop CANCEL event. Allowed in SAFE mode. Returns the ids that are
+        no longer resting.
+
+        If the batch call fails, each id is cancelled on its own to settle its state: ids the venue
+        reports as `OrderNotFound` are gone and forgotten; ids that still fail stay tracked (so the
+        risk engine keeps counting them) and are audited as CANCEL_FAILED. Nothing is raised.
+        """
+        self.ensure_instrument(asset)
+        order_ids = list(self._open_orders.get(asset, {}))
+        if not order_ids:
+            return []
+        errors: dict[str, Exception] = {}
+        with self._latency.time("venue_cancel", self._venue.venue, asset):
+            try:
+                await self._venue.cancel_orders(order_ids, asset=asset)
+            except Exception:
+                errors = await self._cancel_each(asset, order_ids)
+        failed = {oid: exc for oid, exc in errors.items() if not isinstance(exc, OrderNotFound)}
+        cancelled = [oid for oid in order_ids if oid not in failed]
+        for oid in cancelled:
+            self._forget_order(asset, oid)
+        self._flipflop.record(asset, "CANCEL", now_s=self._now_s())
+        self._audit.log("CANCEL_BATCH", {"venue": self._venue.venue, "asset": asset, "order_ids": cancelled})
+        if failed:
+            self._audit.log(
+                "CANCEL_FAILED",
+                {
+                    "venue": self._venue.venue,
+                    "asset": asset,
+                    "order_ids": list(failed),
+                    "errors": {oid: f"{type(exc).__name__}: {exc}" for oid, exc in failed.items()},
+                },
+            )
+
+        if self._flipflop.should_halt(asset, now_s=self._now_s()):
+            self._enter_safe_mode("FLIPFLOP_DETECTED", asset=asset)
+        return cancelled
+
+    async def _cancel_each(self, asset: str, order_ids: Sequence[str]) -> dict[str, Exception]:
+        """Cancel ids one by one (concurrently); returns the error per id that failed."""
+        results = await asyncio.gather(
+            *(self._venue.cancel_order(oid, asset=asset) for oid in order_ids), return_exceptions=True
+        )
+        errors: dict[str, Exception] = {}
+        for oid, res in zip(order_ids, results):
+            if isinstance(res, Exception):
+                errors[oid] = res
+            elif isinstance(res, BaseException):
+                raise res
+        return errors
+
+    async def replace_orders(self, asset: str, reqs: Sequence[OrderRequest]) -> list[OrderAck]:
+        """
+        Requote `asset`: cancel all tracked open orders, then place `reqs` as one batch.
+
+        Two venue round-trips regardless of ladder depth. If the new batch is blocked by a
+        guardrail the cancels stand (pulling quotes is the safe direction). Orders whose cancel
+        failed stay tracked, so the risk checks on the new batch still count them.
+        """
+        await self.cancel_all(asset)
+        return await self.place_orders(reqs)
+
+    def _forget_order(self, asset: str, venue_order_id: str) -> None:
+        book = self._open_orders.get(asset)
+        if book is not None:
+            book.pop(venue_order_id, None)
+        if self._risk is not None:
+            self._risk.order_closed(venue_order_id)
+
     def on_fill(self, fill: FillEvent) -> None:
         """
         Process a fill/trade event.
@@ -273,9 +489,8 @@ class OMS:
         st = self._states[fill.asset]
         st.last_ws_event_ts_ms = self._now_ms()
 
-        if fill.id in st.seen_fill_ids:
+        if not st.seen_fill_ids.add(fill.id):
             return
-        st.seen_fill_ids.add(fill.id)
 
         # Sequence gap detection if provided.
         if fill.seq is not None:
@@ -291,6 +506,18 @@ class OMS:
         signed_qty = fill.qty if fill.side == Side.BUY else -fill.qty
         st.internal_pos_qty += signed_qty
         st.last_fill_ts_ms = fill.ts_ms
+        # Venue fill timestamp -> internal running sum updated (feed + processing delay).
+        self._latency.record_us("fill_to_position", fill.venue, fill.asset, (self._now_ms() - fill.ts_ms) * 1000)
+        if self._risk is not None:
+            self._risk.set_position(fill.asset, st.internal_pos_qty)
+            self._risk.order_filled(fill.order_id, fill.qty)
+
+        book = self._open_orders.get(fill.asset)
+        order = book.get(fill.order_id) if book else None
+        if order is not None:
+            order.remaining_qty -= fill.qty
+            if order.remaining_qty <= 0.0:
+                del book[fill.order_id]
 
         # Mark dirty until confirmed via ws position update OR REST reconciliation.
         st.dirty = True
@@ -359,9 +586,33 @@ class OMS:
         On mismatch (beyond threshold after grace), enter SAFE mode and block new orders.
         """
         self.ensure_instrument(asset)
-        st = self._states[asset]
+        with self._latency.time("reconcile", self._venue.venue, asset):
+            snap = await self._venue.fetch_position(asset)
+            self._apply_rest_snapshot(snap)
 
-        snap = await self._venue.fetch_position(asset)
+    async def reconcile_all(self) -> None:
+        """
+        Reconcile every known instrument from one bulk REST snapshot.
+
+        Uses `VenueAdapter.fetch_positions_snapshot` so a reconcile tick costs a single
+        request against the venue rate limit instead of one per instrument.
+        """
+        assets = list(self._states.keys())
+        if not assets:
+            return
+        with self._latency.time("reconcile", self._venue.venue, "*"):
+            snaps = await self._venue.fetch_positions_snapshot(assets)
+            for asset in assets:
+                snap = snaps.get(asset)
+                if snap is None:
+                    self._enter_safe_mode("RECONCILE_MISSING_SNAPSHOT", asset=asset)
+                    continue
+                self._apply_rest_snapshot(snap)
+
+    def _apply_rest_snapshot(self, snap: PositionSnapshot) -> None:
+        asset = snap.asset
+        self.ensure_instrument(asset)
+        st = self._states[asset]
         st.last_rest_pos_qty = snap.qty
 
         # If we just had a fill, allow grace to avoid false positives.
@@ -405,7 +656,9 @@ class OMS:
             "safe_mode": self._safe_mode,
             "halt_reason": self._halt_reason,
             "armed": self._armed,
-            "instruments": {k: asdict(v) for k, v in self._states.items()},
+            "instruments": {k: _snapshot_instrument(v) for k, v in self._states.items()},
+            "open_orders": {k: len(v) for k, v in self._open_orders.items()},
+            "latency": self._latency.snapshot(),
         }
 
     def _within_threshold(self, *, internal: float, exchange: float) -> bool:
@@ -440,11 +693,16 @@ class OMS:
                 continue
 
             last_reconcile_s = now
-            # Reconcile all known instruments.
-            for asset in list(self._states.keys()):
-                try:
-                    await self.reconcile_position(asset)
-                except Exception as e:
-                    # If the venue is unavailable, fail-safe.
-                    self._enter_safe_mode("RECONCILE_ERROR", asset=asset, extra={"err": repr(e)})
+            # Reconcile all known instruments from one bulk snapshot.
+            try:
+                await self.reconcile_all()
+            except Exception as e:
+                # If the venue is unavailable, fail-safe.
+                self._enter_safe_mode("RECONCILE_ERROR", extra={"err": repr(e)})
+
 
+def _snapshot_instrument(st: InstrumentSafetyState) -> dict:
+    # Shallow field copy; the dedupe window is summarized by size rather than copied.
+    out = {f.name: getattr(st, f.name) for f in fields(st) if f.name != "seen_fill_ids"}
+    out["seen_fill_ids_count"] = len(st.seen_fill_ids)
+    return out
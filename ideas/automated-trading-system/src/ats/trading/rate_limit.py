@@ -16,15 +16,16 @@ class SlidingWindowRateLimiter:
     window_s: float
     _events: dict[str, deque[float]] = field(default_factory=dict)
 
-    def allow(self, key: str, now_s: float | None = None) -> bool:
+    def allow(self, key: str, now_s: float | None = None, cost: int = 1) -> bool:
+        """Take `cost` events for `key` if they all fit in the window (all or nothing)."""
         if now_s is None:
             now_s = time.time()
         q = self._events.setdefault(key, deque())
         cutoff = now_s - self.window_s
         while q and q[0] < cutoff:
             q.popleft()
-        if len(q) >= self.max_events:
+        if len(q) + cost > self.max_events:
             return False
-        q.append(now_s)
+        q.extend([now_s] * cost)
         return True
 
@@ -0,0 +1,242 @@
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass, field
+from typing import Optional, Sequence
+
+from .types import OrderRequest, Side
+
+
+@dataclass
+class RiskLimits:
+    """
+    Pre-trade exposure limits. A limit of 0 (or a missing per-asset entry) disables that check.
+
+    Exposure is worst-case: position plus all resting orders on one side filling. Notional uses
+    the last mark price, or the order's limit price when no mark is known yet.
+    """
+
+    # Per asset
+    max_asset_notional: dict[str, float] = field(default_factory=dict)
+    max_open_orders_per_asset: int = 0
+
+    # Portfolio
+    max_gross_notional: float = 0.0
+    max_net_notional: float = 0.0
+    max_open_orders: int = 0
+
+
+@dataclass(frozen=True, slots=True)
+class RiskBreach:
+    """Which limit blocked an order, with the projected value that breached it."""
+
+    limit: str
+    asset: str
+    projected: float
+    threshold: float
+
+
+class PreTradeRiskEngine:
+    """
+    Portfolio pre-trade risk checks over all instruments.
+
+    State is kept struct-of-arrays (one slot per instrument: position, resting buy/sell qty,
+    mark, open-order count) together with running portfolio totals. A check only recomputes the
+    slot of the order's asset and adjusts the totals, so its cost is O(1) in the number of
+    instruments and it can sit on the order path. Totals are re-summed exactly every
+    `resync_every` updates to bound floating-point drift.
+
+    Feed it from the OMS (positions, order lifecycle) and from market data (`set_mark`).
+    """
+
+    def __init__(self, limits: Optional[RiskLimits] = None, *, resync_every: int = 1024) -> None:
+        self.limits = limits or RiskLimits()
+        self._resync_every = resync_every
+        self._updates = 0
+
+        self._index: dict[str, int] = {}
+        self._assets: list[str] = []
+        self._pos: list[float] = []
+        self._open_buy: list[float] = []
+        self._open_sell: list[float] = []
+        self._mark: list[float] = []  # NaN until known
+        self._open_count: list[int] = []
+
+        # Cached per-slot contributions and their running totals.
+        self._gross: list[float] = []
+        self._net_long: list[float] = []
+        self._net_short: list[float] = []
+        self._total_gross = 0.0
+        self._total_net_long = 0.0
+        self._total_net_short = 0.0
+        self._total_open = 0
+
+        # order_id -> (slot, side, remaining qty)
+        self._orders: dict[str, tuple[int, Side, float]] = {}
+
+    # --- state feed -------------------------------------------------------------------------
+
+    def set_position(self, asset: str, qty: float) -> None:
+        i = self._slot(asset)
+        self._pos[i] = qty
+        self._refresh(i)
+
+    def set_mark(self, asset: str, price: float) -> None:
+        i = self._slot(asset)
+        self._mark[i] = price
+        self._refresh(i)
+
+    def order_opened(self, order_id: str, asset: str, side: Side, qty: float) -> None:
+        if order_id in self._orders:
+            return
+        i = self._slot(asset)
+        self._orders[order_id] = (i, side, qty)
+        self._add_resting(i, side, qty)
+        self._open_count[i] += 1
+        self._total_open += 1
+        self._refresh(i)
+
+    def order_filled(self, order_id: str, qty: float) -> None:
+        rec = self._orders.get(order_id)
+        if rec is None:
+            return
+        i, side, remaining = rec
+        filled = min(qty, remaining)
+        self._add_resting(i, side, -filled)
+        if remaining - filled <= 0.0:
+            del self._orders[order_id]
+            self._open_count[i] -= 1
+            self._total_open -= 1
+        else:
+            self._orders[order_id] = (i, side, remaining - filled)
+        self._refresh(i)
+
+    def order_closed(self, order_id: str) -> None:
+        rec = self._orders.pop(order_id, None)
+        if rec is None:
+            return
+        i, side, remaining = rec
+        self._add_resting(i, side, -remaining)
+        self._open_count[i] -= 1
+        self._total_open -= 1
+        self._refresh(i)
+
+    # --- checks -----------------------------------------------------------------------------
+
+    def check(self, req: OrderRequest) -> Optional[RiskBreach]:
+        """Return the first limit `req` would breach if it rested in full, else None."""
+        buy = req.qty if req.side == Side.BUY else 0.0
+        return self._check(req.asset, buy, req.qty - buy, 1, req.limit_price)
+
+    def check_batch(self, asset: str, reqs: Sequence[OrderRequest]) -> Optional[RiskBreach]:
+        """Like `check`, for several orders on one asset resting at once (e.g. a quote ladder)."""
+        buy = sum(r.qty for r in reqs if r.side == Side.BUY)
+        sell = sum(r.qty for r in reqs if r.side != Side.BUY)
+        prices = [r.limit_price for r in reqs if r.limit_price is not None]
+        return self._check(asset, buy, sell, len(reqs), max(prices) if prices else None)
+
+    def _check(
+        self,
+        asset: str,
+        add_buy: float,
+        add_sell: float,
+        add_orders: int,
+        limit_price: Optional[float],
+    ) -> Optional[RiskBreach]:
+        lim = self.limits
+        i = self._index.get(asset)
+        if i is None:
+            pos = buy = sell = 0.0
+            mark = math.nan
+            count = 0
+            old_gross = old_long = old_short = 0.0
+        else:
+            pos, buy, sell = self._pos[i], self._open_buy[i], self._open_sell[i]
+            mark = self._mark[i]
+            count = self._open_count[i]
+            old_gross, old_long, old_short = self._gross[i], self._net_long[i], self._net_short[i]
+
+        if lim.max_open_orders_per_asset > 0 and count + add_orders > lim.max_open_orders_per_asset:
+            return RiskBreach("MAX_OPEN_ORDERS_PER_ASSET", asset, count + add_orders, lim.max_open_orders_per_asset)
+        if lim.max_open_orders > 0 and self._total_open + add_orders > lim.max_open_orders:
+            return RiskBreach("MAX_OPEN_ORDERS", asset, self._total_open + add_orders, lim.max_open_orders)
+
+        asset_lim = lim.max_asset_notional.get(asset, 0.0)
+        if asset_lim <= 0.0 and lim.max_gross_notional <= 0.0 and lim.max_net_notional <= 0.0:
+            return None
+
+        if math.isnan(mark):
+            mark = limit_price if limit_price is not None else math.nan
+        if math.isnan(mark):
+            return RiskBreach("MARK_PRICE_UNKNOWN", asset, math.nan, 0.0)
+
+        gross, long_, short = _contribution(pos, buy + add_buy, sell + add_sell, mark)
+
+        if asset_lim > 0.0 and gross > asset_lim:
+            return RiskBreach("MAX_ASSET_NOTIONAL", asset, gross, asset_lim)
+        if lim.max_gross_notional > 0.0:
+            total = self._total_gross - old_gross + gross
+            if total > lim.max_gross_notional:
+                return RiskBreach("MAX_GROSS_NOTIONAL", asset, total, lim.max_gross_notional)
+        if lim.max_net_notional > 0.0:
+            net = max(
+                abs(self._total_net_long - old_long + long_),
+                abs(self._total_net_short - old_short + short),
+            )
+            if net > lim.max_net_notional:
+                return RiskBreach("MAX_NET_NOTIONAL", asset, net, lim.max_net_notional)
+        return None
+
+    def snapshot(self) -> dict:
+        return {
+            "gross_notional": self._total_gross,
+            "net_notional_long": self._total_net_long,
+            "net_notional_short": self._total_net_short,
+            "open_orders": self._total_open,
+        }
+
+    # --- internals --------------------------------------------------------------------------
+
+    def _slot(self, asset: str) -> int:
+        i = self._index.get(asset)
+        if i is not None:
+            return i
+        i = len(self._assets)
+        self._index[asset] = i
+        self._assets.append(asset)
+        for arr in (self._pos, self._open_buy, self._open_sell, self._gross, self._net_long, self._net_short):
+            arr.append(0.0)
+        self._mark.append(math.nan)
+        self._open_count.append(0)
+        return i
+
+    def _add_resting(self, i: int, side: Side, qty: float) -> None:
+        if side == Side.BUY:
+            self._open_buy[i] = max(0.0, self._open_buy[i] + qty)
+        else:
+            self._open_sell[i] = max(0.0, self._open_sell[i] + qty)
+
+    def _refresh(self, i: int) -> None:
+        mark = self._mark[i]
+        if math.isnan(mark):
+            gross = long_ = short = 0.0
+        else:
+            gross, long_, short = _contribution(self._pos[i], self._open_buy[i], self._open_sell[i], mark)
+        self._total_gross += gross - self._gross[i]
+        self._total_net_long += long_ - self._net_long[i]
+        self._total_net_short += short - self._net_short[i]
+        self._gross[i], self._net_long[i], self._net_short[i] = gross, long_, short
+
+        self._updates += 1
+        if self._updates >= self._resync_every:
+            self._updates = 0
+            self._total_gross = math.fsum(self._gross)
+            self._total_net_long = math.fsum(self._net_long)
+            self._total_net_short = math.fsum(self._net_short)
+
+
+def _contribution(pos: float, buy: float, sell: float, mark: float) -> tuple[float, float, float]:
+    # Worst-case signed notionals if every resting buy (resp. sell) fills.
+    long_ = (pos + buy) * mark
+    short = (pos - sell) * mark
+    return max(abs(long_), abs(short)), long_, short
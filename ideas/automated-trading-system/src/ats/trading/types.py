@@ -4,6 +4,8 @@ from dataclasses import dataclass, field
 from enum import Enum
 from typing import Optional
 
+from .dedupe import FillIdWindow
+
 
 class Side(str, Enum):
     BUY = "BUY"
@@ -21,7 +23,7 @@ class Mode(str, Enum):
     REPLAY = "REPLAY"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class OrderRequest:
     asset: str
     side: Side
@@ -36,7 +38,7 @@ class OrderRequest:
     client_order_id: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class OrderAck:
     venue_order_id: str
     asset: str
@@ -52,7 +54,21 @@ class OrderAck:
     ts_ms: Optional[int] = None
 
 
-@dataclass(frozen=True)
+@dataclass(slots=True)
+class OpenOrder:
+    """An order the OMS believes is resting on the venue (built from acks, fills and cancels)."""
+
+    venue_order_id: str
+    asset: str
+    side: Side
+    qty: float
+    remaining_qty: float
+    limit_price: Optional[float]
+    client_order_id: str = ""
+    ts_ms: Optional[int] = None
+
+
+@dataclass(frozen=True, slots=True)
 class FillEvent:
     """
     A normalized fill/trade event from WebSocket (preferred) or simulated sources.
@@ -76,7 +92,7 @@ class FillEvent:
     seq: Optional[int] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class InstrumentSafetyState:
     # Running sum based on fills (internal truth while WS is healthy).
     internal_pos_qty: float = 0.0
@@ -94,6 +110,6 @@ class InstrumentSafetyState:
     last_fill_ts_ms: Optional[int] = None
     last_ws_event_ts_ms: Optional[int] = None
 
-    # Used to dedupe fills.
-    seen_fill_ids: set[str] = field(default_factory=set)
+    # Used to dedupe fills (bounded window; see FillIdWindow for false-negative behaviour).
+    seen_fill_ids: FillIdWindow = field(default_factory=FillIdWindow)
 
@@ -1,11 +1,30 @@
 from __future__ import annotations
 
+import asyncio
 from dataclasses import dataclass
-from typing import Protocol
+from typing import Mapping, Protocol, Sequence
 
 from .types import Mode, OrderAck, OrderRequest
 
 
+class OrderNotFound(Exception):
+    """Raised by `cancel_order` when the venue no longer knows the order (filled, cancelled or expired)."""
+
+
+class PartialBatchError(Exception):
+    """
+    Raised by `place_orders` when some legs failed.
+
+    `acks` are the legs the venue accepted (in request order); they are resting and must be
+    tracked. `errors` maps the request index of each failed leg to its exception.
+    """
+
+    def __init__(self, acks: Sequence[OrderAck], errors: Mapping[int, Exception]) -> None:
+        super().__init__(f"{len(errors)} of {len(acks) + len(errors)} batch legs failed")
+        self.acks = list(acks)
+        self.errors = dict(errors)
+
+
 @dataclass(frozen=True)
 class PositionSnapshot:
     asset: str
@@ -30,5 +49,38 @@ class VenueAdapter(Protocol):
 
     async def cancel_order(self, venue_order_id: str, asset: str) -> None: ...
 
+    async def place_orders(self, reqs: Sequence[OrderRequest]) -> list[OrderAck]:
+        """
+        Place several orders, acks in request order.
+
+        Override with the venue's batch endpoint where available; the default issues the
+        single-order calls concurrently and raises `PartialBatchError` (carrying the accepted
+        legs) if any of them fails.
+        """
+        results = await asyncio.gather(*(self.place_order(r) for r in reqs), return_exceptions=True)
+        errors: dict[int, Exception] = {}
+        for i, res in enumerate(results):
+            if isinstance(res, Exception):
+                errors[i] = res
+            elif isinstance(res, BaseException):
+                raise res
+        if errors:
+            raise PartialBatchError([r for i, r in enumerate(results) if i not in errors], errors)
+        return list(results)
+
+    async def cancel_orders(self, venue_order_ids: Sequence[str], asset: str) -> None:
+        """Cancel several orders on one asset (batch endpoint if available, else concurrent)."""
+        await asyncio.gather(*(self.cancel_order(oid, asset) for oid in venue_order_ids))
+
     async def fetch_position(self, asset: str) -> PositionSnapshot: ...
 
+    async def fetch_positions_snapshot(self, assets: Sequence[str]) -> dict[str, PositionSnapshot]:
+        """
+        Bulk position snapshot for many assets, keyed by asset.
+
+        Adapters backed by a venue with a bulk positions endpoint should override this with a
+        single REST call. The default falls back to one `fetch_position` per asset.
+        """
+        snaps = await asyncio.gather(*(self.fetch_position(a) for a in assets))
+        return {s.asset: s for s in snaps}
+
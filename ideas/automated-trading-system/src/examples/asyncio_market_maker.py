@@ -21,7 +21,9 @@ from typing import AsyncIterator, Optional
 
 from ats.trading.audit import AuditLogger
 from ats.trading.config import load_oms_config_from_env, require_env
+from ats.trading.latency import serve_prometheus
 from ats.trading.oms import OMS
+from ats.trading.risk import PreTradeRiskEngine, RiskLimits
 from ats.trading.types import FillEvent, Mode, OrderAck, OrderRequest, OrderType, Side
 from ats.trading.venue import PositionSnapshot, VenueAdapter
 
@@ -134,11 +136,23 @@ async def main() -> None:
     oms_cfg = load_oms_config_from_env()
     oms_cfg.max_abs_position_qty["BTC/USDT"] = float(os.getenv("ATS_MAX_ABS_POSITION_BTC", "0.01"))
 
+    risk = PreTradeRiskEngine(
+        RiskLimits(
+            max_gross_notional=float(os.getenv("ATS_MAX_GROSS_NOTIONAL", "5000")),
+            max_open_orders=int(os.getenv("ATS_MAX_OPEN_ORDERS", "20")),
+        )
+    )
+
     venue = DummyDryRunVenue(venue=venue_cfg.venue, mode=venue_cfg.mode)
-    oms = OMS(venue=venue, audit=audit, config=oms_cfg)
+    oms = OMS(venue=venue, audit=audit, config=oms_cfg, risk=risk)
 
     await oms.start()
 
+    # Optional local Prometheus scrape endpoint for order-path latency histograms.
+    metrics_port = os.getenv("ATS_METRICS_PORT")
+    if metrics_port:
+        await serve_prometheus(oms.latency, port=int(metrics_port))
+
     # For LIVE, you'd call `oms.arm()` only after human confirmation.
     if venue_cfg.mode != Mode.LIVE:
         oms.arm()
@@ -148,6 +162,8 @@ async def main() -> None:
             oms.mark_ws_event(fill.asset)
             # Apply to "exchange" position for DRY_RUN.
             venue.apply_fill_to_exchange_position(fill)
+            # In production, feed marks from the ticker/orderbook stream instead.
+            risk.set_mark(fill.asset, fill.price)
             oms.on_fill(fill)
             # If you also have WS position updates, call:
             # oms.on_ws_position_update(fill.asset, qty=<exchange_reported_qty>)
@@ -158,29 +174,37 @@ async def main() -> None:
         OMS guardrails will block if positions are dirty, feed is stale,
         flip-flopping is detected, or reconcile drift occurs.
         """
+        # Requote slower than the flip-flop pair window so replaces don't count as place/cancel pairs.
+        requote_interval_s = oms_cfg.flipflop_pair_max_delay_s + 1.0
         while True:
-            await asyncio.sleep(1.0)
-            if oms.safe_mode:
-                # In production: cancel all open orders, alert operator, require re-arming.
-                await asyncio.sleep(1.0)
-                continue
-
+            await asyncio.sleep(requote_interval_s)
             try:
-                _ = await oms.place_order(
-                    OrderRequest(
-                        asset="BTC/USDT",
-                        side=Side.BUY,
-                        qty=0.001,
-                        order_type=OrderType.LIMIT,
-                        limit_price=49_900.0,
-                        tif="GTC",
-                        post_only=True,
-                        intent_id="mm_intent_buy",
-                        correlation_id="tick_1",
-                    )
+                if oms.safe_mode:
+                    # Pull resting quotes (allowed in SAFE mode); in production also alert and require re-arming.
+                    await oms.cancel_all("BTC/USDT")
+                    await asyncio.sleep(1.0)
+                    continue
+
+                # Requote the ladder as one batch cancel + one batch place.
+                _ = await oms.replace_orders(
+                    "BTC/USDT",
+                    [
+                        OrderRequest(
+                            asset="BTC/USDT",
+                            side=Side.BUY,
+                            qty=0.001,
+                            order_type=OrderType.LIMIT,
+                            limit_price=49_900.0 - 10.0 * level,
+                            tif="GTC",
+                            post_only=True,
+                            intent_id="mm_intent_buy",
+                            correlation_id="tick_1",
+                        )
+                        for level in range(3)
+                    ],
                 )
             except Exception:
-                # The OMS already audited the block; the strategy should back off.
+                # The OMS already audited the block or failed cancel; the strategy should back off.
                 pass
 
     await asyncio.gather(ws_consumer(), quote_loop())
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Optional
+from typing import Optional, Sequence
 
 from ats.trading.types import Mode, OrderAck, OrderRequest
 from ats.trading.venue import PositionSnapshot, VenueAdapter
@@ -34,6 +34,13 @@ class FakeVenue(VenueAdapter):
         self._clock = clock or FakeClock()
         self._oid = 0
         self._rest_pos: dict[str, float] = {}
+        self.position_fetches = 0
+        self.batch_calls = 0
+        self.cancelled: list[str] = []
+        # limit_price -> error placing an order at that price raises
+        self.place_errors: dict[float, Exception] = {}
+        # venue_order_id -> error its cancel raises (a batch containing it fails as a whole)
+        self.cancel_errors: dict[str, Exception] = {}
 
     @property
     def venue(self) -> str:
@@ -44,6 +51,8 @@ class FakeVenue(VenueAdapter):
         return self._mode
 
     async def place_order(self, req: OrderRequest) -> OrderAck:
+        if req.limit_price in self.place_errors:
+            raise self.place_errors[req.limit_price]
         self._oid += 1
         return OrderAck(
             venue_order_id=f"order_{self._oid}",
@@ -60,12 +69,31 @@ class FakeVenue(VenueAdapter):
             ts_ms=self._clock.now_ms(),
         )
 
+    async def place_orders(self, reqs: Sequence[OrderRequest]) -> list[OrderAck]:
+        self.batch_calls += 1
+        return await super().place_orders(reqs)  # the default concurrent fallback
+
     async def cancel_order(self, venue_order_id: str, asset: str) -> None:
-        return None
+        if venue_order_id in self.cancel_errors:
+            raise self.cancel_errors[venue_order_id]
+        self.cancelled.append(venue_order_id)
+
+    async def cancel_orders(self, venue_order_ids: Sequence[str], asset: str) -> None:
+        self.batch_calls += 1
+        for oid in venue_order_ids:
+            if oid in self.cancel_errors:
+                raise self.cancel_errors[oid]
+        self.cancelled.extend(venue_order_ids)
 
     async def fetch_position(self, asset: str) -> PositionSnapshot:
+        self.position_fetches += 1
         return PositionSnapshot(asset=asset, qty=self._rest_pos.get(asset, 0.0), ts_ms=self._clock.now_ms())
 
+    async def fetch_positions_snapshot(self, assets: Sequence[str]) -> dict[str, PositionSnapshot]:
+        self.position_fetches += 1
+        ts_ms = self._clock.now_ms()
+        return {a: PositionSnapshot(asset=a, qty=self._rest_pos.get(a, 0.0), ts_ms=ts_ms) for a in assets}
+
     def set_rest_position(self, asset: str, qty: float) -> None:
         self._rest_pos[asset] = qty
 
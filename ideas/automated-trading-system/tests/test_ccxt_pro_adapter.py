@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import os
+import sys
+import types
+import unittest
+from typing import Any, Optional
+
+# Ensure we can import `ats` from ideas/automated-trading-system/src
+THIS_DIR = os.path.dirname(__file__)
+SRC_DIR = os.path.abspath(os.path.join(THIS_DIR, "..", "src"))
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+try:
+    import ccxt
+except ImportError:
+    # The adapter only needs ccxt's exception types; stub them when ccxt is not installed.
+    ccxt = types.ModuleType("ccxt")
+
+    class _BaseError(Exception):
+        pass
+
+    ccxt.BaseError = _BaseError
+    ccxt.NotSupported = type("NotSupported", (_BaseError,), {})
+    ccxt.OrderNotFound = type("OrderNotFound", (_BaseError,), {})
+    ccxt.NetworkError = type("NetworkError", (_BaseError,), {})
+    sys.modules["ccxt"] = ccxt
+
+from ats.trading.ccxt_pro_adapter import CcxtProVenueAdapter
+from ats.trading.types import Mode, OrderRequest, OrderType, Side
+
+
+class StubExchange:
+    """Records calls and returns canned ccxt-shaped payloads."""
+
+    id = "stub"
+
+    def __init__(self, *, has: Optional[dict[str, bool]] = None) -> None:
+        self.has = has or {}
+        self.calls: list[tuple[str, Any]] = []
+        self.positions: list[dict[str, Any]] = []
+        self.positions_error: Optional[Exception] = None
+        self.position: dict[str, Optional[dict[str, Any]]] = {}
+        self.position_error: Optional[Exception] = None
+        self._next_id = 0
+
+    async def fetch_positions(self, symbols: list[str]) -> list[dict[str, Any]]:
+        self.calls.append(("fetch_positions", list(symbols)))
+        if self.positions_error is not None:
+            raise self.positions_error
+        return list(self.positions)
+
+    async def fetch_position(self, symbol: str) -> Optional[dict[str, Any]]:
+        self.calls.append(("fetch_position", symbol))
+        if self.position_error is not None:
+            raise self.position_error
+        return self.position.get(symbol)
+
+    async def create_order(self, symbol, typ, side, amount, price, params) -> dict[str, Any]:
+        self.calls.append(("create_order", symbol))
+        return self._created()
+
+    async def create_orders(self, orders: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        self.calls.append(("create_orders", len(orders)))
+        return [self._created() for _ in orders]
+
+    async def cancel_order(self, order_id: str, symbol: str) -> None:
+        self.calls.append(("cancel_order", order_id))
+
+    async def cancel_orders(self, order_ids: list[str], symbol: str) -> None:
+        self.calls.append(("cancel_orders", list(order_ids)))
+
+    def _created(self) -> dict[str, Any]:
+        self._next_id += 1
+        return {"id": f"o{self._next_id}", "status": "open", "timestamp": 1_000}
+
+    def names(self) -> list[str]:
+        return [name for name, _ in self.calls]
+
+
+def _req(price: float) -> OrderRequest:
+    return OrderRequest(
+        asset="BTC/USDT:USDT",
+        side=Side.BUY,
+        qty=0.01,
+        order_type=OrderType.LIMIT,
+        limit_price=price,
+        intent_id="i",
+    )
+
+
+class CcxtProAdapterSnapshotTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.ex = StubExchange()
+        self.adapter = CcxtProVenueAdapter(self.ex, mode=Mode.DRY_RUN)
+
+    async def test_snapshot_is_one_batched_call_and_missing_symbols_are_flat(self) -> None:
+        self.ex.positions = [{"symbol": "BTC/USDT:USDT", "contracts": 2.0, "side": "long", "timestamp": 5}]
+
+        snaps = await self.adapter.fetch_positions_snapshot(["BTC/USDT:USDT", "ETH/USDT:USDT", "BTC/USDT:USDT"])
+
+        self.assertEqual(self.ex.calls, [("fetch_positions", ["BTC/USDT:USDT", "ETH/USDT:USDT"])])
+        self.assertEqual(snaps["BTC/USDT:USDT"].qty, 2.0)
+        self.assertEqual(snaps["BTC/USDT:USDT"].ts_ms, 5)
+        self.assertEqual(snaps["ETH/USDT:USDT"].qty, 0.0)
+
+    async def test_hedge_mode_legs_are_netted(self) -> None:
+        self.ex.positions = [
+            {"symbol": "BTC/USDT:USDT", "contracts": 3.0, "side": "long", "timestamp": 5},
+            {"symbol": "BTC/USDT:USDT", "contracts": 1.0, "side": "short", "timestamp": 7},
+            {"symbol": "XRP/USDT:USDT", "contracts": 9.0, "side": "long"},  # not requested
+        ]
+
+        snaps = await self.adapter.fetch_positions_snapshot(["BTC/USDT:USDT"])
+
+        self.assertEqual(list(snaps), ["BTC/USDT:USDT"])
+        self.assertEqual(snaps["BTC/USDT:USDT"].qty, 2.0)
+        self.assertEqual(snaps["BTC/USDT:USDT"].ts_ms, 7)
+
+    async def test_flat_first_snapshot_does_not_report_contract_size_later(self) -> None:
+        sym = "BTC/USDT:USDT"
+        self.ex.positions = [{"symbol": sym, "contracts": None, "contractSize": 0.001, "size": 0.0}]
+        snaps = await self.adapter.fetch_positions_snapshot([sym])
+        self.assertEqual(snaps[sym].qty, 0.0)
+
+        # A flat snapshot must not pin the field; the next one reports the real size.
+        self.ex.positions = [{"symbol": sym, "contracts": 4.0, "contractSize": 0.001, "side": "short"}]
+        snaps = await self.adapter.fetch_positions_snapshot([sym])
+        self.assertEqual(snaps[sym].qty, -4.0)
+
+    async def test_cached_field_is_reused_and_reprobed_when_missing(self) -> None:
+        sym = "BTC/USDT:USDT"
+        self.ex.positions = [{"symbol": sym, "size": 1.5, "info": {"size": "99"}}]
+        snaps = await self.adapter.fetch_positions_snapshot([sym])
+        self.assertEqual(snaps[sym].qty, 1.5)
+
+        # Once cached, "size" is read even when a higher-priority field appears later.
+        self.ex.positions = [{"symbol": sym, "contracts": 7.0, "size": 2.5}]
+        snaps = await self.adapter.fetch_positions_snapshot([sym])
+        self.assertEqual(snaps[sym].qty, 2.5)
+
+        # Cached field absent from this payload: probe again instead of reporting flat.
+        self.ex.positions = [{"symbol": sym, "info": {"size": "3"}}]
+        snaps = await self.adapter.fetch_positions_snapshot([sym])
+        self.assertEqual(snaps[sym].qty, 3.0)
+
+    async def test_not_supported_falls_back_per_asset(self) -> None:
+        self.ex.positions_error = ccxt.NotSupported("fetchPositions")
+        self.ex.position = {"BTC/USDT:USDT": {"contracts": 1.0, "side": "short"}, "ETH/USDT:USDT": None}
+
+        snaps = await self.adapter.fetch_positions_snapshot(["BTC/USDT:USDT", "ETH/USDT:USDT"])
+
+        self.assertEqual(self.ex.names(), ["fetch_positions", "fetch_position", "fetch_position"])
+        self.assertEqual(snaps["BTC/USDT:USDT"].qty, -1.0)
+        self.assertEqual(snaps["ETH/USDT:USDT"].qty, 0.0)
+
+    async def test_not_supported_fallback_propagates_errors(self) -> None:
+        self.ex.positions_error = ccxt.NotSupported("fetchPositions")
+        self.ex.position_error = ccxt.NetworkError("timeout")
+
+        with self.assertRaises(ccxt.NetworkError):
+            await self.adapter.fetch_positions_snapshot(["BTC/USDT:USDT"])
+
+    async def test_bulk_errors_propagate(self) -> None:
+        self.ex.positions_error = ccxt.NetworkError("timeout")
+
+        with self.assertRaises(ccxt.NetworkError):
+            await self.adapter.fetch_positions_snapshot(["BTC/USDT:USDT"])
+
+
+class CcxtProAdapterBatchTests(unittest.IsolatedAsyncioTestCase):
+    async def test_batch_endpoints_used_when_supported(self) -> None:
+        ex = StubExchange(has={"createOrders": True, "cancelOrders": True})
+        adapter = CcxtProVenueAdapter(ex, mode=Mode.DRY_RUN)
+
+        acks = await adapter.place_orders([_req(100.0), _req(101.0)])
+        await adapter.cancel_orders([a.venue_order_id for a in acks], "BTC/USDT:USDT")
+
+        self.assertEqual(ex.calls, [("create_orders", 2), ("cancel_orders", ["o1", "o2"])])
+        self.assertEqual([a.limit_price for a in acks], [100.0, 101.0])
+
+    async def test_falls_back_to_single_calls_without_batch_support(self) -> None:
+        ex = StubExchange()
+        adapter = CcxtProVenueAdapter(ex, mode=Mode.DRY_RUN)
+
+        acks = await adapter.place_orders([_req(100.0), _req(101.0)])
+        await adapter.cancel_orders([a.venue_order_id for a in acks], "BTC/USDT:USDT")
+
+        self.assertEqual(ex.names(), ["create_order", "create_order", "cancel_order", "cancel_order"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import sys
+import tempfile
+import unittest
+
+# Ensure we can import `ats` from ideas/automated-trading-system/src
+THIS_DIR = os.path.dirname(__file__)
+if THIS_DIR not in sys.path:
+    sys.path.insert(0, THIS_DIR)
+SRC_DIR = os.path.abspath(os.path.join(THIS_DIR, "..", "src"))
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+from ats.trading.audit import AuditLogger
+from ats.trading.latency import LatencyHistogram, LatencyRecorder, serve_prometheus
+from ats.trading.oms import OMS, OMSConfig
+from ats.trading.types import FillEvent, Mode, OrderRequest, OrderType, Side
+
+from fake_venue import FakeClock, FakeVenue
+
+
+class LatencyHistogramTests(unittest.TestCase):
+    def test_percentiles_within_bucket_precision(self) -> None:
+        h = LatencyHistogram()
+        for v in range(1, 100_001):
+            h.record(v)
+        self.assertEqual(h.count, 100_000)
+        self.assertEqual(h.max_us, 100_000)
+        for q, expected in ((0.5, 50_000), (0.99, 99_000)):
+            got = h.percentile(q)
+            self.assertGreaterEqual(got, expected)
+            self.assertLessEqual(got, expected * 1.01)
+
+    def test_prometheus_text(self) -> None:
+        rec = LatencyRecorder()
+        rec.record_us("venue_place", "fake", "BTC/USDT", 1500)
+        text = rec.render_prometheus()
+        self.assertIn("# TYPE ats_oms_latency_seconds summary", text)
+        self.assertIn(
+            'ats_oms_latency_seconds{stage="venue_place",venue="fake",asset="BTC/USDT",quantile="0.5"} 0.001500',
+            text,
+        )
+        self.assertIn('ats_oms_latency_seconds_count{stage="venue_place",venue="fake",asset="BTC/USDT"} 1', text)
+
+
+class OMSLatencyTests(unittest.IsolatedAsyncioTestCase):
+    async def test_order_path_stages_recorded_and_served(self) -> None:
+        clock = FakeClock()
+        venue = FakeVenue(clock=clock)
+        with tempfile.TemporaryDirectory() as tmp:
+            oms = OMS(
+                venue=venue,
+                audit=AuditLogger(path=os.path.join(tmp, "audit.jsonl")),
+                config=OMSConfig(position_latency_grace_s=0.0),
+                now_ms=clock.now_ms,
+                now_s=clock.now_s,
+            )
+            oms.arm()
+            oms.mark_ws_event("BTC/USDT")
+            await oms.place_order(
+                OrderRequest(asset="BTC/USDT", side=Side.BUY, qty=0.1, order_type=OrderType.LIMIT, limit_price=1.0)
+            )
+            oms.on_fill(
+                FillEvent(
+                    id="fill_1",
+                    ts_ms=clock.now_ms() - 7,
+                    venue=venue.venue,
+                    mode=Mode.DRY_RUN,
+                    asset="BTC/USDT",
+                    side=Side.BUY,
+                    qty=0.1,
+                    price=1.0,
+                    fees=0.0,
+                    order_id="order_1",
+                )
+            )
+            await oms.reconcile_all()
+
+            stages = {(r["stage"], r["asset"]) for r in oms.snapshot_state()["latency"]}
+            self.assertEqual(
+                stages,
+                {
+                    ("guardrails", "BTC/USDT"),
+                    ("venue_place", "BTC/USDT"),
+                    ("order_path", "BTC/USDT"),
+                    ("fill_to_position", "BTC/USDT"),
+                    ("reconcile", "*"),
+                },
+            )
+            self.assertEqual(oms.latency.get("fill_to_position", "fake", "BTC/USDT").max_us, 7000)
+
+            server = await serve_prometheus(oms.latency, port=0)
+            try:
+                port = server.sockets[0].getsockname()[1]
+                reader, writer = await asyncio.open_connection("127.0.0.1", port)
+                writer.write(b"GET /metrics HTTP/1.1\r\nHost: localhost\r\n\r\n")
+                await writer.drain()
+                resp = (await reader.read()).decode()
+                writer.close()
+            finally:
+                server.close()
+                await server.wait_closed()
+            self.assertTrue(resp.startswith("HTTP/1.0 200 OK"))
+            self.assertIn('stage="order_path"', resp)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import asyncio
+import json
 import os
 import sys
 import tempfile
@@ -17,6 +18,7 @@ if SRC_DIR not in sys.path:
 from ats.trading.audit import AuditLogger
 from ats.trading.oms import OMS, OMSConfig, OrderBlocked, SafetyHalt
 from ats.trading.types import FillEvent, Mode, OrderRequest, OrderType, Side
+from ats.trading.venue import OrderNotFound, PartialBatchError
 
 from fake_venue import FakeClock, FakeVenue
 
@@ -117,6 +119,34 @@ class OMSSafeguardsTests(unittest.IsolatedAsyncioTestCase):
         self.assertTrue(self.oms.safe_mode)
         self.assertIn("REST_POSITION_MISMATCH", self.oms.halt_reason)
 
+    async def test_reconcile_all_uses_one_bulk_snapshot(self) -> None:
+        self.oms.mark_ws_event("ETH/USDT")
+        self.oms.on_fill(
+            FillEvent(
+                id="fill_eth",
+                ts_ms=self.clock.now_ms(),
+                venue=self.venue.venue,
+                mode=Mode.DRY_RUN,
+                asset="ETH/USDT",
+                side=Side.SELL,
+                qty=2.0,
+                price=1.0,
+                fees=0.0,
+                order_id="order_eth",
+            )
+        )
+        self.venue.set_rest_position("ETH/USDT", -2.0)
+        await self.oms.reconcile_all()
+        self.assertEqual(self.venue.position_fetches, 1)
+        self.assertFalse(self.oms.safe_mode)
+        self.assertEqual(self.oms.snapshot_state()["instruments"]["ETH/USDT"]["last_rest_pos_qty"], -2.0)
+
+        self.venue.set_rest_position("BTC/USDT", 0.5)
+        await self.oms.reconcile_all()
+        self.assertEqual(self.venue.position_fetches, 2)
+        self.assertTrue(self.oms.safe_mode)
+        self.assertIn("REST_POSITION_MISMATCH", self.oms.halt_reason)
+
     async def test_rate_limit_blocks_and_enters_safe_mode(self) -> None:
         # Keep WS healthy.
         self.oms.mark_ws_event("BTC/USDT")
@@ -130,6 +160,20 @@ class OMSSafeguardsTests(unittest.IsolatedAsyncioTestCase):
         self.assertTrue(self.oms.safe_mode)
         self.assertIn("ORDER_RATE_LIMIT_BREACH", self.oms.halt_reason)
 
+    async def test_batch_consumes_one_rate_limit_token_per_order(self) -> None:
+        def ladder(n: int) -> list[OrderRequest]:
+            return [
+                OrderRequest(asset="BTC/USDT", side=Side.BUY, qty=0.01, order_type=OrderType.LIMIT, limit_price=1.0 - i / 100)
+                for i in range(n)
+            ]
+
+        await self.oms.place_orders(ladder(3))
+        # 3 + 3 > 5 orders in the window: the whole batch is blocked, nothing reaches the venue.
+        with self.assertRaises(OrderBlocked):
+            await self.oms.place_orders(ladder(3))
+        self.assertEqual(self.venue.batch_calls, 1)
+        self.assertIn("ORDER_RATE_LIMIT_BREACH", self.oms.halt_reason)
+
     async def test_ws_stale_blocks_new_orders(self) -> None:
         # Advance time so WS becomes stale.
         self.clock.advance_ms(10_000)
@@ -176,6 +220,133 @@ class OMSSafeguardsTests(unittest.IsolatedAsyncioTestCase):
         self.assertTrue(self.oms.safe_mode)
         self.assertIn("FILL_SEQ_GAP", self.oms.halt_reason)
 
+    async def test_fill_dedupe_window_is_bounded(self) -> None:
+        def fill(i: int) -> FillEvent:
+            return FillEvent(
+                id=f"fill_{i}",
+                ts_ms=self.clock.now_ms(),
+                venue=self.venue.venue,
+                mode=Mode.DRY_RUN,
+                asset="ETH/USDT",
+                side=Side.BUY,
+                qty=1.0,
+                price=1.0,
+                fees=0.0,
+                order_id="order_eth",
+            )
+
+        oms = OMS(
+            venue=self.venue,
+            audit=self.audit,
+            config=OMSConfig(fill_dedupe_window=3),
+            now_ms=self.clock.now_ms,
+            now_s=self.clock.now_s,
+        )
+        for i in range(5):
+            oms.on_fill(fill(i))
+        oms.on_fill(fill(4))  # duplicate inside the window is ignored
+
+        inst = oms.snapshot_state()["instruments"]["ETH/USDT"]
+        self.assertEqual(inst["internal_pos_qty"], 5.0)
+        self.assertEqual(inst["seen_fill_ids_count"], 3)
+        self.assertNotIn("seen_fill_ids", inst)
+
+    async def test_open_order_index_and_batch_requote(self) -> None:
+        def ladder(px: float) -> list[OrderRequest]:
+            return [
+                OrderRequest(asset="BTC/USDT", side=Side.BUY, qty=0.1, order_type=OrderType.LIMIT, limit_price=px - i)
+                for i in range(5)
+            ]
+
+        acks = await self.oms.place_orders(ladder(100.0))
+        self.assertEqual(self.venue.batch_calls, 1)
+        self.assertEqual(len(self.oms.open_orders("BTC/USDT")), 5)
+
+        self.oms.on_fill(
+            FillEvent(
+                id="fill_ladder",
+                ts_ms=self.clock.now_ms(),
+                venue=self.venue.venue,
+                mode=Mode.DRY_RUN,
+                asset="BTC/USDT",
+                side=Side.BUY,
+                qty=0.1,
+                price=100.0,
+                fees=0.0,
+                order_id=acks[0].venue_order_id,
+            )
+        )
+        self.assertEqual(len(self.oms.open_orders("BTC/USDT")), 4)
+        self.venue.set_rest_position("BTC/USDT", 0.1)
+        await self.oms.reconcile_position("BTC/USDT")
+
+        # Requote: one batch cancel + one batch place, counted once each by the flip-flop detector.
+        self.clock.advance_ms(1_100)  # a fresh rate-limit window for the second ladder
+        self.oms.mark_ws_event("BTC/USDT")
+        await self.oms.replace_orders("BTC/USDT", ladder(101.0))
+        self.assertEqual(self.venue.batch_calls, 3)
+        self.assertEqual(len(self.venue.cancelled), 4)
+        self.assertEqual(len(self.oms.open_orders("BTC/USDT")), 5)
+        self.assertEqual(self.oms.flipflop.pair_count("BTC/USDT", now_s=self.clock.now_s()), 1)
+
+        self.assertEqual(len(await self.oms.cancel_all("BTC/USDT")), 5)
+        self.assertEqual(self.oms.open_orders("BTC/USDT"), [])
+        self.assertEqual(self.oms.snapshot_state()["open_orders"], {"BTC/USDT": 0})
+
+    async def test_partial_batch_cancel_failure_is_reconciled_and_requote_proceeds(self) -> None:
+        ladder = [
+            OrderRequest(asset="BTC/USDT", side=Side.BUY, qty=0.1, order_type=OrderType.LIMIT, limit_price=100.0 - i)
+            for i in range(3)
+        ]
+        gone, stuck, ok = [a.venue_order_id for a in await self.oms.place_orders(ladder)]
+        self.venue.cancel_errors = {gone: OrderNotFound(gone), stuck: TimeoutError("venue timeout")}
+        self.clock.advance_ms(1_100)  # a fresh rate-limit window for the requote
+        self.oms.mark_ws_event("BTC/USDT")
+
+        acks = await self.oms.replace_orders("BTC/USDT", ladder)
+        self.assertEqual(len(acks), 3)
+        self.assertEqual(self.venue.cancelled, [ok])
+        self.assertEqual(
+            sorted(o.venue_order_id for o in self.oms.open_orders("BTC/USDT")),
+            sorted([stuck] + [a.venue_order_id for a in acks]),
+        )
+
+        with open(self.audit.path, encoding="utf-8") as f:
+            events = [json.loads(line) for line in f]
+        batch = [e for e in events if e["event_type"] == "CANCEL_BATCH"][-1]
+        failed = [e for e in events if e["event_type"] == "CANCEL_FAILED"][-1]
+        self.assertEqual(sorted(batch["order_ids"]), sorted([gone, ok]))
+        self.assertEqual(failed["order_ids"], [stuck])
+        self.assertIn("TimeoutError", failed["errors"][stuck])
+
+        # The stuck order is retried (and forgotten) on the next cancel once the venue recovers.
+        self.venue.cancel_errors = {}
+        self.assertIn(stuck, await self.oms.cancel_all("BTC/USDT"))
+        self.assertEqual(self.oms.open_orders("BTC/USDT"), [])
+
+    async def test_failed_batch_leg_keeps_the_accepted_legs_tracked(self) -> None:
+        ladder = [
+            OrderRequest(asset="BTC/USDT", side=Side.BUY, qty=0.1, order_type=OrderType.LIMIT, limit_price=100.0 - i)
+            for i in range(3)
+        ]
+        self.venue.place_errors = {99.0: TimeoutError("venue timeout")}
+
+        with self.assertRaises(PartialBatchError) as ctx:
+            await self.oms.place_orders(ladder)
+        self.assertEqual(list(ctx.exception.errors), [1])
+        placed = [a.venue_order_id for a in ctx.exception.acks]
+        self.assertEqual(len(placed), 2)
+        self.assertEqual(sorted(o.venue_order_id for o in self.oms.open_orders("BTC/USDT")), sorted(placed))
+
+        with open(self.audit.path, encoding="utf-8") as f:
+            partial = [json.loads(line) for line in f if '"ORDER_BATCH_PARTIAL"' in line]
+        self.assertEqual(partial[-1]["placed"], placed)
+        self.assertIn("TimeoutError", partial[-1]["errors"]["1"])
+
+        # The accepted legs can be pulled like any other resting order.
+        self.assertEqual(sorted(await self.oms.cancel_all("BTC/USDT")), sorted(placed))
+        self.assertEqual(self.oms.open_orders("BTC/USDT"), [])
+
     async def test_flipflop_place_cancel_detected(self) -> None:
         # Create a separate OMS with very high rate limit to isolate flip-flop detector.
         clock = FakeClock()
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+import unittest
+
+# Ensure we can import `ats` from ideas/automated-trading-system/src
+THIS_DIR = os.path.dirname(__file__)
+if THIS_DIR not in sys.path:
+    sys.path.insert(0, THIS_DIR)
+SRC_DIR = os.path.abspath(os.path.join(THIS_DIR, "..", "src"))
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+from ats.trading.audit import AuditLogger
+from ats.trading.oms import OMS, OMSConfig, RiskBlocked
+from ats.trading.risk import PreTradeRiskEngine, RiskLimits
+from ats.trading.types import FillEvent, Mode, OrderRequest, OrderType, Side
+
+from fake_venue import FakeClock, FakeVenue
+
+
+def _limit(asset: str, side: Side, qty: float, price: float = 100.0) -> OrderRequest:
+    return OrderRequest(asset=asset, side=side, qty=qty, order_type=OrderType.LIMIT, limit_price=price)
+
+
+class PreTradeRiskEngineTests(unittest.TestCase):
+    def test_gross_notional_counts_resting_orders(self) -> None:
+        eng = PreTradeRiskEngine(RiskLimits(max_gross_notional=1_000.0))
+        eng.set_mark("A", 100.0)
+        eng.set_mark("B", 100.0)
+        eng.order_opened("o1", "A", Side.BUY, 6.0)
+        self.assertIsNone(eng.check(_limit("B", Side.SELL, 4.0)))
+        breach = eng.check(_limit("B", Side.SELL, 5.0))
+        self.assertIsNotNone(breach)
+        self.assertEqual(breach.limit, "MAX_GROSS_NOTIONAL")
+
+        eng.order_closed("o1")
+        self.assertIsNone(eng.check(_limit("B", Side.SELL, 5.0)))
+
+    def test_net_notional_allows_hedges(self) -> None:
+        eng = PreTradeRiskEngine(RiskLimits(max_net_notional=500.0))
+        eng.set_mark("A", 100.0)
+        eng.set_mark("B", 100.0)
+        eng.set_position("A", 5.0)
+        self.assertEqual(eng.check(_limit("B", Side.BUY, 1.0)).limit, "MAX_NET_NOTIONAL")
+        self.assertIsNone(eng.check(_limit("B", Side.SELL, 5.0)))
+
+    def test_open_order_counts_and_fills(self) -> None:
+        eng = PreTradeRiskEngine(RiskLimits(max_open_orders=2, max_open_orders_per_asset=1))
+        eng.order_opened("o1", "A", Side.BUY, 1.0)
+        self.assertEqual(eng.check(_limit("A", Side.BUY, 1.0)).limit, "MAX_OPEN_ORDERS_PER_ASSET")
+        eng.order_opened("o2", "B", Side.BUY, 1.0)
+        self.assertEqual(eng.check(_limit("C", Side.BUY, 1.0)).limit, "MAX_OPEN_ORDERS")
+        eng.order_filled("o1", 0.4)
+        self.assertEqual(eng.snapshot()["open_orders"], 2)
+        eng.order_filled("o1", 0.6)
+        self.assertEqual(eng.snapshot()["open_orders"], 1)
+        self.assertIsNone(eng.check(_limit("A", Side.BUY, 1.0)))
+
+    def test_unknown_mark_blocks_market_orders_when_notional_limits_set(self) -> None:
+        eng = PreTradeRiskEngine(RiskLimits(max_asset_notional={"A": 1_000.0}))
+        req = OrderRequest(asset="A", side=Side.BUY, qty=1.0, order_type=OrderType.MARKET)
+        self.assertEqual(eng.check(req).limit, "MARK_PRICE_UNKNOWN")
+        self.assertIsNone(eng.check(_limit("A", Side.BUY, 1.0)))
+
+
+class OMSRiskIntegrationTests(unittest.IsolatedAsyncioTestCase):
+    async def test_risk_engine_blocks_on_order_path(self) -> None:
+        clock = FakeClock()
+        venue = FakeVenue(clock=clock)
+        with tempfile.TemporaryDirectory() as tmp:
+            audit = AuditLogger(path=os.path.join(tmp, "audit.jsonl"))
+            risk = PreTradeRiskEngine(RiskLimits(max_asset_notional={"BTC/USDT": 250.0}))
+            oms = OMS(
+                venue=venue,
+                audit=audit,
+                config=OMSConfig(position_latency_grace_s=0.0),
+                risk=risk,
+                now_ms=clock.now_ms,
+                now_s=clock.now_s,
+            )
+            oms.arm()
+            oms.mark_ws_event("BTC/USDT")
+            risk.set_mark("BTC/USDT", 100.0)
+
+            await oms.place_order(_limit("BTC/USDT", Side.BUY, 2.0))
+            with self.assertRaises(RiskBlocked) as ctx:
+                await oms.place_order(_limit("BTC/USDT", Side.BUY, 1.0))
+            self.assertEqual(ctx.exception.breach.limit, "MAX_ASSET_NOTIONAL")
+            self.assertFalse(oms.safe_mode)
+
+            oms.on_fill(
+                FillEvent(
+                    id="fill_1",
+                    ts_ms=clock.now_ms(),
+                    venue=venue.venue,
+                    mode=Mode.DRY_RUN,
+                    asset="BTC/USDT",
+                    side=Side.BUY,
+                    qty=2.0,
+                    price=100.0,
+                    fees=0.0,
+                    order_id="order_1",
+                )
+            )
+            self.assertEqual(risk.snapshot()["open_orders"], 0)
+            self.assertEqual(risk.snapshot()["gross_notional"], 200.0)
+
+
+if __name__ == "__main__":
+    unittest.main()